@@ -32,6 +32,7 @@ from caller import rest
 from ui.design_system_v2 import get_design_system, get_color
 import config
 from utils.secrets_manager import SecretsManager
+from managers.settings_manager import flush_all_settings
 from managers.summer_coupang_queue_status import build_summer_coupang_queue_snapshot
 
 logger = get_logger(__name__)
@@ -328,6 +329,8 @@ class BatchHandler:
         env = os.environ.copy()
         env["SSMAKER_LINKTREE_BROWSER_PUBLISH"] = "1"
         env["SSMAKER_LINKTREE_CLOSE_TAB_AFTER_VERIFY"] = "1"
+        # The runner reads preferences from disk; write pending changes first.
+        flush_all_settings()
         started_at = time.monotonic()
         self._set_run_status(
             "실행 중",
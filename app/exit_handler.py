@@ -103,6 +103,14 @@ class ExitHandler:
                 except Exception as e:
                     logger.error(f"[종료] 세션 저장 실패: {e}")
 
+            # 디바운스 대기 중인 설정 변경 저장
+            try:
+                from managers.settings_manager import flush_all_settings
+
+                flush_all_settings()
+            except Exception as e:
+                logger.error(f"[종료] 설정 저장 실패: {e}")
+
             # 임시 파일 정리
             self.app.cleanup_temp_files()
 
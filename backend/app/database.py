@@ -7,7 +7,7 @@ from app.configuration import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
-EXPECTED_ALEMBIC_REVISION = "20260820_0009"
+EXPECTED_ALEMBIC_REVISION = "20261018_0011"
 
 # Connection pool configuration
 # Using URL.create() instead of f-string to prevent password from appearing in stack traces
@@ -51,6 +51,9 @@ class User(Base):
     # 작업 횟수 관리 (-1 = 무제한)
     work_count = Column(Integer, default=-1, nullable=False)
     work_used = Column(Integer, default=0, nullable=False)
+    # Outstanding v3 reservations. Reserve/finalize/release adjust it with a
+    # conditional UPDATE; it is recomputed from work_usages when leases expire.
+    work_reserved = Column(Integer, default=0, server_default="0", nullable=False)
     # Trial monthly free cycle start timestamp (UTC)
     trial_cycle_started_at = Column(TIMESTAMP, nullable=True)
     # 사용자 유형 (trial=체험판, subscriber=구독자, admin=관리자)
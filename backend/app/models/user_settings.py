@@ -6,7 +6,12 @@ from app.database import Base
 
 
 class UserSettings(Base):
-    """Per-account desktop app settings snapshot."""
+    """Per-account desktop app settings snapshot.
+
+    ``version`` increases on every stored change; ``field_versions_json`` maps
+    each key (including removed keys) to the version that last changed it so
+    clients can pull only the fields changed since their version.
+    """
 
     __tablename__ = "user_settings"
     __table_args__ = (
@@ -21,6 +26,8 @@ class UserSettings(Base):
         index=True,
     )
     settings_json = Column(Text().with_variant(MEDIUMTEXT, "mysql"), nullable=False)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    field_versions_json = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True),
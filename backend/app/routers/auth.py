@@ -9,6 +9,7 @@ from typing import Any, Dict, Optional, List
 from fastapi import APIRouter, Depends, Request, Header, HTTPException, Query
 from pydantic import BaseModel, Field, field_validator
 from slowapi.errors import RateLimitExceeded
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from starlette.responses import JSONResponse
 
@@ -24,6 +25,8 @@ from app.schemas.auth import (
     UseWorkResponse,
     UseWorkV2Response,
     WorkReservationResponse,
+    WorkLeaseRequest,
+    WorkLeaseResponse,
     CheckWorkResponse,
     ChangePasswordRequest,
 )
@@ -140,6 +143,17 @@ def get_client_ip(request: Request) -> str:
 router = APIRouter(prefix="/user", tags=["auth"])
 
 
+MAX_SETTINGS_BYTES = 256 * 1024
+
+
+def _serialized_settings_size(value: Any) -> int:
+    try:
+        serialized = json.dumps(value, ensure_ascii=False, default=str)
+    except TypeError as exc:
+        raise ValueError("Settings must be JSON serializable") from exc
+    return len(serialized.encode("utf-8"))
+
+
 class UserSettingsRequest(BaseModel):
     """Desktop app settings snapshot for the authenticated account."""
 
@@ -148,11 +162,22 @@ class UserSettingsRequest(BaseModel):
     @field_validator("settings")
     @classmethod
     def validate_settings_size(cls, value: Dict[str, Any]) -> Dict[str, Any]:
-        try:
-            serialized = json.dumps(value, ensure_ascii=False, default=str)
-        except TypeError as exc:
-            raise ValueError("Settings must be JSON serializable") from exc
-        if len(serialized.encode("utf-8")) > 256 * 1024:
+        if _serialized_settings_size(value) > MAX_SETTINGS_BYTES:
+            raise ValueError("Settings payload is too large")
+        return value
+
+
+class UserSettingsDeltaRequest(BaseModel):
+    """Field-level change against the settings version the client last saw."""
+
+    base_version: int = Field(..., ge=0)
+    changes: Dict[str, Any] = Field(default_factory=dict)
+    removed: List[str] = Field(default_factory=list, max_length=500)
+
+    @field_validator("changes")
+    @classmethod
+    def validate_changes_size(cls, value: Dict[str, Any]) -> Dict[str, Any]:
+        if _serialized_settings_size(value) > MAX_SETTINGS_BYTES:
             raise ValueError("Settings payload is too large")
         return value
 
@@ -279,33 +304,135 @@ async def change_password(
     return {"success": True}
 
 
-@router.get("/settings")
-@limiter.limit("60/minute")
-async def get_user_settings(
-    request: Request,
-    current_user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
-):
-    """Return the authenticated user's synced desktop settings."""
-    record = (
-        db.query(UserSettings)
-        .filter(UserSettings.user_id == current_user_id)
-        .first()
-    )
-    if not record:
-        return {"success": True, "settings": {}, "updated_at": None}
+def _settings_record(db: Session, user_id: int) -> Optional[UserSettings]:
+    return db.query(UserSettings).filter(UserSettings.user_id == user_id).first()
+
 
+def _decode_settings(record: UserSettings) -> Dict[str, Any]:
     try:
         raw_settings_json = record.settings_json or "{}"
         if is_encrypted(raw_settings_json):
             raw_settings_json = decrypt_billing_key(raw_settings_json)
         settings_payload = json.loads(raw_settings_json)
     except json.JSONDecodeError:
-        logger.warning("[UserSettings] Corrupted settings JSON for user_id=%s", current_user_id)
+        logger.warning("[UserSettings] Corrupted settings JSON for user_id=%s", record.user_id)
         settings_payload = {}
+    return settings_payload if isinstance(settings_payload, dict) else {}
+
+
+def _decode_field_versions(record: UserSettings) -> Dict[str, int]:
+    try:
+        versions = json.loads(record.field_versions_json or "{}")
+    except json.JSONDecodeError:
+        return {}
+    return versions if isinstance(versions, dict) else {}
+
+
+def _encode_settings(settings_payload: Dict[str, Any]) -> str:
+    settings_json = json.dumps(settings_payload, ensure_ascii=False, separators=(",", ":"), default=str)
+    return encrypt_billing_key(settings_json) if has_encryption_key() else settings_json
+
+
+def _changed_keys(before: Dict[str, Any], after: Dict[str, Any]) -> List[str]:
+    return [
+        key
+        for key in set(before) | set(after)
+        if key not in before or key not in after or before[key] != after[key]
+    ]
+
+
+def _store_settings(
+    db: Session,
+    user_id: int,
+    record: Optional[UserSettings],
+    current: Dict[str, Any],
+    updated: Dict[str, Any],
+) -> Optional[UserSettings]:
+    """Write ``updated`` as the next version; None when another write won the race."""
+    changed = _changed_keys(current, updated)
+    if record is None:
+        record = UserSettings(
+            user_id=user_id,
+            settings_json=_encode_settings(updated),
+            version=1,
+            field_versions_json=json.dumps({key: 1 for key in changed}, separators=(",", ":")),
+        )
+        db.add(record)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent first write created the row; retry against it.
+            db.rollback()
+            return None
+        db.refresh(record)
+        return record
+    if not changed:
+        return record
+
+    base_version = int(record.version or 0)
+    next_version = base_version + 1
+    field_versions = _decode_field_versions(record)
+    field_versions.update({key: next_version for key in changed})
+    written = (
+        db.query(UserSettings)
+        .filter(UserSettings.id == record.id, UserSettings.version == base_version)
+        .update(
+            {
+                UserSettings.settings_json: _encode_settings(updated),
+                UserSettings.version: next_version,
+                UserSettings.field_versions_json: json.dumps(field_versions, separators=(",", ":")),
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    if not written:
+        return None
+    db.refresh(record)
+    return record
+
 
+def _settings_saved(record: UserSettings) -> Dict[str, Any]:
     updated_at = record.updated_at.isoformat() if record.updated_at else None
-    return {"success": True, "settings": settings_payload, "updated_at": updated_at}
+    return {"success": True, "updated_at": updated_at, "version": int(record.version or 0)}
+
+
+@router.get("/settings")
+@limiter.limit("60/minute")
+async def get_user_settings(
+    request: Request,
+    since_version: Optional[int] = Query(None, ge=0),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    """Return the authenticated user's synced desktop settings.
+
+    With ``since_version`` only the fields changed after that version are
+    returned (``delta``), or ``unchanged`` when the client is current. A
+    version the server cannot serve a delta for gets the full snapshot.
+    """
+    record = _settings_record(db, current_user_id)
+    if not record:
+        return {"success": True, "settings": {}, "updated_at": None, "version": 0}
+
+    version = int(record.version or 0)
+    updated_at = record.updated_at.isoformat() if record.updated_at else None
+    if since_version is not None and since_version == version:
+        return {"success": True, "unchanged": True, "version": version, "updated_at": updated_at}
+
+    settings_payload = _decode_settings(record)
+    field_versions = _decode_field_versions(record)
+    if since_version and since_version < version and field_versions:
+        newer = [key for key, changed_at in field_versions.items() if int(changed_at) > since_version]
+        return {
+            "success": True,
+            "delta": True,
+            "changes": {key: settings_payload[key] for key in newer if key in settings_payload},
+            "removed": sorted(key for key in newer if key not in settings_payload),
+            "version": version,
+            "updated_at": updated_at,
+        }
+    return {"success": True, "settings": settings_payload, "updated_at": updated_at, "version": version}
 
 
 @router.put("/settings")
@@ -316,29 +443,52 @@ async def save_user_settings(
     current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
-    """Upsert the authenticated user's synced desktop settings."""
-    settings_json = json.dumps(data.settings, ensure_ascii=False, separators=(",", ":"), default=str)
-    stored_settings_json = (
-        encrypt_billing_key(settings_json)
-        if has_encryption_key()
-        else settings_json
-    )
+    """Replace the authenticated user's synced desktop settings (full snapshot)."""
+    for _ in range(3):
+        record = _settings_record(db, current_user_id)
+        current = _decode_settings(record) if record else {}
+        stored = _store_settings(db, current_user_id, record, current, data.settings)
+        if stored is not None:
+            return _settings_saved(stored)
+    raise HTTPException(status_code=409, detail="Settings changed concurrently; retry")
 
-    record = (
-        db.query(UserSettings)
-        .filter(UserSettings.user_id == current_user_id)
-        .first()
-    )
-    if record:
-        record.settings_json = stored_settings_json
-    else:
-        record = UserSettings(user_id=current_user_id, settings_json=stored_settings_json)
-        db.add(record)
 
-    db.commit()
-    db.refresh(record)
-    updated_at = record.updated_at.isoformat() if record.updated_at else None
-    return {"success": True, "updated_at": updated_at}
+@router.patch("/settings")
+@limiter.limit("60/minute")
+async def patch_user_settings(
+    request: Request,
+    data: UserSettingsDeltaRequest,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    """Apply a field-level change if the client is at the current version.
+
+    A version mismatch returns 409 with the current version; the client then
+    pulls the newer fields, re-applies its own changes and retries.
+    """
+    record = _settings_record(db, current_user_id)
+    current_version = int(record.version or 0) if record else 0
+    if data.base_version != current_version:
+        return JSONResponse(
+            status_code=409,
+            content={"success": False, "conflict": True, "version": current_version},
+        )
+
+    current = _decode_settings(record) if record else {}
+    updated = {**current, **data.changes}
+    for key in data.removed:
+        updated.pop(key, None)
+    if _serialized_settings_size(updated) > MAX_SETTINGS_BYTES:
+        raise HTTPException(status_code=413, detail="Settings payload is too large")
+
+    stored = _store_settings(db, current_user_id, record, current, updated)
+    if stored is None:
+        latest = _settings_record(db, current_user_id)
+        return JSONResponse(
+            status_code=409,
+            content={"success": False, "conflict": True, "version": int(latest.version or 0)},
+        )
+    return _settings_saved(stored)
 
 
 @router.get("/check-username/{username}")
@@ -512,3 +662,33 @@ async def release_work_v3(
     return await AuthService(db).release_work_v3(
         data.user_id, token, str(data.idempotency_key)
     )
+
+
+@router.post("/work/lease-v3", response_model=WorkLeaseResponse)
+@limiter.limit("60/minute")
+async def lease_work_v3(
+    request: Request,
+    data: WorkLeaseRequest,
+    authorization: Optional[str] = Header(None, alias="Authorization"),
+    db: Session = Depends(get_db),
+):
+    """Reserve a block of work slots for a batch in one round-trip."""
+    token = _resolve_token(authorization, data.token)
+    return await AuthService(db).lease_work_v3(
+        data.user_id, token, data.idempotency_keys
+    )
+
+
+@router.post("/work/lease-v3/release", response_model=WorkLeaseResponse)
+@limiter.limit("60/minute")
+async def release_work_lease_v3(
+    request: Request,
+    data: WorkLeaseRequest,
+    authorization: Optional[str] = Header(None, alias="Authorization"),
+    db: Session = Depends(get_db),
+):
+    """Return the unused reservations of a lease without charging them."""
+    token = _resolve_token(authorization, data.token)
+    return await AuthService(db).release_work_lease_v3(
+        data.user_id, token, data.idempotency_keys
+    )
@@ -1,7 +1,7 @@
 import re
 from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
-from typing import Literal, Optional, Union
+from typing import List, Literal, Optional, Union
 from uuid import UUID
 
 
@@ -84,6 +84,25 @@ class WorkReservationResponse(UseWorkV2Response):
     lease_expires_at: Optional[datetime] = None
 
 
+MAX_WORK_LEASE = 100
+
+
+class WorkLeaseRequest(UseWorkRequest):
+    """Reserve or return a block of v3 reservations in one request."""
+
+    idempotency_keys: List[UUID] = Field(..., min_length=1, max_length=MAX_WORK_LEASE)
+
+
+class WorkLeaseResponse(BaseModel):
+    success: bool
+    message: str
+    granted: int = 0
+    released: int = 0
+    remaining: Optional[int] = None  # -1 = unlimited
+    used: Optional[int] = None
+    reservations: List[WorkReservationResponse] = Field(default_factory=list)
+
+
 class CheckWorkResponse(BaseModel):
     """Work count check response."""
     success: bool
@@ -775,33 +775,16 @@ class AuthService:
                 remaining = -1
                 can_work = True
             else:
-                now = datetime.now(timezone.utc)
-                expired_count = self.db.query(WorkUsage).filter(
-                    WorkUsage.user_id == int(user_id),
-                    WorkUsage.status == "reserved",
-                    WorkUsage.lease_expires_at <= now,
-                ).update(
-                    {
-                        WorkUsage.status: "expired",
-                        WorkUsage.success: False,
-                        WorkUsage.message: "Reservation lease expired",
-                        WorkUsage.completed_at: now,
-                    },
-                    synchronize_session=False,
-                )
-                active_reservations = (
-                    self.db.query(func.count(WorkUsage.id))
-                    .filter(
-                        WorkUsage.user_id == int(user_id),
-                        WorkUsage.status == "reserved",
-                        WorkUsage.lease_expires_at > now,
-                    )
-                    .scalar()
-                    or 0
-                )
-                if expired_count:
+                # Remaining credit comes straight from the reserved counter;
+                # expired leases are only reaped when they would deny work.
+                reserved = int(getattr(user, "work_reserved", 0) or 0)
+                remaining = max(0, work_count - work_used - reserved)
+                if remaining == 0 and reserved:
+                    self._recover_expired_reservations(int(user_id), datetime.now(timezone.utc))
                     self.db.commit()
-                remaining = max(0, work_count - work_used - int(active_reservations))
+                    self.db.refresh(user)
+                    reserved = int(user.work_reserved or 0)
+                    remaining = max(0, work_count - work_used - reserved)
                 can_work = remaining > 0
 
             return {
@@ -1129,37 +1112,156 @@ class AuthService:
                 "idempotent_replay": False,
             }
 
-    def _locked_work_user(self, user_id: str, token: str) -> tuple[User, int]:
-        """Authenticate a work request and lock its user quota row."""
+    def _authenticated_work_user(self, user_id: str, token: str) -> tuple[User, int]:
+        """Authenticate a work request with a single session+user read.
+
+        No row lock is taken here; quota is enforced by the conditional
+        counter UPDATE in ``_claim_work_slot``.
+        """
         payload = decode_access_token(token)
         if str(payload.get("sub")) != str(user_id):
             raise ValueError("Token mismatch")
         numeric_user_id = int(user_id)
-        session = (
-            self.db.query(SessionModel)
+        user = (
+            self.db.query(User)
+            .join(SessionModel, SessionModel.user_id == User.id)
             .filter(
+                User.id == numeric_user_id,
                 SessionModel.token_jti == payload.get("jti"),
                 SessionModel.is_active.is_(True),
                 SessionModel.expires_at > datetime.now(timezone.utc),
             )
             .first()
         )
-        if not session:
+        if not user:
             raise ValueError("Session expired or revoked")
+        self.apply_trial_monthly_reset(user)
+        return user, numeric_user_id
 
-        # The legacy monthly reset helper may commit, so run it before taking
-        # the quota lock and then reload the row inside this transaction.
-        preliminary = self.db.query(User).filter(User.id == numeric_user_id).first()
-        if not preliminary:
-            raise ValueError("User not found")
-        self.apply_trial_monthly_reset(preliminary)
-        user = (
-            self.db.query(User)
-            .filter(User.id == numeric_user_id)
-            .with_for_update()
-            .one()
+    @staticmethod
+    def _work_entitlement(user: User) -> tuple[bool, bool]:
+        """Return ``(unlimited, trial_expired)`` for a work request."""
+        expiry = getattr(user, "subscription_expires_at", None)
+        user_type = getattr(user, "user_type", UserType.TRIAL)
+        user_type_value = user_type.value if hasattr(user_type, "value") else str(user_type)
+        work_count = int(getattr(user, "work_count", 0) or 0)
+        unlimited = _has_paid_entitlement(user_type_value, work_count, expiry) or work_count == -1
+        trial_expired = (
+            user_type_value == "trial"
+            and expiry is not None
+            and not is_subscription_active(expiry)
         )
-        return user, numeric_user_id
+        return unlimited, trial_expired
+
+    def _claim_work_slot(
+        self,
+        numeric_user_id: int,
+        unlimited: bool,
+        *,
+        charge: bool = False,
+        count: int = 1,
+    ) -> bool:
+        """Atomically move ``count`` units into ``work_reserved`` (or ``work_used``).
+
+        Limited accounts only succeed while ``work_used + work_reserved + count``
+        fits in ``work_count``; the check and the increment are one statement.
+        """
+        column = User.work_used if charge else User.work_reserved
+        statement = update(User).where(User.id == numeric_user_id)
+        if not unlimited:
+            statement = statement.where(
+                User.work_used + User.work_reserved + count <= User.work_count
+            )
+        result = self.db.execute(
+            statement.values({column: column + count}).execution_options(synchronize_session=False)
+        )
+        return bool(result.rowcount)
+
+    def _settle_work_slot(self, numeric_user_id: int, *, charge: bool, count: int = 1) -> None:
+        """Return reserved units, charging them to ``work_used`` when requested."""
+        values = {
+            User.work_reserved: case(
+                (User.work_reserved > count, User.work_reserved - count), else_=0
+            )
+        }
+        if charge:
+            values[User.work_used] = User.work_used + count
+        self.db.execute(
+            update(User)
+            .where(User.id == numeric_user_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _recover_expired_reservations(
+        self,
+        numeric_user_id: int,
+        now: datetime,
+        *,
+        exclude_id: Optional[int] = None,
+    ) -> None:
+        """Expire stale leases and rebuild ``work_reserved`` from work_usages.
+
+        Only runs when a limited account is about to be denied, so the user
+        row lock taken here stays off the fast path.
+        """
+        self.db.query(User.id).filter(User.id == numeric_user_id).with_for_update().first()
+        self.db.query(WorkUsage).filter(
+            WorkUsage.user_id == numeric_user_id,
+            WorkUsage.status == "reserved",
+            WorkUsage.lease_expires_at <= now,
+        ).update(
+            {
+                WorkUsage.status: "expired",
+                WorkUsage.success: False,
+                WorkUsage.message: "Reservation lease expired",
+                WorkUsage.completed_at: now,
+            },
+            synchronize_session=False,
+        )
+        active = self.db.query(func.count(WorkUsage.id)).filter(
+            WorkUsage.user_id == numeric_user_id,
+            WorkUsage.status == "reserved",
+        )
+        if exclude_id is not None:
+            active = active.filter(WorkUsage.id != exclude_id)
+        self.db.execute(
+            update(User)
+            .where(User.id == numeric_user_id)
+            .values(work_reserved=int(active.scalar() or 0))
+            .execution_options(synchronize_session=False)
+        )
+
+    def _existing_reservation(self, numeric_user_id: int, key: str) -> Optional[WorkUsage]:
+        return (
+            self.db.query(WorkUsage)
+            .filter(
+                WorkUsage.user_id == numeric_user_id,
+                WorkUsage.idempotency_key == key,
+            )
+            .first()
+        )
+
+    def _transition_reservation(
+        self,
+        numeric_user_id: int,
+        key: str,
+        now: datetime,
+        values: dict,
+    ) -> bool:
+        """Move a live reservation out of ``reserved``; exactly one caller wins."""
+        result = self.db.execute(
+            update(WorkUsage)
+            .where(
+                WorkUsage.user_id == numeric_user_id,
+                WorkUsage.idempotency_key == key,
+                WorkUsage.status == "reserved",
+                WorkUsage.lease_expires_at > now,
+            )
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        return bool(result.rowcount)
 
     @staticmethod
     def _reservation_response(
@@ -1192,99 +1294,57 @@ class AuthService:
             "lease_expires_at": None,
         }
 
+    @staticmethod
+    def _remaining_after(user: User, unlimited: bool, *, used: int, reserved: int) -> int:
+        if unlimited:
+            return -1
+        return max(0, int(getattr(user, "work_count", 0) or 0) - used - reserved)
+
     async def reserve_work_v3(self, user_id: str, token: str, idempotency_key: str) -> dict:
-        """Reserve capacity atomically; stale leases are recovered automatically."""
+        """Reserve capacity with one insert and one conditional counter update.
+
+        The unique (user_id, idempotency_key) index makes retries replay the
+        stored reservation. ``used``/``remaining`` in the response reflect the
+        account as read at the start of the request.
+        """
         key = str(idempotency_key)
         now = datetime.now(timezone.utc)
         try:
-            user, numeric_user_id = self._locked_work_user(user_id, token)
-            self.db.query(WorkUsage).filter(
-                WorkUsage.user_id == numeric_user_id,
-                WorkUsage.status == "reserved",
-                WorkUsage.lease_expires_at <= now,
-            ).update(
-                {
-                    WorkUsage.status: "expired",
-                    WorkUsage.success: False,
-                    WorkUsage.message: "Reservation lease expired",
-                    WorkUsage.completed_at: now,
-                },
-                synchronize_session=False,
-            )
-
-            existing = (
-                self.db.query(WorkUsage)
-                .filter(
-                    WorkUsage.user_id == numeric_user_id,
-                    WorkUsage.idempotency_key == key,
-                )
-                .with_for_update()
-                .first()
-            )
-            if existing:
-                self.db.commit()
-                return self._reservation_response(
-                    existing,
-                    replay=True,
-                    success=existing.status in {"reserved", "completed"},
-                )
-
-            expiry = getattr(user, "subscription_expires_at", None)
-            user_type = getattr(user, "user_type", UserType.TRIAL)
-            user_type_value = user_type.value if hasattr(user_type, "value") else str(user_type)
-            work_count = int(getattr(user, "work_count", 0) or 0)
-            unlimited = _has_paid_entitlement(user_type_value, work_count, expiry) or work_count == -1
-            if user_type_value == "trial" and expiry is not None and not is_subscription_active(expiry):
+            user, numeric_user_id = self._authenticated_work_user(user_id, token)
+            unlimited, trial_expired = self._work_entitlement(user)
+            if trial_expired:
                 self.db.rollback()
                 return self._reservation_error(key, "Subscription expired")
 
-            active_reservations = (
-                self.db.query(func.count(WorkUsage.id))
-                .filter(
-                    WorkUsage.user_id == numeric_user_id,
-                    WorkUsage.status == "reserved",
-                    WorkUsage.lease_expires_at > now,
-                )
-                .scalar()
-                or 0
-            )
             used = int(getattr(user, "work_used", 0) or 0)
-            if not unlimited and used + int(active_reservations) >= work_count:
-                self.db.rollback()
-                return self._reservation_error(key, "No remaining work count")
-
-            lease_expires_at = now + timedelta(hours=4)
-            remaining = -1 if unlimited else max(
-                0, work_count - used - int(active_reservations) - 1
-            )
+            reserved = int(getattr(user, "work_reserved", 0) or 0)
             usage = WorkUsage(
                 user_id=numeric_user_id,
                 idempotency_key=key,
                 success=True,
                 message="Work reserved",
                 used=used,
-                remaining=remaining,
+                remaining=self._remaining_after(user, unlimited, used=used, reserved=reserved + 1),
                 status="reserved",
                 reserved_at=now,
-                lease_expires_at=lease_expires_at,
+                lease_expires_at=now + timedelta(hours=4),
             )
             self.db.add(usage)
+            self.db.flush()
+
+            if not self._claim_work_slot(numeric_user_id, unlimited):
+                self._recover_expired_reservations(numeric_user_id, now, exclude_id=usage.id)
+                if not self._claim_work_slot(numeric_user_id, unlimited):
+                    self.db.rollback()
+                    return self._reservation_error(key, "No remaining work count")
             self.db.commit()
-            self.db.refresh(usage)
             return self._reservation_response(usage, replay=False)
         except ValueError as exc:
             self.db.rollback()
             return self._reservation_error(key, str(exc))
         except IntegrityError:
             self.db.rollback()
-            existing = (
-                self.db.query(WorkUsage)
-                .filter(
-                    WorkUsage.user_id == int(user_id),
-                    WorkUsage.idempotency_key == key,
-                )
-                .first()
-            )
+            existing = self._existing_reservation(int(user_id), key)
             if existing:
                 return self._reservation_response(
                     existing,
@@ -1302,7 +1362,26 @@ class AuthService:
         key = str(idempotency_key)
         now = datetime.now(timezone.utc)
         try:
-            user, numeric_user_id = self._locked_work_user(user_id, token)
+            user, numeric_user_id = self._authenticated_work_user(user_id, token)
+            unlimited, _trial_expired = self._work_entitlement(user)
+            used = int(getattr(user, "work_used", 0) or 0) + 1
+            reserved = max(0, int(getattr(user, "work_reserved", 0) or 0) - 1)
+            remaining = self._remaining_after(user, unlimited, used=used, reserved=reserved)
+            completed = {
+                WorkUsage.status: "completed",
+                WorkUsage.success: True,
+                WorkUsage.message: "Work completed",
+                WorkUsage.used: used,
+                WorkUsage.remaining: remaining,
+                WorkUsage.completed_at: now,
+            }
+            if self._transition_reservation(numeric_user_id, key, now, completed):
+                self._settle_work_slot(numeric_user_id, charge=True)
+                self.db.commit()
+                return self._reservation_response(
+                    self._existing_reservation(numeric_user_id, key), replay=False
+                )
+
             usage = (
                 self.db.query(WorkUsage)
                 .filter(
@@ -1322,50 +1401,28 @@ class AuthService:
                 self.db.commit()
                 return self._reservation_response(usage, replay=True, success=False)
 
-            recovering_expired = usage.status == "expired"
-            lease = usage.lease_expires_at
-            if usage.status == "reserved" and lease is not None:
-                if lease.tzinfo is None:
-                    lease = lease.replace(tzinfo=timezone.utc)
-                if lease <= now:
-                    usage.status = "expired"
-                    usage.success = False
-                    usage.message = "Reservation lease expired"
-                    usage.completed_at = now
-                    self.db.flush()
-                    recovering_expired = True
-
-            expiry = getattr(user, "subscription_expires_at", None)
-            user_type = getattr(user, "user_type", UserType.TRIAL)
-            user_type_value = user_type.value if hasattr(user_type, "value") else str(user_type)
-            work_count = int(getattr(user, "work_count", 0) or 0)
-            unlimited = _has_paid_entitlement(user_type_value, work_count, expiry) or work_count == -1
-            current_used = int(getattr(user, "work_used", 0) or 0)
-            if recovering_expired and not unlimited:
-                active_reservations = (
-                    self.db.query(func.count(WorkUsage.id))
-                    .filter(
-                        WorkUsage.user_id == numeric_user_id,
-                        WorkUsage.status == "reserved",
-                        WorkUsage.lease_expires_at > now,
-                    )
-                    .scalar()
-                    or 0
-                )
-                if current_used + int(active_reservations) >= work_count:
-                    self.db.commit()
-                    return self._reservation_response(
-                        usage,
-                        replay=True,
-                        success=False,
-                    )
+            # Lease ran out before the render finished. The slot no longer
+            # counts as reserved, so charge it only if quota still allows.
+            if usage.status == "reserved":
+                usage.status = "expired"
+                usage.success = False
+                usage.message = "Reservation lease expired"
+                usage.completed_at = now
+                self.db.flush()
+            self._recover_expired_reservations(numeric_user_id, now)
+            if not self._claim_work_slot(numeric_user_id, unlimited, charge=True):
+                self.db.commit()
+                return self._reservation_response(usage, replay=True, success=False)
 
-            user.work_used = current_used + 1
+            self.db.expire(user)
+            used = int(user.work_used or 0)
             usage.status = "completed"
             usage.success = True
             usage.message = "Work completed"
-            usage.used = user.work_used
-            usage.remaining = -1 if unlimited else max(0, work_count - user.work_used)
+            usage.used = used
+            usage.remaining = self._remaining_after(
+                user, unlimited, used=used, reserved=int(user.work_reserved or 0)
+            )
             usage.completed_at = now
             self.db.commit()
             return self._reservation_response(usage, replay=False)
@@ -1382,27 +1439,32 @@ class AuthService:
         key = str(idempotency_key)
         now = datetime.now(timezone.utc)
         try:
-            _user, numeric_user_id = self._locked_work_user(user_id, token)
-            usage = (
-                self.db.query(WorkUsage)
-                .filter(
-                    WorkUsage.user_id == numeric_user_id,
-                    WorkUsage.idempotency_key == key,
+            _user, numeric_user_id = self._authenticated_work_user(user_id, token)
+            released = {
+                WorkUsage.status: "released",
+                WorkUsage.success: True,
+                WorkUsage.message: "Work reservation released",
+                WorkUsage.completed_at: now,
+            }
+            if self._transition_reservation(numeric_user_id, key, now, released):
+                self._settle_work_slot(numeric_user_id, charge=False)
+                self.db.commit()
+                return self._reservation_response(
+                    self._existing_reservation(numeric_user_id, key), replay=False
                 )
-                .with_for_update()
-                .first()
-            )
+
+            usage = self._existing_reservation(numeric_user_id, key)
             if not usage:
                 self.db.rollback()
                 return self._reservation_error(key, "Reservation not found")
             if usage.status == "reserved":
-                usage.status = "released"
-                usage.success = True
-                usage.message = "Work reservation released"
-                usage.completed_at = now
+                # Lease already ran out; recovery marks it expired and fixes
+                # the reserved counter in one pass.
+                self._recover_expired_reservations(numeric_user_id, now)
+                self.db.commit()
+                self.db.refresh(usage)
+            else:
                 self.db.commit()
-                return self._reservation_response(usage, replay=False)
-            self.db.commit()
             return self._reservation_response(
                 usage,
                 replay=True,
@@ -1417,6 +1479,168 @@ class AuthService:
             logger.exception("Work reservation release failed")
             return self._reservation_error(key, "Internal error")
 
+    async def lease_work_v3(self, user_id: str, token: str, idempotency_keys: list) -> dict:
+        """Reserve a block of work slots for a batch in one round-trip.
+
+        Each key becomes an ordinary v3 reservation, finalized or released one
+        by one later. Limited accounts get as many as their quota allows; keys
+        that already exist replay their stored reservation.
+        """
+        keys = list(dict.fromkeys(str(key) for key in idempotency_keys))
+        now = datetime.now(timezone.utc)
+        try:
+            user, numeric_user_id = self._authenticated_work_user(user_id, token)
+            unlimited, trial_expired = self._work_entitlement(user)
+            if trial_expired:
+                self.db.rollback()
+                return self._lease_error("Subscription expired")
+
+            existing = {
+                usage.idempotency_key: usage
+                for usage in self.db.query(WorkUsage).filter(
+                    WorkUsage.user_id == numeric_user_id,
+                    WorkUsage.idempotency_key.in_(keys),
+                )
+            }
+            fresh = [key for key in keys if key not in existing]
+            granted = len(fresh)
+            if fresh and not self._claim_work_slot(numeric_user_id, unlimited, count=granted):
+                self._recover_expired_reservations(numeric_user_id, now)
+                work_count, used, reserved = (
+                    self.db.query(User.work_count, User.work_used, User.work_reserved)
+                    .filter(User.id == numeric_user_id)
+                    .one()
+                )
+                granted = min(granted, max(0, int(work_count or 0) - int(used or 0) - int(reserved or 0)))
+                if granted and not self._claim_work_slot(numeric_user_id, unlimited, count=granted):
+                    granted = 0
+
+            used = int(getattr(user, "work_used", 0) or 0)
+            reserved = int(getattr(user, "work_reserved", 0) or 0)
+            remaining = self._remaining_after(user, unlimited, used=used, reserved=reserved + granted)
+            created = [
+                WorkUsage(
+                    user_id=numeric_user_id,
+                    idempotency_key=key,
+                    success=True,
+                    message="Work reserved",
+                    used=used,
+                    remaining=remaining,
+                    status="reserved",
+                    reserved_at=now,
+                    lease_expires_at=now + timedelta(hours=4),
+                )
+                for key in fresh[:granted]
+            ]
+            self.db.add_all(created)
+            self.db.commit()
+        except ValueError as exc:
+            self.db.rollback()
+            return self._lease_error(str(exc))
+        except IntegrityError:
+            # A concurrent lease inserted one of the keys; retrying replays it.
+            self.db.rollback()
+            return self._lease_error("Reservation conflict")
+        except Exception:
+            self.db.rollback()
+            logger.exception("Work lease failed")
+            return self._lease_error("Internal error")
+
+        reservations = [
+            self._reservation_response(
+                existing[key],
+                replay=True,
+                success=existing[key].status in {"reserved", "completed"},
+            )
+            for key in keys
+            if key in existing
+        ]
+        reservations.extend(self._reservation_response(usage, replay=False) for usage in created)
+        leased = sum(1 for item in reservations if item["reservation_status"] == "reserved")
+        return {
+            "success": leased > 0,
+            "message": "Work reserved" if leased else "No remaining work count",
+            "granted": granted,
+            "remaining": remaining,
+            "used": used,
+            "reservations": reservations,
+        }
+
+    async def release_work_lease_v3(self, user_id: str, token: str, idempotency_keys: list) -> dict:
+        """Return every unused reservation of a lease in one round-trip."""
+        keys = list(dict.fromkeys(str(key) for key in idempotency_keys))
+        now = datetime.now(timezone.utc)
+        try:
+            _user, numeric_user_id = self._authenticated_work_user(user_id, token)
+            before = dict(
+                self.db.query(WorkUsage.idempotency_key, WorkUsage.status).filter(
+                    WorkUsage.user_id == numeric_user_id,
+                    WorkUsage.idempotency_key.in_(keys),
+                )
+            )
+            result = self.db.execute(
+                update(WorkUsage)
+                .where(
+                    WorkUsage.user_id == numeric_user_id,
+                    WorkUsage.idempotency_key.in_(keys),
+                    WorkUsage.status == "reserved",
+                    WorkUsage.lease_expires_at > now,
+                )
+                .values(
+                    status="released",
+                    success=True,
+                    message="Work reservation released",
+                    completed_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            released = int(result.rowcount or 0)
+            if released:
+                self._settle_work_slot(numeric_user_id, charge=False, count=released)
+            if released < sum(1 for status in before.values() if status == "reserved"):
+                # Some leases already ran out; expire them and fix the counter.
+                self._recover_expired_reservations(numeric_user_id, now)
+            self.db.commit()
+            usages = self.db.query(WorkUsage).filter(
+                WorkUsage.user_id == numeric_user_id,
+                WorkUsage.idempotency_key.in_(keys),
+            ).all()
+        except ValueError as exc:
+            self.db.rollback()
+            return self._lease_error(str(exc))
+        except Exception:
+            self.db.rollback()
+            logger.exception("Work lease release failed")
+            return self._lease_error("Internal error")
+
+        return {
+            "success": True,
+            "message": "Work reservations released",
+            "granted": 0,
+            "released": released,
+            "remaining": None,
+            "used": None,
+            "reservations": [
+                self._reservation_response(
+                    usage,
+                    replay=before.get(usage.idempotency_key) != "reserved",
+                    success=usage.status in {"released", "expired"},
+                )
+                for usage in usages
+            ],
+        }
+
+    @staticmethod
+    def _lease_error(message: str) -> dict:
+        return {
+            "success": False,
+            "message": message,
+            "granted": 0,
+            "remaining": None,
+            "used": None,
+            "reservations": [],
+        }
+
     def cleanup_offline_users_sync(self) -> None:
         """
         Mark users as offline if they haven't sent a heartbeat for more than 2 minutes.
@@ -1434,8 +1658,10 @@ class AuthService:
                 .where(or_(User.last_heartbeat.is_(None), User.last_heartbeat < threshold))
                 .values(is_online=False, current_task=None)
             )
+            # Always end the transaction: an open UPDATE with zero matched rows
+            # still holds the write lock on SQLite until the session closes.
+            self.db.commit()
             if int(getattr(result, "rowcount", 0) or 0) > 0:
-                self.db.commit()
                 logger.info("Marked %s stale users offline", result.rowcount)
         except Exception as e:
             logger.error(f"Error cleaning up offline users: {e}")
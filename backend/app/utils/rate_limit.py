@@ -1,11 +1,48 @@
-"""Single application-wide SlowAPI limiter."""
+"""Single application-wide SlowAPI limiter.
 
+Storage and strategy are pluggable through the process environment:
+
+- ``RATELIMIT_STORAGE_URL`` (default ``bucket+memory://``). Use
+  ``bucket+sqlite:////tmp/ssmaker-rate-limit.db`` to share buckets between
+  uvicorn workers on one host, or any other ``limits`` storage URI.
+- ``RATELIMIT_STRATEGY`` (default ``token-bucket``). Token buckets need a
+  ``bucket+`` storage; with any other storage (``redis://``,
+  ``memcached://`` ...) the limiter falls back to ``fixed-window``, which
+  works with every storage, and logs a warning.
+"""
+
+import logging
+import os
 from pathlib import Path
 
 from slowapi import Limiter
 
 from app.utils.ip_utils import get_client_ip
+from app.utils.rate_limit_storage import TOKEN_BUCKET_STRATEGY, supports_token_bucket
 
+logger = logging.getLogger(__name__)
 
 _CONFIG_FILE = Path(__file__).resolve().parents[1] / "config" / "rate_limit.env"
-limiter = Limiter(key_func=get_client_ip, config_filename=str(_CONFIG_FILE))
+DEFAULT_STORAGE_URL = "bucket+memory://"
+FALLBACK_STRATEGY = "fixed-window"
+
+
+def _resolve_strategy(storage_uri: str, strategy: str) -> str:
+    if strategy == TOKEN_BUCKET_STRATEGY and not supports_token_bucket(storage_uri):
+        logger.warning(
+            "RATELIMIT_STORAGE_URL scheme %r has no token-bucket support; using %s",
+            storage_uri.split("://", 1)[0],
+            FALLBACK_STRATEGY,
+        )
+        return FALLBACK_STRATEGY
+    return strategy
+
+
+_storage_uri = os.getenv("RATELIMIT_STORAGE_URL") or DEFAULT_STORAGE_URL
+
+limiter = Limiter(
+    key_func=get_client_ip,
+    config_filename=str(_CONFIG_FILE),
+    storage_uri=_storage_uri,
+    strategy=_resolve_strategy(_storage_uri, os.getenv("RATELIMIT_STRATEGY") or TOKEN_BUCKET_STRATEGY),
+)
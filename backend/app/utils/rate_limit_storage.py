@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Rate Limit Storage
+토큰 버킷 기반 레이트 리밋 저장소
+
+SlowAPI(limits) 에 연결되는 플러그형 저장소와 ``token-bucket`` 전략입니다.
+
+- ``bucket+memory://``: 프로세스 내부 저장소 (테스트/단일 워커용).
+  키 수가 ``max_keys`` 를 넘으면 다시 가득 찬 버킷을 먼저 버리고, 그래도
+  넘치면 가장 오래 쓰이지 않은 버킷을 버려 메모리가 일정합니다.
+- ``bucket+sqlite:///path/to/rate_limit.db``: 같은 호스트의 모든 워커가
+  공유하는 SQLite 파일. ``BEGIN IMMEDIATE`` 트랜잭션으로 버킷 갱신이 원자적입니다.
+
+Both storages drop a key as soon as its bucket has refilled (or its fixed
+window has expired), because such a key is indistinguishable from a key that
+was never seen. High-cardinality client-IP traffic therefore does not grow
+state without bound.
+"""
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Tuple
+from urllib.parse import parse_qs, urlparse
+
+from limits.limits import RateLimitItem
+from limits.storage import SCHEMES, Storage
+from limits.strategies import STRATEGIES, RateLimiter
+from limits.util import WindowStats
+
+TOKEN_BUCKET_STRATEGY = "token-bucket"
+DEFAULT_MAX_KEYS = 50_000
+_PRUNE_EVERY = 256
+# Over the key cap, scan for refilled buckets at most this often (seconds).
+_OVERFLOW_PRUNE_INTERVAL = 1.0
+
+# (allowed, tokens_left, next_token_at)
+BucketResult = Tuple[bool, float, float]
+
+
+def _refill(
+    tokens: float,
+    updated_at: float,
+    now: float,
+    capacity: int,
+    rate: float,
+) -> float:
+    return min(float(capacity), tokens + max(0.0, now - updated_at) * rate)
+
+
+def _take(
+    row: Tuple[float, float, float] | None,
+    now: float,
+    capacity: int,
+    period: int,
+    cost: int,
+    consume: bool,
+) -> Tuple[BucketResult, Tuple[float, float, float]]:
+    """Pure token-bucket step shared by every storage.
+
+    ``row`` is ``(tokens, updated_at, expires_at)``; the returned row is what
+    should be persisted. ``expires_at`` is the moment the bucket is full again.
+    """
+    rate = capacity / float(max(1, period))
+    if row is None or row[2] <= now:
+        tokens = float(capacity)
+    else:
+        tokens = _refill(row[0], row[1], now, capacity, rate)
+
+    allowed = tokens >= cost
+    if allowed and consume:
+        tokens -= cost
+
+    expires_at = now + (capacity - tokens) / rate
+    next_token_at = now + max(0.0, 1.0 - tokens) / rate
+    return (allowed, tokens, next_token_at), (tokens, now, expires_at)
+
+
+class _StorageOptionsMixin:
+    @staticmethod
+    def _max_keys(uri: str | None, options: dict) -> int:
+        raw = options.pop("max_keys", None)
+        if raw is None and uri:
+            raw = (parse_qs(urlparse(uri).query).get("max_keys") or [None])[0]
+        return max(1, int(raw or DEFAULT_MAX_KEYS))
+
+
+def supports_token_bucket(storage_uri: str) -> bool:
+    """True when the storage behind ``storage_uri`` implements ``acquire_tokens``."""
+    scheme = urlparse(storage_uri).scheme
+    return hasattr(SCHEMES.get(scheme), "acquire_tokens")
+
+
+class LocalTokenBucketStorage(_StorageOptionsMixin, Storage):
+    """In-process bucket store with a hard key cap.
+
+    Over the cap, refilled (expired) buckets go first; only when none are
+    left is the least recently used bucket evicted, so churning through
+    client IPs does not reset buckets that are still draining.
+    """
+
+    STORAGE_SCHEME = ["bucket+memory"]
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        wrap_exceptions: bool = False,
+        **options,
+    ):
+        self.max_keys = self._max_keys(uri, options)
+        self._rows: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ops = 0
+        self._next_overflow_prune = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return ValueError
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _store(self, key: str, row: Tuple[float, float, float], now: float) -> None:
+        self._rows[key] = row
+        self._rows.move_to_end(key)
+        self._ops += 1
+        if self._ops % _PRUNE_EVERY == 0:
+            self._prune(now)
+        if len(self._rows) > self.max_keys and now >= self._next_overflow_prune:
+            self._next_overflow_prune = now + _OVERFLOW_PRUNE_INTERVAL
+            self._prune(now)
+        while len(self._rows) > self.max_keys:
+            self._rows.popitem(last=False)
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, row in self._rows.items() if row[2] <= now]:
+            del self._rows[key]
+
+    def acquire_tokens(
+        self, key: str, capacity: int, period: int, cost: int = 1, consume: bool = True
+    ) -> BucketResult:
+        now = time.time()
+        with self._lock:
+            result, row = _take(self._rows.get(key), now, capacity, period, cost, consume)
+            if consume:
+                if row[0] >= capacity:
+                    self._rows.pop(key, None)
+                else:
+                    self._store(key, row, now)
+            return result
+
+    # -- fixed/sliding window compatibility (limits Storage API) --
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None or row[2] <= now:
+                row = (0.0, now, now + expiry)
+            row = (row[0] + amount, row[1], row[2])
+            self._store(key, row, now)
+            return int(row[0])
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            row = self._rows.get(key)
+            return int(row[0]) if row and row[2] > time.time() else 0
+
+    def get_expiry(self, key: str) -> float:
+        with self._lock:
+            row = self._rows.get(key)
+            return row[2] if row else time.time()
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> int | None:
+        with self._lock:
+            count = len(self._rows)
+            self._rows.clear()
+            return count
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._rows.pop(key, None)
+
+
+class SQLiteTokenBucketStorage(_StorageOptionsMixin, Storage):
+    """Bucket store shared by every worker process on the host.
+
+    URI follows the SQLAlchemy convention: ``bucket+sqlite:////abs/path.db`` or
+    ``bucket+sqlite:///relative.db``. ``bucket+sqlite://`` uses a private
+    in-memory database (tests only).
+    """
+
+    STORAGE_SCHEME = ["bucket+sqlite"]
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        wrap_exceptions: bool = False,
+        **options,
+    ):
+        self.max_keys = self._max_keys(uri, options)
+        path = urlparse(uri or "").path
+        self.path = path[1:] if path.startswith("/") else path
+        self._lock = threading.Lock()
+        self._ops = 0
+        self._conn = sqlite3.connect(
+            self.path or ":memory:",
+            timeout=float(options.pop("timeout", 5.0)),
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        if self.path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            " key TEXT PRIMARY KEY,"
+            " tokens REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_expires_at"
+            " ON rate_limit_buckets (expires_at)"
+        )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rate_limit_buckets").fetchone()[0]
+
+    def _row(self, key: str) -> Tuple[float, float, float] | None:
+        return self._conn.execute(
+            "SELECT tokens, updated_at, expires_at FROM rate_limit_buckets WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+    def _upsert(self, key: str, row: Tuple[float, float, float]) -> None:
+        self._conn.execute(
+            "INSERT INTO rate_limit_buckets (key, tokens, updated_at, expires_at)"
+            " VALUES (?, ?, ?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens,"
+            " updated_at = excluded.updated_at, expires_at = excluded.expires_at",
+            (key, *row),
+        )
+
+    def _maybe_prune(self, now: float) -> None:
+        self._ops += 1
+        if self._ops % _PRUNE_EVERY:
+            return
+        self._conn.execute("DELETE FROM rate_limit_buckets WHERE expires_at <= ?", (now,))
+        # Hard cap: drop the buckets closest to refilling first.
+        self._conn.execute(
+            "DELETE FROM rate_limit_buckets WHERE key IN ("
+            " SELECT key FROM rate_limit_buckets ORDER BY expires_at"
+            " LIMIT max(0, (SELECT COUNT(*) FROM rate_limit_buckets) - ?))",
+            (self.max_keys,),
+        )
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def acquire_tokens(
+        self, key: str, capacity: int, period: int, cost: int = 1, consume: bool = True
+    ) -> BucketResult:
+        now = time.time()
+        with self._transaction():
+            result, row = _take(self._row(key), now, capacity, period, cost, consume)
+            if consume:
+                if row[0] >= capacity:
+                    self._conn.execute("DELETE FROM rate_limit_buckets WHERE key = ?", (key,))
+                else:
+                    self._upsert(key, row)
+                    self._maybe_prune(now)
+            return result
+
+    # -- fixed/sliding window compatibility (limits Storage API) --
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        with self._transaction():
+            row = self._row(key)
+            if row is None or row[2] <= now:
+                row = (0.0, now, now + expiry)
+            row = (row[0] + amount, row[1], row[2])
+            self._upsert(key, row)
+            self._maybe_prune(now)
+            return int(row[0])
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            row = self._row(key)
+        return int(row[0]) if row and row[2] > time.time() else 0
+
+    def get_expiry(self, key: str) -> float:
+        with self._lock:
+            row = self._row(key)
+        return row[2] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            with self._lock:
+                self._conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        with self._transaction():
+            return self._conn.execute("DELETE FROM rate_limit_buckets").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._transaction():
+            self._conn.execute("DELETE FROM rate_limit_buckets WHERE key = ?", (key,))
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """``"10/minute"`` means a bucket of 10 tokens refilled evenly over a minute.
+
+    Unlike the fixed window, a client can not burst 2x the limit across a
+    window boundary, and the state per key is a single row.
+    """
+
+    def __init__(self, storage):
+        if not hasattr(storage, "acquire_tokens"):
+            raise NotImplementedError(
+                "token-bucket is not implemented for storage "
+                f"of type {storage.__class__}"
+            )
+        super().__init__(storage)
+
+    def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        return self.storage.acquire_tokens(
+            item.key_for(*identifiers), item.amount, item.get_expiry(), cost
+        )[0]
+
+    def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        return self.storage.acquire_tokens(
+            item.key_for(*identifiers), item.amount, item.get_expiry(), cost, consume=False
+        )[0]
+
+    def get_window_stats(self, item: RateLimitItem, *identifiers: str) -> WindowStats:
+        _, tokens, next_token_at = self.storage.acquire_tokens(
+            item.key_for(*identifiers), item.amount, item.get_expiry(), consume=False
+        )
+        return WindowStats(math.ceil(next_token_at), int(tokens))
+
+
+STRATEGIES.setdefault(TOKEN_BUCKET_STRATEGY, TokenBucketRateLimiter)
@@ -0,0 +1,37 @@
+"""track outstanding v3 work reservations on the user row"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0010"
+down_revision = "20260820_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "users" not in set(inspector.get_table_names()):
+        return
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    if "work_reserved" not in columns:
+        op.add_column(
+            "users",
+            sa.Column("work_reserved", sa.Integer(), nullable=False, server_default="0"),
+        )
+    if "work_usages" in set(inspector.get_table_names()):
+        op.execute(
+            "UPDATE users SET work_reserved = ("
+            " SELECT COUNT(*) FROM work_usages"
+            " WHERE work_usages.user_id = users.id"
+            " AND work_usages.status = 'reserved')"
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    if "work_reserved" in columns:
+        with op.batch_alter_table("users") as batch:
+            batch.drop_column("work_reserved")
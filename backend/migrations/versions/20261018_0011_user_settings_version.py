@@ -0,0 +1,39 @@
+"""version synced desktop settings for field-level delta sync"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0011"
+down_revision = "20261018_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "user_settings" not in set(inspector.get_table_names()):
+        return
+    columns = {column["name"] for column in inspector.get_columns("user_settings")}
+    if "version" not in columns:
+        op.add_column(
+            "user_settings",
+            sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        )
+    if "field_versions_json" not in columns:
+        op.add_column(
+            "user_settings",
+            sa.Column("field_versions_json", sa.Text(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "user_settings" not in set(inspector.get_table_names()):
+        return
+    columns = {column["name"] for column in inspector.get_columns("user_settings")}
+    with op.batch_alter_table("user_settings") as batch:
+        if "field_versions_json" in columns:
+            batch.drop_column("field_versions_json")
+        if "version" in columns:
+            batch.drop_column("version")
@@ -0,0 +1,451 @@
+"""Drive mixed traffic at the hot backend endpoints and report tail latency.
+
+The FastAPI app is served in-process through ``httpx.ASGITransport`` against a
+freshly seeded database (a temporary SQLite file by default), so the numbers
+cover routing, validation, auth and SQL but not the network. For every
+endpoint the report shows p50/p95/p99 latency in milliseconds and the mean
+number of SQL statements per request. A credit audit afterwards compares the
+charged ``work_used`` counters with completed reservations, so lost or
+double-counted credits under concurrency show up as a non-zero exit.
+
+Usage:
+    python scripts/load_test.py --concurrency 16 --requests 2000
+    python scripts/load_test.py --mix heartbeat=20,work_reserve_finalize=2 --json out.json
+    python scripts/load_test.py --database-url postgresql+psycopg://...
+
+SlowAPI limits are switched off while the benchmark runs (pass
+``--rate-limits`` to keep them) so the report measures the endpoints rather
+than the limiter rejecting a single synthetic client.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+# Settings are validated on import; the benchmark never talks to a real
+# deployment, so placeholders are enough for anything not provided.
+os.environ.setdefault("DB_USER", "loadtest")
+os.environ.setdefault("DB_PASSWORD", "loadtest")
+os.environ.setdefault("JWT_SECRET_KEY", "l" * 64)
+os.environ.setdefault("ADMIN_API_KEY", "a" * 64)
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+DEFAULT_MIX = {
+    "login": 1,
+    "heartbeat": 12,
+    "work_check": 4,
+    "work_reserve_finalize": 2,
+    "log_ingest": 4,
+    "admin_stats": 1,
+}
+PASSWORD = "loadtest-password-1"
+
+_current_sample: contextvars.ContextVar["_Sample | None"] = contextvars.ContextVar(
+    "load_test_sample", default=None
+)
+
+
+@dataclass
+class _Sample:
+    queries: int = 0
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies_ms)
+        count = len(ordered)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "p50_ms": round(percentile(ordered, 50), 2),
+            "p95_ms": round(percentile(ordered, 95), 2),
+            "p99_ms": round(percentile(ordered, 99), 2),
+            "queries_per_request": round(sum(self.queries) / count, 2) if count else 0.0,
+        }
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, int(-(-pct * len(ordered) // 100)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def parse_mix(raw: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for part in filter(None, (p.strip() for p in raw.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"unknown scenario {name!r}; choose from {sorted(DEFAULT_MIX)}")
+        mix[name] = int(weight or 1)
+    return mix or dict(DEFAULT_MIX)
+
+
+def _ip(n: int) -> str:
+    return f"10.{(n >> 16) & 255}.{(n >> 8) & 255}.{n & 255}"
+
+
+class LoadTest:
+    def __init__(self, database_url: str, users: int, seed: int = 7):
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.orm import sessionmaker
+
+        connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+        # One connection per virtual client plus headroom for dependency
+        # teardown, so pool checkout never stalls the event loop.
+        self.engine = create_engine(
+            database_url,
+            connect_args=connect_args,
+            pool_size=users,
+            max_overflow=users,
+        )
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        if database_url.startswith("sqlite"):
+            # Readers must not block the single writer, as on a server database.
+            event.listen(self.engine, "connect", self._sqlite_wal)
+        event.listen(self.engine, "before_cursor_execute", self._count_query)
+        self.users = users
+        self.random = random.Random(seed)
+        self._ip_counter = 0
+        self.stats: dict[str, EndpointStats] = {}
+        self.sessions: list[dict] = []
+        self.login_pool: list[str] = []
+        self.finalized = 0
+
+    @staticmethod
+    def _sqlite_wal(dbapi_connection, _record) -> None:
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute("PRAGMA synchronous=NORMAL")
+
+    @staticmethod
+    def _count_query(*_args) -> None:
+        sample = _current_sample.get()
+        if sample is not None:
+            sample.queries += 1
+
+    def _next_ip(self) -> str:
+        self._ip_counter += 1
+        return _ip(self._ip_counter)
+
+    def seed(self) -> None:
+        from app.database import Base
+        import app.models  # noqa: F401 - register every table on Base
+        from app.models.user import User, UserType
+        from app.utils.password import hash_password
+
+        Base.metadata.create_all(bind=self.engine)
+        password_hash = hash_password(PASSWORD)
+        expires = datetime.now(timezone.utc) + timedelta(days=30)
+        db = self.session_factory()
+        try:
+            for index in range(self.users * 2):
+                db.add(
+                    User(
+                        username=f"load{index:05d}",
+                        password_hash=password_hash,
+                        is_active=True,
+                        user_type=UserType.SUBSCRIBER,
+                        subscription_expires_at=expires,
+                        work_count=-1,
+                    )
+                )
+            db.commit()
+        finally:
+            db.close()
+        # Accounts reserved for the login scenario. Each one is checked out for a
+        # login/logout pair so the single-session policy never rejects it.
+        self.login_pool = [f"load{index:05d}" for index in range(self.users, self.users * 2)]
+
+    async def _request(self, client, name: str, method: str, url: str, ok: Callable[[dict], bool], **kwargs):
+        sample = _Sample()
+        token = _current_sample.set(sample)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            body = response.json() if response.content else {}
+            failed = response.status_code >= 400 or not ok(body)
+        except Exception:
+            body, failed = {}, True
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            _current_sample.reset(token)
+        stats = self.stats.setdefault(name, EndpointStats())
+        stats.latencies_ms.append(elapsed_ms)
+        stats.queries.append(sample.queries)
+        stats.errors += int(failed)
+        return body
+
+    async def _login(self, client, username: str, ip: str) -> dict | None:
+        body = await self._request(
+            client,
+            "login",
+            "POST",
+            "/user/login/god",
+            lambda b: b.get("status") is True,
+            json={"id": username, "pw": PASSWORD, "ip": ip},
+            headers={"X-Forwarded-For": ip},
+        )
+        if body.get("status") is not True:
+            return None
+        data = body["data"]
+        return {"id": data["data"]["id"], "token": data["token"], "ip": ip}
+
+    async def _logout(self, client, session: dict) -> None:
+        await self._request(
+            client,
+            "logout",
+            "POST",
+            "/user/logout/god",
+            lambda b: b.get("status") is True,
+            json={"id": session["id"]},
+            headers=self._auth(session),
+        )
+
+    @staticmethod
+    def _auth(session: dict) -> dict:
+        return {"Authorization": f"Bearer {session['token']}", "X-Forwarded-For": session["ip"]}
+
+    async def _scenario(self, client, name: str, session: dict, admin_key: str) -> None:
+        if name == "login":
+            username = self.login_pool.pop(self.random.randrange(len(self.login_pool)))
+            try:
+                fresh = await self._login(client, username, self._next_ip())
+                if fresh:
+                    await self._logout(client, fresh)
+            finally:
+                self.login_pool.append(username)
+        elif name == "heartbeat":
+            await self._request(
+                client, "heartbeat", "POST", "/user/login/god/check",
+                lambda b: b.get("status") is True,
+                json={"id": session["id"], "ip": session["ip"], "current_task": "rendering"},
+                headers=self._auth(session),
+            )
+        elif name == "work_check":
+            await self._request(
+                client, "work_check", "POST", "/user/work/check",
+                lambda b: b.get("success") is True,
+                json={"user_id": session["id"]},
+                headers=self._auth(session),
+            )
+        elif name == "work_reserve_finalize":
+            payload = {"user_id": session["id"], "idempotency_key": str(uuid.uuid4())}
+            reserved = await self._request(
+                client, "work_reserve", "POST", "/user/work/reserve-v3",
+                lambda b: b.get("success") is True,
+                json=payload, headers=self._auth(session),
+            )
+            if reserved.get("success"):
+                finalized = await self._request(
+                    client, "work_finalize", "POST", "/user/work/finalize-v3",
+                    lambda b: b.get("success") is True,
+                    json=payload, headers=self._auth(session),
+                )
+                if finalized.get("success"):
+                    self.finalized += 1
+        elif name == "log_ingest":
+            await self._request(
+                client, "log_ingest", "POST", "/user/logs",
+                lambda b: "id" in b,
+                json={"action": "render_done", "content": "load-test"},
+                headers=self._auth(session),
+            )
+        elif name == "admin_stats":
+            await self._request(
+                client, "admin_stats", "GET", "/user/admin/stats",
+                lambda b: "users" in b,
+                headers={"X-Admin-API-Key": admin_key},
+            )
+
+    def audit_credits(self) -> dict:
+        """Compare charged counters with the reservation ledger."""
+        from sqlalchemy import func
+
+        from app.models.user import User
+        from app.models.work_usage import WorkUsage
+
+        db = self.session_factory()
+        try:
+            charged = int(db.query(func.coalesce(func.sum(User.work_used), 0)).scalar())
+            reserved = int(db.query(func.coalesce(func.sum(User.work_reserved), 0)).scalar())
+            completed = db.query(WorkUsage).filter(WorkUsage.status == "completed").count()
+            outstanding = db.query(WorkUsage).filter(WorkUsage.status == "reserved").count()
+        finally:
+            db.close()
+        return {
+            "finalized": self.finalized,
+            "charged": charged,
+            "lost": max(0, completed - charged),
+            "double_counted": max(0, charged - completed),
+            "reserved_drift": reserved - outstanding,
+        }
+
+    async def run(self, app, mix: dict[str, int], concurrency: int, total: int) -> dict:
+        import httpx
+
+        from app.configuration import get_settings
+
+        admin_key = get_settings().ADMIN_API_KEY
+        if not admin_key:
+            mix = {k: v for k, v in mix.items() if k != "admin_stats"}
+        names, weights = zip(*mix.items())
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            for index in range(concurrency):
+                session = await self._login(client, f"load{index % self.users:05d}", self._next_ip())
+                if session is None:
+                    raise RuntimeError("seeded user could not log in; check the database")
+                self.sessions.append(session)
+            self.stats.clear()
+
+            remaining = total
+
+            async def worker(session: dict) -> None:
+                nonlocal remaining
+                while remaining > 0:
+                    remaining -= 1
+                    name = self.random.choices(names, weights)[0]
+                    await self._scenario(client, name, session, admin_key)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(s) for s in self.sessions))
+            elapsed = time.perf_counter() - started
+
+        endpoints = {name: stats.summary() for name, stats in sorted(self.stats.items())}
+        requests_done = sum(item["count"] for item in endpoints.values())
+        return {
+            "concurrency": concurrency,
+            "scenarios": total,
+            "requests": requests_done,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(requests_done / elapsed, 1) if elapsed else 0.0,
+            "endpoints": endpoints,
+            "credits": self.audit_credits(),
+        }
+
+
+def run_load_test(
+    *,
+    concurrency: int = 8,
+    requests: int = 500,
+    mix: dict[str, int] | None = None,
+    database_url: str | None = None,
+    rate_limits: bool = False,
+    seed: int = 7,
+) -> dict:
+    """Seed a database, override ``get_db`` and run the mixed workload once."""
+    from app.database import get_db
+    from app.main import app
+    from app.utils.rate_limit import limiter
+
+    workdir = None
+    if not database_url:
+        workdir = tempfile.TemporaryDirectory(prefix="ssmaker-loadtest-")
+        database_url = f"sqlite:///{Path(workdir.name) / 'loadtest.db'}"
+
+    harness = LoadTest(database_url, users=max(1, concurrency), seed=seed)
+    harness.seed()
+
+    def _get_db():
+        db = harness.session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous_override = app.dependency_overrides.get(get_db)
+    previous_enabled = limiter.enabled
+    app.dependency_overrides[get_db] = _get_db
+    limiter.enabled = rate_limits
+    try:
+        return asyncio.run(harness.run(app, mix or dict(DEFAULT_MIX), concurrency, requests))
+    finally:
+        limiter.enabled = previous_enabled
+        if previous_override is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous_override
+        harness.engine.dispose()
+        if workdir is not None:
+            workdir.cleanup()
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['requests']} requests in {report['elapsed_s']}s "
+        f"({report['throughput_rps']} req/s, concurrency={report['concurrency']})",
+        f"{'endpoint':<16}{'count':>7}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'q/req':>7}",
+    ]
+    for name, row in report["endpoints"].items():
+        lines.append(
+            f"{name:<16}{row['count']:>7}{row['errors']:>5}{row['p50_ms']:>9.1f}"
+            f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['queries_per_request']:>7.1f}"
+        )
+    credits = report.get("credits")
+    if credits:
+        lines.append(
+            f"credits: finalized={credits['finalized']} charged={credits['charged']} "
+            f"lost={credits['lost']} double_counted={credits['double_counted']} "
+            f"reserved_drift={credits['reserved_drift']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="scenarios to run in total")
+    parser.add_argument("--mix", default="", help="e.g. heartbeat=10,login=1 (default: built-in mix)")
+    parser.add_argument("--database-url", default="", help="default: temporary SQLite file")
+    parser.add_argument("--rate-limits", action="store_true", help="keep SlowAPI limits enabled")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", default="", help="also write the report here")
+    args = parser.parse_args(argv)
+
+    import logging
+
+    # Request logging would dominate the timings; failures are counted instead.
+    logging.disable(logging.WARNING)
+    report = run_load_test(
+        concurrency=args.concurrency,
+        requests=args.requests,
+        mix=parse_mix(args.mix),
+        database_url=args.database_url or None,
+        rate_limits=args.rate_limits,
+        seed=args.seed,
+    )
+    print(format_report(report))
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    credits = report["credits"]
+    failed = any(row["errors"] for row in report["endpoints"].values()) or any(
+        credits[name] for name in ("lost", "double_counted", "reserved_drift")
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -214,3 +214,250 @@ def test_work_v3_reserve_finalize_release_and_expiry_recovery():
     assert recovered_finalize["reservation_status"] == "completed"
     assert user.work_used == 2
     db.close()
+
+
+def test_work_v3_concurrent_reservations_never_lose_or_double_count_credits(tmp_path):
+    import threading
+
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    engine = create_engine(
+        f"sqlite:///{(tmp_path / 'reserve.db').as_posix()}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=8,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _wal(connection, _record):
+        connection.execute("PRAGMA journal_mode=WAL")
+
+    Base.metadata.create_all(engine)
+    make_session = sessionmaker(bind=engine)
+    db = make_session()
+    user = User(
+        username="concurrent-reservation-user",
+        password_hash="hash",
+        user_type=UserType.TRIAL,
+        work_count=20,
+        work_used=0,
+        subscription_expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    db.add(user)
+    db.commit()
+    token, jti, expires_at = create_access_token(user.id, "127.0.0.1")
+    db.add(SessionModel(
+        user_id=user.id,
+        token_jti=jti,
+        ip_address="127.0.0.1",
+        expires_at=expires_at,
+        is_active=True,
+    ))
+    db.commit()
+    user_id = str(user.id)
+    outcomes: list[tuple[str, bool]] = []
+    outcomes_lock = threading.Lock()
+
+    def _call(method, key):
+        # Lock contention on SQLite surfaces as "Internal error"; retry it.
+        for _ in range(50):
+            session = make_session()
+            try:
+                result = asyncio.run(getattr(AuthService(session), method)(user_id, token, key))
+            finally:
+                session.close()
+            if result["message"] != "Internal error":
+                return result
+        raise AssertionError(f"{method} never completed")
+
+    def worker(index: int) -> None:
+        for round_number in range(6):
+            key = str(uuid4())
+            reserved = _call("reserve_work_v3", key)
+            if not reserved["success"]:
+                continue
+            if (index + round_number) % 3 == 0:
+                _call("release_work_v3", key)
+                continue
+            finalized = _call("finalize_work_v3", key)
+            replay = _call("finalize_work_v3", key)
+            assert replay["idempotent_replay"] is True
+            with outcomes_lock:
+                outcomes.append((key, bool(finalized["success"])))
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db.expire_all()
+    db.refresh(user)
+    completed = db.query(WorkUsage).filter(WorkUsage.status == "completed").count()
+    assert completed == sum(1 for _key, success in outcomes if success)
+    assert user.work_used == completed
+    assert user.work_used <= user.work_count
+    assert user.work_reserved == 0
+    assert db.query(WorkUsage).filter(WorkUsage.status == "reserved").count() == 0
+    db.close()
+    engine.dispose()
+
+
+def test_work_v3_lease_grants_within_quota_and_returns_unused_slots():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user = User(
+        username="lease-user",
+        password_hash="hash",
+        user_type=UserType.TRIAL,
+        work_count=3,
+        work_used=0,
+        subscription_expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    token, jti, expires_at = create_access_token(user.id, "127.0.0.1")
+    db.add(SessionModel(
+        user_id=user.id,
+        token_jti=jti,
+        ip_address="127.0.0.1",
+        expires_at=expires_at,
+        is_active=True,
+    ))
+    db.commit()
+    service = AuthService(db)
+    keys = [str(uuid4()) for _ in range(5)]
+
+    lease = asyncio.run(service.lease_work_v3(str(user.id), token, keys))
+    db.refresh(user)
+    assert lease["success"] is True
+    assert lease["granted"] == 3
+    assert lease["remaining"] == 0
+    leased = [item["idempotency_key"] for item in lease["reservations"]]
+    assert leased == keys[:3]
+    assert user.work_reserved == 3
+
+    replay = asyncio.run(service.lease_work_v3(str(user.id), token, keys[:3]))
+    assert replay["granted"] == 0
+    assert all(item["idempotent_replay"] for item in replay["reservations"])
+    denied = asyncio.run(service.reserve_work_v3(str(user.id), token, keys[3]))
+    assert denied["success"] is False
+
+    finalized = asyncio.run(service.finalize_work_v3(str(user.id), token, keys[0]))
+    assert finalized["reservation_status"] == "completed"
+    returned = asyncio.run(service.release_work_lease_v3(str(user.id), token, keys))
+    db.refresh(user)
+    assert returned["released"] == 2
+    assert {item["reservation_status"] for item in returned["reservations"]} == {
+        "completed",
+        "released",
+    }
+    assert user.work_used == 1
+    assert user.work_reserved == 0
+    db.close()
+
+
+def test_work_check_reaps_expired_leases_from_the_reserved_counter():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user = User(
+        username="expired-lease-user",
+        password_hash="hash",
+        user_type=UserType.TRIAL,
+        work_count=2,
+        work_used=0,
+        subscription_expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    token, jti, expires_at = create_access_token(user.id, "127.0.0.1")
+    db.add(SessionModel(
+        user_id=user.id,
+        token_jti=jti,
+        ip_address="127.0.0.1",
+        expires_at=expires_at,
+        is_active=True,
+    ))
+    db.commit()
+    service = AuthService(db)
+
+    keys = [str(uuid4()), str(uuid4())]
+    asyncio.run(service.lease_work_v3(str(user.id), token, keys))
+    db.query(WorkUsage).filter(WorkUsage.idempotency_key == keys[0]).update(
+        {WorkUsage.lease_expires_at: datetime.now(timezone.utc) - timedelta(seconds=1)}
+    )
+    db.commit()
+
+    available = asyncio.run(service.check_work_available(str(user.id), token))
+    db.refresh(user)
+    assert available["can_work"] is True
+    assert available["remaining"] == 1
+    assert user.work_reserved == 1
+    expired = db.query(WorkUsage).filter(WorkUsage.idempotency_key == keys[0]).one()
+    assert expired.status == "expired"
+    db.close()
+    engine.dispose()
+
+
+def test_work_check_reads_the_reserved_counter_without_reaping():
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user = User(
+        username="counter-check-user",
+        password_hash="hash",
+        user_type=UserType.TRIAL,
+        work_count=3,
+        work_used=0,
+        subscription_expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    token, jti, expires_at = create_access_token(user.id, "127.0.0.1")
+    db.add(SessionModel(
+        user_id=user.id,
+        token_jti=jti,
+        ip_address="127.0.0.1",
+        expires_at=expires_at,
+        is_active=True,
+    ))
+    db.commit()
+    service = AuthService(db)
+
+    keys = [str(uuid4()), str(uuid4())]
+    asyncio.run(service.lease_work_v3(str(user.id), token, keys))
+    db.query(WorkUsage).filter(WorkUsage.idempotency_key == keys[0]).update(
+        {WorkUsage.lease_expires_at: datetime.now(timezone.utc) - timedelta(seconds=1)}
+    )
+    db.commit()
+
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    available = asyncio.run(service.check_work_available(str(user.id), token))
+    event.remove(engine, "before_cursor_execute", record)
+
+    assert available["can_work"] is True
+    assert available["remaining"] == 1
+    assert not any("work_usages" in statement for statement in statements)
+    stale = db.query(WorkUsage).filter(WorkUsage.idempotency_key == keys[0]).one()
+    assert stale.status == "reserved"
+    db.close()
+    engine.dispose()
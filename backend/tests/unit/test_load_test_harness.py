@@ -0,0 +1,66 @@
+"""Smoke tests for the in-repo backend load-test harness."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+
+script_path = Path(__file__).parents[2] / "scripts" / "load_test.py"
+spec = importlib.util.spec_from_file_location("backend_load_test", script_path)
+module = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+sys.modules[spec.name] = module  # dataclasses resolve their module by name
+spec.loader.exec_module(module)
+
+
+def test_percentile_uses_nearest_rank():
+    ordered = [float(value) for value in range(1, 101)]
+
+    assert module.percentile(ordered, 50) == 50.0
+    assert module.percentile(ordered, 95) == 95.0
+    assert module.percentile(ordered, 99) == 99.0
+    assert module.percentile([], 99) == 0.0
+
+
+def test_parse_mix_rejects_unknown_scenarios():
+    assert module.parse_mix("heartbeat=3,login") == {"heartbeat": 3, "login": 1}
+    assert module.parse_mix("") == module.DEFAULT_MIX
+    with pytest.raises(ValueError):
+        module.parse_mix("not_an_endpoint=1")
+
+
+def test_mixed_workload_reports_every_hot_endpoint_without_errors():
+    from app.utils.rate_limit import limiter
+
+    limiter_enabled = limiter.enabled
+    report = module.run_load_test(concurrency=3, requests=60, seed=3, mix={
+        "login": 1,
+        "heartbeat": 1,
+        "work_check": 1,
+        "work_reserve_finalize": 1,
+        "log_ingest": 1,
+        "admin_stats": 1,
+    })
+
+    assert limiter.enabled is limiter_enabled
+    endpoints = report["endpoints"]
+    assert {
+        "login",
+        "logout",
+        "heartbeat",
+        "work_check",
+        "work_reserve",
+        "work_finalize",
+        "log_ingest",
+        "admin_stats",
+    } <= set(endpoints)
+    for name, row in endpoints.items():
+        assert row["errors"] == 0, name
+        assert row["queries_per_request"] > 0, name
+        assert 0 < row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"], name
+    assert report["throughput_rps"] > 0
+    credits = report["credits"]
+    assert credits["finalized"] == credits["charged"] == endpoints["work_finalize"]["count"]
+    assert credits["lost"] == credits["double_counted"] == credits["reserved_drift"] == 0
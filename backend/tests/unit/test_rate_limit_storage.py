@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""Token-bucket rate-limit storage: semantics, sharing and bounded memory."""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "a" * 64)
+
+from app.utils import rate_limit_storage
+from app.utils.rate_limit_storage import (
+    LocalTokenBucketStorage,
+    SQLiteTokenBucketStorage,
+    TOKEN_BUCKET_STRATEGY,
+    TokenBucketRateLimiter,
+)
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(rate_limit_storage.time, "time", fake.time)
+    return fake
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        return storage_from_string("bucket+memory://")
+    return storage_from_string(f"bucket+sqlite:///{tmp_path / 'rl.db'}")
+
+
+def test_storage_schemes_and_strategy_are_registered(tmp_path):
+    assert isinstance(storage_from_string("bucket+memory://"), LocalTokenBucketStorage)
+    sqlite = storage_from_string(f"bucket+sqlite:///{tmp_path / 'rl.db'}")
+    assert isinstance(sqlite, SQLiteTokenBucketStorage)
+    assert sqlite.path == str(tmp_path / "rl.db")
+    assert STRATEGIES[TOKEN_BUCKET_STRATEGY] is TokenBucketRateLimiter
+
+
+def test_bucket_allows_capacity_then_refills_evenly(storage, clock):
+    limiter = TokenBucketRateLimiter(storage)
+    item = parse("6/minute")
+
+    assert all(limiter.hit(item, "1.2.3.4") for _ in range(6))
+    assert not limiter.hit(item, "1.2.3.4")
+    assert limiter.hit(item, "5.6.7.8")
+
+    stats = limiter.get_window_stats(item, "1.2.3.4")
+    assert stats.remaining == 0
+    assert stats.reset_time == pytest.approx(clock.now + 10, abs=1)
+
+    clock.now += 10  # one token per 10 seconds
+    assert limiter.test(item, "1.2.3.4")
+    assert limiter.hit(item, "1.2.3.4")
+    assert not limiter.hit(item, "1.2.3.4")
+
+
+def test_refilled_buckets_are_pruned_without_a_key_cap(storage, clock):
+    limiter = TokenBucketRateLimiter(storage)
+    item = parse("10/minute")  # empty-to-full in 6 seconds
+
+    for i in range(5_000):
+        limiter.hit(item, f"client-{i}")
+        clock.now += 0.01
+
+    # Only clients seen in the last ~6 seconds (600 hits) still hold state.
+    assert len(storage) <= 600 + 256
+
+
+def test_sqlite_buckets_are_shared_between_workers(tmp_path, clock):
+    uri = f"bucket+sqlite:///{tmp_path / 'shared.db'}"
+    worker_a = TokenBucketRateLimiter(storage_from_string(uri))
+    worker_b = TokenBucketRateLimiter(storage_from_string(uri))
+    item = parse("4/minute")
+
+    results = [worker.hit(item, "ip") for worker in (worker_a, worker_b) * 3]
+
+    assert results.count(True) == 4
+
+
+def test_concurrent_hits_never_overgrant(storage):
+    limiter = TokenBucketRateLimiter(storage)
+    item = parse("50/hour")
+    granted = []
+
+    def hammer():
+        for _ in range(40):
+            if limiter.hit(item, "burst"):
+                granted.append(1)
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(granted) == 50
+
+
+@pytest.mark.parametrize("scheme", ["bucket+memory://", "bucket+sqlite://"])
+def test_high_cardinality_client_ips_keep_state_bounded(scheme, clock):
+    storage = storage_from_string(scheme, max_keys=500)
+    limiter = TokenBucketRateLimiter(storage)
+    item = parse("10/minute")
+
+    for i in range(20_000):
+        limiter.hit(item, f"10.{i // 65536}.{(i // 256) % 256}.{i % 256}")
+        clock.now += 0.001
+
+    assert len(storage) <= 500 + 256
+
+
+def test_fixed_window_strategy_still_works_on_bucket_storage(storage, clock):
+    limiter = STRATEGIES["fixed-window"](storage)
+    item = parse("2/minute")
+
+    assert limiter.hit(item, "k")
+    assert limiter.hit(item, "k")
+    assert not limiter.hit(item, "k")
+    clock.now += 61
+    assert limiter.hit(item, "k")
+
+
+def test_application_limiter_uses_token_bucket_by_default():
+    from app.utils.rate_limit import limiter
+
+    assert limiter._strategy == TOKEN_BUCKET_STRATEGY
+    assert limiter._storage_uri == "bucket+memory://"
+
+
+def test_key_cap_evicts_refilled_buckets_before_exhausted_ones(clock):
+    storage = storage_from_string("bucket+memory://", max_keys=100)
+    limiter = TokenBucketRateLimiter(storage)
+    item = parse("2/minute")
+
+    assert limiter.hit(item, "abuser") and limiter.hit(item, "abuser")
+    assert not limiter.hit(item, "abuser")
+    long_item = parse("2/hour")
+    assert limiter.hit(long_item, "abuser") and limiter.hit(long_item, "abuser")
+    # Churn well past the cap with clients whose buckets refill in a second.
+    for i in range(1_000):
+        limiter.hit(parse("100/second"), f"churn-{i}")
+        clock.now += 0.02
+
+    assert len(storage) <= 100
+    assert not limiter.hit(long_item, "abuser")
+
+
+def test_storage_without_token_buckets_falls_back_to_fixed_window(caplog):
+    from app.utils.rate_limit import _resolve_strategy
+
+    assert _resolve_strategy("bucket+sqlite:///rl.db", TOKEN_BUCKET_STRATEGY) == TOKEN_BUCKET_STRATEGY
+    with caplog.at_level("WARNING"):
+        assert _resolve_strategy("redis://localhost:6379", TOKEN_BUCKET_STRATEGY) == "fixed-window"
+    assert "token-bucket" in caplog.text
+    assert _resolve_strategy("memcached://localhost", "moving-window") == "moving-window"
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""Versioned account settings: full snapshots, field-level deltas and conflicts."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "a" * 64)
+os.environ.setdefault("ADMIN_API_KEY", "b" * 64)
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.routers import auth
+from app.routers.auth import UserSettingsDeltaRequest, UserSettingsRequest
+
+
+def _unwrap(fn):
+    while hasattr(fn, "__wrapped__"):
+        fn = fn.__wrapped__
+    return fn
+
+
+get_settings = _unwrap(auth.get_user_settings)
+put_settings = _unwrap(auth.save_user_settings)
+patch_settings = _unwrap(auth.patch_user_settings)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _get(db, since_version=None):
+    return asyncio.run(get_settings(request=None, since_version=since_version, current_user_id=7, db=db))
+
+
+def _put(db, settings):
+    return asyncio.run(put_settings(
+        request=None, data=UserSettingsRequest(settings=settings), current_user_id=7, db=db
+    ))
+
+
+def _patch(db, base_version, changes=None, removed=None):
+    data = UserSettingsDeltaRequest(
+        base_version=base_version, changes=changes or {}, removed=removed or []
+    )
+    return asyncio.run(patch_settings(request=None, data=data, current_user_id=7, db=db))
+
+
+def test_full_snapshot_then_field_deltas_bump_the_version(db):
+    assert _get(db) == {"success": True, "settings": {}, "updated_at": None, "version": 0}
+
+    saved = _put(db, {"theme": "light", "cta_id": "a", "presets": list(range(50))})
+    assert saved["version"] == 1
+    assert _put(db, {"theme": "light", "cta_id": "a", "presets": list(range(50))})["version"] == 1
+
+    patched = _patch(db, 1, changes={"theme": "dark"}, removed=["cta_id"])
+    assert patched["success"] is True and patched["version"] == 2
+
+    delta = _get(db, since_version=1)
+    assert delta["delta"] is True
+    assert delta["changes"] == {"theme": "dark"}
+    assert delta["removed"] == ["cta_id"]
+    assert delta["version"] == 2
+    assert _get(db, since_version=2)["unchanged"] is True
+
+    full = _get(db, since_version=0)
+    assert full["settings"] == {"theme": "dark", "presets": list(range(50))}
+    assert full["version"] == 2
+
+
+def test_stale_base_version_is_a_conflict(db):
+    _put(db, {"theme": "light"})
+    _patch(db, 1, changes={"theme": "dark"})
+
+    response = _patch(db, 1, changes={"cta_id": "late"})
+
+    assert response.status_code == 409
+    assert json.loads(response.body) == {"success": False, "conflict": True, "version": 2}
+    assert "cta_id" not in _get(db)["settings"]
+
+
+def test_client_ahead_of_server_gets_the_full_snapshot(db):
+    _put(db, {"theme": "light"})
+
+    response = _get(db, since_version=9)
+
+    assert response["settings"] == {"theme": "light"}
+    assert "delta" not in response
+
+
+def test_losing_concurrent_first_write_is_a_conflict(db):
+    _patch(db, 0, changes={"theme": "light"})
+
+    # Another request read "no settings yet" before the first write committed.
+    assert auth._store_settings(db, 7, None, {}, {"cta_id": "late"}) is None
+
+    assert _get(db)["settings"] == {"theme": "light"}
+    assert _put(db, {"theme": "dark"})["version"] == 2
@@ -16,7 +16,7 @@ import time
 import functools
 import uuid
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
@@ -35,6 +35,8 @@ _AUTH_CONNECT_TIMEOUT_SECONDS = 2
 _USERNAME_CHECK_READ_TIMEOUT_SECONDS = 12
 _LOGIN_READ_TIMEOUT_SECONDS = 15
 _REGISTRATION_READ_TIMEOUT_SECONDS = 20
+# Server-side cap on keys per /user/work/lease-v3 request.
+MAX_WORK_LEASE = 100
 
 # Generic error messages for client responses (don't expose internals)
 # ???????? ?  (?? ? ? ?)
@@ -1778,34 +1780,13 @@ def consumeWork(user_id: str, idempotency_key: str) -> Dict[str, Any]:
     return {"success": False, "message": last_message, "remaining": None, "used": None}
 
 
-def _transition_work_reservation(
-    user_id: str,
-    idempotency_key: str,
-    transition: str,
-) -> Dict[str, Any]:
-    """Retry one idempotent v3 reservation transition with the same UUID."""
-    endpoints = {
-        "reserve": "reserve-v3",
-        "finalize": "finalize-v3",
-        "release": "release-v3",
-    }
-    endpoint = endpoints.get(str(transition or "").strip().lower())
-    if not endpoint:
-        return {"success": False, "message": "Invalid reservation transition"}
-    stored_token = _get_auth_token()
-    if not stored_token:
-        return {"success": False, "message": "No auth token"}
-    try:
-        normalized_key = str(uuid.UUID(str(idempotency_key)))
-    except (TypeError, ValueError, AttributeError):
-        return {"success": False, "message": "Invalid idempotency key"}
+def _post_work_reservation(endpoint: str, body: Dict[str, Any], token: str) -> Dict[str, Any]:
+    """POST one idempotent v3 reservation request, retrying transient failures.
 
-    body = {
-        "user_id": str(user_id),
-        "token": stored_token,
-        "idempotency_key": normalized_key,
-    }
-    headers = {"Authorization": f"Bearer {stored_token}"}
+    Every retry resends the same idempotency key(s), so a committed request
+    whose response was lost is replayed by the server instead of re-applied.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
     last_message = _ERROR_MESSAGES["network"]
     for attempt in range(3):
         try:
@@ -1847,6 +1828,61 @@ def _transition_work_reservation(
     }
 
 
+def _transition_work_reservation(
+    user_id: str,
+    idempotency_key: str,
+    transition: str,
+) -> Dict[str, Any]:
+    """Retry one idempotent v3 reservation transition with the same UUID."""
+    endpoints = {
+        "reserve": "reserve-v3",
+        "finalize": "finalize-v3",
+        "release": "release-v3",
+    }
+    endpoint = endpoints.get(str(transition or "").strip().lower())
+    if not endpoint:
+        return {"success": False, "message": "Invalid reservation transition"}
+    stored_token = _get_auth_token()
+    if not stored_token:
+        return {"success": False, "message": "No auth token"}
+    try:
+        normalized_key = str(uuid.UUID(str(idempotency_key)))
+    except (TypeError, ValueError, AttributeError):
+        return {"success": False, "message": "Invalid idempotency key"}
+
+    body = {
+        "user_id": str(user_id),
+        "token": stored_token,
+        "idempotency_key": normalized_key,
+    }
+    return _post_work_reservation(endpoint, body, stored_token)
+
+
+def _lease_work_reservations(
+    user_id: str,
+    idempotency_keys: list[str],
+    endpoint: str,
+) -> Dict[str, Any]:
+    stored_token = _get_auth_token()
+    if not stored_token:
+        return {"success": False, "message": "No auth token", "reservations": []}
+    try:
+        normalized_keys = [str(uuid.UUID(str(key))) for key in idempotency_keys]
+    except (TypeError, ValueError, AttributeError):
+        return {"success": False, "message": "Invalid idempotency key", "reservations": []}
+    if not normalized_keys or len(normalized_keys) > MAX_WORK_LEASE:
+        return {"success": False, "message": "Invalid lease size", "reservations": []}
+
+    body = {
+        "user_id": str(user_id),
+        "token": stored_token,
+        "idempotency_keys": normalized_keys,
+    }
+    result = _post_work_reservation(endpoint, body, stored_token)
+    result.setdefault("reservations", [])
+    return result
+
+
 def reserveWork(user_id: str, idempotency_key: str) -> Dict[str, Any]:
     return _transition_work_reservation(user_id, idempotency_key, "reserve")
 
@@ -1859,6 +1895,20 @@ def releaseWork(user_id: str, idempotency_key: str) -> Dict[str, Any]:
     return _transition_work_reservation(user_id, idempotency_key, "release")
 
 
+def leaseWork(user_id: str, idempotency_keys: list[str]) -> Dict[str, Any]:
+    """Reserve up to ``MAX_WORK_LEASE`` work slots in one request.
+
+    ``reservations`` lists the granted keys; each one is finalized or
+    released on its own like a single ``reserveWork`` reservation.
+    """
+    return _lease_work_reservations(user_id, idempotency_keys, "lease-v3")
+
+
+def releaseWorkLease(user_id: str, idempotency_keys: list[str]) -> Dict[str, Any]:
+    """Return the unused keys of a lease in one request."""
+    return _lease_work_reservations(user_id, idempotency_keys, "lease-v3/release")
+
+
 def setPort() -> bool:
     """
     Set port configuration from info.on file.
@@ -2293,8 +2343,12 @@ def safe_subscription_request(user_id: str, message: str = "") -> Dict[str, Any]
         return {"success": False, "message": "Subscription request failed."}
 
 
-def fetch_user_settings() -> Dict[str, Any]:
-    """Fetch synced desktop settings for the currently authenticated user."""
+def fetch_user_settings(since_version: Optional[int] = None) -> Dict[str, Any]:
+    """Fetch synced desktop settings for the currently authenticated user.
+
+    With ``since_version`` the server may answer ``unchanged`` or a ``delta``
+    (``changes``/``removed``) instead of the full ``settings`` snapshot.
+    """
     token = _get_auth_token()
     if not token:
         return {"success": False, "message": "No auth token"}
@@ -2302,6 +2356,7 @@ def fetch_user_settings() -> Dict[str, Any]:
     try:
         response = _secure_session.get(
             f"{main_server}/user/settings",
+            params={"since_version": since_version} if since_version else None,
             headers={"Authorization": f"Bearer {token}"},
             timeout=(3, 10),
         )
@@ -2352,6 +2407,48 @@ def save_user_settings(settings_payload: Dict[str, Any]) -> Dict[str, Any]:
         return {"success": False, "message": _ERROR_MESSAGES["unexpected"]}
 
 
+def patch_user_settings(
+    base_version: int,
+    changes: Dict[str, Any],
+    removed: List[str],
+) -> Dict[str, Any]:
+    """Send a field-level settings change based on ``base_version``.
+
+    ``conflict`` is set when the server moved past ``base_version`` (callers
+    pull and retry on the new version) and ``unsupported`` when the server
+    predates delta sync (callers fall back to ``save_user_settings``).
+    """
+    token = _get_auth_token()
+    if not token:
+        return {"success": False, "message": "No auth token"}
+
+    try:
+        response = _secure_session.patch(
+            f"{main_server}/user/settings",
+            json={"base_version": int(base_version), "changes": changes, "removed": list(removed)},
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=(3, 10),
+        )
+        if response.status_code == 401:
+            return {"success": False, "message": "AUTH_REQUIRED", "auth_required": True}
+        if response.status_code == 409:
+            return {"success": False, "conflict": True, "message": "Settings version conflict"}
+        if response.status_code in (404, 405):
+            return {"success": False, "unsupported": True, "message": "Delta sync unavailable"}
+        response.raise_for_status()
+        payload = response.json()
+        return payload if isinstance(payload, dict) else {"success": False, "message": "Invalid response"}
+    except requests.exceptions.Timeout:
+        logger.warning("[SettingsSync] Patch timed out")
+        return {"success": False, "message": _ERROR_MESSAGES["timeout"], "transient": True}
+    except requests.exceptions.RequestException as exc:
+        logger.warning("[SettingsSync] Patch failed: %s", str(exc)[:160])
+        return {"success": False, "message": _ERROR_MESSAGES["network"], "transient": True}
+    except Exception as exc:
+        logger.warning("[SettingsSync] Patch error: %s", str(exc)[:160])
+        return {"success": False, "message": _ERROR_MESSAGES["unexpected"]}
+
+
 def log_user_action(action: str, content: str = None, level: str = "INFO") -> None:
     """
     Log user activity for debugging.
@@ -69,6 +69,8 @@ GEMINI_TEXT_MODEL = os.getenv("GEMINI_TEXT_MODEL", "gemini-3.5-flash")
 GEMINI_TTS_MODEL = os.getenv("GEMINI_TTS_MODEL", "gemini-3.1-flash-tts-preview")
 GEMINI_THINKING_LEVEL = "low"
 GEMINI_MEDIA_RESOLUTION = "media_resolution_low"
+# 분석/검증 업로드용 프록시: off | video | contact_sheet (core/video/analysis_proxy.py)
+GEMINI_ANALYSIS_PROXY = os.getenv("GEMINI_ANALYSIS_PROXY", "off")
 GEMINI_TEMPERATURE = 1.0
 
 # Vertex AI disabled - Use user's Gemini API key instead
@@ -122,6 +124,7 @@ __all__ = [
     "GEMINI_TTS_MODEL",
     "GEMINI_THINKING_LEVEL",
     "GEMINI_MEDIA_RESOLUTION",
+    "GEMINI_ANALYSIS_PROXY",
     "GEMINI_TEMPERATURE",
     "FONTSIZE",
     "DAESA_GILI",
@@ -9,16 +9,109 @@ Unified entry point for API key management.
 Loads keys from encrypted storage via SecretsManager.
 """
 
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, NamedTuple, Optional
 
 import config
+from core.api.key_scheduler import KeyQuotaScheduler
 from utils.logging_config import get_logger
 from utils.secrets_manager import SecretsManager
 
 logger = get_logger(__name__)
 
+# 키가 모두 차단됐을 때 기다려도 되는 호출자(키 전환 경로 등)가 주는 최대 대기 시간 (초)
+# Wait for callers that opt into get_available_key(wait_seconds=...) when every key is blocked.
+DEFAULT_KEY_WAIT_SECONDS = 60
+
+
+class KeyGrant(NamedTuple):
+    """acquire_key()가 내주는 키 (사용 후 report_* 로 결과를 알려줌)"""
+
+    key_name: str
+    key_value: str
+    estimated_tokens: int
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    message = str(exc)
+    return "429" in message or "RESOURCE_EXHAUSTED" in message
+
+
+def rate_limit_kind(exc: BaseException) -> Optional[str]:
+    """"tokens" when the 429 names the TPM quota, else None (request quota)."""
+    return "tokens" if "token" in str(exc).lower() else None
+
+
+def usage_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", None)
+    return int(total) if isinstance(total, (int, float)) else None
+
+
+class KeyMeter:
+    """
+    앱 클라이언트의 요청마다 키를 배정하고 스케줄러에 기록
+    Routes and records every request of the app client.
+
+    ``init_client()``가 만드는 앱 클라이언트는 ``key_name`` 하나로 만들어져
+    있습니다. ``client_factory``가 있으면 요청마다 먼저
+    ``acquire_key(blocking=False)``로 할당량 여유가 가장 큰 키를 받아 그 키의
+    클라이언트로 보내므로 OCR·분석·번역 요청도 여러 키에 나뉩니다. 여유 있는
+    키가 없거나 요청이 업로드한 파일을 참조하면 (``pinned``, 파일은 올린 키의
+    프로젝트에만 있음) 원래 키로 보내며 ``acquire_key(key_name=...)``로 기록만
+    합니다. 결과는 report_*로 알려 학습한 한도가 실제 트래픽 기준이 되고
+    성공할 때마다 다시 올라가게 합니다.
+    """
+
+    def __init__(
+        self,
+        manager: "APIKeyManager",
+        key_name: str,
+        client_factory: Optional[Callable[[str], Any]] = None,
+    ):
+        self.manager = manager
+        self.key_name = key_name
+        self._client_factory = client_factory
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _models_for(self, grant: KeyGrant) -> Any:
+        """``models`` of a client for the granted key; None for the bound key."""
+        if grant.key_name == self.key_name:
+            return None
+        with self._lock:
+            models = self._models.get(grant.key_value)
+            if models is None:
+                models = self._client_factory(grant.key_value).models
+                self._models[grant.key_value] = models
+            return models
+
+    def call(self, request: Callable[..., Any], pinned: bool = False) -> Any:
+        """
+        ``request(models)`` 실행 - ``models``는 배정된 키의 ``client.models``
+        (원래 키로 보낼 때는 None). ``pinned``이면 항상 원래 키로 보냅니다.
+        """
+        grant = None
+        if self._client_factory is not None and not pinned:
+            grant = self.manager.acquire_key(blocking=False)
+        if grant is None:
+            grant = self.manager.acquire_key(key_name=self.key_name)
+        if grant is None:
+            return request(None)
+        try:
+            response = request(self._models_for(grant))
+        except Exception as exc:
+            if is_rate_limit_error(exc):
+                self.manager.report_rate_limited(grant.key_name, kind=rate_limit_kind(exc))
+            else:
+                # 요청은 나갔으므로 RPM은 쓴 것으로 둠
+                self.manager.report_failure(grant)
+            raise
+        self.manager.report_success(grant, tokens_used=usage_tokens(response))
+        return response
+
 
 class APIKeyManager:
     """
@@ -26,12 +119,12 @@ class APIKeyManager:
 
     기능:
     - SecretsManager를 통한 암호화된 키 로드
-    - 키 로테이션 및 부하 분산
+    - 키별 RPM/TPM 할당량 스케줄링 (429에서 한도 학습)
     - 차단된 키 관리 (Rate Limit 대응)
 
     Features:
     - Encrypted key loading via SecretsManager
-    - Key rotation and load balancing
+    - Per-key RPM/TPM quota scheduling (limits learned from 429s)
     - Blocked key management (Rate Limit handling)
     """
 
@@ -50,7 +143,10 @@ class APIKeyManager:
         self.use_secrets_manager = use_secrets_manager
         self.blocked_keys: Dict[str, datetime] = {}
         self.current_key: Optional[str] = None
-        self._last_key_index = -1  # 라운드로빈 인덱스
+        # 키별 토큰 버킷 스케줄러 (여러 스레드가 공유)
+        self.scheduler = KeyQuotaScheduler()
+        # 마지막으로 읽은 SecretsManager 저장소 버전 (변경 없으면 재로드 생략)
+        self._secrets_version = None
 
         # SecretsManager에서 키 로드 또는 config fallback
         # Load keys from SecretsManager or fallback to config
@@ -119,8 +215,14 @@ class APIKeyManager:
         그렇지 않으면 config에서 로드.
         """
         if self.use_secrets_manager:
+            # 저장소가 그대로면 8개 슬롯을 다시 읽지 않음
+            # Skip the slot scan while the secret store is unchanged
+            version = SecretsManager.store_version()
+            if version == self._secrets_version:
+                return
             # SecretsManager에서 최신 키 로드
             fresh_keys = self._load_keys_from_secrets()
+            self._secrets_version = version
         else:
             fresh_keys = config.GEMINI_API_KEYS if config.GEMINI_API_KEYS else {}
 
@@ -145,92 +247,150 @@ class APIKeyManager:
                 self.api_keys[key_name] = key_value
                 logger.info(f"[API Manager] {key_name} 키 값 업데이트됨")
 
-    def get_available_key(self):
-        """사용 가능한 API 키 가져오기"""
+    def get_available_key(self, wait_seconds: float = 0):
+        """
+        사용 가능한 API 키 가져오기
+        Pick a key for a long-lived client and make it ``current_key``.
+
+        모든 키가 차단됐으면 기본적으로 바로 예외를 던집니다. 기다려도 되는
+        호출자(배치 스크립트, 키 전환 경로)는 ``wait_seconds``로 최대 대기
+        시간을 지정합니다 (보통 DEFAULT_KEY_WAIT_SECONDS). 대기 중에도
+        할당량은 예약하지 않습니다.
+        """
         # ★ 매번 호출 시 새로 추가된 키 감지
         self.refresh_keys()
 
         if not self.api_keys:
             raise Exception("등록된 API 키가 없습니다. 헤더의 '🔑 API 키 관리'에서 키를 추가해주세요.")
-        
-        current_time = datetime.now()
-        
-        # 차단 해제
-        keys_to_unblock = []
-        for key_name, unblock_time in self.blocked_keys.items():
-            if current_time >= unblock_time:
-                keys_to_unblock.append(key_name)
-        
-        for key_name in keys_to_unblock:
+
+        # 클라이언트 초기화용 선택이므로 할당량은 예약하지 않음
+        # Picking a key for a client does not reserve per-request quota.
+        self._sync_scheduler()
+        key_name = self.scheduler.pick()
+        if key_name is None:
+            wait_time = self.scheduler.next_ready_in()
+            if wait_time is None:
+                raise Exception("사용 가능한 API 키가 없습니다.")
+            if wait_time > wait_seconds:
+                raise Exception(f"모든 API 키가 차단됨. {max(1, int(wait_time / 60))}분 후 재시도 필요")
+            deadline = time.monotonic() + wait_seconds
+            while key_name is None:
+                remaining = deadline - time.monotonic()
+                wait_time = self.scheduler.next_ready_in()
+                if wait_time is None or remaining <= 0:
+                    raise Exception("대기 후에도 사용 가능한 API 키가 없습니다.")
+                logger.info(f"[API Manager] {int(wait_time)}초 대기...")
+                time.sleep(min(wait_time, remaining))
+                self._sync_scheduler()
+                key_name = self.scheduler.pick()
+
+        self.current_key = key_name
+        logger.debug(f"[API Manager] {key_name} 선택됨")
+        return self.api_keys[key_name]
+
+    def acquire_key(
+        self,
+        estimated_tokens: int = 0,
+        blocking: bool = True,
+        timeout: Optional[float] = None,
+        key_name: Optional[str] = None,
+    ) -> Optional[KeyGrant]:
+        """
+        할당량 여유가 있는 키 받기
+        Grant the key with the most quota headroom.
+
+        blocking=False이면 즉시 반환(없으면 None), 그 외에는 다른 대기자와
+        도착 순서대로 기다립니다. 호출 결과는 report_success(),
+        report_failure() 또는 report_rate_limited()로 알려주세요.
+
+        key_name을 주면 그 키로 나가는 요청을 기다리지 않고 기록만 합니다
+        (키에 묶인 클라이언트용, 모르는 키면 None).
+
+        요청 하나를 위한 키이므로 ``current_key``는 바꾸지 않습니다
+        (429는 grant.key_name으로 report_rate_limited()에 알림).
+        """
+        self._sync_scheduler()
+        if key_name is not None:
+            if not self.scheduler.charge(key_name, estimated_tokens):
+                return None
+            return KeyGrant(key_name, self.api_keys[key_name], estimated_tokens)
+        if blocking:
+            key_name = self.scheduler.acquire(estimated_tokens, timeout=timeout)
+        else:
+            key_name = self.scheduler.try_acquire(estimated_tokens)
+        if key_name is None:
+            return None
+
+        logger.debug(f"[API Manager] {key_name} 배정됨")
+        return KeyGrant(key_name, self.api_keys[key_name], estimated_tokens)
+
+    def report_success(self, grant: KeyGrant, tokens_used: Optional[int] = None) -> None:
+        """호출 성공 반영 (실제 토큰 사용량으로 TPM 버킷 정산)"""
+        used = grant.estimated_tokens if tokens_used is None else tokens_used
+        self.scheduler.report_success(grant.key_name, used, grant.estimated_tokens)
+
+    def report_failure(self, grant: KeyGrant, tokens_used: int = 0) -> None:
+        """429가 아닌 오류로 끝난 호출 반영 (토큰 추정치만 정산, 한도는 되올리지 않음)"""
+        self.scheduler.report_failure(grant.key_name, tokens_used, grant.estimated_tokens)
+
+    def report_rate_limited(
+        self,
+        key_name: Optional[str] = None,
+        retry_after: Optional[float] = None,
+        kind: Optional[str] = None,
+    ) -> None:
+        """
+        429 응답 반영 - 해당 키의 실제 한도를 학습
+        Learn ``key_name``'s real quota from a 429 (defaults to current_key).
+
+        kind="tokens"는 TPM 한도 초과, 그 외는 RPM 한도 초과로 처리합니다.
+        """
+        self._sync_scheduler()
+        key_name = key_name or self.current_key
+        if key_name:
+            self.scheduler.report_rate_limited(key_name, retry_after=retry_after, kind=kind)
+            limits = self.scheduler.limits(key_name)
+            if limits:
+                logger.info(
+                    f"[API Manager] {key_name} 429 - 학습된 한도 {limits[0]:.1f} RPM / {limits[1]:.0f} TPM"
+                )
+
+    def key_name_for(self, key_value: str) -> Optional[str]:
+        """Name of the configured key whose value is ``key_value``."""
+        for key_name, value in self.api_keys.items():
+            if value and value == key_value:
+                return key_name
+        return None
+
+    def meter(
+        self,
+        key_name: Optional[str],
+        client_factory: Optional[Callable[[str], Any]] = None,
+    ) -> Optional[KeyMeter]:
+        """
+        Scheduler meter for a client built on ``key_name`` (None for unknown keys).
+
+        With ``client_factory`` (key value -> client) each request goes out on
+        the key with the most headroom; without it every request stays on
+        ``key_name`` and is only recorded.
+        """
+        if not key_name or key_name not in self.api_keys:
+            return None
+        return KeyMeter(self, key_name, client_factory)
+
+    def _sync_scheduler(self) -> None:
+        now = datetime.now()
+        for key_name in [k for k, t in self.blocked_keys.items() if now >= t]:
             del self.blocked_keys[key_name]
             logger.info(f"[API Manager] {key_name} 차단 해제됨")
-        
-        # 사용 가능한 키 찾기
-        available_keys = []
-        for key_name, key_value in self.api_keys.items():
-            if key_value and key_name not in self.blocked_keys:
-                available_keys.append((key_name, key_value))
-        
-        if not available_keys:
-            if self.blocked_keys:
-                next_unblock = min(self.blocked_keys.values())
-                wait_time = (next_unblock - current_time).total_seconds()
-                if wait_time <= 60:
-                    logger.info(f"[API Manager] {int(wait_time)}초 대기...")
-                    time.sleep(wait_time + 1)
-                    # 재귀 대신 반복문으로 처리 (스택 오버플로우 방지)
-                    return self._get_available_key_after_wait()
-                else:
-                    raise Exception(f"모든 API 키가 차단됨. {int(wait_time/60)}분 후 재시도 필요")
-            else:
-                raise Exception("사용 가능한 API 키가 없습니다.")
-        
-        # 라운드로빈 키 선택
-        self._last_key_index = (self._last_key_index + 1) % len(available_keys)
-        selected_key_name, selected_key_value = available_keys[self._last_key_index]
-
-        self.current_key = selected_key_name
-        logger.debug(f"[API Manager] {selected_key_name} 선택됨")
-        return selected_key_value
-
-    def _get_available_key_after_wait(self, max_retries: int = 3):
-        """대기 후 사용 가능한 키를 찾는 헬퍼 함수 (재귀 방지)"""
-        for retry in range(max_retries):
-            current_time = datetime.now()
-
-            # 차단 해제
-            keys_to_unblock = [k for k, t in self.blocked_keys.items() if current_time >= t]
-            for key_name in keys_to_unblock:
-                del self.blocked_keys[key_name]
-                logger.info(f"[API Manager] {key_name} 차단 해제됨")
-
-            # 사용 가능한 키 찾기
-            available_keys = [(k, v) for k, v in self.api_keys.items()
-                              if v and k not in self.blocked_keys]
-
-            if available_keys:
-                self._last_key_index = (self._last_key_index + 1) % len(available_keys)
-                selected_key_name, selected_key_value = available_keys[self._last_key_index]
-                self.current_key = selected_key_name
-                logger.debug(f"[API Manager] {selected_key_name} 선택됨")
-                return selected_key_value
-
-            # 여전히 사용 가능한 키가 없으면 대기
-            if self.blocked_keys:
-                next_unblock = min(self.blocked_keys.values())
-                wait_time = (next_unblock - current_time).total_seconds()
-                if wait_time > 0 and wait_time <= 60:
-                    logger.info(f"[API Manager] 재시도 {retry + 1}/{max_retries}: {int(wait_time)}초 대기...")
-                    time.sleep(wait_time + 1)
-                else:
-                    break
-
-        raise Exception("대기 후에도 사용 가능한 API 키가 없습니다.")
+        self.scheduler.set_keys(name for name, value in self.api_keys.items() if value)
 
     def block_current_key(self, duration_minutes=5):
         if self.current_key:
+            self._sync_scheduler()
             unblock_time = datetime.now() + timedelta(minutes=duration_minutes)
             self.blocked_keys[self.current_key] = unblock_time
+            self.scheduler.block(self.current_key, duration_minutes * 60)
             logger.warning(f"[API Manager] {self.current_key} 차단됨. 해제 시간: {unblock_time.strftime('%H:%M:%S')}")
             self.current_key = None
     
@@ -0,0 +1,246 @@
+"""
+Shared Gemini request layer
+Gemini 공통 요청 계층
+
+배치 워커들이 비슷한 상품을 동시에 처리하면 같은 프롬프트가 병렬로
+나가 따로 과금되고 따로 기다립니다. ``wrap_client()``로 감싼 클라이언트는
+모델·프롬프트·미디어·설정이 같은 진행 중 ``generate_content`` 호출을
+하나의 업스트림 요청으로 합칩니다 (single-flight). 완료된 응답은 캐시하지
+않으므로 이후 호출은 다시 업스트림으로 갑니다.
+
+Identical in-flight ``generate_content`` calls (same model, contents, media
+and config) share one upstream request. Nothing is cached after the
+request completes. With a ``meter`` (``APIKeyManager.meter(key_name)``)
+every upstream request is also recorded against an API key, and a meter
+with a client factory sends it on the key with the most headroom. Requests
+that reference an uploaded file stay on the client's own key, since File
+API files belong to the uploading key's project.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Unkeyable(Exception):
+    """Argument we cannot fingerprint safely; the call goes upstream alone."""
+
+
+def normalize_request_text(text: str) -> str:
+    """Line endings and trailing/surrounding whitespace do not change a prompt's meaning."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def _canonical(value: Any, normalize: bool = False) -> Any:
+    if isinstance(value, str):
+        return normalize_request_text(value) if normalize else value
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"sha256": hashlib.sha256(bytes(value)).hexdigest()}
+    if isinstance(value, dict):
+        return {
+            str(key): _canonical(item, normalize)
+            for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))
+        }
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item, normalize) for item in value]
+
+    # google.genai.types.File: an uploaded media object is identified by its URI.
+    if type(value).__name__ == "File" and (getattr(value, "uri", None) or getattr(value, "name", None)):
+        return {"file": getattr(value, "uri", None) or value.name}
+
+    # google.genai.types.* (pydantic); walk fields so nested bytes/Files keep the rules above.
+    fields = getattr(type(value), "model_fields", None)
+    if isinstance(fields, dict):
+        body = {
+            name: _canonical(getattr(value, name), normalize)
+            for name in fields
+            if getattr(value, name, None) is not None
+        }
+        return {"type": type(value).__name__, **body}
+
+    # PIL.Image.Image
+    if all(hasattr(value, attr) for attr in ("tobytes", "size", "mode")):
+        return {
+            "image": [value.mode, list(value.size)],
+            "sha256": hashlib.sha256(value.tobytes()).hexdigest(),
+        }
+    raise _Unkeyable(type(value).__name__)
+
+
+def references_uploaded_file(value: Any) -> bool:
+    """True when ``contents`` refer to a File API upload (File or file URI part)."""
+    if value is None or isinstance(value, (str, bytes, bytearray, memoryview, int, float, bool)):
+        return False
+    if isinstance(value, dict):
+        if value.get("file_data") or value.get("file_uri"):
+            return True
+        return any(references_uploaded_file(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(references_uploaded_file(item) for item in value)
+    if type(value).__name__ == "File" and (getattr(value, "uri", None) or getattr(value, "name", None)):
+        return True
+    if getattr(value, "file_data", None) is not None or getattr(value, "file_uri", None):
+        return True
+    # google.genai.types.Content 등 (parts 안의 Part까지 확인)
+    fields = getattr(type(value), "model_fields", None)
+    if isinstance(fields, dict):
+        return any(references_uploaded_file(getattr(value, name, None)) for name in fields)
+    return False
+
+
+def request_fingerprint(
+    model: Any,
+    contents: Any,
+    config: Any = None,
+    *,
+    normalize: bool = False,
+    **kwargs: Any,
+) -> Optional[str]:
+    """
+    요청 식별자 (sha256) - 키로 만들 수 없는 인자가 있으면 None
+    Stable digest of a ``generate_content`` request, or None when an argument
+    cannot be fingerprinted. ``normalize`` folds whitespace-only differences
+    in prompt text (used for the persistent response cache).
+    """
+    try:
+        payload = _canonical(
+            {"model": model, "contents": contents, "config": config, "extra": kwargs},
+            normalize,
+        )
+    except _Unkeyable as exc:
+        logger.debug("[Gemini] 요청 식별 불가 (%s) - 합치지 않음", exc)
+        return None
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """같은 키의 동시 호출을 하나로 합침 (결과/예외를 모두에게 전달)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.upstream_calls += 1
+            else:
+                flight.followers += 1
+                self.coalesced_calls += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+            if flight.followers:
+                logger.debug("[Gemini] 동일 요청 %d건 합침", flight.followers)
+
+
+# 모든 클라이언트가 공유 (워커마다 다른 키/클라이언트를 써도 같은 요청은 합침)
+_shared_flights = SingleFlight()
+
+
+class CoalescingModels:
+    """``client.models`` proxy whose ``generate_content`` is single-flight."""
+
+    def __init__(self, models: Any, flights: SingleFlight, meter: Any = None):
+        self._models = models
+        self._flights = flights
+        self._meter = meter
+
+    def generate_content(self, *, model: str, contents: Any, config: Any = None, **kwargs: Any) -> Any:
+        def _upstream(models: Any = None):
+            # 미터가 다른 키를 배정하면 그 키의 models로 보냄
+            models = models or self._models
+            if config is None:
+                return models.generate_content(model=model, contents=contents, **kwargs)
+            return models.generate_content(model=model, contents=contents, config=config, **kwargs)
+
+        def _call():
+            # 합쳐진 호출은 업스트림 요청 하나로만 기록
+            if self._meter is None:
+                return _upstream()
+            # 업로드한 파일은 올린 키의 프로젝트에만 있으므로 원래 키로 보냄
+            return self._meter.call(_upstream, pinned=references_uploaded_file(contents))
+
+        key = request_fingerprint(model, contents, config, **kwargs)
+        if key is None:
+            return _call()
+        return self._flights.do(key, _call)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._models, name)
+
+
+class CoalescingClient:
+    """genai.Client proxy; everything except ``models.generate_content`` passes through."""
+
+    def __init__(self, client: Any, flights: Optional[SingleFlight] = None, meter: Any = None):
+        self._client = client
+        self.models = CoalescingModels(client.models, flights or _shared_flights, meter)
+
+    @property
+    def wrapped(self) -> Any:
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+def wrap_client(client: Any, flights: Optional[SingleFlight] = None, meter: Any = None) -> Any:
+    """
+    Wrap a genai client once (None and already wrapped clients pass through).
+
+    ``meter`` is an object with ``call(request, pinned=False)``
+    (``ApiKeyManager.KeyMeter``) that records each upstream request against a
+    key; it calls ``request(models)`` with the ``models`` of the key it chose,
+    or None to use the wrapped client. ``pinned`` is set for requests that
+    reference an uploaded file, which must use the wrapped client.
+    """
+    if client is None or isinstance(client, CoalescingClient):
+        return client
+    return CoalescingClient(client, flights, meter)
+
+
+def flight_stats() -> Dict[str, int]:
+    """Process-wide upstream vs coalesced ``generate_content`` counts."""
+    return {
+        "upstream_calls": _shared_flights.upstream_calls,
+        "coalesced_calls": _shared_flights.coalesced_calls,
+    }
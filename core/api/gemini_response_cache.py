@@ -0,0 +1,292 @@
+"""
+Persistent Gemini response cache
+Gemini 응답 디스크 캐시 (선택 기능)
+
+키워드 변환, 대본 번역, 자막 분할처럼 같은 입력이면 같은 결과를 기대하는
+호출은 재시도·재실행 때 다시 과금됩니다. ``SSMAKER_GEMINI_RESPONSE_CACHE=1``
+로 켜면 모델·정규화된 프롬프트·미디어 해시·생성 설정을 키로 응답을
+디스크(SQLite)에 저장합니다. 항목은 TTL이 지나면 버리고, 전체 크기가
+한도를 넘으면 가장 오래 안 쓴 항목부터 지웁니다.
+
+Opt-in on-disk cache for deterministic ``generate_content`` calls, keyed by
+model, normalized prompt, media hashes and generation config, with a TTL and
+least-recently-used eviction under a byte budget.
+
+Environment:
+- ``SSMAKER_GEMINI_RESPONSE_CACHE``: ``1`` enables the cache (default off).
+- ``SSMAKER_GEMINI_CACHE_ROOT``: cache directory (default ``~/.ssmaker/gemini_cache``).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from core.api.gemini_requests import request_fingerprint
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# 키 형식/저장 형식이 바뀌면 올려서 이전 항목을 무효화
+CACHE_SCHEMA_VERSION = 1
+
+_RESPONSE_FIELDS_NOT_CACHED = ("usage_metadata", "sdk_http_response", "automatic_function_calling_history")
+
+
+class GeminiResponseCache:
+    """SQLite-backed response cache; safe to share between threads."""
+
+    def __init__(
+        self,
+        root: Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.root = Path(root)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.root / "responses.sqlite3"), timeout=5, check_same_thread=False
+        )
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, created REAL NOT NULL, accessed REAL NOT NULL,"
+                " size INTEGER NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    # -- keys --
+
+    @staticmethod
+    def key(model: str, contents: Any, config: Any = None, **extra: Any) -> Optional[str]:
+        """Cache key, or None when the request cannot be fingerprinted (never cached)."""
+        return request_fingerprint(
+            model, contents, config, normalize=True, cache_schema=CACHE_SCHEMA_VERSION, **extra
+        )
+
+    # -- payloads --
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created, payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[0] > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._stats["expired"] += 1
+                row = None
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._stats["hits"] += 1
+        try:
+            return json.loads(row[1])
+        except ValueError:
+            return None
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, created, accessed, size, payload)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, size, encoded),
+            )
+            self._stats["stores"] += 1
+            expired = self._conn.execute(
+                "DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,)
+            ).rowcount
+            self._stats["expired"] += max(0, expired)
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._stats["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current on-disk footprint."""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            stats: Dict[str, Any] = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update(
+            entries=entries,
+            bytes=total,
+            hit_rate=(stats["hits"] / lookups) if lookups else 0.0,
+        )
+        return stats
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache_lock = threading.Lock()
+_cache: Optional[GeminiResponseCache] = None
+
+
+def response_cache_enabled() -> bool:
+    return os.getenv("SSMAKER_GEMINI_RESPONSE_CACHE", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def get_response_cache() -> Optional[GeminiResponseCache]:
+    """Process-wide cache when enabled by the environment, else None."""
+    global _cache
+    if not response_cache_enabled():
+        return None
+    root = Path(
+        os.getenv("SSMAKER_GEMINI_CACHE_ROOT", "").strip()
+        or os.path.expanduser("~/.ssmaker/gemini_cache")
+    )
+    with _cache_lock:
+        if _cache is None or _cache.root != root:
+            try:
+                _cache = GeminiResponseCache(root)
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("[Gemini 캐시] 캐시를 열 수 없어 사용하지 않습니다: %s", exc)
+                return None
+        return _cache
+
+
+def cached_generate_content(
+    client: Any,
+    *,
+    model: str,
+    contents: Any,
+    config: Any = None,
+    cache: Optional[GeminiResponseCache] = None,
+    validate: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """
+    결정적인 호출 전용 ``client.models.generate_content`` (캐시 꺼져 있으면 그대로 호출)
+
+    Hits are rebuilt as ``GenerateContentResponse`` without ``usage_metadata``,
+    so cost accounting does not bill a cached answer twice.
+
+    ``validate`` is the caller's check of a usable answer (e.g. it parses):
+    a fresh response is stored only when it passes, and a stored one that
+    fails it is ignored and requested again.
+    """
+
+    def _request():
+        if config is None:
+            return client.models.generate_content(model=model, contents=contents)
+        return client.models.generate_content(model=model, contents=contents, config=config)
+
+    def _load(payload):
+        from google.genai import types
+
+        return types.GenerateContentResponse.model_validate(payload)
+
+    def _dump(response):
+        if not getattr(response, "candidates", None) or not hasattr(response, "model_dump"):
+            return None
+        payload = response.model_dump(mode="json", exclude_none=True)
+        for field in _RESPONSE_FIELDS_NOT_CACHED:
+            payload.pop(field, None)
+        return payload
+
+    cache = cache or get_response_cache()
+    key = cache.key(model, contents, config) if cache is not None else None
+    return _cached_call(cache, key, _request, _load, _dump, validate)
+
+
+def cached_generate_text(
+    generate: Callable[[], str],
+    *,
+    model: str,
+    contents: Any,
+    cache: Optional[GeminiResponseCache] = None,
+    validate: Optional[Callable[[str], bool]] = None,
+    **key_extra: Any,
+) -> str:
+    """
+    응답 텍스트만 쓰는 호출용 ``cached_generate_content`` (``generate()``가 텍스트 반환)
+
+    For callers that go through their own client wrapper (model fallback,
+    async clients) and only need the answer text. ``model``/``contents`` and
+    ``key_extra`` form the key; ``validate`` works as in
+    ``cached_generate_content``. Empty answers are never stored.
+    """
+    cache = cache or get_response_cache()
+    key = cache.key(model, contents, **key_extra) if cache is not None else None
+    return _cached_call(
+        cache,
+        key,
+        generate,
+        lambda payload: str(payload["text"]),
+        lambda text: {"text": text} if text else None,
+        validate,
+    )
+
+
+def _cached_call(
+    cache: Optional[GeminiResponseCache],
+    key: Optional[str],
+    request: Callable[[], Any],
+    load: Callable[[Dict[str, Any]], Any],
+    dump: Callable[[Any], Optional[Dict[str, Any]]],
+    validate: Optional[Callable[[Any], bool]],
+) -> Any:
+    if key is not None:
+        payload = cache.get(key)
+        if payload is not None:
+            try:
+                cached = load(payload)
+            except Exception as exc:
+                logger.debug("[Gemini 캐시] 저장된 응답 복원 실패: %s", exc)
+            else:
+                if validate is None or _passes(validate, cached):
+                    return cached
+                logger.debug("[Gemini 캐시] 저장된 응답이 검증을 통과하지 못해 다시 요청")
+
+    result = request()
+
+    if key is not None and (validate is None or _passes(validate, result)):
+        try:
+            payload = dump(result)
+            if payload is not None:
+                cache.put(key, payload)
+        except Exception as exc:
+            logger.debug("[Gemini 캐시] 응답 저장 실패: %s", exc)
+    return result
+
+
+def _passes(validate: Callable[[Any], bool], response: Any) -> bool:
+    try:
+        return bool(validate(response))
+    except Exception as exc:
+        logger.debug("[Gemini 캐시] 응답 검증 중 오류 (저장 안 함): %s", exc)
+        return False
@@ -0,0 +1,332 @@
+"""
+API Key Quota Scheduler
+API 키 할당량 스케줄러
+
+키마다 분당 요청 수(RPM)와 분당 토큰 수(TPM) 토큰 버킷을 두고 요청을
+분배합니다. 429 응답에서 실제 한도를 학습하고, 여유가 있는 키는 호출
+스레드를 재우지 않고 즉시 내주며, 모든 키가 소진되면 대기자를 도착
+순서대로 처리합니다.
+
+Per-key RPM/TPM token buckets. Real limits are learned from 429 responses,
+a key with headroom is granted without blocking, and when every key is
+exhausted waiters are served in arrival order.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+# 학습 전 기본 한도 (429를 받으면 실제 한도로 내려감)
+# Starting limits; 429 responses pull them down to the real quota.
+DEFAULT_RPM = 60.0
+DEFAULT_TPM = 1_000_000.0
+
+# 버킷 용량 = 분당 한도 × 비율 (버스트 허용량)
+# Bucket capacity as a fraction of the per-minute limit.
+BURST_FRACTION = 0.1
+
+WINDOW_SECONDS = 60.0
+# 429 직전까지 허용된 사용량의 이 비율로 한도를 설정
+LEARNED_LIMIT_MARGIN = 0.9
+# 성공할 때마다 학습된 한도를 이 비율만큼 천천히 되올림
+RECOVERY_PER_SUCCESS = 0.005
+MIN_RPM = 1.0
+MIN_TPM = 1.0
+# 스케줄러가 기록하지 않은 요청의 429는 한도를 학습하지 않고 이만큼 쉼
+UNTRACKED_COOLDOWN_SECONDS = WINDOW_SECONDS
+
+
+class _KeyQuota:
+    """한 키의 버킷 상태와 최근 60초 사용 기록"""
+
+    def __init__(self, rpm: float, tpm: float, now: float):
+        self.rpm_ceiling = rpm
+        self.tpm_ceiling = tpm
+        self.rpm = rpm
+        self.tpm = tpm
+        self.request_tokens = self.request_capacity
+        self.token_tokens = self.token_capacity
+        self.updated = now
+        self.cooldown_until = 0.0
+        self.last_granted = float("-inf")
+        self.requests: Deque[float] = deque()
+        self.tokens: Deque[Tuple[float, int]] = deque()
+
+    @property
+    def request_capacity(self) -> float:
+        return max(1.0, self.rpm * BURST_FRACTION)
+
+    @property
+    def token_capacity(self) -> float:
+        return max(1.0, self.tpm * BURST_FRACTION)
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.updated = now
+        self.request_tokens = min(
+            self.request_capacity, self.request_tokens + elapsed * self.rpm / WINDOW_SECONDS
+        )
+        self.token_tokens = min(
+            self.token_capacity, self.token_tokens + elapsed * self.tpm / WINDOW_SECONDS
+        )
+        horizon = now - WINDOW_SECONDS
+        while self.requests and self.requests[0] <= horizon:
+            self.requests.popleft()
+        while self.tokens and self.tokens[0][0] <= horizon:
+            self.tokens.popleft()
+
+    def ready_in(self, now: float, tokens: int) -> float:
+        """Seconds until this key can take a request of ``tokens`` (0 = now)."""
+        self.refill(now)
+        wait = max(0.0, self.cooldown_until - now)
+        request_deficit = 1.0 - self.request_tokens
+        if request_deficit > 0:
+            wait = max(wait, request_deficit * WINDOW_SECONDS / self.rpm)
+        # A request larger than the bucket waits for a full bucket, then runs into debt.
+        token_deficit = min(tokens, self.token_capacity) - self.token_tokens
+        if token_deficit > 0:
+            wait = max(wait, token_deficit * WINDOW_SECONDS / self.tpm)
+        return wait
+
+    def take(self, now: float, tokens: int) -> None:
+        self.request_tokens -= 1.0
+        self.token_tokens -= tokens
+        self.last_granted = now
+        self.requests.append(now)
+        if tokens:
+            self.tokens.append((now, tokens))
+
+
+class KeyQuotaScheduler:
+    """
+    키별 할당량 스케줄러
+
+    - try_acquire(): 여유 있는 키를 즉시 반환, 없으면 None (비차단)
+    - acquire(): 키가 생길 때까지 FIFO 순서로 대기
+    - report_success()/report_failure()/report_rate_limited(): 실제 사용량과 429를 반영
+
+    ``clock`` is injectable so quota behaviour can be simulated without
+    sleeping; ``acquire`` waits on real time and is meant for the default
+    monotonic clock.
+    """
+
+    def __init__(
+        self,
+        rpm: float = DEFAULT_RPM,
+        tpm: float = DEFAULT_TPM,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._default_rpm = float(rpm)
+        self._default_tpm = float(tpm)
+        self._clock = clock
+        self._quotas: Dict[str, _KeyQuota] = {}
+        self._cond = threading.Condition()
+        self._waiters: Deque[object] = deque()
+
+    # -- key set --
+
+    def set_keys(self, key_names: Iterable[str]) -> None:
+        """Track exactly ``key_names``; learned state of surviving keys is kept."""
+        names = list(key_names)
+        with self._cond:
+            if names == list(self._quotas):
+                return
+            now = self._clock()
+            self._quotas = {
+                name: self._quotas.get(name) or _KeyQuota(self._default_rpm, self._default_tpm, now)
+                for name in names
+            }
+            self._cond.notify_all()
+
+    def key_names(self) -> List[str]:
+        with self._cond:
+            return list(self._quotas)
+
+    # -- granting --
+
+    def try_acquire(self, tokens: int = 0) -> Optional[str]:
+        """Grant a key right now or return None; never jumps queued waiters."""
+        with self._cond:
+            if self._waiters:
+                return None
+            key_name, _wait = self._grant_locked(tokens)
+            return key_name
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None) -> Optional[str]:
+        """Wait (FIFO) for a key; None on timeout or when no keys are configured."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ticket = object()
+        with self._cond:
+            self._waiters.append(ticket)
+            try:
+                while True:
+                    if not self._quotas:
+                        return None
+                    wait = None
+                    if self._waiters[0] is ticket:
+                        key_name, wait = self._grant_locked(tokens)
+                        if key_name is not None:
+                            return key_name
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return None
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+    def pick(self, tokens: int = 0) -> Optional[str]:
+        """
+        Choose a key for a long-lived client without reserving quota.
+
+        Keys cooling down after a 429/block are skipped; among the rest the
+        one with the most headroom wins, rotating between equals. None when
+        every key is cooling down.
+        """
+        with self._cond:
+            now = self._clock()
+            best_name = None
+            best_rank = None
+            for name, quota in self._quotas.items():
+                wait = quota.ready_in(now, tokens)
+                if quota.cooldown_until > now:
+                    continue
+                rank = (wait == 0, quota.request_tokens / quota.request_capacity, -quota.last_granted)
+                if best_rank is None or rank > best_rank:
+                    best_name, best_rank = name, rank
+            if best_name is not None:
+                self._quotas[best_name].last_granted = now
+            return best_name
+
+    def charge(self, key_name: str, tokens: int = 0) -> bool:
+        """
+        Record a request that goes out on ``key_name`` regardless of headroom.
+
+        Used for clients bound to one key, so the window and the learned
+        limits reflect their real traffic. False for an unknown key.
+        """
+        with self._cond:
+            quota = self._quotas.get(key_name)
+            if quota is None:
+                return False
+            now = self._clock()
+            quota.refill(now)
+            quota.take(now, tokens)
+            return True
+
+    def next_ready_in(self, tokens: int = 0) -> Optional[float]:
+        """Seconds until some key could take a request; None without keys."""
+        with self._cond:
+            now = self._clock()
+            waits = [quota.ready_in(now, tokens) for quota in self._quotas.values()]
+            return min(waits) if waits else None
+
+    def _grant_locked(self, tokens: int) -> Tuple[Optional[str], Optional[float]]:
+        now = self._clock()
+        best_name = None
+        best_rank = None
+        shortest_wait = None
+        for name, quota in self._quotas.items():
+            wait = quota.ready_in(now, tokens)
+            if wait > 0:
+                shortest_wait = wait if shortest_wait is None else min(shortest_wait, wait)
+                continue
+            # Most headroom first; least recently used breaks ties (round robin).
+            rank = (quota.request_tokens / quota.request_capacity, -quota.last_granted)
+            if best_rank is None or rank > best_rank:
+                best_name, best_rank = name, rank
+        if best_name is None:
+            return None, shortest_wait
+        self._quotas[best_name].take(now, tokens)
+        return best_name, 0.0
+
+    # -- feedback --
+
+    def report_success(self, key_name: str, tokens_used: int = 0, tokens_estimated: int = 0) -> None:
+        """Settle the token estimate and slowly probe learned limits back up."""
+        with self._cond:
+            quota = self._settle_locked(key_name, tokens_used, tokens_estimated)
+            if quota is None:
+                return
+            quota.rpm = min(quota.rpm_ceiling, quota.rpm * (1 + RECOVERY_PER_SUCCESS))
+            quota.tpm = min(quota.tpm_ceiling, quota.tpm * (1 + RECOVERY_PER_SUCCESS))
+            self._cond.notify_all()
+
+    def report_failure(self, key_name: str, tokens_used: int = 0, tokens_estimated: int = 0) -> None:
+        """Settle the token estimate of a failed (non-429) call; limits stay where they are."""
+        with self._cond:
+            if self._settle_locked(key_name, tokens_used, tokens_estimated) is not None:
+                self._cond.notify_all()
+
+    def _settle_locked(self, key_name: str, tokens_used: int, tokens_estimated: int) -> Optional[_KeyQuota]:
+        quota = self._quotas.get(key_name)
+        if quota is None:
+            return None
+        now = self._clock()
+        quota.refill(now)
+        correction = int(tokens_used) - int(tokens_estimated)
+        if correction:
+            quota.token_tokens -= correction
+            quota.tokens.append((now, correction))
+        return quota
+
+    def report_rate_limited(
+        self,
+        key_name: str,
+        retry_after: Optional[float] = None,
+        kind: Optional[str] = None,
+    ) -> None:
+        """
+        429 응답 반영: 직전 60초 동안 허용된 사용량으로 한도를 학습
+
+        ``kind`` is ``"tokens"`` when the server named the TPM quota; anything
+        else is treated as the request quota. Without ``retry_after`` the key
+        cools down until its oldest request in the window ages out.
+
+        Nothing is learned when the window holds no requests (the call was not
+        recorded here, so "accepted" would wrongly read as zero) or when the
+        key is already cooling down from an earlier report of the same burst;
+        both only extend the cooldown.
+        """
+        with self._cond:
+            quota = self._quotas.get(key_name)
+            if quota is None:
+                return
+            now = self._clock()
+            quota.refill(now)
+            already_cooling = quota.cooldown_until > now
+            if kind == "tokens":
+                learnable = bool(quota.tokens) and not already_cooling
+                if learnable:
+                    accepted = sum(tokens for _at, tokens in quota.tokens)
+                    quota.tpm = max(MIN_TPM, min(quota.tpm, accepted) * LEARNED_LIMIT_MARGIN)
+                quota.token_tokens = min(quota.token_tokens, 0.0)
+            else:
+                learnable = bool(quota.requests) and not already_cooling
+                if learnable:
+                    # The rejected request is in the window but was not accepted.
+                    accepted = max(0, len(quota.requests) - 1)
+                    quota.rpm = max(MIN_RPM, min(quota.rpm, accepted) * LEARNED_LIMIT_MARGIN)
+            quota.request_tokens = min(quota.request_tokens, 0.0)
+            if retry_after is None:
+                if quota.requests:
+                    retry_after = quota.requests[0] + WINDOW_SECONDS - now
+                else:
+                    retry_after = UNTRACKED_COOLDOWN_SECONDS
+            quota.cooldown_until = max(quota.cooldown_until, now + max(0.0, retry_after))
+
+    def block(self, key_name: str, seconds: float) -> None:
+        """Keep ``key_name`` out of rotation for ``seconds`` without changing its limits."""
+        with self._cond:
+            quota = self._quotas.get(key_name)
+            if quota is not None:
+                quota.cooldown_until = max(quota.cooldown_until, self._clock() + seconds)
+
+    def limits(self, key_name: str) -> Optional[Tuple[float, float]]:
+        """Current (rpm, tpm) estimate for ``key_name``."""
+        with self._cond:
+            quota = self._quotas.get(key_name)
+            return None if quota is None else (quota.rpm, quota.tpm)
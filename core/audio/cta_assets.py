@@ -0,0 +1,133 @@
+"""
+Pre-rendered CTA audio
+음성별 CTA 음성 사전 생성·재사용
+
+상품 대본 끝에는 선택한 CTA 문구(``ui.panels.cta_panel.CTA_OPTIONS``)가
+그대로 붙는데, 예전에는 작업마다 본문과 함께 CTA까지 다시 합성했습니다.
+``CTAAssetStore``는 (TTS 모델, 음성, CTA 문구, 샘플레이트/채널)별로 한 번
+합성한 CTA PCM을 보관하고, 파이프라인은 본문만 합성한 뒤 쉼을 두고 이
+음성을 이어 붙입니다.
+
+- 저장: ``SSMAKER_CTA_ASSET_DIR`` (기본 ``~/.ssmaker/cta_assets``)에 16-bit WAV
+- 메모리: 최근 ``MEMORY_ENTRIES``개는 PCM 배열로 유지
+- Gemini로 만든 음성만 저장 (Edge 폴백 음성은 다음 작업에서 다시 시도)
+
+Audio is stored before the speed change; the tempo pass runs over the
+spliced take, so one asset serves every speed ratio.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import wave
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 음성 파일 형식/트림 기준이 바뀌면 올려서 예전 자산을 무시
+ASSET_VERSION = 1
+
+# 메모리에 유지하는 CTA 음성 수 (44.1kHz 스테레오 3초 ≈ 1MB)
+MEMORY_ENTRIES = 32
+
+
+def asset_key(model: str, voice: str, text: str, sample_rate: int, channels: int) -> str:
+    payload = json.dumps(
+        [ASSET_VERSION, model, voice, " ".join(str(text).split()), int(sample_rate), int(channels)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class CTAAssetStore:
+    """
+    CTA 음성 PCM 보관소
+
+    Thread-safe; ``directory=None`` keeps assets in memory only.
+    """
+
+    def __init__(self, directory: Optional[str] = None, memory_entries: int = MEMORY_ENTRIES):
+        self.directory = directory
+        self.memory_entries = max(1, int(memory_entries))
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Optional[str]:
+        return os.path.join(self.directory, f"cta_{key}.wav") if self.directory else None
+
+    def _remember_locked(self, key: str, samples: np.ndarray) -> None:
+        self._memory[key] = samples
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, model: str, voice: str, text: str, sample_rate: int, channels: int) -> Optional[np.ndarray]:
+        """Stored samples at ``sample_rate``/``channels``, or None."""
+        key = asset_key(model, voice, text, sample_rate, channels)
+        with self._lock:
+            samples = self._memory.get(key)
+            if samples is not None:
+                self._memory.move_to_end(key)
+                return samples
+        path = self._path(key)
+        if not path or not os.path.exists(path):
+            return None
+
+        from core.audio import pcm
+
+        try:
+            with open(path, "rb") as handle:
+                samples, rate = pcm.decode_wav_bytes(handle.read())
+        except (OSError, ValueError, EOFError, wave.Error) as exc:
+            logger.debug("[CTA 자산] 읽기 실패, 다시 생성: %s", exc)
+            return None
+        if rate != sample_rate or samples.shape[1] != channels:
+            return None
+        samples.setflags(write=False)
+        with self._lock:
+            self._remember_locked(key, samples)
+        return samples
+
+    def put(self, model: str, voice: str, text: str, sample_rate: int, samples: np.ndarray) -> np.ndarray:
+        """Store ``samples`` (frames, channels) and return the shared read-only copy."""
+        from core.audio import pcm
+
+        channels = samples.shape[1]
+        key = asset_key(model, voice, text, sample_rate, channels)
+        # 디스크(16-bit)에서 다시 읽은 것과 같은 값으로 보관
+        stored = pcm.to_int16(samples).astype(np.float32) / 32768.0
+        stored.setflags(write=False)
+        with self._lock:
+            self._remember_locked(key, stored)
+        path = self._path(key)
+        if path:
+            temp_path = f"{path}.tmp"
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                pcm.write_wav(temp_path, stored, sample_rate)
+                os.replace(temp_path, path)
+            except OSError as exc:
+                logger.debug("[CTA 자산] 저장 실패: %s", exc)
+        return stored
+
+
+_store_lock = threading.Lock()
+_store: Optional[CTAAssetStore] = None
+
+
+def get_cta_asset_store() -> CTAAssetStore:
+    """Process-wide store under ``SSMAKER_CTA_ASSET_DIR``."""
+    global _store
+    directory = os.getenv("SSMAKER_CTA_ASSET_DIR", "").strip() or os.path.expanduser(
+        "~/.ssmaker/cta_assets"
+    )
+    with _store_lock:
+        if _store is None or _store.directory != directory:
+            _store = CTAAssetStore(directory)
+        return _store
@@ -0,0 +1,265 @@
+"""
+Edge TTS fallback on a persistent event loop
+상시 이벤트 루프에서 Edge TTS 폴백 스트리밍 합성
+
+Gemini TTS가 할당량에 걸리면 모든 구간이 Edge TTS로 넘어오는데, 예전에는
+호출마다 스레드 + 이벤트 루프를 새로 만들고, MP3 파일로 저장한 뒤 pydub
+(ffmpeg 프로세스)로 다시 읽고 지웠습니다. 구간이 수십 개면 이 고정 비용이
+그대로 쌓입니다.
+
+- ``BackgroundLoop``: 프로세스에 하나, 데몬 스레드에서 계속 도는 asyncio 루프.
+  어느 스레드에서든 ``run(coro)``로 코루틴을 맡기고 결과를 기다립니다.
+- ``Mp3StreamDecoder``: 웹소켓으로 받는 MP3 청크를 받는 즉시 PCM으로
+  디코딩 (PyAV, 임시 파일 없음). PyAV가 없으면 모아서 pydub로 디코딩.
+- ``synthesize``: 한 구간 합성. 여러 작업 스레드에서 동시에 불러도 같은
+  루프에서 처리되고 동시 요청은 ``MAX_CONCURRENT_REQUESTS``로 제한.
+
+Samples follow ``core.audio.pcm``: float32 ``(frames, channels)`` in ``[-1, 1)``.
+"""
+
+import asyncio
+import concurrent.futures
+import io
+import threading
+import weakref
+from typing import Any, Coroutine, List, Optional, Tuple
+
+import numpy as np
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_EDGE_VOICE = "ko-KR-HyunsuMultilingualNeural"
+
+# 동시에 열어 두는 Edge TTS 웹소켓 수 (모든 호출 스레드가 공유)
+MAX_CONCURRENT_REQUESTS = 4
+
+# 한 구간 합성을 기다리는 최대 시간 (초)
+REQUEST_TIMEOUT_SECONDS = 120.0
+
+try:
+    import av
+
+    PYAV_AVAILABLE = True
+except ImportError:  # pragma: no cover - faster-whisper와 함께 설치됨
+    av = None
+    PYAV_AVAILABLE = False
+
+
+class BackgroundLoop:
+    """
+    데몬 스레드에서 계속 도는 asyncio 이벤트 루프
+
+    The loop starts on first use and lives for the rest of the process, so
+    connections, semaphores and other loop-bound state can be shared by
+    every caller thread.
+    """
+
+    def __init__(self, name: str = "async-tts-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _serve():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                try:
+                    loop.run_forever()
+                finally:
+                    try:
+                        loop.run_until_complete(loop.shutdown_asyncgens())
+                    except Exception:
+                        pass
+                    asyncio.set_event_loop(None)
+                    loop.close()
+
+            thread = threading.Thread(target=_serve, name=self.name, daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread = loop, thread
+            return loop
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._ensure_started()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule ``coro`` on the loop without waiting."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        코루틴을 루프에 맡기고 결과를 기다림 (오류는 호출 스레드에서 다시 발생)
+
+        Raises:
+            RuntimeError: 루프 스레드 안에서 호출 (교착 방지)
+            TimeoutError: ``timeout`` 초 안에 끝나지 않음 (코루틴은 취소)
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run()은 루프 스레드 안에서 호출할 수 없습니다.")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"비동기 작업이 {timeout:.0f}초 안에 끝나지 않았습니다.") from None
+
+    def close(self) -> None:
+        """Stop the loop; the next ``run`` starts a fresh one."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and thread is not None and thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            if threading.current_thread() is not thread:
+                thread.join(timeout=5)
+
+
+_background_loop = BackgroundLoop()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """비동기 TTS 엔진이 공유하는 프로세스 전역 루프"""
+    return _background_loop
+
+
+def _frame_samples(frame) -> np.ndarray:
+    """PyAV audio frame to float32 ``(frames, channels)``."""
+    values = frame.to_ndarray()
+    channels = len(frame.layout.channels)
+    if frame.format.is_planar:
+        values = values.T
+    else:
+        values = values.reshape(-1, channels)
+    if values.dtype == np.int16:
+        return values.astype(np.float32) / 32768.0
+    if values.dtype == np.int32:
+        return (values.astype(np.float64) / float(1 << 31)).astype(np.float32)
+    return values.astype(np.float32, copy=False)
+
+
+def _mp3_codec():
+    # 파일 디코딩(ffmpeg)과 같은 부동소수점 디코더 우선
+    try:
+        return av.CodecContext.create("mp3float", "r")
+    except (ValueError, av.error.FFmpegError):
+        return av.CodecContext.create("mp3", "r")
+
+
+class Mp3StreamDecoder:
+    """
+    MP3 청크를 받는 대로 PCM으로 디코딩
+
+    ``feed(chunk)`` as bytes arrive, then ``finish()`` for ``(samples, rate)``.
+    """
+
+    def __init__(self):
+        self._codec = _mp3_codec() if PYAV_AVAILABLE else None
+        self._blocks: List[np.ndarray] = []
+        self._buffer = io.BytesIO()
+        self._rate = 0
+        self.bytes_received = 0
+        self.skipped_packets = 0
+
+    def _decode(self, packet) -> None:
+        try:
+            frames = self._codec.decode(packet)
+        except av.error.InvalidDataError:
+            # ID3 태그 등 오디오가 아닌 조각은 건너뜀
+            self.skipped_packets += 1
+            return
+        for frame in frames:
+            self._rate = frame.sample_rate
+            self._blocks.append(_frame_samples(frame))
+
+    def feed(self, chunk: bytes) -> None:
+        self.bytes_received += len(chunk)
+        if self._codec is None:
+            self._buffer.write(chunk)
+            return
+        for packet in self._codec.parse(chunk):
+            self._decode(packet)
+
+    def finish(self) -> Tuple[np.ndarray, int]:
+        """
+        Raises:
+            RuntimeError: 받은 오디오가 없거나 디코딩할 수 없음
+        """
+        if self._codec is None:
+            return self._finish_with_pydub()
+        for packet in self._codec.parse(None):
+            self._decode(packet)
+        self._decode(None)
+        if not self._blocks or not self._rate:
+            raise RuntimeError("Edge TTS 응답에서 MP3 오디오를 디코딩하지 못했습니다.")
+        return np.concatenate(self._blocks), self._rate
+
+    def _finish_with_pydub(self) -> Tuple[np.ndarray, int]:
+        from core.audio import pcm
+
+        try:
+            from pydub import AudioSegment
+        except ImportError as exc:
+            raise RuntimeError("Gemini TTS returned no audio and pydub is not installed.") from exc
+        if not self.bytes_received:
+            raise RuntimeError("Edge TTS fallback did not create audio.")
+        self._buffer.seek(0)
+        return pcm.from_segment(AudioSegment.from_file(self._buffer, format="mp3"))
+
+
+_request_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _slots() -> asyncio.Semaphore:
+    # 루프마다 하나 (루프 스레드 안에서만 호출되므로 잠금 불필요)
+    loop = asyncio.get_running_loop()
+    slots = _request_slots.get(loop)
+    if slots is None:
+        slots = _request_slots[loop] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return slots
+
+
+async def stream_to_decoder(text: str, voice: str, decoder: Mp3StreamDecoder) -> Mp3StreamDecoder:
+    """Edge TTS 웹소켓 스트림의 오디오 청크를 ``decoder``에 바로 넘김"""
+    try:
+        import edge_tts
+    except ImportError as exc:
+        raise RuntimeError("Gemini TTS returned no audio and edge-tts is not installed.") from exc
+
+    async with _slots():
+        communicate = edge_tts.Communicate(text, voice=voice)
+        async for chunk in communicate.stream():
+            if chunk.get("type") == "audio" and chunk.get("data"):
+                decoder.feed(chunk["data"])
+    if not decoder.bytes_received:
+        raise RuntimeError("Edge TTS fallback did not create audio.")
+    return decoder
+
+
+async def synthesize_async(text: str, voice: str = DEFAULT_EDGE_VOICE) -> Tuple[np.ndarray, int]:
+    decoder = await stream_to_decoder(text, voice, Mp3StreamDecoder())
+    return decoder.finish()
+
+
+def synthesize(
+    text: str,
+    voice: str = DEFAULT_EDGE_VOICE,
+    timeout: Optional[float] = REQUEST_TIMEOUT_SECONDS,
+) -> Tuple[np.ndarray, int]:
+    """한 구간 Edge TTS -> ``(samples, rate)`` (어느 스레드에서든 호출 가능)"""
+    return get_background_loop().run(synthesize_async(text, voice), timeout=timeout)
@@ -0,0 +1,258 @@
+"""
+Transcript-constrained forced alignment for subtitle timing
+대본을 알고 있는 TTS 음성의 자막 구간 강제 정렬
+
+자막 타이밍은 TTS에 넣은 대본을 이미 정확히 알고 있는데도 Whisper로 전체
+음성 인식(빔 서치)을 한 뒤 텍스트를 다시 맞춰 왔습니다. 이 모듈은 인식
+없이 음성 에너지 곡선과 대본만으로 각 자막 세그먼트의 경계를 찾습니다.
+
+Method (CPU, NumPy only):
+1. 10ms frame energy (dB) of the mono signal; the voiced span is where the
+   energy rises above ``speech level - SILENCE_DROP_DB``.
+2. Each subtitle segment gets an expected length from its syllable count
+   (Hangul syllables, digits, Latin letters, trailing punctuation pauses),
+   scaled so the segments fill the voiced span.
+3. Dynamic programming places the K-1 boundaries: each boundary pays for
+   how loud the audio is there (pauses and word gaps are cheap) and each
+   segment pays for how far its length strays from the expectation.
+4. A confidence in ``[0, 1]`` combines boundary depth, duration fit and
+   how well the energy peaks (about one per syllable) inside each segment
+   match its syllable count, gated on a plausible speaking rate. Callers
+   fall back to Whisper below ``MIN_CONFIDENCE``.
+
+Limits: despite the name this is not acoustic forced alignment. There is no
+acoustic or phoneme model; boundaries come only from the energy curve and
+syllable counts. It notices skipped or extra speech, not a TTS engine that
+read different words of the same length. ``MIN_CONFIDENCE`` was tuned on the
+same synthetic fixtures the tests use, so subtitle timing
+(``analyze_tts_timing``) and tail-only TTS retries (``AudioPipeline``) use it
+only when ``SSMAKER_FORCED_ALIGNMENT=1`` (``is_enabled``) until it is
+calibrated on real TTS speech.
+
+Result dictionaries use the ``analyze_tts_with_whisper`` layout.
+"""
+
+import math
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+FRAME_SECONDS = 0.01
+# 음성 레벨보다 이만큼 낮으면 무음 (경계 비용 0)
+SILENCE_DROP_DB = 30.0
+# 이보다 조용한 신호는 음성 없음으로 처리
+ABSOLUTE_FLOOR_DB = -60.0
+DURATION_WEIGHT = 4.0
+BOUNDARY_WEIGHT = 2.0
+# 세그먼트 길이 탐색 범위 (예상 길이 대비)
+MIN_LENGTH_RATIO = 0.35
+MAX_LENGTH_RATIO = 2.8
+# 1.2배속 한국어 TTS 기준 정상 발화 속도 범위 (음절/초)
+MIN_SYLLABLES_PER_SECOND = 2.0
+MAX_SYLLABLES_PER_SECOND = 15.0
+# 에너지 봉우리(음절 핵) 수 / 대본 음절 수 허용 범위 - 벗어나면 대본과 음성이 다름
+MIN_NUCLEI_RATIO = 0.45
+MAX_NUCLEI_RATIO = 1.8
+# 테스트와 같은 합성 픽스처로만 정함 (올바른 대본 0.85 이상, 음절 30개 누락 0.7 미만)
+# - 실제 TTS 음성으로 보정되지 않았으므로 기본값으로 켜지 않음
+MIN_CONFIDENCE = 0.7
+
+ENABLE_ENV = "SSMAKER_FORCED_ALIGNMENT"
+
+_HANGUL = re.compile(r"[가-힣]")
+_DIGIT = re.compile(r"[0-9]")
+_LATIN = re.compile(r"[A-Za-z]")
+_PAUSE_PUNCT = re.compile(r"[.,!?~…]\s*$")
+
+
+def is_enabled() -> bool:
+    """True when ``SSMAKER_FORCED_ALIGNMENT`` opts into acting on alignment results."""
+    env = (os.environ.get(ENABLE_ENV) or "").strip().lower()
+    return env in ("1", "true", "yes", "on")
+
+
+def segment_weight(text: str) -> float:
+    """Expected spoken length of ``text`` in syllable units."""
+    text = str(text or "")
+    weight = (
+        len(_HANGUL.findall(text))
+        + 1.3 * len(_DIGIT.findall(text))  # 숫자는 보통 1~2음절로 읽힘
+        + 0.4 * len(_LATIN.findall(text))
+    )
+    if _PAUSE_PUNCT.search(text):
+        weight += 0.8  # 문장부호 뒤 쉼
+    return max(0.5, float(weight))
+
+
+def frame_energy_db(samples: np.ndarray, rate: int, frame_seconds: float = FRAME_SECONDS) -> np.ndarray:
+    """Per-frame energy in dBFS of a ``(frames, channels)`` or mono float array."""
+    mono = samples.mean(axis=1) if samples.ndim == 2 else samples
+    hop = max(1, int(round(rate * frame_seconds)))
+    count = len(mono) // hop
+    if count == 0:
+        return np.zeros(0, dtype=np.float64)
+    frames = mono[: count * hop].astype(np.float64).reshape(count, hop)
+    power = np.einsum("ij,ij->i", frames, frames) / hop
+    return 10.0 * np.log10(power + 1e-12)
+
+
+def _smooth(values: np.ndarray, width: int = 3) -> np.ndarray:
+    if len(values) < width:
+        return values
+    kernel = np.ones(width) / width
+    return np.convolve(np.pad(values, (width // 2, width - 1 - width // 2), mode="edge"), kernel, mode="valid")
+
+
+def syllable_nuclei(energy_db: np.ndarray, floor_db: float) -> np.ndarray:
+    """Frames of energy peaks at least 4dB prominent and 80ms apart (about one per syllable)."""
+    from scipy.signal import find_peaks
+
+    peaks, _props = find_peaks(energy_db, height=floor_db, prominence=4.0, distance=8)
+    return peaks
+
+
+def _place_boundaries(
+    expected: np.ndarray, cost: np.ndarray
+) -> Optional[List[int]]:
+    """
+    DP over boundary frames; returns K+1 positions (0 ... T) or ``None``.
+
+    ``expected`` holds K expected segment lengths in frames, ``cost`` the
+    per-frame boundary cost for frames 0..T.
+    """
+    total = len(cost) - 1
+    count = len(expected)
+    best = np.full(total + 1, np.inf)
+    best[0] = 0.0
+    choices = []
+    for k, length in enumerate(expected):
+        low = max(1, int(math.floor(length * MIN_LENGTH_RATIO)))
+        high = max(low, int(math.ceil(length * MAX_LENGTH_RATIO)) + 3)
+        current = np.full(total + 1, np.inf)
+        choice = np.zeros(total + 1, dtype=np.int32)
+        for span in range(low, min(high, total) + 1):
+            candidate = best[:-span] + DURATION_WEIGHT * math.log(span / length) ** 2
+            better = candidate < current[span:]
+            current[span:][better] = candidate[better]
+            choice[span:][better] = span
+        if k < count - 1:
+            current = current + BOUNDARY_WEIGHT * cost
+        best = current
+        choices.append(choice)
+    if not np.isfinite(best[total]):
+        return None
+    positions = [total]
+    for choice in reversed(choices):
+        positions.append(positions[-1] - int(choice[positions[-1]]))
+    positions.reverse()
+    return positions if positions[0] == 0 else None
+
+
+def align_segments(
+    samples: np.ndarray,
+    rate: int,
+    subtitle_segments: Sequence[str],
+) -> Optional[Dict[str, Any]]:
+    """
+    자막 세그먼트를 음성에 강제 정렬
+
+    Returns the ``analyze_tts_with_whisper`` layout plus ``confidence``, or
+    ``None`` when no speech is found.
+    """
+    segments = [str(text) for text in subtitle_segments or []]
+    energy = _smooth(frame_energy_db(samples, rate))
+    audio_duration = len(samples) / float(rate) if rate else 0.0
+    if not segments or len(energy) == 0:
+        return None
+
+    speech_level = float(np.percentile(energy, 95))
+    if speech_level < ABSOLUTE_FLOOR_DB:
+        return None
+    silence_db = max(speech_level - SILENCE_DROP_DB, ABSOLUTE_FLOOR_DB)
+    voiced = np.flatnonzero(energy > silence_db)
+    if len(voiced) < 2:
+        return None
+    first, last = int(voiced[0]), int(voiced[-1]) + 1
+
+    region = energy[first : last + 1]
+    boundary_cost = np.clip((region - silence_db) / SILENCE_DROP_DB, 0.0, 1.0)
+    weights = np.array([segment_weight(text) for text in segments])
+    span_frames = last - first
+    expected = np.maximum(1.0, weights / weights.sum() * span_frames)
+
+    positions = _place_boundaries(expected, boundary_cost)
+    if positions is None:
+        return None
+
+    quiet = region <= silence_db
+    results = []
+    ratios = []
+    for index, text in enumerate(segments):
+        start, end = positions[index], positions[index + 1]
+        ratios.append(abs(math.log(max(1, end - start) / expected[index])))
+        # 경계가 쉼 안에 놓였으면 쉼 구간은 자막에서 제외
+        while start < end - 1 and quiet[start]:
+            start += 1
+        while end > start + 1 and quiet[end - 1]:
+            end -= 1
+        results.append(
+            {
+                "index": index + 1,
+                "text": text,
+                "start": round((first + start) * FRAME_SECONDS, 3),
+                "end": round(min(audio_duration, (first + end) * FRAME_SECONDS), 3),
+            }
+        )
+
+    # 신뢰도: 경계가 쉼에 놓였는지 x 세그먼트 길이 적합도 x 세그먼트별 음절 핵 수 일치
+    inner = positions[1:-1]
+    depth = 1.0 - float(np.mean(boundary_cost[inner])) if inner else 1.0
+    fit = math.exp(-float(np.mean(ratios)))
+    peaks = syllable_nuclei(region, silence_db)
+    counts = np.diff(np.searchsorted(peaks, positions))
+    content = math.exp(-float(np.mean(np.abs(np.log((counts + 1.0) / (weights + 1.0))))))
+    rate_sps = weights.sum() / max(FRAME_SECONDS, span_frames * FRAME_SECONDS)
+    nuclei_ratio = len(peaks) / weights.sum()
+    plausible = (
+        MIN_SYLLABLES_PER_SECOND <= rate_sps <= MAX_SYLLABLES_PER_SECOND
+        and MIN_NUCLEI_RATIO <= nuclei_ratio <= MAX_NUCLEI_RATIO
+    )
+    confidence = depth * fit * content if plausible else 0.0
+    logger.debug(
+        "[강제 정렬] depth=%.2f fit=%.2f content=%.2f rate=%.1f음절/초 nuclei=%.2f -> %.2f",
+        depth,
+        fit,
+        content,
+        rate_sps,
+        nuclei_ratio,
+        confidence,
+    )
+
+    return {
+        "audio_duration": audio_duration,
+        "voice_start": round(first * FRAME_SECONDS, 3),
+        "voice_end": round(min(audio_duration, last * FRAME_SECONDS), 3),
+        "segments": results,
+        "confidence": round(confidence, 3),
+    }
+
+
+def align_file(audio_path: str, subtitle_segments: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """WAV (or any pydub-readable file) to ``align_segments`` result."""
+    from core.audio import pcm
+
+    with open(audio_path, "rb") as handle:
+        data = handle.read()
+    if data[:4] == b"RIFF":
+        samples, rate = pcm.decode_wav_bytes(data)
+    else:
+        from pydub import AudioSegment
+
+        samples, rate = pcm.from_segment(AudioSegment.from_file(audio_path))
+    return align_segments(samples, rate, subtitle_segments)
@@ -0,0 +1,206 @@
+"""
+Concurrent multi-voice TTS
+여러 음성 TTS 동시 생성
+
+음성을 여러 개 선택하면 음성마다 TTS를 차례로 만들었는데, 그 시간의
+대부분은 TTS 엔진 응답을 기다리는 네트워크 대기입니다.
+
+- ``KeyedTTSClients``: Gemini 요청마다 ``APIKeyManager.acquire_key()``로
+  키별 RPM/TPM 할당량을 받고 그 키의 클라이언트로 호출합니다. 429는 해당
+  키에 반영하고 다른 키로 다시 시도합니다. 키 관리자가 없으면
+  ``app.genai_client`` 하나로 호출합니다 (기존 동작).
+- ``MultiVoiceSynthesizer``: 크기가 제한된 스레드 풀에서 음성별 합성을
+  돌리고, 끝나는 순서대로 결과를 넘겨 다음 단계(렌더링)가 먼저 끝난
+  음성부터 시작할 수 있게 합니다.
+
+Requests from all voices share the key manager's buckets, so running voices
+in parallel never exceeds a key's quota; a voice waits for headroom instead.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from core.api.ApiKeyManager import is_rate_limit_error
+from core.api.ApiKeyManager import rate_limit_kind as _rate_limit_kind
+from core.api.ApiKeyManager import usage_tokens as _usage_tokens
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 동시에 합성하는 음성 수 (키 할당량이 실제 요청 속도를 다시 제한함)
+MAX_CONCURRENT_VOICES = 3
+
+# 할당량 여유가 생길 때까지 기다리는 최대 시간 (초)
+KEY_ACQUIRE_TIMEOUT_SECONDS = 60.0
+
+# 429를 받은 뒤 다른 키로 다시 시도하는 횟수
+RATE_LIMIT_RETRIES = 2
+
+# TTS 요청의 토큰 추정치: 오디오 출력은 초당 32토큰, 한국어 TTS는 초당 약 7자
+AUDIO_TOKENS_PER_SECOND = 32
+CHARS_PER_SECOND = 7.0
+
+
+def estimate_tts_tokens(text: str) -> int:
+    """Input text tokens plus audio output tokens for one TTS request."""
+    chars = len(text or "")
+    return chars + int(chars / CHARS_PER_SECOND * AUDIO_TOKENS_PER_SECOND)
+
+
+def _default_client_factory(api_key: str) -> Any:
+    from google import genai
+    from core.api.gemini_requests import wrap_client
+
+    return wrap_client(genai.Client(api_key=api_key))
+
+
+class KeyedTTSClients:
+    """
+    키 할당량을 지키는 Gemini 클라이언트 묶음
+
+    ``call(request, text)`` runs ``request(client)`` with a client for a key
+    that currently has RPM/TPM headroom. Clients are created once per key
+    and shared by all threads.
+    """
+
+    def __init__(
+        self,
+        app,
+        client_factory: Callable[[str], Any] = _default_client_factory,
+        acquire_timeout: float = KEY_ACQUIRE_TIMEOUT_SECONDS,
+    ):
+        self.app = app
+        self.acquire_timeout = acquire_timeout
+        self._client_factory = client_factory
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _manager(self):
+        manager = getattr(self.app, "api_key_manager", None)
+        return manager if hasattr(manager, "acquire_key") else None
+
+    def _client_for(self, key_value: str) -> Any:
+        with self._lock:
+            client = self._clients.get(key_value)
+            if client is None:
+                client = self._client_factory(key_value)
+                self._clients[key_value] = client
+            return client
+
+    def call(self, request: Callable[[Any], Any], text: str = "") -> Any:
+        """
+        할당량을 받은 키로 ``request(client)`` 실행
+
+        Raises:
+            RuntimeError: 클라이언트가 없거나 제한 시간 안에 할당량을 받지 못함
+            Exception: ``request``가 던진 오류 (429는 재시도 후)
+        """
+        manager = self._manager()
+        if manager is None:
+            client = getattr(self.app, "genai_client", None)
+            if client is None:
+                raise RuntimeError("Gemini 클라이언트가 초기화되지 않았습니다.")
+            return request(client)
+
+        estimated = estimate_tts_tokens(text)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            grant = manager.acquire_key(estimated, timeout=self.acquire_timeout)
+            if grant is None:
+                raise RuntimeError(
+                    f"{self.acquire_timeout:.0f}초 안에 할당량 여유가 있는 API 키가 없습니다 (429 RESOURCE_EXHAUSTED)."
+                )
+            try:
+                response = request(self._client_for(grant.key_value))
+            except Exception as exc:
+                if not is_rate_limit_error(exc):
+                    # 요청은 나갔으므로 RPM은 쓴 것으로 두고 토큰 추정치만 돌려받음
+                    manager.report_failure(grant)
+                    raise
+                manager.report_rate_limited(grant.key_name, kind=_rate_limit_kind(exc))
+                logger.warning(
+                    "[TTS] %s 할당량 초과 (시도 %d/%d)",
+                    grant.key_name,
+                    attempt + 1,
+                    RATE_LIMIT_RETRIES + 1,
+                )
+                if attempt >= RATE_LIMIT_RETRIES:
+                    raise
+                continue
+            manager.report_success(grant, tokens_used=_usage_tokens(response))
+            return response
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+
+_keyed_tts_clients_lock = threading.Lock()
+
+
+def keyed_tts_clients(app) -> KeyedTTSClients:
+    """앱에 하나씩 두는 ``KeyedTTSClients`` (모든 음성·스레드가 공유)"""
+    clients = getattr(app, "_keyed_tts_clients", None)
+    if clients is None:
+        # 여러 음성 스레드가 처음 동시에 불러도 하나만 만들어야 키별 할당량이 공유됨
+        with _keyed_tts_clients_lock:
+            clients = getattr(app, "_keyed_tts_clients", None)
+            if clients is None:
+                clients = KeyedTTSClients(app)
+                app._keyed_tts_clients = clients
+    return clients
+
+
+class MultiVoiceSynthesizer:
+    """
+    음성별 TTS를 제한된 스레드 풀에서 동시에 생성
+
+    Usage::
+
+        with MultiVoiceSynthesizer(lambda voice: pipeline.generate_tts(...)) as tts:
+            tts.submit(voices)
+            for voice in tts.as_completed():
+                result = tts.result(voice)  # 합성 오류는 여기서 다시 발생
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[str], Any],
+        max_workers: int = MAX_CONCURRENT_VOICES,
+    ):
+        self._synthesize = synthesize
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)), thread_name_prefix="multi-voice-tts"
+        )
+        self._futures: Dict[str, Future] = {}
+
+    def __enter__(self) -> "MultiVoiceSynthesizer":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close(cancel=True)
+
+    def submit(self, voices: Iterable[str]) -> "MultiVoiceSynthesizer":
+        """Queue every voice not already submitted, in order."""
+        for voice in voices:
+            if voice not in self._futures:
+                self._futures[voice] = self._executor.submit(self._synthesize, voice)
+        return self
+
+    @property
+    def voices(self):
+        return list(self._futures)
+
+    def future(self, voice: str) -> Future:
+        return self._futures[voice]
+
+    def result(self, voice: str, timeout: Optional[float] = None) -> Any:
+        """Wait for ``voice`` only; re-raises its synthesis error."""
+        return self._futures[voice].result(timeout=timeout)
+
+    def as_completed(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """Submitted voices in the order their synthesis finishes (or fails)."""
+        by_future = {future: voice for voice, future in self._futures.items()}
+        for future in as_completed(by_future, timeout=timeout):
+            yield by_future[future]
+
+    def close(self, cancel: bool = False) -> None:
+        """Release the pool; ``cancel=True`` drops voices that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=cancel)
@@ -0,0 +1,188 @@
+"""
+In-memory PCM helpers for TTS post-processing
+메모리 상 PCM 배열로 TTS 후처리
+
+AudioPipeline은 예전에 WAV 저장 → pydub 재로드 → 정규화본 export →
+ffmpeg atempo용 export/재로드를 거치며 같은 음성을 네 번 이상 디스크에
+인코딩/디코딩했습니다. 여기 함수들은 디코딩, 무음 트림, 44.1kHz 스테레오
+리샘플, 템포 변경을 float32 ``(frames, channels)`` 배열에서 처리하고
+마지막에 한 번만 WAV로 씁니다.
+
+Samples are float32 arrays shaped ``(frames, channels)`` in ``[-1, 1)``.
+"""
+
+import io
+import wave
+from typing import Tuple
+
+import numpy as np
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Gemini TTS는 헤더 없는 16-bit 모노 24kHz PCM을 돌려줌
+GEMINI_PCM_RATE = 24000
+GEMINI_PCM_CHANNELS = 1
+
+_INT16_SCALE = 32768.0
+
+
+def _from_int(raw: bytes, sample_width: int, channels: int) -> np.ndarray:
+    if sample_width == 1:
+        values = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        values = np.frombuffer(raw, dtype="<i2").astype(np.float32) / _INT16_SCALE
+    elif sample_width == 3:
+        bytes3 = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        ints = (
+            bytes3[:, 0].astype(np.int32)
+            | (bytes3[:, 1].astype(np.int32) << 8)
+            | (bytes3[:, 2].astype(np.int32) << 16)
+        )
+        ints = np.where(ints >= 1 << 23, ints - (1 << 24), ints)
+        values = ints.astype(np.float32) / float(1 << 23)
+    elif sample_width == 4:
+        values = (np.frombuffer(raw, dtype="<i4").astype(np.float64) / float(1 << 31)).astype(np.float32)
+    else:
+        raise ValueError(f"지원하지 않는 샘플 폭: {sample_width}")
+    usable = len(values) - len(values) % channels
+    return values[:usable].reshape(-1, channels)
+
+
+def decode_wav_bytes(
+    data: bytes,
+    *,
+    raw_rate: int = GEMINI_PCM_RATE,
+    raw_channels: int = GEMINI_PCM_CHANNELS,
+) -> Tuple[np.ndarray, int]:
+    """RIFF WAV bytes, or headerless 16-bit PCM (Gemini TTS), to ``(samples, rate)``."""
+    if data[:4] == b"RIFF":
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            rate = wf.getframerate()
+            samples = _from_int(wf.readframes(wf.getnframes()), wf.getsampwidth(), wf.getnchannels())
+        return samples, rate
+    return _from_int(data, 2, raw_channels), raw_rate
+
+
+def from_segment(segment) -> Tuple[np.ndarray, int]:
+    """pydub ``AudioSegment`` to ``(samples, rate)`` without touching disk."""
+    return _from_int(segment.raw_data, segment.sample_width, segment.channels), segment.frame_rate
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    return np.clip(np.round(samples * _INT16_SCALE), -32768, 32767).astype("<i2")
+
+
+def to_segment(samples: np.ndarray, rate: int):
+    """``(samples, rate)`` to a 16-bit pydub ``AudioSegment`` (in memory)."""
+    from pydub import AudioSegment
+
+    return AudioSegment(
+        data=to_int16(samples).tobytes(),
+        sample_width=2,
+        frame_rate=rate,
+        channels=samples.shape[1],
+    )
+
+
+def trim_silence(samples: np.ndarray, rate: int) -> np.ndarray:
+    """Leading/trailing silence trim with the batch pipeline's thresholds (``_trim_silence``)."""
+    from core.video.batch.audio_utils import _trim_silence
+
+    if len(samples) == 0:
+        return samples
+    segment = to_segment(samples, rate)
+    trimmed = _trim_silence(segment)
+    if trimmed is segment:
+        return samples
+    return from_segment(trimmed)[0]
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Polyphase resampling (anti-aliased), e.g. Gemini 24kHz -> 44.1kHz."""
+    if src_rate == dst_rate or len(samples) == 0:
+        return samples
+    from math import gcd
+
+    from scipy.signal import resample_poly
+
+    factor = gcd(int(src_rate), int(dst_rate))
+    return resample_poly(samples, dst_rate // factor, src_rate // factor, axis=0).astype(np.float32)
+
+
+def to_channels(samples: np.ndarray, channels: int) -> np.ndarray:
+    """Mono is duplicated; more channels are averaged down (pydub ``set_channels``)."""
+    current = samples.shape[1]
+    if current == channels:
+        return samples
+    mono = samples if current == 1 else samples.mean(axis=1, keepdims=True)
+    return np.repeat(mono, channels, axis=1) if channels > 1 else mono
+
+
+def change_tempo(
+    samples: np.ndarray,
+    rate: int,
+    ratio: float,
+    *,
+    frame_ms: float = 30.0,
+    search_ms: float = 8.0,
+) -> np.ndarray:
+    """
+    피치 유지 배속 (WSOLA, ffmpeg ``atempo``와 같은 방식)
+
+    Overlap-adds Hann-windowed frames taken every ``ratio * hop`` input
+    samples, shifting each by up to ``search_ms`` to line up with the natural
+    continuation of the previous frame so the waveform stays phase-coherent.
+    """
+    if len(samples) == 0 or abs(ratio - 1.0) < 1e-6:
+        return samples.copy()
+
+    frames, channels = samples.shape
+    win = max(64, int(rate * frame_ms / 1000.0) // 2 * 2)
+    hop = win // 2
+    search = max(1, int(rate * search_ms / 1000.0))
+    # 상관 탐색은 모노를 1/4로 솎아서 계산 (정밀도 ~0.1ms, 비용 1/16)
+    step = 4
+    window = np.hanning(win + 1)[:win].astype(np.float32)
+
+    target_frames = int(round(frames / ratio))
+    count = target_frames // hop + 2
+    tail = int(count * hop * ratio) + win + 2 * search + hop
+    padded = np.pad(samples, ((search, max(0, tail - frames)), (0, 0)))
+    mono = padded.mean(axis=1)
+
+    out = np.zeros(((count + 1) * hop + win, channels), dtype=np.float32)
+    weight = np.zeros(len(out), dtype=np.float32)
+    previous = search
+    for index in range(count):
+        nominal = search + int(round(index * hop * ratio))
+        if index == 0:
+            start = nominal
+        else:
+            template = mono[previous + hop : previous + hop + win : step]
+            region = mono[nominal - search : nominal + search + win : step]
+            scores = np.correlate(region, template, mode="valid")
+            start = nominal - search + int(np.argmax(scores)) * step
+        out_at = index * hop
+        out[out_at : out_at + win] += padded[start : start + win] * window[:, None]
+        weight[out_at : out_at + win] += window
+        previous = start
+
+    out = out[:target_frames]
+    weight = weight[:target_frames]
+    np.divide(out, weight[:, None], out=out, where=weight[:, None] > 1e-3)
+    return out
+
+
+def write_wav(path: str, samples: np.ndarray, rate: int) -> None:
+    """16-bit PCM WAV (the only disk write in the TTS post-processing chain)."""
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(samples.shape[1])
+        wf.setsampwidth(2)
+        wf.setframerate(int(rate))
+        wf.writeframes(to_int16(samples).tobytes())
+
+
+def duration_seconds(samples: np.ndarray, rate: int) -> float:
+    return len(samples) / float(rate) if rate else 0.0
@@ -11,7 +11,8 @@ TTS 생성, 배속 적용, 길이 체크를 위한 통합 파이프라인입니
 주요 기능:
 - TTS 생성 전 길이 예측 및 스크립트 사전 축소
 - 영상 길이에 맞는 TTS 생성 (재시도 로직 포함)
-- 1.2배속 적용 (ffmpeg atempo 또는 pydub)
+- 음성·배속별 학습된 발화 속도로 사전 축소, 재시도는 잘린 끝부분만 재생성
+- 1.2배속 적용 (메모리 PCM 배열에서 피치 유지 배속, core/audio/pcm.py)
 - Whisper 분석을 통한 자막 타이밍 추출
 """
 
@@ -19,8 +20,6 @@ import os
 import re
 import time
 import secrets
-import subprocess
-import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
@@ -31,40 +30,20 @@ from caller import ui_controller
 
 logger = get_logger(__name__)
 
+# 끝부분만 재생성할 때 유지한 앞부분과 새 끝부분 사이 쉼 (원본 속도 기준, 초)
+TAIL_JOIN_PAUSE = 0.3
+# 유지할 마지막 문장 뒤에 남기는 여운 (초)
+HEAD_RELEASE = 0.05
 
-def _run_coro_in_isolated_loop(coro):
-    """Run a coroutine even when the current thread already has a running loop."""
-    import asyncio
+_SENTENCE_END = re.compile(r"[.!?。！？]\s*")
 
-    try:
-        asyncio.get_running_loop()
-    except RuntimeError:
-        return asyncio.run(coro)
 
-    result: Dict[str, Any] = {}
+def _tail_only_retry_default() -> bool:
+    # 강제 정렬 경계로 실제 음성을 자르므로 자막 타이밍과 같은 선택 기능으로 둠
+    from core.audio import forced_align
 
-    def _runner():
-        loop = asyncio.new_event_loop()
-        try:
-            asyncio.set_event_loop(loop)
-            result["value"] = loop.run_until_complete(coro)
-        except Exception as exc:  # pragma: no cover - re-raised in caller thread
-            result["error"] = exc
-        finally:
-            try:
-                loop.run_until_complete(loop.shutdown_asyncgens())
-            except Exception:
-                pass
-            asyncio.set_event_loop(None)
-            loop.close()
+    return forced_align.is_enabled()
 
-    thread = threading.Thread(target=_runner, name="edge-tts-loop", daemon=True)
-    thread.start()
-    thread.join()
-
-    if "error" in result:
-        raise result["error"]
-    return result.get("value")
 
 # ============================================================
 # 선택적 의존성 임포트 (런타임에 없을 수 있음)
@@ -99,6 +78,10 @@ class AudioConfig:
         max_chars_per_segment: 자막 세그먼트당 최대 글자 수
         sample_rate: 오디오 샘플레이트
         channels: 오디오 채널 수
+        learn_speech_rate: 지난 생성에서 학습한 음성·배속별 발화 속도로 사전 축소
+        tail_only_retry: 길이 초과 시 맞는 앞부분 음성은 두고 끝부분만 재생성
+            (기본값은 SSMAKER_FORCED_ALIGNMENT=1일 때만 켜짐)
+        reuse_cta_audio: 음성별로 한 번 만든 CTA 음성을 본문 뒤에 이어 붙임
     """
 
     speed_ratio: float = 1.2
@@ -112,6 +95,10 @@ class AudioConfig:
     # 배속 후 영상 대비 TTS 최대 비율 (85% = 영상보다 짧게)
     max_duration_ratio: float = 0.85
 
+    learn_speech_rate: bool = True
+    tail_only_retry: bool = field(default_factory=_tail_only_retry_default)
+    reuse_cta_audio: bool = True
+
 
 @dataclass
 class TTSResult:
@@ -123,7 +110,7 @@ class TTSResult:
         original_duration: 원본 TTS 길이 (초)
         speeded_duration: 배속 후 TTS 길이 (초)
         metadata: 자막 동기화를 위한 메타데이터 리스트
-        timestamps_source: 타임스탬프 추출 방식 (whisper_analysis)
+        timestamps_source: 타임스탬프 추출 방식 (forced_alignment / whisper_analysis)
     """
 
     audio_path: str
@@ -136,6 +123,17 @@ class TTSResult:
     voice_end: float = 0.0
 
 
+@dataclass
+class _Take:
+    """재시도에서 다시 쓰는 한 번의 생성 결과 (배속 전 PCM 포함)"""
+
+    result: TTSResult
+    samples: Any
+    script: str
+    # 전체가 Gemini 음성인지 (False면 Edge 폴백이 섞였거나 Edge로만 생성)
+    from_gemini: bool = True
+
+
 class AudioPipeline:
     """
     TTS 생성 및 오디오 처리 통합 파이프라인
@@ -152,16 +150,48 @@ class AudioPipeline:
         result = pipeline.generate_tts(script, voice="Charon", video_duration=30.0)
     """
 
-    def __init__(self, app, config: Optional[AudioConfig] = None):
+    def __init__(
+        self,
+        app,
+        config: Optional[AudioConfig] = None,
+        speech_rates=None,
+        cta_assets=None,
+    ):
         """
         AudioPipeline 초기화
 
         Args:
             app: 앱 인스턴스 (genai_client, tts_output_dir 등 포함)
             config: 오디오 처리 설정 (기본값 사용 시 None)
+            speech_rates: 발화 속도 모델 (None이면 프로세스 공용 모델)
+            cta_assets: CTA 음성 보관소 (None이면 프로세스 공용 보관소)
         """
         self.app = app
         self.config = config or AudioConfig()
+        self._speech_rates = speech_rates
+        self._cta_assets = cta_assets
+
+    @property
+    def speech_rates(self):
+        """음성·배속별 발화 속도 통계 (core.audio.speech_rate)"""
+        if self._speech_rates is None:
+            from core.audio.speech_rate import get_speech_rate_model
+
+            self._speech_rates = get_speech_rate_model()
+        return self._speech_rates
+
+    @property
+    def cta_assets(self):
+        """음성별 CTA 음성 보관소 (core.audio.cta_assets)"""
+        if self._cta_assets is None:
+            from core.audio.cta_assets import get_cta_asset_store
+
+            self._cta_assets = get_cta_asset_store()
+        return self._cta_assets
+
+    def _prior_seconds_per_unit(self) -> float:
+        """학습 전 발화 단위당 길이 (배속 후) - chars_per_second 가정"""
+        return 1.0 / (self.config.chars_per_second * self.config.speed_ratio)
 
     # ============================================================
     # 공개 API 메서드
@@ -221,7 +251,7 @@ class AudioPipeline:
 
         # 스크립트 사전 축소 (너무 긴 경우)
         adjusted_script, cta_text = self._prepare_script_for_duration(
-            script, max_duration_original, cta_lines
+            script, max_duration_original, cta_lines, voice=voice
         )
 
         # 자막 세그먼트 분할
@@ -241,16 +271,21 @@ class AudioPipeline:
 
         return result
 
-    def estimate_duration(self, script: str) -> float:
+    def estimate_duration(self, script: str, voice: Optional[str] = None) -> float:
         """
         스크립트의 TTS 예상 길이 계산 (배속 후)
 
         Args:
             script: 스크립트 텍스트
+            voice: 음성 ID (주면 이 음성의 학습된 발화 속도 사용)
 
         Returns:
             예상 TTS 길이 (초, 배속 후)
         """
+        if voice and self.config.learn_speech_rate:
+            return self.speech_rates.predict(
+                voice, self.config.speed_ratio, script, prior=self._prior_seconds_per_unit()
+            )
         char_count = len(script.replace(" ", "").replace("\n", ""))
         original_duration = char_count / self.config.chars_per_second
         return original_duration / self.config.speed_ratio
@@ -296,6 +331,7 @@ class AudioPipeline:
         script: str,
         max_duration_original: float,
         cta_lines: List[str],
+        voice: Optional[str] = None,
     ) -> Tuple[str, str]:
         """
         영상 길이에 맞게 스크립트 사전 조정
@@ -319,6 +355,15 @@ class AudioPipeline:
         if cta_text and cta_text in script:
             main_script = script.replace(cta_text, "").strip()
 
+        # 학습된 발화 속도가 있으면 예상 길이 상한으로 축소
+        if voice and self.config.learn_speech_rate:
+            return (
+                self._presize_with_speech_rate(
+                    script, main_script, cta_text, voice, max_duration_original
+                ),
+                cta_text,
+            )
+
         # 길이 체크 및 축소
         if len(script) > max_chars:
             logger.info(
@@ -332,6 +377,38 @@ class AudioPipeline:
 
         return script, cta_text
 
+    def _presize_with_speech_rate(
+        self,
+        script: str,
+        main_script: str,
+        cta_text: str,
+        voice: str,
+        max_duration_original: float,
+    ) -> str:
+        """학습된 발화 속도 상한(mean + z*std)에 맞게 본문 축소 (CTA 유지)"""
+        from core.audio.speech_rate import spoken_units
+
+        budget = self.speech_rates.budget_units(
+            voice,
+            self.config.speed_ratio,
+            max_duration_original / self.config.speed_ratio,
+            prior=self._prior_seconds_per_unit(),
+        )
+        units = spoken_units(script)
+        if units <= budget:
+            return script
+
+        main_budget = budget - (spoken_units(cta_text) if cta_text else 0.0)
+        main_script = self._trim_script_by_chars(
+            main_script, main_budget, measure=spoken_units
+        )
+        logger.info(
+            f"[AudioPipeline] 학습된 발화 속도로 사전 축소: {units:.0f} -> "
+            f"{spoken_units(main_script) + (spoken_units(cta_text) if cta_text else 0):.0f}단위 "
+            f"(허용 {budget:.0f}단위)"
+        )
+        return main_script + (" " + cta_text if cta_text else "")
+
     def _is_product_video(self) -> bool:
         """상품 영상인지 확인"""
         translation = getattr(self.app, "translation_result", "") or ""
@@ -350,33 +427,34 @@ class AudioPipeline:
     def _trim_script_by_chars(
         self,
         script: str,
-        target_chars: int,
+        target_chars: float,
         preserve_text: Optional[str] = None,
+        measure=len,
     ) -> str:
         """
         글자 수 기준으로 스크립트 축소 (문장 단위 유지)
 
         Args:
             script: 원본 스크립트
-            target_chars: 목표 글자 수
+            target_chars: 목표 글자 수 (``measure`` 단위)
             preserve_text: 보존할 텍스트 (CTA 등)
+            measure: 길이 측정 함수 (기본 글자 수, 발화 단위 등)
         """
-        if len(script) <= target_chars:
+        if measure(script) <= target_chars:
             return script
 
         # 보존할 텍스트 제거 후 본문만 처리
         main_script = script
         if preserve_text and preserve_text in script:
             main_script = script.replace(preserve_text, "").strip()
-            target_chars = target_chars - len(preserve_text) - 1
+            target_chars = target_chars - measure(preserve_text) - 1
 
         if target_chars <= 0:
             return preserve_text or ""
 
         # 문장 단위로 분리
-        sentence_pattern = re.compile(r"[.!?。！？]\s*")
-        sentences = sentence_pattern.split(main_script)
-        sentence_ends = sentence_pattern.findall(main_script)
+        sentences = _SENTENCE_END.split(main_script)
+        sentence_ends = _SENTENCE_END.findall(main_script)
 
         # 목표 글자 수까지 문장 추가
         reduced = ""
@@ -387,12 +465,12 @@ class AudioPipeline:
             end_char = sentence_ends[i] if i < len(sentence_ends) else ""
             candidate = reduced + (" " if reduced else "") + sent + end_char.strip()
 
-            if len(candidate) <= target_chars:
+            if measure(candidate) <= target_chars:
                 reduced = candidate
             else:
                 if reduced:
                     break
-                reduced = sent[:target_chars]
+                reduced = sent[: int(target_chars)]
                 break
 
         result = reduced.strip()
@@ -422,47 +500,61 @@ class AudioPipeline:
     ) -> TTSResult:
         """
         재시도 로직을 포함한 TTS 생성
+
+        길이 초과 시 줄인 대본 전체를 다시 생성합니다. ``tail_only_retry``가
+        켜져 있으면 먼저 직전 생성 음성을 대본에 강제 정렬해, 목표 안에 들어오는
+        앞 문장들의 음성은 그대로 두고 잘린 끝부분(CTA)만 다시 생성합니다
+        (정렬 신뢰도가 낮으면 전체 재생성).
         """
-        last_result: Optional[TTSResult] = None
+        last_take: Optional[_Take] = None
         last_duration = 0.0
         main_script = script.replace(cta_text, "").strip() if cta_text else script
 
         for attempt in range(self.config.max_attempts):
             try:
-                # 재시도 시 스크립트 축소
-                if attempt > 0:
-                    if last_duration > 0:
-                        overshoot_ratio = last_duration / max_duration_after_speed
-                        reduction_rate = max(
-                            0.3, min(0.9, (1.0 / overshoot_ratio) * 0.85)
+                take = None
+                if attempt > 0 and last_take is not None and self.config.tail_only_retry:
+                    take = self._retry_tail(
+                        last_take, voice, max_duration_after_speed, cta_text
+                    )
+
+                if take is None:
+                    # 재시도 시 스크립트 축소
+                    if attempt > 0:
+                        if last_duration > 0:
+                            overshoot_ratio = last_duration / max_duration_after_speed
+                            reduction_rate = max(
+                                0.3, min(0.9, (1.0 / overshoot_ratio) * 0.85)
+                            )
+                        else:
+                            reduction_rate = 0.7 if attempt == 1 else 0.5
+
+                        logger.info(
+                            f"[AudioPipeline] 재시도 {attempt + 1}: {reduction_rate * 100:.0f}% 축소"
+                        )
+                        reduced_main = self._trim_script_for_retry(
+                            main_script, reduction_rate
                         )
+                        current_script = reduced_main + (" " + cta_text if cta_text else "")
+                        current_segments = self._split_text_naturally(current_script)
                     else:
-                        reduction_rate = 0.7 if attempt == 1 else 0.5
+                        current_script = script
+                        current_segments = subtitle_segments
 
                     logger.info(
-                        f"[AudioPipeline] 재시도 {attempt + 1}: {reduction_rate * 100:.0f}% 축소"
+                        f"[AudioPipeline] 시도 {attempt + 1}/{self.config.max_attempts}: {len(current_script)}자"
                     )
-                    reduced_main = self._trim_script_for_retry(
-                        main_script, reduction_rate
-                    )
-                    current_script = reduced_main + (" " + cta_text if cta_text else "")
-                    current_segments = self._split_text_naturally(current_script)
-                else:
-                    current_script = script
-                    current_segments = subtitle_segments
 
-                logger.info(
-                    f"[AudioPipeline] 시도 {attempt + 1}/{self.config.max_attempts}: {len(current_script)}자"
-                )
-
-                # TTS 생성
-                result = self._generate_tts_internal(
-                    script=current_script,
-                    voice=voice,
-                    subtitle_segments=current_segments,
-                )
+                    # TTS 생성
+                    take = self._generate_take(
+                        script=current_script,
+                        voice=voice,
+                        subtitle_segments=current_segments,
+                        cta_text=cta_text,
+                    )
 
-                last_result = result
+                result = take.result
+                last_take = take
                 last_duration = result.speeded_duration
 
                 # 길이 체크
@@ -488,25 +580,70 @@ class AudioPipeline:
                     raise RuntimeError(f"TTS 생성 실패 (최대 재시도 횟수 초과): {exc}")
 
         # 모든 시도 실패 시 마지막 결과 반환 (길이 초과 허용)
-        if last_result:
+        if last_take:
             logger.warning(
                 f"[AudioPipeline] 목표 길이 미달성, 마지막 결과 사용: {last_duration:.1f}초"
             )
-            return last_result
+            return last_take.result
 
         raise RuntimeError("TTS 생성 실패")
 
-    def _generate_tts_internal(
+    def _generate_take(
         self,
         script: str,
         voice: str,
         subtitle_segments: List[str],
-    ) -> TTSResult:
+        cta_text: str = "",
+    ) -> _Take:
         """
-        실제 TTS 생성 로직
+        대본 전체를 한 번 합성하고 배속/타이밍 분석까지 마친 결과
+
+        대본이 ``cta_text``로 끝나면 본문만 합성하고 음성별로 미리 만든 CTA
+        음성을 쉼과 함께 이어 붙입니다. 본문과 CTA가 모두 같은 음성의 Gemini
+        음성일 때만 이어 붙이고, 하나라도 Edge 폴백이면 대본 전체를 한 엔진으로
+        다시 합성합니다 (한 클립 안에서 목소리가 바뀌지 않도록).
         """
-        import wave
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:21]
+        random_suffix = secrets.token_hex(4)
 
+        main_script = ""
+        if self.config.reuse_cta_audio and cta_text and script.endswith(cta_text):
+            main_script = script[: -len(cta_text)].strip()
+        samples, use_gemini = None, True
+        if main_script:
+            head, from_gemini = self._synthesize_with_engine(main_script, voice, timestamp, random_suffix)
+            if from_gemini:
+                tail, tail_from_gemini = self._cta_samples(cta_text, voice, timestamp, random_suffix)
+                if tail_from_gemini:
+                    samples = self._splice_tail(head, tail)
+            # 본문이 Edge 폴백이면 전체도 Edge로 (Gemini를 다시 기다리지 않음)
+            use_gemini = from_gemini
+            if samples is None:
+                logger.info("[AudioPipeline] Edge 폴백 음성이 섞여 CTA를 잇지 않고 대본 전체를 합성")
+        if samples is None:
+            samples, from_gemini = self._synthesize_with_engine(
+                script, voice, timestamp, random_suffix, use_gemini=use_gemini
+            )
+        result = self._finish_take(
+            samples, script, voice, subtitle_segments, timestamp, random_suffix
+        )
+        return _Take(result=result, samples=samples, script=script, from_gemini=from_gemini)
+
+    def _synthesize_with_engine(
+        self,
+        script: str,
+        voice: str,
+        timestamp: str,
+        random_suffix: str,
+        use_gemini: bool = True,
+    ):
+        """
+        TTS 1회 호출 -> 무음 트림 -> ``config.sample_rate``/채널 PCM 배열
+        -> ``(samples, Gemini 음성 여부)`` (False면 Edge 폴백)
+
+        Gemini 음성으로 만든 경우 발화 속도 통계에 반영합니다.
+        ``use_gemini=False``면 Gemini를 건너뛰고 바로 Edge로 합성합니다.
+        """
         # TTS용 텍스트 변환 (숫자 -> 한글, 영어 -> 한글 발음)
         tts_text = process_korean_script(script)
 
@@ -514,108 +651,88 @@ class AudioPipeline:
         logger.debug(f"  원본: {script[:50]}...")
         logger.debug(f"  TTS용: {tts_text[:50]}...")
 
-        # 원본 TTS 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:21]
-        random_suffix = secrets.token_hex(4)
-        original_filename = f"tts_full_{voice}_{timestamp}_{random_suffix}.wav"
-        original_path = os.path.join(self.app.tts_output_dir, original_filename)
+        audio_data = self._request_gemini_audio(tts_text, voice) if use_gemini else b""
 
-        audio_data = b""
-        genai_client = getattr(self.app, "genai_client", None)
-        if genai_client is None:
-            logger.info("[TTS] Gemini TTS is unavailable; using Edge fallback.")
-        else:
-            try:
-                response = genai_client.models.generate_content(
-                    model=self.app.config.GEMINI_TTS_MODEL,
-                    contents=[tts_text],
-                    config=types.GenerateContentConfig(
-                        response_modalities=["AUDIO"],
-                        speech_config=types.SpeechConfig(
-                            voice_config=types.VoiceConfig(
-                                prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                    voice_name=voice
-                                )
-                            )
-                        ),
-                    ),
-                )
-                if response and response.candidates:
-                    candidate = response.candidates[0]
-                    parts = (
-                        getattr(getattr(candidate, "content", None), "parts", None)
-                        or []
-                    )
-                    if parts and getattr(parts[0], "inline_data", None):
-                        audio_data = parts[0].inline_data.data or b""
-                    else:
-                        finish_reason = getattr(candidate, "finish_reason", "unknown")
-                        logger.warning(
-                            "[TTS] Gemini returned no audio parts (finish=%s); using Edge fallback.",
-                            finish_reason,
-                        )
-                else:
-                    logger.warning("[TTS] Gemini returned no candidates; using Edge fallback.")
-            except Exception as exc:
-                logger.warning("[TTS] Gemini TTS failed; using Edge fallback: %s", exc)
+        # 디코딩 → 무음 트림 → 44.1kHz 스테레오 → 배속까지 메모리에서 처리,
+        # 디스크에는 최종 배속본만 한 번 기록
+        from core.audio import pcm
 
         if audio_data:
-            # WAV 파일 저장
-            if audio_data[:4] == b"RIFF":
-                with open(original_path, "wb") as f:
-                    f.write(audio_data)
-            else:
-                with wave.open(original_path, "wb") as wf:
-                    wf.setnchannels(1)
-                    wf.setsampwidth(2)
-                    wf.setframerate(24000)
-                    wf.writeframes(audio_data)
+            samples, sample_rate = pcm.decode_wav_bytes(audio_data)
         else:
-            self._generate_edge_tts_wav(tts_text, original_path)
+            samples, sample_rate = self._generate_edge_tts_samples(tts_text)
 
-        # pydub로 로드 및 정규화
-        from core.video.batch.audio_utils import (
-            _prepare_segment,
-            _ensure_pydub_converter,
+        samples = pcm.trim_silence(samples, sample_rate)
+        samples = pcm.to_channels(
+            pcm.resample(samples, sample_rate, self.config.sample_rate),
+            self.config.channels,
         )
 
-        raw_audio = AudioSegment.from_file(original_path, format="wav")
-        prepared_audio = _prepare_segment(raw_audio)
+        # Edge 폴백 음성은 속도가 달라 Gemini 음성 통계에 넣지 않음
+        if audio_data and self.config.learn_speech_rate:
+            self.speech_rates.observe(
+                voice,
+                self.config.speed_ratio,
+                script,
+                pcm.duration_seconds(samples, self.config.sample_rate) / self.config.speed_ratio,
+            )
+        return samples, bool(audio_data)
 
-        # 정규화된 버전 저장
-        ffmpeg_path = _ensure_pydub_converter()
-        try:
-            if ffmpeg_path:
-                prepared_audio.export(
-                    original_path,
-                    format="wav",
-                    parameters=[
-                        "-ar",
-                        str(self.config.sample_rate),
-                        "-ac",
-                        str(self.config.channels),
-                    ],
-                )
-            else:
-                from core.video.batch.audio_utils import _write_wave_fallback
+    def _cta_samples(self, cta_text: str, voice: str, timestamp: str, random_suffix: str):
+        """
+        음성별 CTA 음성 -> ``(samples, from_gemini)`` (보관소에 없으면 한 번 합성해 저장)
 
-                _write_wave_fallback(
-                    prepared_audio, original_path, sample_rate=self.config.sample_rate
-                )
-        except Exception as export_err:
-            logger.warning(f"[TTS] export 폴백: {export_err}")
-            from core.video.batch.audio_utils import _write_wave_fallback
+        보관소에는 Gemini 음성만 있습니다. Edge 폴백으로 만든 음성은 저장하지
+        않아 다음 작업에서 Gemini로 다시 시도합니다.
+        """
+        model = getattr(getattr(self.app, "config", None), "GEMINI_TTS_MODEL", "")
+        rate, channels = self.config.sample_rate, self.config.channels
+        if self.config.reuse_cta_audio:
+            samples = self.cta_assets.get(model, voice, cta_text, rate, channels)
+            if samples is not None:
+                logger.info(f"[AudioPipeline] 미리 만든 CTA 음성 사용 ({voice})")
+                return samples, True
+
+        samples, from_gemini = self._synthesize_with_engine(
+            cta_text, voice, timestamp, random_suffix
+        )
+        if self.config.reuse_cta_audio and from_gemini:
+            samples = self.cta_assets.put(model, voice, cta_text, rate, samples)
+        return samples, from_gemini
 
-            _write_wave_fallback(
-                prepared_audio, original_path, sample_rate=self.config.sample_rate
-            )
+    def _splice_tail(self, head, tail):
+        """``head`` + ``TAIL_JOIN_PAUSE`` 쉼 + ``tail`` (원본 속도 PCM)"""
+        import numpy as np
+
+        gap = np.zeros(
+            (int(round(TAIL_JOIN_PAUSE * self.config.sample_rate)), head.shape[1]),
+            dtype=head.dtype,
+        )
+        return np.concatenate([head, gap, tail.astype(head.dtype, copy=False)])
 
-        original_duration = len(prepared_audio) / 1000.0
+    def _finish_take(
+        self,
+        samples,
+        script: str,
+        voice: str,
+        subtitle_segments: List[str],
+        timestamp: str,
+        random_suffix: str,
+    ) -> TTSResult:
+        """배속 적용 + 저장 + 자막 타이밍 분석"""
+        from core.audio import pcm
+
+        started = time.perf_counter()
+        original_duration = pcm.duration_seconds(samples, self.config.sample_rate)
         logger.info(f"[TTS 생성] 원본 길이: {original_duration:.2f}초")
 
         # 1.2배속 적용
         speeded_path, speeded_duration = self._apply_speed(
-            original_path, prepared_audio, voice, timestamp, random_suffix
+            samples, voice, timestamp, random_suffix
+        )
+        logger.info(
+            f"[TTS 생성] 후처리 {(time.perf_counter() - started) * 1000:.0f}ms "
+            f"(배속/저장)"
         )
 
         # Whisper 분석으로 자막 타이밍 추출
@@ -636,97 +753,196 @@ class AudioPipeline:
             voice_end=voice_end,
         )
 
-    def _generate_edge_tts_wav(self, text: str, output_path: str) -> None:
-        """Generate a Korean TTS WAV file with edge-tts as a runtime fallback."""
-        try:
-            import edge_tts
-        except ImportError as exc:
-            raise RuntimeError("Gemini TTS returned no audio and edge-tts is not installed.") from exc
-        if not PYDUB_AVAILABLE or AudioSegment is None:
-            raise RuntimeError("Gemini TTS returned no audio and pydub is not installed.")
+    @staticmethod
+    def _split_sentences(text: str) -> List[str]:
+        """문장부호/줄바꿈 기준 문장 목록 (문장부호 포함)"""
+        sentences = []
+        for line in text.split("\n"):
+            pieces = _SENTENCE_END.split(line)
+            ends = _SENTENCE_END.findall(line)
+            for index, piece in enumerate(pieces):
+                end = ends[index].strip() if index < len(ends) else ""
+                if piece.strip():
+                    sentences.append(piece.strip() + end)
+        return sentences
+
+    def _retry_tail(
+        self,
+        take: _Take,
+        voice: str,
+        max_duration_after_speed: float,
+        cta_text: str,
+    ) -> Optional[_Take]:
+        """
+        직전 생성의 앞 문장 음성은 유지하고 끝부분만 다시 생성
+
+        직전 음성을 대본 문장(+CTA)에 강제 정렬한 뒤, CTA 예상 길이를 더해도
+        목표 안에 들어오는 곳까지 앞 문장을 남기고 잘라냅니다. CTA가 있으면
+        CTA만 다시 합성해 이어 붙이고, 없으면 TTS 호출 없이 자르기만 합니다.
+
+        앞부분과 CTA는 둘 다 같은 음성의 Gemini 음성일 때만 이어 붙입니다.
 
-        voice = getattr(self.app, "edge_tts_voice", "ko-KR-HyunsuMultilingualNeural")
-        mp3_path = os.path.splitext(output_path)[0] + "_edge.mp3"
+        Returns:
+            새 결과, 정렬을 믿을 수 없거나 자를 곳이 없거나 엔진이 섞이면
+            None (전체 재생성)
+        """
+        from core.audio import forced_align
+        from core.audio.speech_rate import DEFAULT_Z
+
+        if cta_text and not take.from_gemini:
+            return None
+        main_script = take.script
+        if cta_text and main_script.endswith(cta_text):
+            main_script = main_script[: -len(cta_text)].strip()
+        sentences = self._split_sentences(main_script)
+        if len(sentences) < 2:
+            return None
+
+        rate = self.config.sample_rate
+        pieces = sentences + ([cta_text] if cta_text else [])
+        aligned = forced_align.align_segments(take.samples, rate, pieces)
+        if not aligned or aligned["confidence"] < forced_align.MIN_CONFIDENCE:
+            logger.info("[AudioPipeline] 강제 정렬 신뢰도 부족 - 전체 재생성")
+            return None
+
+        # 원본 속도 기준 예산 (초)
+        budget = max_duration_after_speed * self.config.speed_ratio
+        tail_seconds = 0.0
+        pause = 0.0
+        if cta_text:
+            pause = TAIL_JOIN_PAUSE
+            tail_seconds = self.config.speed_ratio * self.speech_rates.predict(
+                voice,
+                self.config.speed_ratio,
+                cta_text,
+                z=DEFAULT_Z,
+                prior=self._prior_seconds_per_unit(),
+            )
+        segments = aligned["segments"]
+        keep = 0
+        for count in range(len(sentences) - 1, 0, -1):
+            if segments[count - 1]["end"] + HEAD_RELEASE + pause + tail_seconds <= budget:
+                keep = count
+                break
+        if keep == 0:
+            return None
+
+        cut = min(segments[keep - 1]["end"] + HEAD_RELEASE, segments[keep]["start"])
+        head = take.samples[: int(round(cut * rate))]
+        new_script = " ".join(sentences[:keep]) + (" " + cta_text if cta_text else "")
+        logger.info(
+            f"[AudioPipeline] 끝부분만 재생성: 문장 {keep}/{len(sentences)} 유지 "
+            f"({cut:.1f}초){' + CTA 합성' if cta_text else ''}"
+        )
 
-        async def _save():
-            communicate = edge_tts.Communicate(text, voice=voice)
-            await communicate.save(mp3_path)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:21]
+        random_suffix = secrets.token_hex(4)
+        samples = head
+        if cta_text:
+            tail, tail_from_gemini = self._cta_samples(cta_text, voice, timestamp, random_suffix)
+            if not tail_from_gemini:
+                logger.info("[AudioPipeline] CTA가 Edge 폴백으로 생성됨 - 전체 재생성")
+                return None
+            samples = self._splice_tail(head, tail)
+
+        result = self._finish_take(
+            samples,
+            new_script,
+            voice,
+            self._split_text_naturally(new_script),
+            timestamp,
+            random_suffix,
+        )
+        return _Take(result=result, samples=samples, script=new_script, from_gemini=take.from_gemini)
 
-        _run_coro_in_isolated_loop(_save())
+    def _request_gemini_audio(self, tts_text: str, voice: str) -> bytes:
+        """
+        Gemini TTS 호출 (실패하거나 오디오가 없으면 b"" -> Edge 폴백)
 
-        if not os.path.exists(mp3_path) or os.path.getsize(mp3_path) == 0:
-            raise RuntimeError("Edge TTS fallback did not create audio.")
+        키 관리자가 있으면 키별 할당량을 받은 뒤 그 키의 클라이언트로 호출하므로
+        여러 음성을 동시에 생성해도 키 한도를 넘지 않습니다.
+        """
+        from core.audio.multi_voice import keyed_tts_clients
+
+        if getattr(self.app, "api_key_manager", None) is None and getattr(self.app, "genai_client", None) is None:
+            logger.info("[TTS] Gemini TTS is unavailable; using Edge fallback.")
+            return b""
+
+        def _request(client):
+            return client.models.generate_content(
+                model=self.app.config.GEMINI_TTS_MODEL,
+                contents=[tts_text],
+                config=types.GenerateContentConfig(
+                    response_modalities=["AUDIO"],
+                    speech_config=types.SpeechConfig(
+                        voice_config=types.VoiceConfig(
+                            prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                                voice_name=voice
+                            )
+                        )
+                    ),
+                ),
+            )
 
-        audio = AudioSegment.from_file(mp3_path)
-        audio.export(output_path, format="wav")
         try:
-            os.remove(mp3_path)
-        except OSError:
-            pass
-        logger.info("[TTS] Edge fallback generated audio: %s", output_path)
+            response = keyed_tts_clients(self.app).call(_request, tts_text)
+        except Exception as exc:
+            logger.warning("[TTS] Gemini TTS failed; using Edge fallback: %s", exc)
+            return b""
+
+        if not (response and response.candidates):
+            logger.warning("[TTS] Gemini returned no candidates; using Edge fallback.")
+            return b""
+        candidate = response.candidates[0]
+        parts = getattr(getattr(candidate, "content", None), "parts", None) or []
+        if parts and getattr(parts[0], "inline_data", None):
+            return parts[0].inline_data.data or b""
+        finish_reason = getattr(candidate, "finish_reason", "unknown")
+        logger.warning(
+            "[TTS] Gemini returned no audio parts (finish=%s); using Edge fallback.",
+            finish_reason,
+        )
+        return b""
+
+    def _generate_edge_tts_samples(self, text: str):
+        """
+        Edge TTS 폴백 -> ``(samples, rate)``
+
+        상시 백그라운드 루프에서 스트리밍으로 받은 MP3 청크를 바로 PCM으로
+        디코딩합니다 (임시 MP3 파일 없음).
+        """
+        from core.audio import edge_tts_stream
+
+        voice = getattr(self.app, "edge_tts_voice", edge_tts_stream.DEFAULT_EDGE_VOICE)
+        samples, sample_rate = edge_tts_stream.synthesize(text, voice)
+        logger.info("[TTS] Edge fallback generated audio (%.2fs)", len(samples) / float(sample_rate))
+        return samples, sample_rate
 
     def _apply_speed(
         self,
-        original_path: str,
-        audio: "AudioSegment",
+        samples,
         voice: str,
         timestamp: str,
         random_suffix: str,
     ) -> Tuple[str, float]:
         """
-        오디오에 배속 적용
+        오디오에 배속 적용 (피치 유지 WSOLA) 후 WAV로 저장
+
+        Args:
+            samples: ``config.sample_rate`` 기준 PCM 배열 (core.audio.pcm)
 
         Returns:
             (배속된 파일 경로, 배속 후 길이)
         """
-        from core.video.batch.audio_utils import (
-            _ensure_pydub_converter,
-            _write_wave_fallback,
-        )
+        from core.audio import pcm
 
         speeded_filename = f"tts_speeded_{voice}_{timestamp}_{random_suffix}.wav"
         speeded_path = os.path.join(self.app.tts_output_dir, speeded_filename)
 
-        ffmpeg_path = _ensure_pydub_converter()
         speed_ratio = self.config.speed_ratio
-
-        # ffmpeg atempo 사용 (더 좋은 품질)
-        if ffmpeg_path:
-            cmd = [
-                ffmpeg_path,
-                "-y",
-                "-i",
-                original_path,
-                "-filter:a",
-                f"atempo={speed_ratio}",
-                "-ar",
-                str(self.config.sample_rate),
-                "-ac",
-                str(self.config.channels),
-                speeded_path,
-            ]
-            result = subprocess.run(cmd, capture_output=True, timeout=60)
-
-            if result.returncode == 0 and os.path.exists(speeded_path):
-                logger.info(f"[배속] ffmpeg atempo {speed_ratio}x 성공")
-            else:
-                # ffmpeg 실패 시 pydub 폴백
-                speeded_audio = audio.speedup(
-                    playback_speed=speed_ratio, chunk_size=150, crossfade=25
-                )
-                speeded_audio.export(speeded_path, format="wav")
-                logger.info(f"[배속] pydub {speed_ratio}x 폴백")
-        else:
-            # ffmpeg 없으면 pydub 사용
-            speeded_audio = audio.speedup(
-                playback_speed=speed_ratio, chunk_size=150, crossfade=25
-            )
-            speeded_audio.export(speeded_path, format="wav")
-            logger.info(f"[배속] pydub {speed_ratio}x (ffmpeg 없음)")
-
-        # 배속 후 길이 측정
-        speeded_audio = AudioSegment.from_file(speeded_path)
-        speeded_duration = len(speeded_audio) / 1000.0
+        speeded = pcm.change_tempo(samples, self.config.sample_rate, speed_ratio)
+        pcm.write_wav(speeded_path, speeded, self.config.sample_rate)
+        speeded_duration = pcm.duration_seconds(speeded, self.config.sample_rate)
 
         logger.info(f"[배속] {speed_ratio}x 후 길이: {speeded_duration:.2f}초")
 
@@ -745,12 +961,13 @@ class AudioPipeline:
         Returns:
             (메타데이터 리스트, 타임스탬프 소스, 음성 시작, 음성 끝)
         """
-        from core.video.batch.whisper_analyzer import analyze_tts_with_whisper
+        from core.video.batch.whisper_analyzer import analyze_tts_timing
 
         logger.info("[Whisper] 자막 타이밍 분석 시작...")
 
         try:
-            whisper_result = analyze_tts_with_whisper(
+            # 대본 강제 정렬이 먼저, 신뢰도가 낮을 때만 Whisper 인식
+            whisper_result = analyze_tts_timing(
                 self.app, audio_path, script, subtitle_segments
             )
 
@@ -776,8 +993,13 @@ class AudioPipeline:
                     }
                 )
 
-            logger.info(f"[Whisper] {len(metadata)}개 세그먼트 분석 완료")
-            return metadata, "whisper_analysis", voice_start, voice_end
+            source = (
+                "forced_alignment"
+                if whisper_result.get("method") == "forced_alignment"
+                else "whisper_analysis"
+            )
+            logger.info(f"[{source}] {len(metadata)}개 세그먼트 분석 완료")
+            return metadata, source, voice_start, voice_end
 
         except Exception as exc:
             # Whisper가 실패해도 전체 파이프라인이 멈추지 않도록 폴백 타이밍을 생성한다.
@@ -0,0 +1,226 @@
+"""
+Learned TTS speaking rate
+음성·배속별 TTS 발화 속도 학습
+
+TTS 길이를 고정된 초당 글자 수로 추정하면 음성마다 빠르기가 달라 긴
+상품 대본은 "생성 -> 길이 초과 -> 축소 -> 전체 재생성"을 두세 번 반복합니다.
+``SpeechRateModel``은 지난 생성 결과에서 (음성, 배속)별 발화 단위당 길이의
+평균과 분산을 학습해, 첫 시도 전에 대본을 목표 길이에 맞게 줄이는 데
+씁니다.
+
+- 발화 단위: ``forced_align.segment_weight`` (한글 음절, 숫자, 영문, 문장부호 쉼)
+- 통계: 지수 가중 평균/분산 (최근 생성이 더 중요, 음성 업데이트 반영)
+- 예측: ``mean + z * std`` 상한으로 사전 축소해 첫 시도 적중률을 높임
+- 저장: ``SSMAKER_SPEECH_RATE_PATH`` (기본 ``~/.ssmaker/speech_rate.json``),
+  관측마다 쓰지 않고 모아서 임시 파일 + ``os.replace``로 한 번에 교체
+
+Durations are seconds after the speed change, so each ``(voice, speed)``
+pair is learned separately.
+"""
+
+import atexit
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 이 횟수 전까지는 단순 평균, 이후에는 지수 가중 (최근 약 20회 기준)
+MIN_ALPHA = 0.05
+# 학습 전 분산: 평균의 이 비율을 표준편차로 가정
+PRIOR_RELATIVE_STD = 0.12
+# 이 범위를 벗어난 관측(초/발화 단위)은 오류로 보고 버림
+MIN_SECONDS_PER_UNIT = 0.04
+MAX_SECONDS_PER_UNIT = 0.6
+# 사전 축소에 쓰는 상한 분위 (약 90%)
+DEFAULT_Z = 1.3
+SCHEMA_VERSION = 1
+# 관측이 몰릴 때 마지막 관측 후 이 시간 안에 한 번만 저장
+SAVE_DEBOUNCE_SECONDS = 2.0
+
+_CLAUSE_SPLIT = re.compile(r"(?<=[.,!?~…])\s+|\n+")
+
+
+def spoken_units(text: str) -> float:
+    """Expected spoken length of ``text`` in syllable units (clause pauses included)."""
+    from core.audio.forced_align import segment_weight
+
+    clauses = [clause for clause in _CLAUSE_SPLIT.split(str(text or "")) if clause.strip()]
+    return float(sum(segment_weight(clause) for clause in clauses))
+
+
+class SpeechRateModel:
+    """
+    (음성, 배속)별 발화 단위당 초 통계
+
+    Thread-safe; ``path=None`` keeps the statistics in memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None, prior_seconds_per_unit: float = 1 / 8.4):
+        self.path = path
+        self.prior_seconds_per_unit = float(prior_seconds_per_unit)
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        if path:
+            self._load()
+            _live_models.add(self)
+
+    @staticmethod
+    def _key(voice: str, speed_ratio: float) -> str:
+        return f"{voice}@{float(speed_ratio):.2f}"
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("[발화 속도] 통계 파일을 읽지 못해 새로 학습합니다: %s", exc)
+            return
+        if data.get("version") == SCHEMA_VERSION:
+            self._stats = {
+                key: {name: float(value) for name, value in entry.items()}
+                for key, entry in data.get("voices", {}).items()
+            }
+
+    def _schedule_save_locked(self) -> None:
+        """Mark the statistics dirty and start one debounced flush."""
+        if not self.path:
+            return
+        self._dirty = True
+        if self._flush_timer is None:
+            timer = self._flush_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, self.flush)
+            timer.daemon = True
+            timer.start()
+
+    def flush(self) -> bool:
+        """Write pending statistics now (atomic replace); False when the write failed."""
+        with self._lock:
+            timer, self._flush_timer = self._flush_timer, None
+            if timer is not None:
+                timer.cancel()
+            if not self._dirty:
+                return True
+            payload = json.dumps({"version": SCHEMA_VERSION, "voices": self._stats}, ensure_ascii=False, indent=1)
+            temp_path = ""
+            try:
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    "w",
+                    encoding="utf-8",
+                    dir=directory,
+                    prefix=f".{os.path.basename(self.path)}.",
+                    suffix=".tmp",
+                    delete=False,
+                ) as handle:
+                    temp_path = handle.name
+                    handle.write(payload)
+                os.replace(temp_path, self.path)
+            except OSError as exc:
+                if temp_path:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                # 다음 관측이나 종료 시 다시 시도
+                logger.debug("[발화 속도] 통계 저장 실패: %s", exc)
+                return False
+            self._dirty = False
+            return True
+
+    def rate(self, voice: str, speed_ratio: float, prior: Optional[float] = None) -> Tuple[float, float, int]:
+        """
+        (mean, std, samples) seconds per spoken unit after the speed change
+
+        ``prior`` replaces the default mean while nothing has been learned.
+        """
+        with self._lock:
+            entry = self._stats.get(self._key(voice, speed_ratio))
+        if not entry:
+            mean = prior or self.prior_seconds_per_unit
+            return mean, mean * PRIOR_RELATIVE_STD, 0
+        return entry["mean"], math.sqrt(max(entry["var"], 0.0)), int(entry["count"])
+
+    def predict(
+        self, voice: str, speed_ratio: float, text: str, z: float = 0.0, prior: Optional[float] = None
+    ) -> float:
+        """Predicted duration of ``text`` in seconds after the speed change (``mean + z*std``)."""
+        mean, std, _count = self.rate(voice, speed_ratio, prior)
+        return spoken_units(text) * (mean + z * std)
+
+    def budget_units(
+        self,
+        voice: str,
+        speed_ratio: float,
+        seconds: float,
+        z: float = DEFAULT_Z,
+        prior: Optional[float] = None,
+    ) -> float:
+        """Spoken units that fit in ``seconds`` at the ``z`` upper bound."""
+        mean, std, _count = self.rate(voice, speed_ratio, prior)
+        return max(0.0, seconds) / (mean + z * std)
+
+    def observe(self, voice: str, speed_ratio: float, text: str, seconds: float) -> bool:
+        """Record one generation; returns False when the sample is implausible and ignored."""
+        units = spoken_units(text)
+        if units < 3 or seconds <= 0:
+            return False
+        sample = seconds / units
+        if not MIN_SECONDS_PER_UNIT <= sample <= MAX_SECONDS_PER_UNIT:
+            logger.debug("[발화 속도] 무시: %s %.3f초/단위", voice, sample)
+            return False
+        key = self._key(voice, speed_ratio)
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                prior_var = (sample * PRIOR_RELATIVE_STD) ** 2
+                self._stats[key] = {"mean": sample, "var": prior_var, "count": 1.0}
+            else:
+                count = entry["count"] + 1
+                alpha = max(1.0 / count, MIN_ALPHA)
+                delta = sample - entry["mean"]
+                entry["mean"] += alpha * delta
+                entry["var"] = (1 - alpha) * (entry["var"] + alpha * delta * delta)
+                entry["count"] = count
+            self._schedule_save_locked()
+        return True
+
+
+# 저장 대기 중인 모델 (인터프리터 종료 시 flush)
+_live_models: "weakref.WeakSet[SpeechRateModel]" = weakref.WeakSet()
+
+
+@atexit.register
+def flush_all_speech_rates() -> None:
+    """Write pending statistics of every live model."""
+    for model in list(_live_models):
+        model.flush()
+
+
+_model_lock = threading.Lock()
+_model: Optional[SpeechRateModel] = None
+
+
+def get_speech_rate_model() -> SpeechRateModel:
+    """Process-wide model persisted under ``SSMAKER_SPEECH_RATE_PATH``."""
+    global _model
+    path = os.getenv("SSMAKER_SPEECH_RATE_PATH", "").strip() or os.path.expanduser(
+        "~/.ssmaker/speech_rate.json"
+    )
+    with _model_lock:
+        if _model is None or _model.path != path:
+            if _model is not None:
+                _model.flush()
+            _model = SpeechRateModel(path)
+        return _model
@@ -9,6 +9,7 @@ import os
 from typing import Optional
 
 import config
+from core.api.gemini_requests import wrap_client
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -61,7 +62,7 @@ class VertexGeminiProvider:
                 self._api_key_configured = False
                 return None
 
-            client = genai.Client(api_key=key)
+            client = wrap_client(genai.Client(api_key=key))
             self._api_key_configured = True
             logger.info(f"[Provider] Gemini 초기화 완료 (모델: {config.GEMINI_TEXT_MODEL})")
             return client
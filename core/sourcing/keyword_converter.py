@@ -7,8 +7,10 @@ from __future__ import annotations
 import asyncio
 import os
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import config
+from core.api.gemini_response_cache import cached_generate_text
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -476,8 +478,6 @@ async def generate_content_text(gemini_client: object, prompt: str) -> str:
 
     models = getattr(gemini_client, "models", None)
     if models is not None and hasattr(models, "generate_content"):
-        import config
-
         model_name = getattr(config, "GEMINI_TEXT_MODEL", "gemini-3.5-flash")
         loop = asyncio.get_running_loop()
 
@@ -549,6 +549,19 @@ async def generate_content_text(gemini_client: object, prompt: str) -> str:
     return ""
 
 
+def _parse_keyword_reply(text: str) -> Tuple[str, str]:
+    """(chinese, english) from a ``chinese: ...`` / ``english: ...`` reply; blanks when missing."""
+    cn = ""
+    en = ""
+    for line in (text or "").split("\n"):
+        line = line.strip()
+        if line.lower().startswith("chinese:"):
+            cn = line.split(":", 1)[1].strip()
+        elif line.lower().startswith("english:"):
+            en = line.split(":", 1)[1].strip()
+    return cn, en
+
+
 async def convert_keywords_gemini(product_name: str, gemini_client: Optional[object] = None) -> Dict[str, str]:
     """
     Use Gemini API to convert Korean product name to Chinese + English search keywords.
@@ -571,20 +584,31 @@ async def convert_keywords_gemini(product_name: str, gemini_client: Optional[obj
             f"최고/인기 같은 판매 문구만 제외해."
         )
 
-        text = await generate_content_text(gemini_client, prompt)
+        # 같은 상품명은 재실행 때 응답 캐시 사용 (SSMAKER_GEMINI_RESPONSE_CACHE=1)
+        # 두 줄을 모두 파싱할 수 있는 응답만 저장. 캐시 조회는 작업 스레드에서,
+        # 업스트림 요청은 이 이벤트 루프에서 실행
+        loop = asyncio.get_running_loop()
+
+        def _generate() -> str:
+            return asyncio.run_coroutine_threadsafe(
+                generate_content_text(gemini_client, prompt), loop
+            ).result()
+
+        text = await loop.run_in_executor(
+            None,
+            lambda: cached_generate_text(
+                _generate,
+                model=getattr(config, "GEMINI_TEXT_MODEL", ""),
+                contents=prompt,
+                validate=lambda reply: all(_parse_keyword_reply(reply)),
+                purpose="keyword_converter",
+            ),
+        )
         if not text:
             logger.warning("[KeywordConverter] Gemini client unsupported/empty, fallback to rules")
             return convert_keywords_rule_based(product_name)
 
-        cn = ""
-        en = ""
-        for line in text.split("\n"):
-            line = line.strip()
-            if line.lower().startswith("chinese:"):
-                cn = line.split(":", 1)[1].strip()
-            elif line.lower().startswith("english:"):
-                en = line.split(":", 1)[1].strip()
-
+        cn, en = _parse_keyword_reply(text)
         if cn and en:
             cn = _sanitize_search_phrase(_append_identity_tokens(cn, product_name, "cn"))
             en = _sanitize_search_phrase(_append_identity_tokens(en, product_name, "en"))
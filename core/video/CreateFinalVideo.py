@@ -43,6 +43,8 @@ from core.video import VideoTool
 
 from core.api import ApiController
 
+from core.api.gemini_response_cache import cached_generate_content
+
 from core.download import DouyinExtract, TicktokExtract
 
 from core.video import VideoExtract
@@ -2095,36 +2097,15 @@ def _split_subtitle_with_gemini(app, text: str, max_chars: int = 10) -> list:
 
         prompt = get_subtitle_split_prompt(text)
 
-        response = client.models.generate_content(
+        response = cached_generate_content(
+            client,
             model=getattr(config, "GEMINI_TEXT_MODEL", "gemini-3.5-flash"),
             contents=[prompt],
+            # 분할 줄이 안 나오는 응답은 단순 분할로 대체되므로 캐시에 남기지 않음
+            validate=lambda r: bool(_parse_subtitle_split_response(r)),
         )
 
-        result_text = ""
-
-        if hasattr(response, "candidates") and response.candidates:
-            for candidate in response.candidates:
-                if hasattr(candidate, "content") and candidate.content:
-                    for part in candidate.content.parts:
-                        if hasattr(part, "text") and part.text:
-                            result_text += part.text
-
-        if not result_text:
-            result_text = getattr(response, "text", "")
-
-        # 결과 파싱
-
-        segments = []
-
-        for line in result_text.strip().split("\n"):
-            line = line.strip()
-
-            # 번호나 마커 제거 (예: "1.", "-", "•")
-
-            line = re.sub(r"^[\d\.\-\•\*]+\s*", "", line).strip()
-
-            if line and len(line) >= 2:
-                segments.append(line)
+        segments = _parse_subtitle_split_response(response)
 
         if segments:
             logger.debug(
@@ -2146,6 +2127,36 @@ def _split_subtitle_with_gemini(app, text: str, max_chars: int = 10) -> list:
         return _fallback_split(text, max_chars)
 
 
+def _parse_subtitle_split_response(response) -> list:
+    """Gemini 자막 분할 응답 -> 세그먼트 리스트 (번호/마커 제거, 2자 미만 줄 제외)"""
+
+    result_text = ""
+
+    if hasattr(response, "candidates") and response.candidates:
+        for candidate in response.candidates:
+            if hasattr(candidate, "content") and candidate.content:
+                for part in candidate.content.parts:
+                    if hasattr(part, "text") and part.text:
+                        result_text += part.text
+
+    if not result_text:
+        result_text = getattr(response, "text", "") or ""
+
+    segments = []
+
+    for line in result_text.strip().split("\n"):
+        line = line.strip()
+
+        # 번호나 마커 제거 (예: "1.", "-", "•")
+
+        line = re.sub(r"^[\d\.\-\•\*]+\s*", "", line).strip()
+
+        if line and len(line) >= 2:
+            segments.append(line)
+
+    return segments
+
+
 def _fallback_split(text: str, max_chars: int = 10) -> list:
     """Gemini 실패 시 사용하는 단순 분할"""
 
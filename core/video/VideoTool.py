@@ -2,6 +2,8 @@ import os
 import re
 import wave
 import sys
+import threading
+from collections import OrderedDict
 from pydub import AudioSegment
 from caller import ui_controller
 from config.font_catalog import (
@@ -18,6 +20,13 @@ logger = get_logger(__name__)
 _font_cache = {}  # key: (font_id, font_size) -> ImageFont object
 _font_fallback_warned = set()  # track which font_ids already had fallback warning
 
+# CTA 자막은 작업마다 같은 문구라 렌더링한 자막 박스 이미지를 재사용
+# (전체 프레임이 아니라 박스 영역만 잘라 RGBA 배열로 보관 - 한 항목 수백 KB)
+# key: (text, font_id, font_size, width, height, layout) -> (RGBA ndarray, 위치, box)
+_cta_subtitle_cache = OrderedDict()
+_CTA_SUBTITLE_CACHE_SIZE = 16
+_cta_subtitle_lock = threading.Lock()
+
 
 def _resource_path(relative_path: str) -> str:
     if getattr(sys, "frozen", False):
@@ -71,8 +80,6 @@ def _detect_audio_start_offset(path: str, threshold_ratio: float = 0.01) -> floa
         앞 무음 길이 (초). 감지 실패 시 0.0 반환
     """
     try:
-        import numpy as np
-
         with wave.open(path, "rb") as wf:
             n_channels = wf.getnchannels()
             sample_width = wf.getsampwidth()
@@ -85,55 +92,125 @@ def _detect_audio_start_offset(path: str, threshold_ratio: float = 0.01) -> floa
             # 오디오 데이터 읽기
             frames = wf.readframes(n_frames)
 
-            # numpy 배열로 변환
-            if sample_width == 2:
-                audio = np.frombuffer(frames, dtype=np.int16)
-            elif sample_width == 1:
-                audio = np.frombuffer(frames, dtype=np.uint8).astype(np.int16) - 128
-            else:
-                # 다른 비트 깊이는 지원하지 않음
-                return 0.0
+        return _detect_pcm_start_offset(frames, n_channels, sample_width, frame_rate, threshold_ratio)
 
-            # 스테레오면 모노로 변환
-            if n_channels == 2:
-                audio = audio[::2]  # 왼쪽 채널만 사용
+    except Exception as e:
+        logger.warning(f"[Audio Offset] 감지 실패: {e}")
+        return 0.0
 
-            # 절대값으로 변환
-            audio_abs = np.abs(audio)
-            max_amplitude = np.max(audio_abs)
 
-            if max_amplitude == 0:
-                return 0.0
+def _detect_pcm_start_offset(
+    frames: bytes, n_channels: int, sample_width: int, frame_rate: int, threshold_ratio: float = 0.01
+) -> float:
+    """
+    ``_detect_audio_start_offset``과 같은 감지를 메모리의 PCM 바이트에 수행
 
-            # 임계값 계산 (최대 진폭의 threshold_ratio)
-            threshold = max_amplitude * threshold_ratio
+    파일로 저장하기 전에 이미 샘플을 들고 있으면 다시 읽지 않고 이걸 씁니다.
+    """
+    try:
+        import numpy as np
 
-            # 임계값을 초과하는 첫 번째 샘플 찾기
-            non_silent = np.where(audio_abs > threshold)[0]
+        if not frames or frame_rate == 0:
+            return 0.0
 
-            if len(non_silent) == 0:
-                return 0.0
+        # numpy 배열로 변환 (복사 없이 버퍼를 그대로 봄)
+        if sample_width == 2:
+            audio = np.frombuffer(frames, dtype=np.int16)
+        elif sample_width == 1:
+            audio = np.frombuffer(frames, dtype=np.uint8)
+        else:
+            # 다른 비트 깊이는 지원하지 않음
+            return 0.0
 
-            first_sound_sample = non_silent[0]
-            offset_seconds = first_sound_sample / frame_rate
+        # 스테레오면 모노로 변환
+        if n_channels == 2:
+            audio = audio[::2]  # 왼쪽 채널만 사용 (strided view)
 
-            # 최대 0.5초까지만 오프셋으로 인정 (너무 큰 값은 오류)
-            if offset_seconds > 0.5:
-                logger.warning(
-                    f"[Audio Offset] 감지된 오프셋이 너무 큼 ({offset_seconds:.3f}s), 0.0s 사용"
-                )
-                return 0.0
+        # 최대 진폭: abs 배열을 만들지 않고 min/max로 계산 (int16 -32768 overflow 방지)
+        center = 128 if sample_width == 1 else 0
+        max_amplitude = max(int(audio.max()) - center, center - int(audio.min()))
 
-            logger.info(
-                f"[Audio Offset] 앞 무음 감지: {offset_seconds:.3f}초 (임계값: {threshold_ratio * 100:.1f}%)"
-            )
-            return offset_seconds
+        if max_amplitude == 0:
+            return 0.0
+
+        # 임계값 계산 (최대 진폭의 threshold_ratio)
+        threshold = max_amplitude * threshold_ratio
+
+        # 0.5초 넘는 오프셋은 어차피 버리므로 앞 0.5초만 검사
+        window = audio[: int(0.5 * frame_rate) + 1].astype(np.int32) - center
+        loud = np.abs(window) > threshold
+        if not loud.any():
+            if max_amplitude > threshold:
+                logger.warning("[Audio Offset] 감지된 오프셋이 너무 큼 (>0.5s), 0.0s 사용")
+            return 0.0
+
+        first_sound_sample = int(np.argmax(loud))
+        offset_seconds = first_sound_sample / frame_rate
+
+        logger.info(
+            f"[Audio Offset] 앞 무음 감지: {offset_seconds:.3f}초 (임계값: {threshold_ratio * 100:.1f}%)"
+        )
+        return offset_seconds
 
     except Exception as e:
         logger.warning(f"[Audio Offset] 감지 실패: {e}")
         return 0.0
 
 
+def _cta_subtitle_lines(app) -> set:
+    """선택한 CTA 문구의 줄들 (공백 제거)"""
+    try:
+        from ui.panels.cta_panel import get_selected_cta_lines
+
+        lines = get_selected_cta_lines(app)
+    except ImportError:
+        return set()
+    return {"".join(str(line).split()) for line in lines or []} - {""}
+
+
+def _is_cta_subtitle(app, text: str) -> bool:
+    """CTA 문구 한 줄과 (공백을 무시하고) 통째로 같은 자막인지"""
+    return "".join(text.split()) in _cta_subtitle_lines(app)
+
+
+def _positioned_subtitle_clip(image, origin):
+    """잘라낸 자막 박스 이미지를 프레임 안 ``origin`` (왼쪽 위) 위치에 놓는 클립"""
+    from moviepy.editor import ImageClip
+
+    return ImageClip(image).set_position(origin)
+
+
+def _subtitle_layout_key(app):
+    """자막 박스 위치를 정하는 앱 설정 (_resolve_korean_subtitle_bbox 입력)"""
+    override = getattr(app, "korean_subtitle_override", None)
+    return (
+        bool(getattr(app, "subtitle_overlay_on_chinese", False)),
+        tuple(sorted(override.items())) if isinstance(override, dict) else None,
+        getattr(app, "subtitle_position", "bottom_center"),
+        getattr(app, "subtitle_custom_y_percent", 80.0),
+    )
+
+
+def _record_korean_subtitle_overlay(app, start_time, duration, box):
+    # Precision QA must distinguish the Korean subtitle intentionally
+    # rendered by this application from source-language text.  Record the
+    # exact time/pixel rectangle used by the compositor; the independent
+    # OCR audit may ignore only detections fully contained in this known
+    # overlay, never a broad subtitle band.
+    if getattr(app, "_precision_record_korean_subtitle_overlays", False):
+        records = getattr(app, "_precision_korean_subtitle_overlays", None)
+        if not isinstance(records, list):
+            records = []
+            app._precision_korean_subtitle_overlays = records
+        records.append(
+            {
+                "start_time": float(start_time),
+                "end_time": float(start_time + duration),
+                "box": list(box),
+            }
+        )
+
+
 def _create_single_line_subtitle(
     app, text, duration, start_time, video_width, video_height
 ):
@@ -241,6 +318,30 @@ def _create_single_line_subtitle(
 
         text = text.strip()
 
+        # CTA 자막은 미리 렌더링한 클립의 시작/길이만 바꿔 사용
+        cta_key = None
+        if _is_cta_subtitle(app, text):
+            cta_key = (
+                text,
+                selected_font_id,
+                font_size,
+                video_width,
+                video_height,
+                _subtitle_layout_key(app),
+            )
+            with _cta_subtitle_lock:
+                cached = _cta_subtitle_cache.get(cta_key)
+                if cached is not None:
+                    _cta_subtitle_cache.move_to_end(cta_key)
+            if cached is not None:
+                image, origin, box = cached
+                _record_korean_subtitle_overlay(app, start_time, duration, box)
+                return (
+                    _positioned_subtitle_clip(image, origin)
+                    .set_duration(duration)
+                    .set_start(start_time)
+                )
+
         # 텍스트 너비 측정 (줄바꿈 없이 한 줄로 표시)
         tmp = Image.new("RGBA", (1, 1), (0, 0, 0, 0))
         draw_tmp = ImageDraw.Draw(tmp)
@@ -278,23 +379,8 @@ def _create_single_line_subtitle(
             app, desired_w, desired_h, video_width, video_height
         )
 
-        # Precision QA must distinguish the Korean subtitle intentionally
-        # rendered by this application from source-language text.  Record the
-        # exact time/pixel rectangle used by the compositor; the independent
-        # OCR audit may ignore only detections fully contained in this known
-        # overlay, never a broad subtitle band.
-        if getattr(app, "_precision_record_korean_subtitle_overlays", False):
-            records = getattr(app, "_precision_korean_subtitle_overlays", None)
-            if not isinstance(records, list):
-                records = []
-                app._precision_korean_subtitle_overlays = records
-            records.append(
-                {
-                    "start_time": float(start_time),
-                    "end_time": float(start_time + duration),
-                    "box": [int(bg_x), int(bg_y), int(bg_x + bg_w), int(bg_y + bg_h)],
-                }
-            )
+        box = (int(bg_x), int(bg_y), int(bg_x + bg_w), int(bg_y + bg_h))
+        _record_korean_subtitle_overlay(app, start_time, duration, box)
 
         # 둥근 모서리 반경 (살짝만 - 박스 높이의 15%)
         corner_radius = max(8, int(bg_h * 0.15))
@@ -328,8 +414,24 @@ def _create_single_line_subtitle(
             bg_draw.text((text_x, text_y), text, font=font, fill=(255, 255, 255, 255))
 
         # 3. 단일 이미지 클립 생성 (배경 + 텍스트 합친 상태)
-        subtitle_np = np.array(bg_image)
-        subtitle_clip = ImageClip(subtitle_np, duration=duration).set_start(start_time)
+        if cta_key is not None:
+            # CTA는 박스 영역만 잘라 보관하고 같은 위치에 배치
+            crop_box = (
+                max(0, box[0]),
+                max(0, box[1]),
+                min(video_width, box[2] + 1),
+                min(video_height, box[3] + 1),
+            )
+            image = np.array(bg_image.crop(crop_box))
+            image.flags.writeable = False
+            with _cta_subtitle_lock:
+                _cta_subtitle_cache[cta_key] = (image, crop_box[:2], box)
+                while len(_cta_subtitle_cache) > _CTA_SUBTITLE_CACHE_SIZE:
+                    _cta_subtitle_cache.popitem(last=False)
+            base_clip = _positioned_subtitle_clip(image, crop_box[:2])
+        else:
+            base_clip = ImageClip(np.array(bg_image))
+        subtitle_clip = base_clip.set_duration(duration).set_start(start_time)
 
         return subtitle_clip
 
@@ -0,0 +1,278 @@
+"""
+Analysis proxy media for Gemini uploads
+Gemini 분석용 저해상도 프록시 업로드
+
+영상 분석·품질 검증은 원본/최종 영상을 그대로 업로드합니다. Gemini는
+영상을 초당 1프레임, 낮은 미디어 해상도로 샘플링하므로 고해상도 원본의
+대부분은 업로드 시간과 대역폭만 소모합니다. ``GEMINI_ANALYSIS_PROXY``를
+켜면 로컬에서 저해상도·저비트레이트 사본(또는 키프레임 콘택트 시트)을
+만들어 그것을 업로드하고, 업로드 바이트와 변환 시간을 집계해 오프라인에서
+trade-off를 비교할 수 있게 합니다.
+
+Modes (``config.GEMINI_ANALYSIS_PROXY``):
+- ``off``: upload the source file unchanged (default).
+- ``video``: low-resolution, low-frame-rate H.264 copy with mono speech audio.
+- ``contact_sheet``: one JPEG tiling frames sampled evenly across the probed
+  duration (no audio). Only used where the caller allows it (final-video
+  validation, which then uses a still-image prompt and skips its
+  subtitle/audio sync check); script analysis needs the soundtrack and uses
+  ``video`` instead. A source whose duration cannot be probed gets ``video``.
+
+Any transcode failure (no FFmpeg, timeout, non-zero exit, proxy not smaller)
+falls back to uploading the source file.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import config
+from utils.ffmpeg import resolve_ffmpeg_exe
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PROXY_MODE_OFF = "off"
+PROXY_MODE_VIDEO = "video"
+PROXY_MODE_CONTACT_SHEET = "contact_sheet"
+_MODES = (PROXY_MODE_OFF, PROXY_MODE_VIDEO, PROXY_MODE_CONTACT_SHEET)
+
+# 프록시 영상: 긴 변 640px, 5fps, 영상 250kbps / 모노 16kHz 음성 32kbps
+PROXY_LONG_SIDE = 640
+PROXY_FPS = 5
+PROXY_VIDEO_BITRATE = "250k"
+PROXY_AUDIO_BITRATE = "32k"
+# 콘택트 시트: 전체 길이에서 같은 간격으로 뽑은 16장을 4x4로 (한 칸 너비 320px)
+CONTACT_SHEET_GRID = (4, 4)
+CONTACT_SHEET_TILE_WIDTH = 320
+# 이보다 작은 파일은 변환 비용이 업로드 절감보다 큼
+MIN_SOURCE_BYTES = 4 * 1024 * 1024
+TRANSCODE_TIMEOUT = 180
+
+
+@dataclass
+class ProxyMedia:
+    """File to upload in place of ``source_path`` (may be the source itself)."""
+
+    source_path: str
+    path: str
+    mode: str
+    source_bytes: int
+    upload_bytes: int
+    transcode_seconds: float = 0.0
+    is_temporary: bool = False
+
+    def record_upload(self) -> None:
+        """Count one successful upload of ``path`` (retries re-upload)."""
+        _stats.add(uploads=1, bytes_uploaded=self.upload_bytes, source_bytes=self.source_bytes)
+
+    def cleanup(self) -> None:
+        if self.is_temporary:
+            try:
+                os.remove(self.path)
+            except OSError as exc:
+                logger.debug("[분석 프록시] 임시 파일 삭제 실패 (무시됨): %s", exc)
+            self.is_temporary = False
+
+
+class _ProxyStats:
+    """Process-wide counters for comparing proxy vs source uploads offline."""
+
+    _FIELDS = ("uploads", "bytes_uploaded", "source_bytes", "transcodes", "transcode_seconds", "fallbacks")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values: Dict[str, float] = {field: 0 for field in self._FIELDS}
+
+    def add(self, **deltas: float) -> None:
+        with self._lock:
+            for field, delta in deltas.items():
+                self._values[field] += delta
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+_stats = _ProxyStats()
+
+
+def proxy_stats() -> Dict[str, float]:
+    """Uploads, bytes uploaded vs source bytes, transcode count/seconds, fallbacks."""
+    return _stats.snapshot()
+
+
+def reset_proxy_stats() -> None:
+    _stats.reset()
+
+
+def proxy_mode() -> str:
+    mode = str(getattr(config, "GEMINI_ANALYSIS_PROXY", PROXY_MODE_OFF) or PROXY_MODE_OFF).strip().lower()
+    if mode not in _MODES:
+        logger.warning("[분석 프록시] 알 수 없는 모드 '%s' - 원본 업로드", mode)
+        return PROXY_MODE_OFF
+    return mode
+
+
+def _video_proxy_args(source: str, target: str) -> List[str]:
+    scale = (
+        f"scale='if(gt(iw,ih),min({PROXY_LONG_SIDE},iw),-2)'"
+        f":'if(gt(iw,ih),-2,min({PROXY_LONG_SIDE},ih))'"
+    )
+    return [
+        "-i", source,
+        "-vf", f"fps={PROXY_FPS},{scale}",
+        "-c:v", "libx264", "-preset", "veryfast",
+        "-b:v", PROXY_VIDEO_BITRATE, "-maxrate", PROXY_VIDEO_BITRATE, "-bufsize", "500k",
+        "-c:a", "aac", "-ac", "1", "-ar", "16000", "-b:a", PROXY_AUDIO_BITRATE,
+        "-movflags", "+faststart",
+        target,
+    ]
+
+
+def _contact_sheet_args(source: str, target: str, duration: float) -> List[str]:
+    columns, rows = CONTACT_SHEET_GRID
+    return [
+        "-i", source,
+        # 키프레임만 고르면 앞쪽 16장에 몰리므로 길이 기준으로 같은 간격 샘플링
+        "-vf", (
+            f"fps={columns * rows}/{duration:.3f},"
+            f"scale={CONTACT_SHEET_TILE_WIDTH}:-2,tile={columns}x{rows}"
+        ),
+        "-frames:v", "1",
+        "-q:v", "4",
+        target,
+    ]
+
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+
+def _probe_duration(ffmpeg_exe: str, source: str) -> float:
+    """``ffmpeg -i`` 헤더 출력에서 길이(초) 읽기, 실패하면 0.0 (ffprobe는 번들에 없음)"""
+    try:
+        result = subprocess.run(
+            [ffmpeg_exe, "-hide_banner", "-i", source],
+            capture_output=True,
+            timeout=30,
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        logger.debug("[분석 프록시] 길이 확인 실패: %s", exc)
+        return 0.0
+    match = _DURATION_RE.search((result.stderr or b"").decode("utf-8", errors="replace"))
+    if not match:
+        return 0.0
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _run_ffmpeg(cmd: List[str], timeout: float) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        cmd,
+        capture_output=True,
+        timeout=timeout,
+        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+    )
+
+
+def prepare_upload(
+    source_path: str,
+    *,
+    allow_contact_sheet: bool = False,
+    mode: Optional[str] = None,
+    min_source_bytes: int = MIN_SOURCE_BYTES,
+    runner: Optional[Callable[[List[str], float], Any]] = None,
+) -> ProxyMedia:
+    """
+    업로드할 파일 결정 (프록시 변환 또는 원본)
+
+    ``allow_contact_sheet=False`` downgrades ``contact_sheet`` to ``video`` for
+    callers whose analysis needs the soundtrack. Call ``cleanup()`` on the
+    result once the upload is no longer needed.
+    """
+    try:
+        source_bytes = os.path.getsize(source_path)
+    except OSError:
+        # 업로드 단계에서 원래대로 오류 처리되도록 원본 경로를 그대로 돌려줌
+        return ProxyMedia(source_path, source_path, PROXY_MODE_OFF, 0, 0)
+    original = ProxyMedia(source_path, source_path, PROXY_MODE_OFF, source_bytes, source_bytes)
+
+    mode = proxy_mode() if mode is None else mode
+    if mode == PROXY_MODE_CONTACT_SHEET and not allow_contact_sheet:
+        mode = PROXY_MODE_VIDEO
+    if mode == PROXY_MODE_OFF or source_bytes < min_source_bytes:
+        return original
+
+    ffmpeg_exe = resolve_ffmpeg_exe()
+    if not ffmpeg_exe:
+        logger.info("[분석 프록시] FFmpeg 없음 - 원본 업로드")
+        _stats.add(fallbacks=1)
+        return original
+
+    duration = _probe_duration(ffmpeg_exe, source_path) if mode == PROXY_MODE_CONTACT_SHEET else 0.0
+    if mode == PROXY_MODE_CONTACT_SHEET and duration <= 0:
+        logger.info("[분석 프록시] 영상 길이를 알 수 없어 콘택트 시트 대신 프록시 영상 사용")
+        mode = PROXY_MODE_VIDEO
+
+    suffix = ".jpg" if mode == PROXY_MODE_CONTACT_SHEET else ".mp4"
+    fd, target = tempfile.mkstemp(prefix="ssmaker_proxy_", suffix=suffix)
+    os.close(fd)
+    if mode == PROXY_MODE_CONTACT_SHEET:
+        build_args = _contact_sheet_args(source_path, target, duration)
+    else:
+        build_args = _video_proxy_args(source_path, target)
+    cmd = [ffmpeg_exe, "-hide_banner", "-loglevel", "error", "-y", *build_args]
+
+    started = time.perf_counter()
+    try:
+        result = (runner or _run_ffmpeg)(cmd, TRANSCODE_TIMEOUT)
+        returncode = getattr(result, "returncode", 1)
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        logger.warning("[분석 프록시] 변환 실패 - 원본 업로드: %s", exc)
+        returncode = None
+    elapsed = time.perf_counter() - started
+    _stats.add(transcodes=1, transcode_seconds=elapsed)
+
+    proxy_bytes = os.path.getsize(target) if os.path.exists(target) else 0
+    if returncode != 0 or not 0 < proxy_bytes < source_bytes:
+        if returncode:
+            stderr = getattr(result, "stderr", b"") or b""
+            logger.warning(
+                "[분석 프록시] FFmpeg 종료 코드 %s - 원본 업로드: %s",
+                returncode,
+                stderr[-300:].decode("utf-8", errors="replace") if isinstance(stderr, bytes) else stderr[-300:],
+            )
+        try:
+            os.remove(target)
+        except OSError:
+            pass
+        _stats.add(fallbacks=1)
+        return original
+
+    logger.info(
+        "[분석 프록시] %s: %.1fMB -> %.1fMB (변환 %.1f초)",
+        mode,
+        source_bytes / 1048576,
+        proxy_bytes / 1048576,
+        elapsed,
+    )
+    return ProxyMedia(
+        source_path,
+        target,
+        mode,
+        source_bytes,
+        proxy_bytes,
+        transcode_seconds=elapsed,
+        is_temporary=True,
+    )
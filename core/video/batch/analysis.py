@@ -22,6 +22,9 @@ from .utils import (
     parse_script_from_text
 )
 from caller import ui_controller
+from core.api.ApiKeyManager import DEFAULT_KEY_WAIT_SECONDS
+from core.api.gemini_response_cache import cached_generate_content
+from core.video.analysis_proxy import prepare_upload
 from utils.logging_config import get_logger
 import config
 from prompts import get_video_analysis_prompt, get_translation_prompt
@@ -259,6 +262,8 @@ def _analyze_video_for_batch(app):
         last_error = None
         is_server_error = False
         video_file = None
+        # 대본 추출에 음성이 필요하므로 콘택트 시트는 쓰지 않음 (프록시 영상은 음성 유지)
+        upload_media = prepare_upload(app._temp_downloaded_file)
 
         for attempt in range(1, MAX_RETRIES + 1):
             try:
@@ -272,10 +277,11 @@ def _analyze_video_for_batch(app):
                     app.add_log(f"[분석] 영상 파일 업로드 중... ({os.path.basename(app._temp_downloaded_file)})")
                     logger.info(f"[배치 분석] 영상 파일 업로드 중... ({os.path.basename(app._temp_downloaded_file)})")
                     video_file = _run_with_timeout(
-                        lambda: app.genai_client.files.upload(file=app._temp_downloaded_file),
+                        lambda: app.genai_client.files.upload(file=upload_media.path),
                         FILE_UPLOAD_TIMEOUT,
                         "Gemini file upload",
                     )
+                    upload_media.record_upload()
                     app.add_log("[분석] 업로드 완료, Gemini 서버에서 처리 대기 중...")
                     logger.info("[배치 분석] 업로드 완료, 파일 처리 대기 중...")
 
@@ -394,7 +400,7 @@ def _analyze_video_for_batch(app):
                         except Exception as block_err:
                             logger.error(f"[배치 분석] 키 차단 실패: {block_err}")
                         try:
-                            new_key_value = api_mgr.get_available_key()
+                            new_key_value = api_mgr.get_available_key(wait_seconds=DEFAULT_KEY_WAIT_SECONDS)
                             new_key_name = getattr(api_mgr, 'current_key', 'unknown')
                             if app.init_client(use_specific_key=new_key_value):
                                 logger.info(f"[배치 분석] API 키 교체 완료: {blocked_key} -> {new_key_name}")
@@ -428,6 +434,7 @@ def _analyze_video_for_batch(app):
         # 진행 표시 스레드 종료
         analysis_done.set()
         progress_thread.join(timeout=0.5)
+        upload_media.cleanup()
 
         if response is None:
             if _apply_sourcing_analysis_fallback(app, str(last_error or "analysis failed")):
@@ -615,9 +622,13 @@ def _translate_script_for_batch(app):
                 current_api_key = getattr(api_mgr, 'current_key', 'unknown') if api_mgr else 'unknown'
                 logger.debug(f"[번역 API] 사용 중인 API 키 (시도 {attempt}): {current_api_key}")
 
-                response = app.genai_client.models.generate_content(
+                # 같은 대본/설정의 재시도·재실행은 응답 캐시 사용 (선택 기능)
+                response = cached_generate_content(
+                    app.genai_client,
                     model=config.GEMINI_TEXT_MODEL,
                     contents=[prompt],
+                    # 빈 번역은 원본 대본으로 대체되므로 캐시에 남기지 않음
+                    validate=lambda r: bool(_extract_text_from_response(r).strip()),
                 )
                 break # 성공 시 루프 탈출
                 
@@ -631,7 +642,7 @@ def _translate_script_for_batch(app):
                     if api_mgr:
                         api_mgr.block_current_key(duration_minutes=30)
                         try:
-                            new_key_value = api_mgr.get_available_key()
+                            new_key_value = api_mgr.get_available_key(wait_seconds=DEFAULT_KEY_WAIT_SECONDS)
                             new_key_name = getattr(api_mgr, 'current_key', 'unknown')
                             if app.init_client(use_specific_key=new_key_value):
                                 logger.info(f"[배치 번역] API 키 교체 완료: {blocked_key} -> {new_key_name}")
@@ -9,6 +9,8 @@ import logging
 import threading
 import time
 
+from core.api.ApiKeyManager import DEFAULT_KEY_WAIT_SECONDS
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -150,7 +152,7 @@ def try_rotate_key(app, block_duration=KEY_BLOCK_DURATION_MINUTES):
         app.add_log(f"[WARN] 키 차단 중 오류: {block_err}")
 
     try:
-        new_key = api_mgr.get_available_key()
+        new_key = api_mgr.get_available_key(wait_seconds=DEFAULT_KEY_WAIT_SECONDS)
         new_key_name = getattr(api_mgr, "current_key", "unknown")
         if new_key and app.init_client(use_specific_key=new_key):
             return True, blocked_key, new_key_name
@@ -226,7 +228,7 @@ def wait_for_user_key_retry(app, step_name, key_name, error_msg, error_type="quo
             continue
 
         try:
-            new_key = api_mgr.get_available_key()
+            new_key = api_mgr.get_available_key(wait_seconds=DEFAULT_KEY_WAIT_SECONDS)
         except Exception as retry_err:
             app.add_log(f"[WARN] 사용 가능한 키 없음: {retry_err}")
             if retry_count >= max_retries:
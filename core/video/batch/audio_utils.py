@@ -5,12 +5,13 @@ Contains audio processing utilities like ffmpeg setup, silence trimming,
 and audio segment preparation.
 """
 
+import math
 import os
-from typing import Optional
+from typing import Optional, Tuple
 
+import numpy as np
 from pydub import AudioSegment
 from pydub.utils import which
-from pydub.silence import detect_leading_silence
 
 from caller import ui_controller
 from utils.ffmpeg import ensure_ffmpeg_on_path
@@ -51,6 +52,91 @@ def _write_wave_fallback(audio_segment: AudioSegment, path: str, sample_rate: in
         wf.writeframes(audio_segment.raw_data)
 
 
+def _segment_frames(segment: AudioSegment) -> np.ndarray:
+    """Integer samples shaped ``(frames, channels)`` as a view of the raw data (no copy)."""
+    # pydub는 24-bit를 로드 시 32-bit로 바꾸고, 8-bit는 audioop처럼 부호 있는 값으로 다룸
+    dtype = {1: np.int8, 2: "<i2", 4: "<i4"}[segment.sample_width]
+    raw = segment.raw_data
+    count = (len(raw) // segment.frame_width) * segment.channels
+    return np.frombuffer(raw, dtype=dtype, count=count).reshape(-1, segment.channels)
+
+
+def _silent_rms_limit(max_amplitude: float, silence_threshold_db: float) -> int:
+    """Smallest integer RMS whose pydub ``dBFS`` is not below the threshold."""
+    limit = max(1, math.ceil(max_amplitude * 10 ** (silence_threshold_db / 20.0)))
+    # 부동소수 경계를 pydub의 ratio_to_db와 똑같이 맞춤
+    while limit > 1 and 20 * math.log((limit - 1) / max_amplitude, 10) >= silence_threshold_db:
+        limit -= 1
+    while 20 * math.log(limit / max_amplitude, 10) < silence_threshold_db:
+        limit += 1
+    return limit
+
+
+def _silence_bounds(
+    frames: np.ndarray,
+    frame_rate: int,
+    sample_width: int,
+    *,
+    silence_threshold_db: float,
+    chunk_size_ms: int,
+) -> Tuple[int, int]:
+    """
+    앞/뒤 무음 길이(ms) - pydub ``detect_leading_silence(seg)``와
+    ``detect_leading_silence(seg.reverse())``와 같은 결과
+
+    Chunk energies are computed with NumPy in blocks that grow from each end
+    (so a clip with short silences only touches its edges), and the tail is
+    measured by mirroring the chunk grid instead of reversing the audio.
+    pydub's integer RMS, ms->frame truncation and zero padding of the final
+    chunk are reproduced exactly.
+    """
+    assert chunk_size_ms > 0
+    frame_count = frames.shape[0]
+    channels = frames.shape[1]
+    length_ms = round(1000 * (frame_count / frame_rate))
+    if length_ms <= 0:
+        return 0, 0
+
+    per_ms = frame_rate / 1000.0
+    starts_ms = np.arange(0, length_ms, chunk_size_ms, dtype=np.int64)
+    starts = (starts_ms * per_ms).astype(np.int64)
+    ends = (np.minimum(starts_ms + chunk_size_ms, length_ms) * per_ms).astype(np.int64)
+    # 마지막 조각이 데이터보다 길면 pydub는 0으로 채움 -> 샘플 수에는 포함
+    sample_counts = (ends - starts) * channels
+    limit = _silent_rms_limit(2 ** (sample_width * 8) / 2, silence_threshold_db)
+    samples = frames.reshape(-1)
+    # 16-bit 이하는 int64 제곱합이 정확함; 32-bit는 audioop처럼 double로 누적
+    accumulator = np.int64 if sample_width <= 2 else np.float64
+
+    def leading(lo: np.ndarray, hi: np.ndarray) -> int:
+        position, block = 0, 64
+        while position < lo.size:
+            block_lo = lo[position : position + block] * channels
+            block_hi = hi[position : position + block] * channels
+            first = int(block_lo.min())
+            energy = np.square(samples[first : int(block_hi.max())], dtype=accumulator)
+            energy = np.append(energy, accumulator(0))
+            bounds = np.empty(block_lo.size * 2, dtype=np.int64)
+            bounds[0::2] = block_lo - first
+            bounds[1::2] = block_hi - first
+            sums = np.add.reduceat(energy, bounds)[0::2]
+            sums[block_hi <= block_lo] = 0
+            counts = sample_counts[position : position + block]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rms = np.floor(np.sqrt(sums / counts))
+            rms[counts == 0] = 0
+            loud = np.flatnonzero(rms >= limit)
+            if loud.size:
+                return int(starts_ms[position + loud[0]])
+            position += block
+            block = min(block * 2, 512)
+        return length_ms
+
+    head = leading(np.minimum(starts, frame_count), np.minimum(ends, frame_count))
+    tail = leading(np.maximum(frame_count - ends, 0), np.maximum(frame_count - starts, 0))
+    return head, tail
+
+
 def _trim_silence(
     segment: AudioSegment,
     *,
@@ -64,11 +150,12 @@ def _trim_silence(
     if segment.duration_seconds <= 0:
         return segment
 
-    start_trim = detect_leading_silence(
-        segment, silence_threshold=silence_threshold_db, chunk_size=chunk_size_ms
-    )
-    end_trim = detect_leading_silence(
-        segment.reverse(), silence_threshold=silence_threshold_db, chunk_size=chunk_size_ms
+    start_trim, end_trim = _silence_bounds(
+        _segment_frames(segment),
+        segment.frame_rate,
+        segment.sample_width,
+        silence_threshold_db=silence_threshold_db,
+        chunk_size_ms=chunk_size_ms,
     )
 
     if start_trim <= 0 and end_trim <= 0:
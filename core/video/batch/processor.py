@@ -22,7 +22,7 @@ from PyQt6.QtCore import QTimer
 from utils.logging_config import get_logger
 from caller import rest
 from utils.auth_helpers import extract_user_id
-from managers.work_quota import DurableWorkReservation
+from managers.work_quota import DurableWorkReservation, WorkLease
 from utils.error_handlers import TrialLimitExceededError
 from core.video.batch.api_key_recovery import (
     show_api_key_error_and_wait,
@@ -622,7 +622,7 @@ from .encoder import (
     _ensure_even_resolution,
     RealtimeEncodingLogger,
 )
-from .tts_handler import _generate_tts_for_batch, combine_tts_files_with_speed
+from .tts_handler import _generate_tts_for_batch, _start_multi_voice_tts, combine_tts_files_with_speed
 from .subtitle_handler import create_subtitle_clips_for_speed
 from .analysis import _analyze_video_for_batch, _translate_script_for_batch
 from core.video.CreateFinalVideo import (
@@ -632,6 +632,30 @@ from core.video.CreateFinalVideo import (
 from caller import ui_controller
 
 
+def _lease_batch_work(app) -> Optional[WorkLease]:
+    """Reserve quota for every waiting URL with one request.
+
+    Jobs that find the lease empty (quota ran out, URLs added later, or the
+    lease request failed) fall back to reserving on their own.
+    """
+    user_id = extract_user_id(getattr(app, "login_data", None))
+    if not user_id:
+        return None
+    waiting = sum(
+        1 for url in app.url_queue if app.url_status.get(url) in ("waiting", None)
+    )
+    if waiting < 2:
+        return None
+    try:
+        lease = WorkLease.acquire(str(user_id), waiting)
+    except Exception as exc:
+        logger.warning("[작업횟수] 일괄 예약 실패: %s", exc)
+        return None
+    if len(lease):
+        logger.info("[작업횟수] %d건 일괄 예약", len(lease))
+    return lease
+
+
 def dynamic_batch_processing_thread(app):
     """Main batch processing workflow for multiple URLs"""
     successful_count = 0
@@ -639,6 +663,7 @@ def dynamic_batch_processing_thread(app):
     processed_urls = set()
     pending_remaining: List[str] = []
     unexpected_error: Optional[Exception] = None
+    work_lease: Optional[WorkLease] = None
 
     try:
         app.add_log("=" * 60)
@@ -647,6 +672,8 @@ def dynamic_batch_processing_thread(app):
         app.add_log("오류 발생 시 최대 3회까지 자동 재시도합니다.")
         app.add_log("=" * 60)
 
+        work_lease = _lease_batch_work(app)
+
         while app.batch_processing:
             # 대기 중인 URL 찾기
             waiting_urls = []
@@ -716,7 +743,7 @@ def dynamic_batch_processing_thread(app):
 
                         work_reservation, work_consume_result = (
                             DurableWorkReservation.begin(
-                                str(user_id), work_job_key
+                                str(user_id), work_job_key, lease=work_lease
                             )
                         )
                         if not work_consume_result.get("success"):
@@ -1309,6 +1336,11 @@ def dynamic_batch_processing_thread(app):
     finally:
         app.batch_processing = False
         app.dynamic_processing = False
+        if work_lease is not None:
+            try:
+                work_lease.release_unused()
+            except Exception as lease_err:
+                logger.warning("[작업횟수] 미사용 예약 반환 실패: %s", lease_err)
         successful_count, failed_count = _count_batch_results(app, processed_urls)
         pending_remaining = [
             job_key
@@ -1410,6 +1442,7 @@ def _process_single_video(app, url, current_number, total_urls):
     current_step = "download"
     display_source = _get_job_display_source(app, url)
     _stage_times = {}  # Track elapsed time per stage
+    multi_voice_tts = None
 
     app._url_log_buffer = []
     app._capture_url_logs = True
@@ -1677,7 +1710,14 @@ def _process_single_video(app, url, current_number, total_urls):
             voices = [app.fixed_tts_voice]
             total_voices = 1
 
-        for idx_voice, voice in enumerate(voices, 1):
+        # 음성이 여럿이면 모든 음성의 TTS를 동시에 생성하고 먼저 끝난 음성부터 렌더링
+        voice_order = voices
+        if total_voices > 1 and isinstance(voices, (list, tuple)) and len(set(voices)) == total_voices:
+            current_step = "tts"
+            multi_voice_tts = _start_multi_voice_tts(app, voices)
+            voice_order = multi_voice_tts.as_completed()
+
+        for idx_voice, voice in enumerate(voice_order, 1):
             # ★★★ 핵심 수정: 음성마다 모든 TTS 관련 데이터 완전 초기화 ★★★
             # 이전 음성의 타이밍 데이터가 남아있으면 새 음성에 잘못 적용됨
             app._cached_subtitle_clips = None
@@ -1726,7 +1766,7 @@ def _process_single_video(app, url, current_number, total_urls):
                 rest.log_user_action("TTS 생성 시작", f"[{current_number}/{total_urls}] {voice_label} ({idx_voice}/{total_voices})")
             except Exception:
                 pass
-            _generate_tts_for_batch(app, voice)
+            _generate_tts_for_batch(app, voice, synthesizer=multi_voice_tts)
             _tts_elapsed = time.time() - _tts_start
             _stage_times[f'tts_{voice_label}'] = _tts_elapsed
             logger.info("[STAGE 4] TTS 생성 완료 - %.1f초 소요", _tts_elapsed)
@@ -2266,6 +2306,8 @@ def _process_single_video(app, url, current_number, total_urls):
         raise
     finally:
         app._capture_url_logs = False
+        if multi_voice_tts is not None:
+            multi_voice_tts.close(cancel=True)
 
 
 def _create_final_video_for_batch(
@@ -10,6 +10,7 @@ TTS 생성, 배속 적용, 자막 싱크를 수행합니다.
 - 전체 스크립트 통으로 TTS 생성 (_generate_tts_full_script)
 - 세그먼트별 개별 TTS 생성 (_generate_tts_for_segment)
 - 배치 처리용 TTS 생성 워크플로우 (_generate_tts_for_batch)
+- 여러 음성 TTS 동시 생성 (_start_multi_voice_tts)
 - Fallback 메타데이터 생성 (_create_fallback_metadata)
 
 변경 이력:
@@ -32,7 +33,7 @@ from google.genai import types
 from pydub import AudioSegment
 
 from .audio_utils import _ensure_pydub_converter, _prepare_segment, _write_wave_fallback
-from .whisper_analyzer import analyze_tts_with_whisper
+from .whisper_analyzer import analyze_tts_timing
 from .utils import (
     _split_text_naturally,
     _get_voice_display_name,
@@ -338,7 +339,58 @@ def _generate_tts_for_segment(app, text: str, voice: str, is_cta: bool = False,
                 logger.warning(f"[TTS] 임시 파일 삭제 실패: {temp_file} - {e}")
 
 
-def _generate_tts_for_batch(app, voice):
+def _extract_batch_script(app):
+    """TTS에 넣을 대본 추출 (없으면 RuntimeError)"""
+    original_script = app.extract_clean_script_from_translation()
+
+    logger.info("[TTS] 스크립트 추출 완료: %d자", len(original_script) if original_script else 0)
+    if original_script:
+        preview = original_script[:100].replace('\n', ' ')
+        logger.info("  스크립트 미리보기: %s...", preview)
+
+    if not original_script:
+        logger.error("[TTS 오류] 스크립트 추출 실패!")
+        logger.error("  - translation_result: %s자", len(app.translation_result) if app.translation_result else 'None')
+        logger.error("  - video_analysis_result: %s", type(getattr(app, 'video_analysis_result', None)))
+        logger.error("  - analysis_result.script: %s개", len(app.analysis_result.get('script', [])) if app.analysis_result else 'None')
+        raise RuntimeError("추출된 대본이 없습니다 (분석 결과를 확인하세요)")
+    return original_script
+
+
+def _start_multi_voice_tts(app, voices):
+    """
+    선택된 모든 음성의 TTS를 동시에 생성 시작
+
+    대본·영상 길이·CTA는 호출 스레드에서 한 번만 읽고, 음성별 합성은
+    MultiVoiceSynthesizer의 제한된 스레드 풀에서 키 할당량을 지키며
+    진행합니다. 앱 상태(_per_line_tts 등)는 건드리지 않으므로 결과는
+    _generate_tts_for_batch(app, voice, synthesizer=...)로 음성마다 적용합니다.
+
+    Returns:
+        MultiVoiceSynthesizer (사용 후 close() 필요)
+    """
+    from core.audio.multi_voice import MultiVoiceSynthesizer
+    from ui.panels.cta_panel import get_selected_cta_lines
+
+    video_duration = app.get_video_duration_helper()
+    original_script = _extract_batch_script(app)
+    cta_lines = get_selected_cta_lines(app)
+    pipeline = _get_audio_pipeline(app)
+
+    def _synthesize(voice):
+        logger.info("[TTS] %s 음성 동시 생성 시작 (%d자)", _get_voice_display_name(voice), len(original_script))
+        return pipeline.generate_tts(
+            script=original_script,
+            voice=voice,
+            video_duration=video_duration,
+            cta_lines=cta_lines,
+        )
+
+    app.add_log(f"[TTS] {len(voices)}개 음성 동시 생성 시작")
+    return MultiVoiceSynthesizer(_synthesize).submit(voices)
+
+
+def _generate_tts_for_batch(app, voice, synthesizer=None):
     """
     TTS 통으로 생성 + Whisper 분석으로 자막 싱크
 
@@ -358,6 +410,8 @@ def _generate_tts_for_batch(app, voice):
     Args:
         app: 앱 인스턴스
         voice: Gemini TTS 음성 ID
+        synthesizer: _start_multi_voice_tts()가 돌려준 동시 생성기. 주어지면
+            이 음성의 결과만 기다려 적용합니다.
     """
     # 영상 길이 확인
     video_duration = app.get_video_duration_helper()
@@ -374,39 +428,31 @@ def _generate_tts_for_batch(app, voice):
     logger.info("  음성: %s (%s)", voice_label, voice)
     logger.info("=" * 60)
 
-    # 스크립트 추출
-    original_script = app.extract_clean_script_from_translation()
-
-    logger.info("[TTS] 스크립트 추출 완료: %d자", len(original_script) if original_script else 0)
-    if original_script:
-        preview = original_script[:100].replace('\n', ' ')
-        logger.info("  스크립트 미리보기: %s...", preview)
-
-    if not original_script:
-        logger.error("[TTS 오류] 스크립트 추출 실패!")
-        logger.error("  - translation_result: %s자", len(app.translation_result) if app.translation_result else 'None')
-        logger.error("  - video_analysis_result: %s", type(getattr(app, 'video_analysis_result', None)))
-        logger.error("  - analysis_result.script: %s개", len(app.analysis_result.get('script', [])) if app.analysis_result else 'None')
-        raise RuntimeError("추출된 대본이 없습니다 (분석 결과를 확인하세요)")
+    # 스크립트 추출 (동시 생성이면 시작할 때 이미 추출함)
+    if synthesizer is None:
+        original_script = _extract_batch_script(app)
 
     # AudioPipeline 사용하여 TTS 생성
     try:
-        pipeline = _get_audio_pipeline(app)
+        if synthesizer is not None:
+            result = synthesizer.result(voice)
+        else:
+            pipeline = _get_audio_pipeline(app)
 
-        # CTA 문장 가져오기
-        from ui.panels.cta_panel import get_selected_cta_lines
-        cta_lines = get_selected_cta_lines(app)
+            # CTA 문장 가져오기
+            from ui.panels.cta_panel import get_selected_cta_lines
+            cta_lines = get_selected_cta_lines(app)
 
-        # TTS 생성 (파이프라인이 길이 체크, 재시도, 배속 모두 처리)
-        logger.info("[TTS] AudioPipeline API 호출 중... (%d자)", len(original_script))
-        app.add_log(f"[TTS] 음성 생성 API 호출 중... ({len(original_script)}자)")
+            # TTS 생성 (파이프라인이 길이 체크, 재시도, 배속 모두 처리)
+            logger.info("[TTS] AudioPipeline API 호출 중... (%d자)", len(original_script))
+            app.add_log(f"[TTS] 음성 생성 API 호출 중... ({len(original_script)}자)")
 
-        result = pipeline.generate_tts(
-            script=original_script,
-            voice=selected_voice,
-            video_duration=video_duration,
-            cta_lines=cta_lines,
-        )
+            result = pipeline.generate_tts(
+                script=original_script,
+                voice=selected_voice,
+                video_duration=video_duration,
+                cta_lines=cta_lines,
+            )
 
         app.add_log(f"[TTS] 음성 생성 완료 - {result.speeded_duration:.1f}초")
 
@@ -681,7 +727,7 @@ def _generate_tts_for_batch_legacy(app, voice):
             # Whisper 분석
             app.add_log("[자막] Whisper로 자막 타이밍 분석 중...")
 
-            whisper_result = analyze_tts_with_whisper(
+            whisper_result = analyze_tts_timing(
                 app, speeded_path, full_script, subtitle_segments
             )
             app.add_log("[자막] Whisper 분석 완료")
@@ -707,7 +753,10 @@ def _generate_tts_for_batch_legacy(app, voice):
                     'is_narr': False,
                 })
 
-            timestamps_source = 'whisper_analysis'
+            if whisper_result.get('method') == 'forced_alignment':
+                timestamps_source = 'forced_alignment'
+            else:
+                timestamps_source = 'whisper_analysis'
 
             # 결과 저장
             app._per_line_tts = subtitle_entries
@@ -29,6 +29,7 @@ from .audio_utils import (
 from .whisper_analyzer import (
     analyze_tts_with_whisper,
     analyze_tts_with_gemini,
+    analyze_tts_timing,
 )
 
 # ============================================================================
@@ -47,6 +48,7 @@ from .tts_generator import (
     _generate_tts_full_script,
     _generate_tts_for_segment,
     _generate_tts_for_batch,
+    _start_multi_voice_tts,
     _cleanup_previous_attempts,
 )
 
@@ -62,6 +64,7 @@ __all__ = [
     # whisper_analyzer
     'analyze_tts_with_whisper',
     'analyze_tts_with_gemini',
+    'analyze_tts_timing',
     # tts_speed
     '_apply_speed_to_segment_tts',
     'combine_tts_files_with_speed',
@@ -70,5 +73,6 @@ __all__ = [
     '_generate_tts_full_script',
     '_generate_tts_for_segment',
     '_generate_tts_for_batch',
+    '_start_multi_voice_tts',
     '_cleanup_previous_attempts',
 ]
@@ -4,11 +4,15 @@ TTS Speed Processing Module
 TTS 오디오의 배속 처리를 담당하는 모듈입니다.
 
 주요 기능:
-- TTS 오디오 1.2배속 적용 (ffmpeg atempo 또는 pydub)
+- TTS 오디오 1.2배속 적용 (pydub, 메모리에서 한 번에)
 - 세그먼트별 TTS 배속 처리
 - 메타데이터 타임스탬프 스케일링
 - 앞무음 오프셋 감지 및 보정
 
+배속은 한 번의 메모리 패스로 처리합니다: 세그먼트 파일을 한 번씩만 읽어
+이어 붙이고, 배속/44.1kHz 스테레오 변환 후 WAV를 한 번 쓰며, 앞무음도 파일을
+다시 읽지 않고 메모리의 샘플에서 감지합니다 (ffmpeg 프로세스 없음).
+
 사용되는 곳:
 - processor.py (배치 처리 워크플로우)
 - CreateFinalVideo.py (최종 영상 생성)
@@ -16,21 +20,131 @@ TTS 오디오의 배속 처리를 담당하는 모듈입니다.
 
 import os
 import secrets
-import subprocess
 import traceback
+import wave
 from datetime import datetime
 
+import numpy as np
 from pydub import AudioSegment
 
 from core.video import VideoTool
 from core.video.CreateFinalVideo import _rescale_tts_metadata_to_duration
-from .audio_utils import _ensure_pydub_converter, _write_wave_fallback
+from .audio_utils import _write_wave_fallback
 from .whisper_analyzer import analyze_tts_with_whisper
 from caller import ui_controller
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 배속 결과 WAV 형식 (예전 ffmpeg export의 -ar 44100 -ac 2와 동일)
+OUTPUT_FRAME_RATE = 44100
+OUTPUT_CHANNELS = 2
+
+
+def _wav_length_seconds(path):
+    """
+    WAV 헤더만 읽어 길이 계산 (pydub ``len(AudioSegment) / 1000``과 같은 ms 반올림)
+    """
+    try:
+        with wave.open(path, "rb") as wf:
+            frame_count, frame_rate = wf.getnframes(), wf.getframerate()
+        return round(1000 * (frame_count / frame_rate)) / 1000.0
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return len(AudioSegment.from_wav(path)) / 1000.0
+
+
+def _segment_tts_paths(app):
+    """_per_line_tts 순서대로 중복 없는 TTS 파일 경로"""
+    paths = []
+    for entry in app._per_line_tts:
+        path = entry.get('path') if isinstance(entry, dict) else None
+        if path and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def _load_concatenated_tts(paths):
+    """
+    TTS 파일들을 한 번씩만 읽어 하나의 AudioSegment로 이어 붙임
+
+    Returns:
+        (AudioSegment, {경로: 이어 붙인 타임라인에서 그 파일의 시작(초)})
+        항목 start/end는 건드리지 않으므로, 저장이 끝난 뒤 호출한 쪽이
+        ``_shift_entries_to_timeline``로 한 번만 옮깁니다.
+    """
+    segments = [AudioSegment.from_wav(path) for path in paths]
+    first = segments[0]
+    if len(segments) == 1:
+        return first, {}
+
+    raw_parts = []
+    offsets = {}
+    position = 0
+    for path, segment in zip(paths, segments):
+        # 형식이 다르면 첫 파일에 맞춤 (audioop 변환, 프로세스 없음)
+        segment = (
+            segment.set_sample_width(first.sample_width)
+            .set_frame_rate(first.frame_rate)
+            .set_channels(first.channels)
+        )
+        offsets[path] = position / first.frame_rate
+        position += int(segment.frame_count())
+        raw_parts.append(segment.raw_data)
+
+    # 한 번에 이어 붙임 (AudioSegment + 반복은 매번 전체를 복사)
+    return first._spawn(b"".join(raw_parts)), offsets
+
+
+def _shift_entries_to_timeline(entries, offsets, new_path):
+    """
+    파일 기준 start/end를 이어 붙인 타임라인 기준으로 바꾸고 경로를 새 파일로
+
+    원래 값에서 한 번에 계산해 넣으므로 같은 항목을 두 번 밀지 않습니다
+    (경로가 바뀐 항목은 ``offsets``에 없어 그대로).
+    """
+    for entry in entries or []:
+        if not isinstance(entry, dict):
+            continue
+        shift = offsets.get(entry.get('path'), 0.0)
+        updates = {'path': new_path}
+        for key in ('start', 'end'):
+            if shift and isinstance(entry.get(key), (int, float)):
+                updates[key] = float(entry[key]) + shift
+        entry.update(updates)
+
+
+def _speed_up_segment(audio, speed_ratio):
+    """재생 속도 변경 + 44.1kHz 스테레오 변환 (한 번의 메모리 패스)"""
+    try:
+        new_frame_rate = int(audio.frame_rate * speed_ratio)
+        speeded_audio = audio._spawn(
+            audio.raw_data,
+            overrides={"frame_rate": new_frame_rate}
+        )
+        speeded_audio = speeded_audio.set_frame_rate(OUTPUT_FRAME_RATE)
+    except (ValueError, TypeError, AttributeError) as speed_err:
+        logger.warning(f"[TTS 배속] frame_rate 방식 실패, speedup 사용: {speed_err}")
+        from pydub.effects import speedup
+        speeded_audio = speedup(audio, playback_speed=speed_ratio).set_frame_rate(OUTPUT_FRAME_RATE)
+    return _to_output_channels(speeded_audio.set_sample_width(2))
+
+
+def _to_output_channels(audio):
+    """
+    16-bit 오디오를 스테레오로 (ffmpeg ``-ac 2`` 결과와 같은 샘플 값)
+
+    libswresample는 모노를 스테레오로 올릴 때 양쪽에 -3dB(Q15 정수 1/√2)를
+    곱하므로 예전 export 결과와 같도록 똑같이 계산합니다.
+    """
+    if audio.channels != 1:
+        return audio.set_channels(OUTPUT_CHANNELS)
+    mono = np.frombuffer(audio.raw_data, dtype="<i2").astype(np.int32)
+    scaled = ((mono * 23170 + 16384) >> 15).astype("<i2")
+    return audio._spawn(
+        np.repeat(scaled, OUTPUT_CHANNELS).tobytes(),
+        overrides={"channels": OUTPUT_CHANNELS, "frame_width": 2 * OUTPUT_CHANNELS},
+    )
+
 
 def _apply_speed_to_segment_tts(app, tts_path):
     """
@@ -45,9 +159,8 @@ def _apply_speed_to_segment_tts(app, tts_path):
             logger.error(f"[세그먼트 TTS] 오류: 파일 없음")
             return None
 
-        # 오디오 길이 측정
-        audio = AudioSegment.from_wav(tts_path)
-        actual_duration = len(audio) / 1000.0
+        # 오디오 길이 측정 (헤더만 읽음)
+        actual_duration = _wav_length_seconds(tts_path)
 
         logger.debug(f"[세그먼트 TTS] 파일 길이: {actual_duration:.3f}초")
 
@@ -100,6 +213,7 @@ def combine_tts_files_with_speed(app, target_duration=None):
     - segment_by_segment_measured: 이미 완료됨
     - gemini_audio_analysis: 재처리 불필요
     - whisper_analysis: 재처리 불필요
+    - forced_alignment: 대본 강제 정렬 완료, 재처리 불필요
     - char_proportional_fallback: Whisper 실패 시 글자 수 비례 폴백 타이밍
     """
     try:
@@ -157,9 +271,9 @@ def combine_tts_files_with_speed(app, target_duration=None):
                        f"파일={os.path.basename(tts_path)}, 배속 후 길이={sync_info.get('speeded_duration', 0):.3f}초")
             return tts_path
 
-        if timestamps_source == 'whisper_analysis':
+        if timestamps_source in ('whisper_analysis', 'forced_alignment'):
             tts_path = sync_info.get('file_path') or app._per_line_tts[0]['path']
-            logger.info(f"[TTS 배속] Whisper 분석 완료됨 - 재처리 스킵, "
+            logger.info(f"[TTS 배속] {timestamps_source} 완료됨 - 재처리 스킵, "
                        f"파일={os.path.basename(tts_path)}, 배속 후 길이={sync_info.get('speeded_duration', 0):.3f}초, "
                        f"세그먼트 수={sync_info.get('segment_count', 'N/A')}개 (100% 정확)")
             return tts_path
@@ -188,7 +302,10 @@ def combine_tts_files_with_speed(app, target_duration=None):
             actual_duration = len(speeded_audio) / 1000.0
             speed_ratio = 1.2
 
-            existing_audio_offset = VideoTool._detect_audio_start_offset(tts_path)
+            # 읽어 둔 샘플에서 바로 감지 (파일 다시 읽지 않음)
+            existing_audio_offset = VideoTool._detect_pcm_start_offset(
+                speeded_audio.raw_data, speeded_audio.channels, speeded_audio.sample_width, speeded_audio.frame_rate
+            )
             logger.debug(f"[앞무음 보정] 기존 배속 파일 앞 무음: {existing_audio_offset:.3f}초")
 
             _rescale_tts_metadata_to_duration(app, actual_duration, new_path=tts_path, start_offset=existing_audio_offset)
@@ -206,11 +323,13 @@ def combine_tts_files_with_speed(app, target_duration=None):
             logger.info(f"  배속 파일 길이: {actual_duration:.3f}초, 메타데이터 스케일링 완료 (offset: {existing_audio_offset:.3f}s)")
             return tts_path
 
-        # 원본 오디오 로드
-        audio = AudioSegment.from_wav(tts_path)
+        # 원본 오디오 로드 (세그먼트 파일이 여러 개면 한 번씩 읽어 이어 붙임)
+        segment_paths = [path for path in _segment_tts_paths(app) if os.path.exists(path)] or [tts_path]
+        audio, segment_offsets = _load_concatenated_tts(segment_paths)
         original_duration = len(audio) / 1000.0
 
-        logger.info(f"[원본 TTS 정보] 길이: {original_duration:.3f}초, 샘플레이트: {audio.frame_rate}Hz")
+        logger.info(f"[원본 TTS 정보] 길이: {original_duration:.3f}초, 샘플레이트: {audio.frame_rate}Hz, "
+                    f"파일 {len(segment_paths)}개")
 
         # 1.2배속 적용
         speed_ratio = 1.2
@@ -218,20 +337,7 @@ def combine_tts_files_with_speed(app, target_duration=None):
 
         logger.debug(f"[배속 계산] 배속 비율: {speed_ratio}x, 목표 길이: {target_speed_duration:.3f}초")
 
-        ffmpeg_path = _ensure_pydub_converter()
-
-        # 배속 적용
-        try:
-            new_frame_rate = int(audio.frame_rate * speed_ratio)
-            speeded_audio = audio._spawn(
-                audio.raw_data,
-                overrides={"frame_rate": new_frame_rate}
-            )
-            speeded_audio = speeded_audio.set_frame_rate(44100)
-        except (ValueError, TypeError, AttributeError) as speed_err:
-            logger.warning(f"[TTS 배속] frame_rate 방식 실패, speedup 사용: {speed_err}")
-            from pydub.effects import speedup
-            speeded_audio = speedup(audio, playback_speed=speed_ratio)
+        speeded_audio = _speed_up_segment(audio, speed_ratio)
 
         start_silence_ms = 0  # 무음 제거
 
@@ -245,24 +351,16 @@ def combine_tts_files_with_speed(app, target_duration=None):
         speeded_filename = f"speeded_tts_1.2x_{timestamp}_{random_suffix}.wav"
         speeded_path = os.path.join(app.tts_output_dir, speeded_filename)
 
-        try:
-            if ffmpeg_path:
-                speeded_audio.export(speeded_path, format="wav", parameters=["-ar", "44100", "-ac", "2"])
-            else:
-                logger.warning("[export 대체] ffmpeg 경로를 찾지 못해 wave 모듈로 저장합니다.")
-                _write_wave_fallback(speeded_audio, speeded_path, sample_rate=44100)
-        except (OSError, IOError, subprocess.SubprocessError) as e:
-            ui_controller.write_error_log(e)
-            logger.warning(f"[export 폴백] ffmpeg export 실패, wave 모듈로 저장 시도: {e}")
-            _write_wave_fallback(speeded_audio, speeded_path, sample_rate=44100)
-
-        audio_start_offset = VideoTool._detect_audio_start_offset(speeded_path)
+        # 이미 44.1kHz 스테레오 16-bit라 ffmpeg 변환 없이 그대로 기록
+        _write_wave_fallback(speeded_audio, speeded_path, sample_rate=OUTPUT_FRAME_RATE)
+
+        audio_start_offset = VideoTool._detect_pcm_start_offset(
+            speeded_audio.raw_data, speeded_audio.channels, speeded_audio.sample_width, OUTPUT_FRAME_RATE
+        )
         logger.debug(f"[앞무음 보정] 배속 파일 앞 무음: {audio_start_offset:.3f}초")
 
-        if hasattr(app, '_per_line_tts') and app._per_line_tts:
-            for entry in app._per_line_tts:
-                if isinstance(entry, dict):
-                    entry['path'] = speeded_path
+        # 파일이 저장된 뒤에 한 번만 타임라인/경로 반영
+        _shift_entries_to_timeline(getattr(app, '_per_line_tts', None), segment_offsets, speeded_path)
 
         app.tts_sync_info = {
             'original_duration': original_duration,
@@ -14,6 +14,7 @@ from pydub import AudioSegment
 
 from .audio_utils import _ensure_pydub_converter
 from .utils import _split_text_naturally
+from .whisper_worker import get_worker
 from caller import ui_controller
 from utils.logging_config import get_logger
 
@@ -311,6 +312,121 @@ def _get_model_path(model_size):
     )
 
 
+def _import_whisper_model():
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        if getattr(sys, 'frozen', False):
+            raise RuntimeError(
+                "[Faster-Whisper] faster-whisper 패키지가 빌드에 포함되지 않았습니다. "
+                "재빌드가 필요합니다."
+            )
+
+        logger.info("[Faster-Whisper] faster-whisper 패키지 없음 - 설치 중...")
+        import subprocess as sp
+        sp.run([sys.executable, "-m", "pip", "install", "faster-whisper"], check=True)
+        from faster_whisper import WhisperModel
+    return WhisperModel
+
+
+def _resolve_whisper_runtime(app):
+    """(model_size, device, compute_type, cpu_threads, beam_size) with the CUDA→CPU probe applied."""
+    whisper_params = _get_whisper_model_params(app)
+    model_size = whisper_params.get('model_size', 'base')
+    device = whisper_params.get('device', 'cpu')
+    compute_type = whisper_params.get('compute_type', 'int8')
+    cpu_threads = whisper_params.get('cpu_threads', 4)
+    beam_size = whisper_params.get('beam_size', 5)
+
+    # If CUDA was requested but not actually available, fall back to CPU.
+    if str(device).lower() == "cuda":
+        try:
+            import ctranslate2
+
+            cuda_count = getattr(ctranslate2, "get_cuda_device_count", lambda: 0)()
+            if not cuda_count:
+                logger.warning(
+                    "[Faster-Whisper] CUDA requested but no CUDA devices detected by CTranslate2; using CPU."
+                )
+                device = "cpu"
+                compute_type = "int8"
+        except Exception as cuda_probe_err:
+            logger.warning(
+                "[Faster-Whisper] CUDA probe failed (%s); using CPU.",
+                cuda_probe_err,
+            )
+            device = "cpu"
+            compute_type = "int8"
+    return model_size, device, compute_type, cpu_threads, beam_size
+
+
+def _load_whisper_model(model_size, device, compute_type, cpu_threads):
+    """WhisperModel 로드 (워커 스레드에서 호출됨)"""
+    WhisperModel = _import_whisper_model()
+    logger.info(f"[Faster-Whisper] 모델 로딩 중 ({model_size}, {device}, {compute_type})...")
+    model_path = _get_model_path(model_size)
+
+    try:
+        model = WhisperModel(
+            model_path,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+        )
+    except Exception as model_err:
+        # Common failure mode: CUDA selected on a non-CUDA machine.
+        if str(device).lower() != "cuda":
+            raise
+        logger.warning(
+            "[Faster-Whisper] CUDA model init failed (%s); retrying on CPU.",
+            model_err,
+        )
+        model = WhisperModel(
+            model_path,
+            device="cpu",
+            compute_type="int8",
+            cpu_threads=cpu_threads,
+        )
+
+    logger.info("[Faster-Whisper] 모델 로드 완료")
+    return model
+
+
+def _alignment_worker(app):
+    """
+    설정(size/device/compute type)별 상주 워커와 beam size
+
+    The worker (and its model) is shared process-wide instead of being cached
+    on ``app``, so a model preloaded at startup serves every later job.
+    """
+    model_size, device, compute_type, cpu_threads, beam_size = _resolve_whisper_runtime(app)
+    key = (model_size, device, compute_type, cpu_threads)
+    worker = get_worker(
+        key,
+        lambda: _load_whisper_model(model_size, device, compute_type, cpu_threads),
+        name=f"whisper-align-{model_size}",
+    )
+    return worker, beam_size
+
+
+def preload_alignment_worker(app):
+    """
+    앱 시작 시 Whisper 모델을 백그라운드에서 미리 로드 (비차단, 실패 무시)
+
+    Returns the worker, or ``None`` when faster-whisper is disabled or the
+    worker could not be created. Load errors surface on the first job.
+    """
+    if _should_disable_faster_whisper():
+        return None
+    try:
+        worker, _beam_size = _alignment_worker(app)
+        logger.info("[Faster-Whisper] 모델 백그라운드 로드 시작")
+        return worker
+    except Exception as e:
+        logger.warning(f"[Faster-Whisper] 모델 미리 로드 실패 (첫 작업에서 재시도): {e}")
+        return None
+
+
 def analyze_tts_with_whisper(app, tts_path, transcript_text, subtitle_segments=None):
     """
     Faster-Whisper STT로 TTS 오디오 분석 (로컬, 무료, 빠름)
@@ -349,88 +465,12 @@ def analyze_tts_with_whisper(app, tts_path, transcript_text, subtitle_segments=N
                 os.environ['PATH'] = ffmpeg_dir + os.pathsep + current_path
                 logger.debug(f"[Faster-Whisper] ffmpeg 경로 추가: {ffmpeg_dir}")
 
-        # Faster-Whisper 모델 로드
-        try:
-            from faster_whisper import WhisperModel
-        except ImportError:
-            if getattr(sys, 'frozen', False):
-                raise RuntimeError(
-                    "[Faster-Whisper] faster-whisper 패키지가 빌드에 포함되지 않았습니다. "
-                    "재빌드가 필요합니다."
-                )
-
-            logger.info("[Faster-Whisper] faster-whisper 패키지 없음 - 설치 중...")
-            import subprocess as sp
-            sp.run([sys.executable, "-m", "pip", "install", "faster-whisper"], check=True)
-            from faster_whisper import WhisperModel
-
-        # 시스템 최적화 파라미터 가져오기
-        whisper_params = _get_whisper_model_params(app)
-        model_size = whisper_params.get('model_size', 'base')
-        device = whisper_params.get('device', 'cpu')
-        compute_type = whisper_params.get('compute_type', 'int8')
-        cpu_threads = whisper_params.get('cpu_threads', 4)
-        beam_size = whisper_params.get('beam_size', 5)
-
-        # If CUDA was requested but not actually available, fall back to CPU.
-        if str(device).lower() == "cuda":
-            try:
-                import ctranslate2
-
-                cuda_count = getattr(ctranslate2, "get_cuda_device_count", lambda: 0)()
-                if not cuda_count:
-                    logger.warning(
-                        "[Faster-Whisper] CUDA requested but no CUDA devices detected by CTranslate2; using CPU."
-                    )
-                    device = "cpu"
-                    compute_type = "int8"
-            except Exception as cuda_probe_err:
-                logger.warning(
-                    "[Faster-Whisper] CUDA probe failed (%s); using CPU.",
-                    cuda_probe_err,
-                )
-                device = "cpu"
-                compute_type = "int8"
-
-        # 모델 로드 (cache key includes device/compute_type to avoid mixing CPU/CUDA instances).
-        model_key = f"_faster_whisper_model_{model_size}_{device}_{compute_type}"
-        model = getattr(app, model_key, None)
-        if model is None:
-            logger.info(f"[Faster-Whisper] 모델 로딩 중 ({model_size}, {device}, {compute_type})...")
-            model_path = _get_model_path(model_size)
-
-            try:
-                model = WhisperModel(
-                    model_path,
-                    device=device,
-                    compute_type=compute_type,
-                    cpu_threads=cpu_threads,
-                )
-            except Exception as model_err:
-                # Common failure mode: CUDA selected on a non-CUDA machine.
-                if str(device).lower() == "cuda":
-                    logger.warning(
-                        "[Faster-Whisper] CUDA model init failed (%s); retrying on CPU.",
-                        model_err,
-                    )
-                    device = "cpu"
-                    compute_type = "int8"
-                    model_key = f"_faster_whisper_model_{model_size}_{device}_{compute_type}"
-                    model = getattr(app, model_key, None)
-                    if model is None:
-                        model = WhisperModel(
-                            model_path,
-                            device=device,
-                            compute_type=compute_type,
-                            cpu_threads=cpu_threads,
-                        )
-                else:
-                    raise
-
-            setattr(app, model_key, model)
-            logger.info("[Faster-Whisper] 모델 로드 완료")
+        # 상주 워커 (앱 시작 시 백그라운드 로드됨, 아니면 여기서 로드 시작)
+        worker, beam_size = _alignment_worker(app)
+        if not worker.ready:
+            logger.info("[Faster-Whisper] 모델 준비 대기 중...")
         else:
-            logger.debug("[Faster-Whisper] 캐시된 모델 사용")
+            logger.debug("[Faster-Whisper] 미리 로드된 모델 사용")
 
         # 자막 세그먼트 준비
         if subtitle_segments is None:
@@ -442,30 +482,14 @@ def analyze_tts_with_whisper(app, tts_path, transcript_text, subtitle_segments=N
 
         # Faster-Whisper 음성 인식 (단어 타임스탬프 포함)
         logger.info("[Faster-Whisper] 음성 인식 중...")
-
-        try:
-            segments, info = model.transcribe(
-                tts_path,
-                language="ko",
-                beam_size=beam_size,
-                word_timestamps=True,
-                vad_filter=True
-            )
-        except RuntimeError as vad_err:
-            if "onnxruntime" in str(vad_err).lower():
-                logger.warning("[Faster-Whisper] VAD 필터에 onnxruntime 필요 - VAD 없이 재시도")
-                segments, info = model.transcribe(
-                    tts_path,
-                    language="ko",
-                    beam_size=beam_size,
-                    word_timestamps=True,
-                    vad_filter=False
-                )
-            else:
-                raise
-
-        # 세그먼트를 리스트로 변환 (generator이므로)
-        whisper_segments = list(segments)
+        result = worker.submit(tts_path, language="ko", beam_size=beam_size).result()
+        whisper_segments = result.segments
+        logger.info(
+            "[Faster-Whisper] 대기 %.2f초 / 추론 %.2f초 (배치 %d개)",
+            result.queue_seconds,
+            result.inference_seconds,
+            result.batch_size,
+        )
 
         # 전체 오디오 정보
         audio = AudioSegment.from_file(tts_path)
@@ -476,7 +500,11 @@ def analyze_tts_with_whisper(app, tts_path, transcript_text, subtitle_segments=N
 
         logger.info("[Faster-Whisper] 인식 완료!")
         logger.info(f"  - 오디오 길이: {audio_duration:.2f}초")
-        logger.info(f"  - 언어: {info.language} (확률: {info.language_probability:.2f})")
+        probability = result.language_probability
+        logger.info(
+            f"  - 언어: {result.language} "
+            f"(확률: {'알 수 없음' if probability is None else f'{probability:.2f}'})"
+        )
         logger.debug(f"  - 인식된 텍스트: {recognized_text[:50]}...")
 
         # 단어 목록 추출
@@ -678,6 +706,45 @@ def analyze_tts_with_whisper(app, tts_path, transcript_text, subtitle_segments=N
         raise RuntimeError(f"Whisper 자막 분석 실패: {e}") from e
 
 
+def analyze_tts_timing(app, tts_path, transcript_text, subtitle_segments=None):
+    """
+    자막 타이밍 분석: 대본 강제 정렬 우선(선택 기능), 신뢰도가 낮으면 Whisper
+
+    With ``SSMAKER_FORCED_ALIGNMENT=1`` (off by default until the confidence
+    threshold is calibrated on real TTS speech) ``core.audio.forced_align``
+    places the subtitle boundaries on the audio directly, since the TTS
+    script is known exactly (no transcription). Results
+    below ``forced_align.MIN_CONFIDENCE`` (skipped/added words, odd pauses)
+    go through ``analyze_tts_with_whisper`` as before. The returned dict has
+    the Whisper layout plus ``method`` (``forced_alignment`` or ``whisper``).
+    """
+    if subtitle_segments is None:
+        subtitle_segments = _split_text_naturally(app, transcript_text)
+
+    from core.audio import forced_align
+
+    if forced_align.is_enabled() and subtitle_segments:
+        try:
+            aligned = forced_align.align_file(tts_path, subtitle_segments)
+            confidence = aligned["confidence"] if aligned else 0.0
+            if aligned and confidence >= forced_align.MIN_CONFIDENCE:
+                logger.info(
+                    "[강제 정렬] %d개 세그먼트 정렬 완료 (신뢰도 %.2f) - Whisper 생략",
+                    len(aligned["segments"]),
+                    confidence,
+                )
+                aligned["method"] = "forced_alignment"
+                return aligned
+            logger.info("[강제 정렬] 신뢰도 낮음 (%.2f) - Whisper로 분석", confidence)
+        except Exception as e:
+            logger.warning(f"[강제 정렬] 실패 - Whisper로 분석: {e}")
+
+    result = analyze_tts_with_whisper(app, tts_path, transcript_text, subtitle_segments)
+    if result is not None:
+        result["method"] = "whisper"
+    return result
+
+
 def analyze_tts_with_gemini(app, tts_path, transcript_text, subtitle_segments=None):
     """
     Faster-Whisper STT로 대체됨 (무료, 로컬, 빠름)
@@ -0,0 +1,429 @@
+"""
+Persistent Faster-Whisper alignment worker
+상주형 Faster-Whisper 단어 타임스탬프 워커
+
+예전에는 ``analyze_tts_with_whisper``가 첫 호출 때 ``WhisperModel``을
+로드해서 세션의 첫 작업이 모델 로딩(수 초)을 그대로 기다렸고, 클립마다
+단독으로 추론했습니다. 이 모듈의 워커는 앱 시작 시 백그라운드 스레드에서
+모델을 미리 로드해 두고, 큐에 쌓인 오디오 클립을 한 번에 꺼내 배치 추론한
+뒤 ``concurrent.futures.Future``로 단어 타임스탬프를 돌려줍니다.
+
+Batching: clips up to ``chunk_length`` (30s) are packed into one buffer and
+decoded together by faster-whisper's ``BatchedInferencePipeline`` (one
+encoder/decoder batch via ``clip_timestamps``). Longer clips, or models
+without a batched pipeline, are transcribed one by one on the preloaded
+model with the previous VAD settings.
+
+The model object is only ever touched from the worker thread.
+"""
+
+import bisect
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+# faster-whisper 한 청크 길이 (이보다 긴 클립은 배치 대신 단독 추론)
+CHUNK_SECONDS = 30.0
+# 패킹한 클립 사이 무음 (세그먼트를 클립에 되돌려 매핑할 때 경계 모호성 제거)
+PACK_GAP_SECONDS = 1.0
+MAX_BATCH = 8
+# 이보다 짧은 클립은 인식할 음성이 없음
+MIN_CLIP_SECONDS = 0.1
+
+AudioInput = Union[str, np.ndarray]
+
+
+@dataclass
+class AlignedWord:
+    word: str
+    start: float
+    end: float
+    probability: float = 0.0
+
+
+@dataclass
+class AlignedSegment:
+    text: str
+    start: float
+    end: float
+    words: List[AlignedWord] = field(default_factory=list)
+
+
+@dataclass
+class AlignmentResult:
+    """Word timestamps for one clip (times relative to the clip start)."""
+
+    segments: List[AlignedSegment]
+    language: str
+    # None이면 모델이 확률을 주지 않음 (묶음 추론은 묶음 전체에 대한 값)
+    language_probability: Optional[float]
+    duration: float
+    queue_seconds: float = 0.0
+    inference_seconds: float = 0.0
+    batch_size: int = 1
+
+    @property
+    def words(self) -> List[AlignedWord]:
+        return [word for segment in self.segments for word in segment.words]
+
+    @property
+    def text(self) -> str:
+        return " ".join(segment.text for segment in self.segments)
+
+
+@dataclass
+class _Request:
+    audio: AudioInput
+    language: Optional[str]
+    beam_size: int
+    future: Future
+    submitted: float = field(default_factory=time.perf_counter)
+    samples: Optional[np.ndarray] = None
+
+
+_STOP = object()
+
+
+def _load_samples(audio: AudioInput) -> np.ndarray:
+    if isinstance(audio, np.ndarray):
+        return np.asarray(audio, dtype=np.float32).reshape(-1)
+    from faster_whisper import decode_audio
+
+    return decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+
+def _default_pipeline_factory(model) -> Any:
+    """``BatchedInferencePipeline`` for real faster-whisper models, else ``None``."""
+    try:
+        from faster_whisper import BatchedInferencePipeline, WhisperModel
+    except ImportError:
+        return None
+    if not isinstance(model, WhisperModel):
+        return None
+    return BatchedInferencePipeline(model)
+
+
+def _convert_segment(segment, offset: float = 0.0) -> AlignedSegment:
+    words = [
+        AlignedWord(
+            word=word.word,
+            start=round(max(0.0, word.start - offset), 3),
+            end=round(max(0.0, word.end - offset), 3),
+            probability=float(getattr(word, "probability", 0.0) or 0.0),
+        )
+        for word in (segment.words or [])
+    ]
+    return AlignedSegment(
+        text=segment.text,
+        start=round(max(0.0, segment.start - offset), 3),
+        end=round(max(0.0, segment.end - offset), 3),
+        words=words,
+    )
+
+
+def _language_probability(info) -> Optional[float]:
+    value = getattr(info, "language_probability", None)
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def transcribe_packed(
+    pipeline,
+    clips: Sequence[np.ndarray],
+    *,
+    language: Optional[str],
+    beam_size: int,
+    batch_size: int = MAX_BATCH,
+) -> Tuple[List[List[AlignedSegment]], Any]:
+    """
+    짧은 클립 여러 개를 한 버퍼에 이어 붙여 한 번의 배치 추론으로 처리
+
+    Each clip becomes one ``clip_timestamps`` entry, so the pipeline pads and
+    decodes them as a single batch; segments are mapped back to their clip by
+    start time (clips are separated by ``PACK_GAP_SECONDS`` of silence).
+    Returns the per-clip segments and the pipeline's ``info`` for the packed
+    buffer (language and its probability are shared by all clips).
+    """
+    gap = np.zeros(int(PACK_GAP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+    pieces, offsets, clip_timestamps = [], [], []
+    cursor = 0
+    for clip in clips:
+        offsets.append(cursor / SAMPLE_RATE)
+        clip_timestamps.append({"start": cursor / SAMPLE_RATE, "end": (cursor + len(clip)) / SAMPLE_RATE})
+        pieces.extend((clip, gap))
+        cursor += len(clip) + len(gap)
+    packed = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+
+    segments, info = pipeline.transcribe(
+        packed,
+        language=language,
+        beam_size=beam_size,
+        word_timestamps=True,
+        clip_timestamps=clip_timestamps,
+        batch_size=batch_size,
+    )
+    per_clip: List[List[AlignedSegment]] = [[] for _ in clips]
+    for segment in segments:
+        # 세그먼트 시작은 반올림(1ms) 때문에 클립 시작보다 살짝 앞설 수 있음
+        index = max(0, bisect.bisect_right(offsets, segment.start + 0.002) - 1)
+        per_clip[index].append(_convert_segment(segment, offsets[index]))
+    return per_clip, info
+
+
+class AlignmentWorker:
+    """
+    모델을 미리 로드해 두고 큐의 클립을 배치로 처리하는 상주 워커
+
+    ``loader`` is called once on the worker thread. ``submit`` may be called
+    before the model is ready; those clips simply wait in the queue and are
+    batched together once loading finishes.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        *,
+        max_batch: int = MAX_BATCH,
+        batch_window: float = 0.0,
+        pipeline_factory: Callable[[Any], Any] = _default_pipeline_factory,
+        name: str = "whisper-align",
+    ):
+        self._loader = loader
+        self.max_batch = max(1, int(max_batch))
+        self.batch_window = max(0.0, float(batch_window))
+        self._pipeline_factory = pipeline_factory
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._name = name
+        self._stopped = False
+        self.model: Any = None
+        self.load_error: Optional[BaseException] = None
+        self.load_seconds = 0.0
+        self._stats = {"batches": 0, "clips": 0, "packed_clips": 0, "largest_batch": 0}
+
+    # ------------------------------------------------------------------ lifecycle
+    def start(self) -> "AlignmentWorker":
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+        return self
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the model is loaded (or failed); ``False`` on timeout."""
+        return self._ready.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set() and self.load_error is None
+
+    @property
+    def failed(self) -> bool:
+        return self.load_error is not None
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+        self._queue.put(_STOP)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats, load_seconds=self.load_seconds)
+
+    # ------------------------------------------------------------------ API
+    def submit(self, audio: AudioInput, *, language: Optional[str] = "ko", beam_size: int = 5) -> Future:
+        """Queue one clip (path or 16kHz mono float array); resolves to ``AlignmentResult``."""
+        future: Future = Future()
+        self.start()
+        # 로드 실패/종료 처리와 같은 락 아래에서 큐에 넣어야 대기 중 미아가 생기지 않음
+        with self._lock:
+            if self.load_error is not None:
+                future.set_exception(self.load_error)
+            elif self._stopped:
+                future.set_exception(RuntimeError("Whisper 정렬 워커가 종료되었습니다."))
+            else:
+                self._queue.put(_Request(audio, language, int(beam_size), future))
+        return future
+
+    # ------------------------------------------------------------------ worker thread
+    def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            self.model = self._loader()
+        except BaseException as exc:  # noqa: BLE001 - surfaced through every future
+            with self._lock:
+                self.load_error = exc
+            self.load_seconds = time.perf_counter() - started
+            self._ready.set()
+            logger.error("[Whisper 워커] 모델 로드 실패: %s", exc)
+            self._fail_pending(exc)
+            return
+        self.load_seconds = time.perf_counter() - started
+        self._ready.set()
+        logger.info("[Whisper 워커] 모델 준비 완료 (%.2f초)", self.load_seconds)
+
+        pipeline = None
+        try:
+            pipeline = self._pipeline_factory(self.model)
+        except Exception as exc:
+            logger.warning("[Whisper 워커] 배치 파이프라인 사용 불가 - 단독 추론: %s", exc)
+
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stop_after = self._collect_batch(item)
+            self._run_batch(pipeline, batch)
+            if stop_after:
+                break
+        with self._lock:
+            self._stopped = True
+        self._fail_pending(RuntimeError("Whisper 정렬 워커가 종료되었습니다."))
+
+    def _collect_batch(self, first: "_Request"):
+        batch = [first]
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item.future.set_running_or_notify_cancel():
+                item.future.set_exception(exc)
+
+    def _run_batch(self, pipeline, batch: List["_Request"]) -> None:
+        live = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["clips"] += len(live)
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(live))
+
+        packable: Dict[Hashable, List[_Request]] = {}
+        for request in live:
+            if pipeline is not None:
+                try:
+                    request.samples = _load_samples(request.audio)
+                except Exception as exc:
+                    request.future.set_exception(exc)
+                    continue
+                duration = len(request.samples) / SAMPLE_RATE
+                if MIN_CLIP_SECONDS <= duration <= CHUNK_SECONDS:
+                    packable.setdefault((request.language, request.beam_size), []).append(request)
+                    continue
+            self._run_single(request, len(live))
+
+        for (language, beam_size), group in packable.items():
+            started = time.perf_counter()
+            try:
+                per_clip, info = transcribe_packed(
+                    pipeline,
+                    [request.samples for request in group],
+                    language=language,
+                    beam_size=beam_size,
+                    batch_size=self.max_batch,
+                )
+            except Exception as exc:
+                logger.warning("[Whisper 워커] 배치 추론 실패 - 클립별 재시도: %s", exc)
+                for request in group:
+                    self._run_single(request, len(live))
+                continue
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._stats["packed_clips"] += len(group)
+            probability = _language_probability(info)
+            for request, segments in zip(group, per_clip):
+                request.future.set_result(
+                    AlignmentResult(
+                        segments=segments,
+                        language=getattr(info, "language", None) or language or "",
+                        language_probability=probability,
+                        duration=len(request.samples) / SAMPLE_RATE,
+                        queue_seconds=started - request.submitted,
+                        inference_seconds=elapsed,
+                        batch_size=len(group),
+                    )
+                )
+
+    def _run_single(self, request: "_Request", batch_size: int) -> None:
+        started = time.perf_counter()
+        audio = request.samples if request.samples is not None else request.audio
+        kwargs = dict(language=request.language, beam_size=request.beam_size, word_timestamps=True)
+        try:
+            try:
+                segments, info = self.model.transcribe(audio, vad_filter=True, **kwargs)
+                segments = list(segments)
+            except RuntimeError as vad_err:
+                if "onnxruntime" not in str(vad_err).lower():
+                    raise
+                logger.warning("[Faster-Whisper] VAD 필터에 onnxruntime 필요 - VAD 없이 재시도")
+                segments, info = self.model.transcribe(audio, vad_filter=False, **kwargs)
+                segments = list(segments)
+        except Exception as exc:
+            request.future.set_exception(exc)
+            return
+        request.future.set_result(
+            AlignmentResult(
+                segments=[_convert_segment(segment) for segment in segments],
+                language=getattr(info, "language", request.language or ""),
+                language_probability=_language_probability(info),
+                duration=float(getattr(info, "duration", 0.0) or 0.0),
+                queue_seconds=started - request.submitted,
+                inference_seconds=time.perf_counter() - started,
+                batch_size=batch_size,
+            )
+        )
+
+
+_workers: Dict[Hashable, AlignmentWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_worker(key: Hashable, loader: Callable[[], Any], **options) -> AlignmentWorker:
+    """
+    Process-wide worker for ``key`` (e.g. model size/device/compute type).
+
+    A worker whose model failed to load is replaced, so a later call retries
+    the load like the old lazy path did.
+    """
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None or worker.failed:
+            worker = AlignmentWorker(loader, **options).start()
+            _workers[key] = worker
+        return worker
+
+
+def shutdown_workers(timeout: Optional[float] = 2.0) -> None:
+    with _workers_lock:
+        workers = list(_workers.values())
+        _workers.clear()
+    for worker in workers:
+        worker.stop(timeout)
@@ -12,8 +12,9 @@ from typing import Dict, Any, Optional, Tuple
 
 from google.genai import types
 
-from prompts import get_video_validation_prompt
+from prompts import get_contact_sheet_validation_prompt, get_video_validation_prompt
 from caller import ui_controller
+from core.video.analysis_proxy import PROXY_MODE_CONTACT_SHEET, prepare_upload
 import config
 from utils.logging_config import get_logger
 
@@ -54,9 +55,15 @@ def validate_final_video(app, video_path: str) -> Dict[str, Any]:
             logger.warning("[영상 검증] Gemini 클라이언트가 없습니다")
             return _create_error_result("Gemini 클라이언트 없음")
 
-        # 영상 업로드
+        # 영상 업로드 (contact_sheet 모드는 음성 싱크 검사를 포기하고 업로드를 최소화)
         logger.info("[영상 검증] 영상 파일 업로드 중...")
-        video_file = app.genai_client.files.upload(file=video_path)
+        upload_media = prepare_upload(video_path, allow_contact_sheet=True)
+        is_contact_sheet = upload_media.mode == PROXY_MODE_CONTACT_SHEET
+        try:
+            video_file = app.genai_client.files.upload(file=upload_media.path)
+        finally:
+            upload_media.cleanup()
+        upload_media.record_upload()
 
         # 파일 처리 대기
         wait_count = 0
@@ -72,8 +79,8 @@ def validate_final_video(app, video_path: str) -> Dict[str, Any]:
             logger.error(f"[영상 검증] 파일 처리 실패: {error_msg}")
             return _create_error_result(f"파일 처리 실패: {error_msg}")
 
-        # 검증 프롬프트 생성
-        prompt = get_video_validation_prompt()
+        # 검증 프롬프트 생성 (콘택트 시트는 정지 이미지용 프롬프트)
+        prompt = get_contact_sheet_validation_prompt() if is_contact_sheet else get_video_validation_prompt()
 
         # API 호출
         logger.info("[영상 검증] Gemini API로 영상 분석 요청 중...")
@@ -104,6 +111,9 @@ def validate_final_video(app, video_path: str) -> Dict[str, Any]:
             logger.warning("[영상 검증] JSON 파싱 실패")
             logger.debug(f"[영상 검증] 원본 응답: {result_text[:500]}...")
             return _create_error_result("JSON 파싱 실패")
+        if is_contact_sheet:
+            # 정지 이미지로는 싱크를 볼 수 없으므로 실패로 치지 않음
+            validation_result.get('validation_result', validation_result)['subtitle_sync'] = {'pass': True, 'score': 100, 'issues': [], 'skipped': True}
 
         # 결과 로깅
         _log_validation_result(validation_result)
@@ -187,6 +197,10 @@ def _log_validation_result(result: Dict[str, Any]):
         item_score = item.get('score', 0)
         issues = item.get('issues', [])
 
+        if item.get('skipped'):
+            logger.info(f"[영상 검증] [SKIP] {name}: 콘택트 시트라 검사 안 함")
+            continue
+
         status = 'PASS' if item_pass else 'FAIL'
         logger.info(f"[영상 검증] [{status}] {name}: {item_score}/100")
 
@@ -92,6 +92,7 @@ from utils.error_handlers import global_exception_handler, thread_exception_hand
 from utils.token_cost_calculator import TokenCostCalculator
 from core.providers import VertexGeminiProvider
 from core.api import ApiKeyManager
+from core.api.gemini_requests import wrap_client
 from app.login_handler import LoginHandler
 from app.exit_handler import ExitHandler
 
@@ -435,7 +436,14 @@ class VideoAnalyzerGUI(
                 logger.warning("[init_client] 사용 가능한 API 키가 없습니다.")
                 return False
 
-            client = genai.Client(api_key=key)
+            # 동시에 나가는 동일 요청은 하나로 합치고, 요청마다 여유 있는 키로 보내며 스케줄러에 기록
+            mgr = getattr(self, "api_key_manager", None)
+            meter = (
+                mgr.meter(mgr.key_name_for(key), client_factory=lambda value: genai.Client(api_key=value))
+                if hasattr(mgr, "meter")
+                else None
+            )
+            client = wrap_client(genai.Client(api_key=key), meter=meter)
             self.genai_client = client
             self.state.genai_client = client
             self.model_provider.gemini_client = client
@@ -7,10 +7,11 @@
 This module centralizes URL queue and status management with thread safety.
 Previously scattered URL state management is now unified here.
 """
+import itertools
 import threading
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Iterable
 
 from utils.logging_config import get_logger
 
@@ -51,7 +52,8 @@ class ProcessingQueue:
     All state changes are thread-safe through Lock mechanism.
 
     Attributes:
-        _url_queue: URL 목록 (순서 유지)
+        _url_queue: URL -> 삽입 순번 (삽입 순서를 유지하는 dict, O(1) 조회)
+        _by_status: 상태별 URL 집합 (큐 순서 유지, O(1) 상태 변경/다음 대기 URL)
         _url_status: URL별 상태 매핑
         _url_status_message: URL별 상태 메시지
         _url_remarks: URL별 비고/메모
@@ -74,8 +76,15 @@ class ProcessingQueue:
         Args:
             on_change_callback: 상태 변경 시 호출될 콜백 함수 (UI 업데이트 등)
         """
-        # URL 큐 (순서 유지 리스트)
-        self._url_queue: List[str] = []
+        # URL 큐: URL -> 삽입 순번. dict 는 삽입 순서를 유지하므로 기존 리스트와
+        # 같은 순서로 순회하면서 포함 여부/제거는 O(1) 입니다.
+        self._url_queue: Dict[str, int] = {}
+        self._sequence = itertools.count()
+
+        # 상태별 URL 집합 (큐 순서). 재시도 등으로 앞선 URL 이 다시 들어오면
+        # 해당 상태만 _unsorted 로 표시하고 다음 순서 조회 때 한 번 정렬합니다.
+        self._by_status: Dict[Optional[str], Dict[str, None]] = {}
+        self._unsorted: set = set()
 
         # URL별 상태 매핑
         self._url_status: Dict[str, str] = {}
@@ -132,8 +141,8 @@ class ProcessingQueue:
                 logger.debug(f"[ProcessingQueue] URL 이미 존재: {url[:50]}...")
                 return False
 
-            self._url_queue.append(url)
-            self._url_status[url] = status if isinstance(status, str) else status.value
+            self._url_queue[url] = next(self._sequence)
+            self._index(url, status if isinstance(status, str) else status.value)
             self._url_timestamps[url] = datetime.now()
 
             if message:
@@ -180,7 +189,8 @@ class ProcessingQueue:
             if url not in self._url_queue:
                 return False
 
-            self._url_queue.remove(url)
+            self._unindex(url)
+            del self._url_queue[url]
             self._url_status.pop(url, None)
             self._url_status_message.pop(url, None)
             self._url_remarks.pop(url, None)
@@ -198,6 +208,8 @@ class ProcessingQueue:
         with self._lock:
             count = len(self._url_queue)
             self._url_queue.clear()
+            self._by_status.clear()
+            self._unsorted.clear()
             self._url_status.clear()
             self._url_status_message.clear()
             self._url_remarks.clear()
@@ -244,7 +256,9 @@ class ProcessingQueue:
                 return False
 
             old_status = self._url_status.get(url)
-            self._url_status[url] = status_value
+            if old_status != status_value:
+                self._unindex(url)
+                self._index(url, status_value)
 
             if message:
                 self._url_status_message[url] = message
@@ -365,11 +379,7 @@ class ProcessingQueue:
         Returns:
             List[str]: 대기 중(waiting) 상태인 URL 목록
         """
-        with self._lock:
-            return [
-                url for url in self._url_queue
-                if self._url_status.get(url) == UrlStatus.WAITING.value
-            ]
+        return self.get_urls_by_status(UrlStatus.WAITING)
 
     def get_urls_by_status(self, status: str) -> List[str]:
         """
@@ -384,10 +394,7 @@ class ProcessingQueue:
         status_value = status if isinstance(status, str) else status.value
 
         with self._lock:
-            return [
-                url for url in self._url_queue
-                if self._url_status.get(url) == status_value
-            ]
+            return list(self._ordered(status_value))
 
     def get_completed_urls(self) -> List[str]:
         """
@@ -437,12 +444,12 @@ class ProcessingQueue:
                 'total': len(self._url_queue)
             }
 
-            for status in self._url_status.values():
+            for status, urls in self._by_status.items():
                 # None 상태를 waiting으로 간주
                 if status is None:
-                    stats['waiting'] += 1
+                    stats['waiting'] += len(urls)
                 elif status in stats:
-                    stats[status] += 1
+                    stats[status] += len(urls)
 
             return stats
 
@@ -456,10 +463,7 @@ class ProcessingQueue:
             str 또는 None: 다음 대기 중인 URL
         """
         with self._lock:
-            for url in self._url_queue:
-                if self._url_status.get(url) == UrlStatus.WAITING.value:
-                    return url
-            return None
+            return next(iter(self._ordered(UrlStatus.WAITING.value)), None)
 
     def has_pending_urls(self) -> bool:
         """
@@ -469,10 +473,10 @@ class ProcessingQueue:
             bool: 대기 중이거나 처리 중인 URL이 있으면 True
         """
         with self._lock:
-            for status in self._url_status.values():
-                if status in (UrlStatus.WAITING.value, UrlStatus.PROCESSING.value):
-                    return True
-            return False
+            return bool(
+                self._by_status.get(UrlStatus.WAITING.value)
+                or self._by_status.get(UrlStatus.PROCESSING.value)
+            )
 
     def is_empty(self) -> bool:
         """
@@ -547,7 +551,7 @@ class ProcessingQueue:
                 if not isinstance(url_queue, list):
                     logger.warning("[ProcessingQueue] url_queue가 list가 아님 - 빈 리스트로 초기화")
                     url_queue = []
-                self._url_queue = url_queue
+                self._url_queue = {url: next(self._sequence) for url in url_queue}
 
                 # URL 상태 복구
                 url_status = data.get('url_status', {})
@@ -583,6 +587,7 @@ class ProcessingQueue:
                     elif status == UrlStatus.PROCESSING.value:
                         self._url_status[url] = UrlStatus.WAITING.value
                         processing_count += 1
+                self._rebuild_index()
 
                 if processing_count > 0:
                     logger.info(f"[ProcessingQueue] {processing_count}개 URL을 processing에서 waiting으로 변경")
@@ -605,12 +610,12 @@ class ProcessingQueue:
         Returns:
             int: 변경된 URL 수
         """
-        changed_count = 0
         with self._lock:
-            for url in self._url_queue:
-                if self._url_status.get(url) == UrlStatus.PROCESSING.value:
-                    self._url_status[url] = UrlStatus.WAITING.value
-                    changed_count += 1
+            processing = list(self._by_status.get(UrlStatus.PROCESSING.value, ()))
+            for url in processing:
+                self._unindex(url)
+                self._index(url, UrlStatus.WAITING.value)
+            changed_count = len(processing)
 
         if changed_count > 0:
             logger.info(f"[ProcessingQueue] {changed_count}개 URL을 waiting으로 변경")
@@ -622,6 +627,38 @@ class ProcessingQueue:
     # 내부 메서드
     # ========================================
 
+    def _index(self, url: str, status: Optional[str]) -> None:
+        """URL 상태를 기록하고 상태별 집합에 추가 (호출자가 Lock 보유)"""
+        self._url_status[url] = status
+        bucket = self._by_status.setdefault(status, {})
+        if bucket and status not in self._unsorted:
+            last = next(reversed(bucket))
+            if self._url_queue[last] > self._url_queue[url]:
+                self._unsorted.add(status)
+        bucket[url] = None
+
+    def _unindex(self, url: str) -> None:
+        bucket = self._by_status.get(self._url_status.get(url))
+        if bucket is not None:
+            bucket.pop(url, None)
+
+    def _ordered(self, status: Optional[str]) -> Iterable[str]:
+        """상태별 URL 을 큐 순서로 반환 (호출자가 Lock 보유)"""
+        bucket = self._by_status.get(status)
+        if not bucket:
+            return ()
+        if status in self._unsorted:
+            ordered = sorted(bucket, key=self._url_queue.__getitem__)
+            self._by_status[status] = bucket = dict.fromkeys(ordered)
+            self._unsorted.discard(status)
+        return bucket
+
+    def _rebuild_index(self) -> None:
+        self._by_status = {}
+        self._unsorted = set()
+        for url in self._url_queue:
+            self._by_status.setdefault(self._url_status.get(url), {})[url] = None
+
     def _notify_change(self) -> None:
         """
         상태 변경 알림 (콜백 호출)
@@ -13,7 +13,6 @@ from urllib.parse import urlsplit
 from uuid import uuid4
 
 from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QTreeWidget, QTreeWidgetItem
 
 from managers.settings_manager import get_settings_manager
 from managers.summer_coupang_queue_status import (
@@ -21,6 +20,7 @@ from managers.summer_coupang_queue_status import (
     delete_summer_coupang_queue_items,
 )
 from ui.components.custom_dialog import show_info, show_question, show_warning
+from ui.components.queue_table import QueueRow, QueueTreeView
 from utils.logging_config import get_logger
 from utils.secrets_manager import get_secrets_manager
 
@@ -32,6 +32,42 @@ LEGACY_QUEUE_PREFIX_PATTERN = re.compile(
     r"^(?:(?:waiting|processing|completed|failed|skipped|done|error|대기|진행|완료|실패|건너뜀)\s+\d+\s+)",
     re.IGNORECASE,
 )
+STATUS_ALIASES = {
+    "waiting": "waiting",
+    "wait": "waiting",
+    "대기": "waiting",
+    "processing": "processing",
+    "in progress": "processing",
+    "진행": "processing",
+    "진행 중": "processing",
+    "completed": "completed",
+    "complete": "completed",
+    "done": "completed",
+    "완료": "completed",
+    "failed": "failed",
+    "error": "failed",
+    "실패": "failed",
+    "skipped": "skipped",
+    "skip": "skipped",
+    "건너뜀": "skipped",
+    "건너뛰기": "skipped",
+}
+STATUS_WORD_LABELS = {
+    "waiting": "대기",
+    "processing": "진행 중",
+    "completed": "완료",
+    "done": "완료",
+    "failed": "실패",
+    "error": "실패",
+    "skipped": "건너뜀",
+    "disabled": "사용 안 함",
+    "connected": "연결됨",
+    "youtube": "유튜브",
+}
+STATUS_WORD_PATTERN = re.compile(
+    r"\b(" + "|".join(STATUS_WORD_LABELS) + r")\b",
+    re.IGNORECASE,
+)
 ACTIVE_QUEUE_MESSAGE = (
     "이미 대기 중이거나 진행 중인 영상 작업이 있습니다.\n"
     "현재 작업을 완료하거나 진행 상황 화면에서 삭제한 뒤 다시 담아 주세요."
@@ -39,7 +75,7 @@ ACTIVE_QUEUE_MESSAGE = (
 
 
 class QueueManager:
-    """Manages URL queue and mirrors state to a QTreeWidget."""
+    """Manages URL queue and mirrors state to the queue table view."""
 
     def __init__(self, gui):
         self.gui = gui
@@ -108,27 +144,7 @@ class QueueManager:
         if not raw:
             return "waiting"
         lowered = raw.lower()
-        mapping = {
-            "waiting": "waiting",
-            "wait": "waiting",
-            "대기": "waiting",
-            "processing": "processing",
-            "in progress": "processing",
-            "진행": "processing",
-            "진행 중": "processing",
-            "completed": "completed",
-            "complete": "completed",
-            "done": "completed",
-            "완료": "completed",
-            "failed": "failed",
-            "error": "failed",
-            "실패": "failed",
-            "skipped": "skipped",
-            "skip": "skipped",
-            "건너뜀": "skipped",
-            "건너뛰기": "skipped",
-        }
-        return mapping.get(raw, mapping.get(lowered, lowered))
+        return STATUS_ALIASES.get(raw, STATUS_ALIASES.get(lowered, lowered))
 
     @staticmethod
     def _localize_status_text(text: str) -> str:
@@ -158,20 +174,9 @@ class QueueManager:
         if lowered in direct_map:
             return direct_map[lowered]
 
-        for eng, kor in (
-            ("waiting", "대기"),
-            ("processing", "진행 중"),
-            ("completed", "완료"),
-            ("done", "완료"),
-            ("failed", "실패"),
-            ("error", "실패"),
-            ("skipped", "건너뜀"),
-            ("disabled", "사용 안 함"),
-            ("connected", "연결됨"),
-            ("youtube", "유튜브"),
-        ):
-            message = re.sub(rf"\b{re.escape(eng)}\b", kor, message, flags=re.IGNORECASE)
-        return message
+        return STATUS_WORD_PATTERN.sub(
+            lambda match: STATUS_WORD_LABELS[match.group(1).lower()], message
+        )
 
     @staticmethod
     def _normalize_source_label(source_label: str) -> str:
@@ -377,7 +382,7 @@ class QueueManager:
         self._show_delete_feedback(message)
 
     def remove_selected_url(self):
-        tree: QTreeWidget = getattr(self.gui, "url_listbox", None)
+        tree: QueueTreeView = getattr(self.gui, "url_listbox", None)
         if tree is None:
             return
 
@@ -549,10 +554,9 @@ class QueueManager:
 
     # ----------------------- UI sync helpers -----------------------
     def update_url_listbox(self):
-        tree: QTreeWidget = getattr(self.gui, "url_listbox", None)
+        tree: QueueTreeView = getattr(self.gui, "url_listbox", None)
         if tree is None:
             return
-        tree.clear()
 
         status_labels = {
             "waiting": "대기",
@@ -566,6 +570,21 @@ class QueueManager:
         if not auto_upload_status and hasattr(self.gui, "state"):
             auto_upload_status = getattr(self.gui.state, "url_auto_upload_status", {})
 
+        default_upload_text = None
+
+        def _default_upload_text() -> str:
+            # One settings lookup per refresh instead of one per row.
+            nonlocal default_upload_text
+            if default_upload_text is None:
+                settings = get_settings_manager()
+                if settings.get_youtube_auto_upload() and settings.get_youtube_connected():
+                    default_upload_text = "유튜브"
+                else:
+                    default_upload_text = "사용 안 함"
+            return default_upload_text
+
+        rows: List[QueueRow] = []
+        queued = set(self.gui.url_queue)
         for idx, key in enumerate(self.gui.url_queue, 1):
             status_raw = self.gui.url_status.get(key, "waiting")
             status = self._normalize_status(status_raw)
@@ -581,13 +600,7 @@ class QueueManager:
             else:
                 status_text = status_labels.get(status, self._localize_status_text(status_raw))
 
-            auto_upload_text = auto_upload_status.get(key, "")
-            if not auto_upload_text:
-                settings = get_settings_manager()
-                if settings.get_youtube_auto_upload() and settings.get_youtube_connected():
-                    auto_upload_text = "유튜브"
-                else:
-                    auto_upload_text = "사용 안 함"
+            auto_upload_text = auto_upload_status.get(key, "") or _default_upload_text()
             auto_upload_text = self._localize_upload_status(auto_upload_text)
 
             remarks_text = ""
@@ -596,20 +609,18 @@ class QueueManager:
             elif status in ("failed", "skipped"):
                 remarks_text = self.gui.url_status_message.get(key, "")
 
-            item = QTreeWidgetItem(
-                [order_text, display_url, status_text, auto_upload_text, remarks_text]
-            )
-            item.setData(
-                0,
-                Qt.ItemDataRole.UserRole,
-                {"source": "local", "key": key, "status": status},
+            rows.append(
+                QueueRow(
+                    ("local", key),
+                    (order_text, display_url, status_text, auto_upload_text, remarks_text),
+                    {"source": "local", "key": key, "status": status},
+                )
             )
-            tree.addTopLevelItem(item)
 
         processed_items = []
         for key, raw_status in self.gui.url_status.items():
             status = self._normalize_status(raw_status)
-            if key in self.gui.url_queue or status not in ("completed", "failed", "skipped"):
+            if key in queued or status not in ("completed", "failed", "skipped"):
                 continue
             if raw_status != status:
                 self.gui.url_status[key] = status
@@ -625,11 +636,7 @@ class QueueManager:
 
             auto_upload_text = auto_upload_status.get(key, "")
             if not auto_upload_text and status == "completed":
-                settings = get_settings_manager()
-                if settings.get_youtube_auto_upload() and settings.get_youtube_connected():
-                    auto_upload_text = "유튜브"
-                else:
-                    auto_upload_text = "사용 안 함"
+                auto_upload_text = _default_upload_text()
             elif not auto_upload_text:
                 auto_upload_text = "-"
             auto_upload_text = self._localize_upload_status(auto_upload_text)
@@ -639,38 +646,36 @@ class QueueManager:
                 if status == "completed"
                 else self.gui.url_status_message.get(key, "")
             )
-            item = QTreeWidgetItem(
-                [order_text, display_url, status_text, auto_upload_text, remarks_text]
-            )
-            item.setData(
-                0,
-                Qt.ItemDataRole.UserRole,
-                {"source": "local", "key": key, "status": status},
+            rows.append(
+                QueueRow(
+                    ("local", key),
+                    (order_text, display_url, status_text, auto_upload_text, remarks_text),
+                    {"source": "local", "key": key, "status": status},
+                )
             )
-            tree.addTopLevelItem(item)
 
         summer_snapshot = build_summer_coupang_queue_snapshot()
         self._last_summer_coupang_snapshot = summer_snapshot
         for row in summer_snapshot.get("rows", []):
-            item = QTreeWidgetItem(
-                [
-                    str(row.get("order", "")),
-                    str(row.get("url", "")),
-                    str(row.get("status", "")),
-                    str(row.get("upload", "")),
-                    str(row.get("remarks", "")),
-                ]
-            )
-            item.setData(
-                0,
-                Qt.ItemDataRole.UserRole,
-                {
-                    "source": "scheduled",
-                    "id": str(row.get("queue_item_id", "")),
-                    "status": str(row.get("bucket", "waiting")),
-                },
+            queue_item_id = str(row.get("queue_item_id", ""))
+            rows.append(
+                QueueRow(
+                    ("scheduled", queue_item_id),
+                    (
+                        str(row.get("order", "")),
+                        str(row.get("url", "")),
+                        str(row.get("status", "")),
+                        str(row.get("upload", "")),
+                        str(row.get("remarks", "")),
+                    ),
+                    {
+                        "source": "scheduled",
+                        "id": queue_item_id,
+                        "status": str(row.get("bucket", "waiting")),
+                    },
+                )
             )
-            tree.addTopLevelItem(item)
+        tree.set_rows(rows)
 
         keep = set(self.gui.url_queue).union(self.gui.url_status.keys())
         self._prune_mix_jobs(keep)
@@ -2,14 +2,21 @@
 Settings Manager for UI Preferences Persistence
 
 Saves and loads user preferences (CTA, voice selection, font) to a JSON file.
+
+Setters only mark the settings dirty; a debounced background flush writes the
+file once per burst of changes and schedules one coalesced account push.
+``flush()`` writes immediately and runs automatically at interpreter exit.
 """
 
+import atexit
+import hashlib
 import json
 import hmac
 import os
 import shutil
 import tempfile
 import threading
+import weakref
 from copy import deepcopy
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
@@ -31,6 +38,13 @@ class SettingsManager:
     """Manages persistent storage of UI preferences (thread-safe)"""
 
     CURRENT_SETTINGS_SCHEMA_VERSION = 1
+    # Changes made within this window share one disk write and one push.
+    SAVE_DEBOUNCE_SECONDS = 0.5
+    # Device-local record of the account settings version this device last
+    # synced and a digest per field, so pushes can send only changed fields.
+    REMOTE_SYNC_STATE_KEY = "remote_settings_sync"
+    # Delta pushes rejected as stale are rebased on a fresh pull this many times.
+    REMOTE_CONFLICT_RETRIES = 3
 
     REMOTE_SECRET_STRING_KEYS = {
         "coupang_access_key",
@@ -247,8 +261,15 @@ class SettingsManager:
         self._lock = threading.Lock()  # Thread safety lock
         self._remote_sync_enabled = False
         self._remote_push_running = False
-        self._remote_lock = threading.Lock()
+        self._remote_push_requested = False
+        self._remote_lock = threading.RLock()
+        self._remote_user_id = ""
+        self._dirty = False
+        self._push_pending = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
         self._load_settings()
+        _live_managers.add(self)
 
     def _get_settings_dir(self) -> str:
         """
@@ -733,7 +754,8 @@ class SettingsManager:
         if storage_failed:
             self._record_secure_storage_issue()
         if changed or storage_failed:
-            self._save_settings(sync_remote=False)
+            # Plaintext secrets must leave the file now, not after a debounce.
+            self._save_settings(sync_remote=False, immediate=True)
 
     def _load_settings(self) -> None:
         """Load settings from file (thread-safe)"""
@@ -812,15 +834,61 @@ class SettingsManager:
 
         # Save outside the lock so _save_settings can acquire it normally.
         if needs_save:
-            if not self._save_settings(sync_remote=False):
+            if not self._write_settings():
                 logger.warning("[SettingsManager] Could not persist normalized settings from %s", source_path)
 
         # Secret-bearing settings from older releases must never remain in the
         # JSON preferences file, even when OS credential storage is unavailable.
         self._migrate_legacy_secret_settings()
 
-    def _save_settings(self, sync_remote: bool = True) -> bool:
-        """Save settings to file (thread-safe)"""
+    def _save_settings(self, sync_remote: bool = True, immediate: bool = False) -> bool:
+        """
+        Mark settings dirty and schedule a debounced flush (thread-safe).
+
+        Returns True once the change is queued. With ``immediate=True`` the file
+        is written before returning and the result reflects the disk write;
+        credential setters use it so a failed write is reported as False.
+        """
+        with self._lock:
+            self._dirty = True
+            self._push_pending = self._push_pending or sync_remote
+            if immediate:
+                timer = None
+            elif self._flush_timer is None:
+                timer = self._flush_timer = threading.Timer(
+                    self.SAVE_DEBOUNCE_SECONDS, self.flush
+                )
+                timer.daemon = True
+            else:
+                return True
+        if immediate:
+            return self.flush()
+        timer.start()
+        return True
+
+    def flush(self) -> bool:
+        """Write pending changes now and schedule one remote push for them."""
+        with self._flush_lock:
+            with self._lock:
+                timer, self._flush_timer = self._flush_timer, None
+                dirty, self._dirty = self._dirty, False
+                push, self._push_pending = self._push_pending, False
+            if timer is not None:
+                timer.cancel()
+            if not dirty:
+                return True
+            if not self._write_settings():
+                with self._lock:
+                    # Keep the changes pending; the next flush retries them.
+                    self._dirty = True
+                    self._push_pending = self._push_pending or push
+                return False
+        if push:
+            self.schedule_remote_push()
+        return True
+
+    def _write_settings(self) -> bool:
+        """Atomically replace the settings file with the current values."""
         settings_path = self._get_settings_path()
         temporary_path = ""
 
@@ -843,8 +911,6 @@ class SettingsManager:
                 os.replace(temporary_path, settings_path)
                 temporary_path = ""
             logger.debug(f"[SettingsManager] Settings saved: {settings_path}")
-            if sync_remote:
-                self.schedule_remote_push()
             return True
         except Exception as e:
             if temporary_path:
@@ -879,7 +945,7 @@ class SettingsManager:
 
         exported: Dict[str, Any] = {}
         for key, value in snapshot.items():
-            if key == "settings_recovery_issues":
+            if key in ("settings_recovery_issues", self.REMOTE_SYNC_STATE_KEY):
                 # Diagnostics contain local file paths and are intentionally
                 # device-local rather than part of account settings sync.
                 continue
@@ -902,6 +968,7 @@ class SettingsManager:
 
         prepared = self._normalize_settings(remote_copy)
         prepared.pop("settings_recovery_issues", None)
+        prepared.pop(self.REMOTE_SYNC_STATE_KEY, None)
 
         storage_failed = False
         for key in self.SECURE_CREDENTIAL_KEYS:
@@ -937,49 +1004,174 @@ class SettingsManager:
         prepared = self._prepare_remote_settings_for_local(remote_settings)
         with self._lock:
             self._settings = prepared
-        saved = self._save_settings(sync_remote=False)
+        saved = self._save_settings(sync_remote=False, immediate=True)
         self.sync_launch_on_startup()
         return saved
 
+    @staticmethod
+    def _remote_field_digest(value: Any) -> str:
+        serialized = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _login_user_id(login_data: Optional[Dict[str, Any]]) -> str:
+        data_part = login_data.get("data", {}) if isinstance(login_data, dict) else {}
+        inner = data_part.get("data", {}) if isinstance(data_part, dict) else {}
+        user_id = inner.get("id") if isinstance(inner, dict) else None
+        return str(user_id) if user_id not in (None, "") else ""
+
+    def _remote_sync_state(self) -> tuple:
+        """Return ``(version, {field: digest})`` of the last synced server state.
+
+        The state belongs to the account that recorded it; another account's
+        state is dropped so its version is never sent as a base version.
+        """
+        with self._lock:
+            state = self._settings.get(self.REMOTE_SYNC_STATE_KEY)
+            if isinstance(state, dict) and str(state.get("user_id") or "") != self._remote_user_id:
+                self._settings.pop(self.REMOTE_SYNC_STATE_KEY, None)
+                self._dirty = True
+                state = None
+        if not isinstance(state, dict):
+            return 0, {}
+        version = state.get("version")
+        fields = state.get("fields")
+        if isinstance(version, bool) or not isinstance(version, int) or not isinstance(fields, dict):
+            return 0, {}
+        return version, fields
+
+    def _record_remote_sync(self, version: Any, fields: Dict[str, str]) -> None:
+        if isinstance(version, bool) or not isinstance(version, int) or version <= 0:
+            # Servers without versioning: the next push sends a full snapshot.
+            version, fields = 0, {}
+        with self._lock:
+            self._settings[self.REMOTE_SYNC_STATE_KEY] = {
+                "user_id": self._remote_user_id,
+                "version": version,
+                "fields": fields,
+            }
+            # Rides along with the next write or the exit flush; losing it only
+            # costs one full-snapshot push after a version conflict.
+            self._dirty = True
+
     def push_remote_settings(self) -> bool:
-        """Upload the current local settings snapshot to the authenticated account."""
+        """Upload local settings changes to the authenticated account.
+
+        Only fields whose digest differs from the last synced server state are
+        sent. When the server reports a version conflict, the other device's
+        changes are pulled, the local changes are applied on top and the delta
+        is sent again. Without a synced version, or against a server without
+        delta sync, the full snapshot is uploaded instead.
+        """
         if self._remote_sync_disabled():
             return False
         try:
             from caller import rest
 
-            payload = self._export_remote_settings()
-            result = rest.save_user_settings(payload)
-            ok = bool(isinstance(result, dict) and result.get("success"))
-            if ok:
-                logger.debug("[SettingsSync] Remote settings saved")
-            else:
-                logger.debug("[SettingsSync] Remote settings save skipped/failed: %s", result)
-            return ok
+            with self._remote_lock:
+                for _attempt in range(self.REMOTE_CONFLICT_RETRIES + 1):
+                    payload = self._export_remote_settings()
+                    digests = {key: self._remote_field_digest(value) for key, value in payload.items()}
+                    version, synced = self._remote_sync_state()
+                    if not version:
+                        break
+                    changes = {
+                        key: value
+                        for key, value in payload.items()
+                        if synced.get(key) != digests[key]
+                    }
+                    removed = sorted(key for key in synced if key not in payload)
+                    if not changes and not removed:
+                        return True
+                    result = rest.patch_user_settings(version, changes, removed)
+                    if isinstance(result, dict) and result.get("success"):
+                        self._record_remote_sync(result.get("version"), digests)
+                        logger.debug("[SettingsSync] Remote settings delta saved: %d fields", len(changes) + len(removed))
+                        return True
+                    if isinstance(result, dict) and result.get("unsupported"):
+                        break
+                    if not (isinstance(result, dict) and result.get("conflict")):
+                        logger.debug("[SettingsSync] Remote settings delta skipped/failed: %s", result)
+                        return False
+                    logger.info("[SettingsSync] Settings version diverged; rebasing local changes")
+                    if not self._rebase_remote_changes(changes, removed):
+                        return False
+                else:
+                    logger.warning("[SettingsSync] Settings kept changing remotely; push deferred")
+                    return False
+
+                result = rest.save_user_settings(payload)
+                ok = bool(isinstance(result, dict) and result.get("success"))
+                if ok:
+                    self._record_remote_sync(result.get("version"), digests)
+                    logger.debug("[SettingsSync] Remote settings saved")
+                else:
+                    logger.debug("[SettingsSync] Remote settings save skipped/failed: %s", result)
+                return ok
         except Exception as exc:
             logger.debug("[SettingsSync] Remote push failed: %s", exc)
             return False
 
+    def _rebase_remote_changes(self, changes: Dict[str, Any], removed: List[str]) -> bool:
+        """Pull the account's newer state, then re-apply this device's changes on top."""
+        if not self.pull_remote_settings():
+            return False
+        with self._lock:
+            self._settings.update(deepcopy(changes))
+            for key in removed:
+                self._settings.pop(key, None)
+        return self._save_settings(sync_remote=False, immediate=True)
+
     def pull_remote_settings(self) -> bool:
-        """Download and apply settings from the authenticated account, if present."""
+        """Download and apply settings from the authenticated account, if present.
+
+        A device with a synced version asks only for fields changed since then.
+        """
         if self._remote_sync_disabled():
             return False
         try:
             from caller import rest
 
-            result = rest.fetch_user_settings()
-            if not (isinstance(result, dict) and result.get("success")):
-                logger.debug("[SettingsSync] Remote settings fetch skipped/failed: %s", result)
-                return False
-
-            remote_settings = result.get("settings")
-            if not isinstance(remote_settings, dict) or not remote_settings:
-                return False
+            with self._remote_lock:
+                version, synced = self._remote_sync_state()
+                result = (
+                    rest.fetch_user_settings(since_version=version)
+                    if version
+                    else rest.fetch_user_settings()
+                )
+                if not (isinstance(result, dict) and result.get("success")):
+                    logger.debug("[SettingsSync] Remote settings fetch skipped/failed: %s", result)
+                    return False
+
+                if result.get("unchanged"):
+                    return True
+
+                if result.get("delta"):
+                    changes = result.get("changes") if isinstance(result.get("changes"), dict) else {}
+                    removed = result.get("removed") if isinstance(result.get("removed"), list) else []
+                    remote_settings = self._export_remote_settings()
+                    remote_settings.update(changes)
+                    for key in removed:
+                        remote_settings.pop(key, None)
+                    synced = dict(synced)
+                    synced.update({key: self._remote_field_digest(value) for key, value in changes.items()})
+                    for key in removed:
+                        synced.pop(key, None)
+                else:
+                    remote_settings = result.get("settings")
+                    if not isinstance(remote_settings, dict) or not remote_settings:
+                        return False
+                    synced = {
+                        key: self._remote_field_digest(value)
+                        for key, value in remote_settings.items()
+                    }
 
-            if self.apply_remote_settings(remote_settings):
+                if not self.apply_remote_settings(remote_settings):
+                    return False
+                self._record_remote_sync(result.get("version"), synced)
+                self.flush()
                 logger.info("[SettingsSync] Remote settings loaded")
                 return True
-            return False
         except Exception as exc:
             logger.debug("[SettingsSync] Remote pull failed: %s", exc)
             return False
@@ -994,6 +1186,8 @@ class SettingsManager:
         """
         if self._remote_sync_disabled():
             return False
+        with self._remote_lock:
+            self._remote_user_id = self._login_user_id(login_data)
         self._remote_sync_enabled = True
         pulled = self.pull_remote_settings()
         if pulled:
@@ -1001,21 +1195,28 @@ class SettingsManager:
         return self.push_remote_settings()
 
     def schedule_remote_push(self) -> None:
-        """Best-effort non-blocking upload after local settings changes."""
-        if (
-            self._remote_sync_disabled()
-            or not self._remote_sync_enabled
-            or self._remote_push_running
-        ):
+        """Best-effort non-blocking upload after local settings changes.
+
+        A request that arrives while a push is running is folded into one
+        follow-up push of the latest snapshot.
+        """
+        if self._remote_sync_disabled() or not self._remote_sync_enabled:
             return
-        self._remote_push_running = True
+        with self._lock:
+            self._remote_push_requested = True
+            if self._remote_push_running:
+                return
+            self._remote_push_running = True
 
         def _worker() -> None:
             with self._remote_lock:
-                try:
+                while True:
+                    with self._lock:
+                        if not self._remote_push_requested:
+                            self._remote_push_running = False
+                            return
+                        self._remote_push_requested = False
                     self.push_remote_settings()
-                finally:
-                    self._remote_push_running = False
 
         threading.Thread(target=_worker, daemon=True).start()
 
@@ -1139,7 +1340,7 @@ class SettingsManager:
         with self._lock:
             previous = bool(self._settings.get("launch_on_startup", True))
             self._settings["launch_on_startup"] = bool(enabled)
-        saved = self._save_settings()
+        saved = self._save_settings(immediate=True)
         if not saved:
             with self._lock:
                 self._settings["launch_on_startup"] = previous
@@ -1659,7 +1860,8 @@ class SettingsManager:
                 self._settings["computer_use_bridge_url"] = str(bridge_url or "").strip()
             if bridge_api_key is not None:
                 self._settings["computer_use_bridge_api_key"] = ""
-        return self._save_settings()
+        # 자격 증명을 바꿨으면 파일에서 평문이 지워졌는지까지 결과로 알림
+        return self._save_settings(immediate=bridge_api_key is not None)
 
     def get_sourcing_ai_policy(self) -> Dict[str, Any]:
         """
@@ -1868,7 +2070,7 @@ class SettingsManager:
         with self._lock:
             self._settings["coupang_access_key"] = ""
             self._settings["coupang_secret_key"] = ""
-        return self._save_settings()
+        return self._save_settings(immediate=True)
 
     def get_linktree_settings(self) -> Dict[str, Any]:
         """Get Linktree webhook integration settings."""
@@ -1924,7 +2126,7 @@ class SettingsManager:
                 )
             if auto_publish is not None:
                 self._settings["linktree_auto_publish"] = bool(auto_publish)
-        return self._save_settings()
+        return self._save_settings(immediate=True)
 
     def get_linktree_account_email(self) -> str:
         """Get the Linktree account email recorded by the user/setup flow."""
@@ -2001,7 +2203,7 @@ class SettingsManager:
             return False
         with self._lock:
             self._settings["cookies_inpock"] = {}
-        return self._save_settings()
+        return self._save_settings(immediate=True)
 
     def get_1688_cookies(self) -> Dict[str, str]:
         """Get device-local 1688 cookies from OS storage."""
@@ -2021,7 +2223,7 @@ class SettingsManager:
             return False
         with self._lock:
             self._settings["cookies_1688"] = {}
-        return self._save_settings()
+        return self._save_settings(immediate=True)
 
     # ============ Bulk Operations ============
 
@@ -2054,6 +2256,17 @@ class SettingsManager:
         return self._save_settings()
 
 
+# Managers with possibly unflushed changes; flushed when the interpreter exits.
+_live_managers: "weakref.WeakSet[SettingsManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def flush_all_settings() -> None:
+    """Write pending changes of every live settings manager."""
+    for manager in list(_live_managers):
+        manager.flush()
+
+
 # Global instance for easy access (thread-safe singleton)
 _settings_manager: Optional[SettingsManager] = None
 _settings_manager_lock = threading.Lock()
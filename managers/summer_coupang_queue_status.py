@@ -5,10 +5,12 @@ from __future__ import annotations
 import json
 import os
 import shutil
+import threading
+import time
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from user_facing_errors import sanitize_user_message
 
@@ -60,6 +62,14 @@ STATUS_LABELS = {
 }
 STATUS_LABELS[AFFILIATE_LINK_BLOCKED_STATUS] = "제휴 링크 필요"
 
+# A file rewritten within this window of the stat may still change without
+# moving mtime (coarse filesystem clocks), so such snapshots are not reused.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+FileSignature = Tuple[int, int, int]
+_snapshot_cache: Dict[str, Tuple[FileSignature, Dict[str, Any]]] = {}
+_snapshot_cache_lock = threading.Lock()
+
 
 def load_summer_coupang_queue(
     path: Optional[Path] = None,
@@ -203,6 +213,7 @@ def delete_summer_coupang_queue_items(
                     encoding="utf-8",
                 )
                 os.replace(temp_path, queue_path)
+                invalidate_summer_coupang_queue_snapshot(queue_path)
             finally:
                 if temp_path.exists():
                     temp_path.unlink()
@@ -383,13 +394,62 @@ def _row_for_item(item: Dict[str, Any]) -> Dict[str, str]:
     }
 
 
+def _file_signature(queue_path: Path) -> Optional[FileSignature]:
+    try:
+        stat = queue_path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def invalidate_summer_coupang_queue_snapshot(path: Optional[Path] = None) -> None:
+    """Drop the cached snapshot for ``path`` (all paths when omitted).
+
+    Writers in this process call it after replacing the file; changes made
+    by other processes are caught by the mtime/size/inode signature.
+    """
+    with _snapshot_cache_lock:
+        if path is None:
+            _snapshot_cache.clear()
+        else:
+            _snapshot_cache.pop(str(path), None)
+
+
 def build_summer_coupang_queue_snapshot(
     path: Optional[Path] = None,
 ) -> Dict[str, Any]:
-    payload = load_summer_coupang_queue(path)
+    """Return the queue status view, reparsing only when the file changed.
+
+    Snapshots are shared process-wide and keyed by the file's mtime, size and
+    inode. ``rows`` and ``rows_by_id`` are shared between callers: read only.
+    """
+    queue_path = path or DEFAULT_QUEUE_PATH
+    key = str(queue_path)
+    signature = _file_signature(queue_path)
+    with _snapshot_cache_lock:
+        cached = _snapshot_cache.get(key)
+    if cached is not None and signature is not None and cached[0] == signature:
+        return dict(cached[1])
+
+    snapshot = _parse_snapshot(queue_path)
+    cacheable = (
+        signature is not None
+        and _file_signature(queue_path) == signature
+        and time.time_ns() - signature[0] > RACY_MTIME_WINDOW_NS
+    )
+    with _snapshot_cache_lock:
+        if cacheable:
+            _snapshot_cache[key] = (signature, snapshot)
+        else:
+            _snapshot_cache.pop(key, None)
+    return dict(snapshot)
+
+
+def _parse_snapshot(queue_path: Path) -> Dict[str, Any]:
+    payload = load_summer_coupang_queue(queue_path)
     items = payload.get("items") if isinstance(payload.get("items"), list) else []
-    rows = [_row_for_item(item) for item in items if isinstance(item, dict)]
 
+    rows: List[Dict[str, str]] = []
     counts = {
         "waiting": 0,
         "processing": 0,
@@ -397,18 +457,17 @@ def build_summer_coupang_queue_snapshot(
         "skipped": 0,
         "failed": 0,
     }
+    pending_items = []
     for item in items:
         if not isinstance(item, dict):
             continue
-        bucket = _status_bucket_for_item(item)
+        row = _row_for_item(item)
+        rows.append(row)
+        bucket = row["bucket"]
         counts[bucket] = counts.get(bucket, 0) + 1
+        if bucket == "waiting":
+            pending_items.append(item)
 
-    pending_items = [
-        item
-        for item in items
-        if isinstance(item, dict)
-        and _status_bucket_for_item(item) == "waiting"
-    ]
     pending_items.sort(
         key=lambda item: (
             parse_datetime(item.get("scheduled_at")) or datetime.max,
@@ -431,11 +490,12 @@ def build_summer_coupang_queue_snapshot(
         interval = intervals[0] if intervals else 0
 
     return {
-        "path": str(path or DEFAULT_QUEUE_PATH),
+        "path": str(queue_path),
         "exists": bool(payload),
         "total": len(rows),
         "counts": counts,
         "rows": rows,
+        "rows_by_id": {row["queue_item_id"]: row for row in rows},
         "interval_minutes": int(interval or 0),
         "next_planned_number": str(next_pending.get("planned_number") or "").strip(),
         "next_scheduled_at": str(next_pending.get("scheduled_at") or "").strip(),
@@ -1,14 +1,117 @@
 """Shared durable reserve/finalize/release contract for all production modes."""
 from __future__ import annotations
 
+import threading
+import uuid
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional
 
 from caller import rest
 from managers.work_reservation_store import (
     WorkReservationStore,
     get_work_reservation_store,
 )
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# A render started on a lease this close to expiry could outlive it.
+LEASE_EXPIRY_MARGIN = timedelta(minutes=10)
+
+
+def _lease_expires_at(item: Dict[str, Any]) -> Optional[datetime]:
+    raw = item.get("lease_expires_at")
+    if not raw:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class WorkLease:
+    """A block of server reservations leased up front for one batch.
+
+    ``take()`` hands out a reserved key without a network call. Whatever is
+    left is returned with one ``release_unused()`` request when the batch ends;
+    keys that were never returned expire on the server with their lease.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        reservations: List[Dict[str, Any]],
+        remaining: Optional[int] = None,
+    ):
+        self.user_id = str(user_id)
+        self.remaining = remaining
+        self._available: Deque[Dict[str, Any]] = deque(reservations)
+        self._stale: List[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def acquire(cls, user_id: str, count: int) -> "WorkLease":
+        count = max(0, min(int(count), rest.MAX_WORK_LEASE))
+        if count == 0:
+            return cls(user_id, [])
+        keys = [str(uuid.uuid4()) for _ in range(count)]
+        result = rest.leaseWork(str(user_id), keys)
+        granted = [
+            item
+            for item in result.get("reservations") or []
+            if isinstance(item, dict)
+            and item.get("success")
+            and item.get("reservation_status") == "reserved"
+        ]
+        if not result.get("success"):
+            logger.info("[작업횟수] 일괄 예약 실패, 작업별 예약으로 진행: %s", result.get("message"))
+        remaining = result.get("remaining")
+        return cls(user_id, granted, remaining if isinstance(remaining, int) else None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._available)
+
+    def take(self) -> Optional[Dict[str, Any]]:
+        """Pop a leased reservation as a ``reserveWork``-shaped result."""
+        deadline = datetime.now(timezone.utc) + LEASE_EXPIRY_MARGIN
+        with self._lock:
+            while self._available:
+                item = self._available.popleft()
+                expires_at = _lease_expires_at(item)
+                if expires_at is not None and expires_at <= deadline:
+                    self._stale.append(str(item["idempotency_key"]))
+                    continue
+                result = dict(item)
+                result["leased"] = True
+                if self.remaining is not None and self.remaining != -1:
+                    # Slots still held by the lease are available to this batch.
+                    result["remaining"] = self.remaining + len(self._available)
+                return result
+        return None
+
+    def put_back(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self._available.appendleft(item)
+
+    def release_unused(self) -> Dict[str, Any]:
+        with self._lock:
+            keys = [str(item["idempotency_key"]) for item in self._available] + self._stale
+            self._available.clear()
+            self._stale = []
+        if not keys:
+            return {"success": True, "released": 0, "reservations": []}
+        result = rest.releaseWorkLease(self.user_id, keys)
+        if not result.get("success"):
+            logger.warning(
+                "[작업횟수] 미사용 예약 %d건 반환 실패, 서버 임대 만료 후 자동 해제: %s",
+                len(keys),
+                result.get("message"),
+            )
+        return result
 
 
 @dataclass
@@ -31,10 +134,24 @@ class DurableWorkReservation:
         job_key: str,
         *,
         store: Optional[WorkReservationStore] = None,
+        lease: Optional[WorkLease] = None,
     ) -> tuple["DurableWorkReservation", Dict[str, Any]]:
         durable_store = store or get_work_reservation_store()
-        key = durable_store.get_or_create(job_key, str(user_id))
+        leased = lease.take() if lease is not None else None
+        key = durable_store.get_or_create(
+            job_key,
+            str(user_id),
+            preferred_key=leased["idempotency_key"] if leased else None,
+        )
+        if leased is not None and key != leased["idempotency_key"]:
+            # The job already has a key from an earlier run; keep the leased
+            # slot for another job and recover this one as before.
+            lease.put_back(leased)
+            leased = None
         reservation = cls(str(user_id), str(job_key), key, durable_store)
+        if leased is not None:
+            reservation.reserved = True
+            return reservation, leased
 
         recovery_state = durable_store.state(job_key, str(user_id))
         if recovery_state == "completed_pending_delivery":
@@ -92,7 +92,13 @@ class WorkReservationStore:
             if os.path.exists(temp_name):
                 os.unlink(temp_name)
 
-    def get_or_create(self, job_key: str, user_id: str = "") -> str:
+    def get_or_create(
+        self,
+        job_key: str,
+        user_id: str = "",
+        preferred_key: Optional[str] = None,
+    ) -> str:
+        """Return the job's key, recording ``preferred_key`` (a leased key) if new."""
         normalized_job_key = str(job_key or "").strip()
         normalized_user_id = str(user_id or "").strip()
         storage_key = _record_key(normalized_job_key, normalized_user_id)
@@ -104,7 +110,7 @@ class WorkReservationStore:
             if existing:
                 return existing["idempotency_key"]
             # Ownerless legacy records are not authority for a logged-in user.
-            value = str(uuid.uuid4())
+            value = str(uuid.UUID(str(preferred_key))) if preferred_key else str(uuid.uuid4())
             payload[storage_key] = {
                 "idempotency_key": value,
                 "state": "reserved",
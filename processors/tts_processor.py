@@ -4,16 +4,87 @@ TTS Processing Module
 This module handles text-to-speech generation and metadata building.
 """
 
+import hashlib
 import os
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Iterable
+from typing import Any, Callable, Dict, List, Iterable, NamedTuple, Optional
 
 from utils.logging_config import get_logger
 from utils.korean_text_processor import process_korean_script
+from core.api.gemini_response_cache import GeminiResponseCache, get_response_cache
+from core.audio.multi_voice import keyed_tts_clients
 
 logger = get_logger(__name__)
 
+# Gemini 오디오 분석 요청 문구나 응답 파싱이 바뀌면 올려서 이전 분석 결과를 무효화
+ANALYSIS_VERSION = 1
+
+# 같은 TTS 파일을 다시 렌더링할 때 업로드/분석을 건너뛰도록 응답 원문을 보관
+# key: 오디오 내용 해시 + 분석 버전 + 모델 + 요청 문구 -> Gemini 응답 텍스트
+_ANALYSIS_MEMORY_ENTRIES = 32
+_analysis_memory: "OrderedDict[str, str]" = OrderedDict()
+_analysis_lock = threading.Lock()
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def audio_analysis_key(audio_path: str, model: str, request_text: str) -> Optional[str]:
+    """
+    오디오 분석 캐시 키 (파일 경로가 아니라 내용 기준)
+
+    Changes to the audio bytes, ``ANALYSIS_VERSION``, the model or the request
+    text (e.g. different subtitle segments) all produce a new key.
+    """
+    return GeminiResponseCache.key(
+        model,
+        request_text,
+        purpose="tts_audio_analysis",
+        audio_sha256=_file_sha256(audio_path),
+        analysis_version=ANALYSIS_VERSION,
+    )
+
+
+def _cached_analysis(key: Optional[str]) -> Optional[str]:
+    """메모리 -> 디스크(SSMAKER_GEMINI_RESPONSE_CACHE=1일 때) 순서로 조회"""
+    if not key:
+        return None
+    with _analysis_lock:
+        transcript = _analysis_memory.get(key)
+        if transcript is not None:
+            _analysis_memory.move_to_end(key)
+            return transcript
+    cache = get_response_cache()
+    transcript = ((cache.get(key) if cache is not None else None) or {}).get("text")
+    if transcript:
+        _remember_analysis(key, transcript)
+    return transcript or None
+
+
+def _remember_analysis(key: str, transcript: str) -> None:
+    with _analysis_lock:
+        _analysis_memory[key] = transcript
+        _analysis_memory.move_to_end(key)
+        while len(_analysis_memory) > _ANALYSIS_MEMORY_ENTRIES:
+            _analysis_memory.popitem(last=False)
+
+
+def _store_analysis(key: Optional[str], transcript: str) -> None:
+    if not key:
+        return
+    _remember_analysis(key, transcript)
+    cache = get_response_cache()
+    if cache is not None:
+        cache.put(key, {"text": transcript})
+
 try:
     from google import genai
     from google.genai import types
@@ -39,6 +110,22 @@ except Exception as e:
 from caller import ui_controller
 
 
+class TTSInputs(NamedTuple):
+    """
+    TTS 생성에 필요한 GUI 상태 스냅샷
+
+    Read once on the GUI thread so concurrent per-voice workers never touch
+    widgets or the CTA selection themselves.
+    """
+
+    script: str
+    translation_text: str
+    cta_lines: List[str]
+    video_duration: float
+    output_dir: str
+    voice_profiles: Dict[str, Dict[str, Any]]
+
+
 class TTSProcessor:
     """
     Handles text-to-speech generation and metadata processing.
@@ -56,7 +143,40 @@ class TTSProcessor:
         """
         self.gui = gui
 
-    def generate_tts_for_voice(self, voice: str):
+    def snapshot_inputs(self, voices: Iterable[str] = ()) -> TTSInputs:
+        """
+        Read everything ``generate_tts_for_voice`` needs from the GUI.
+
+        Call this on the GUI thread before handing voices to worker threads.
+
+        Args:
+            voices: Voices whose profiles should be captured
+
+        Returns:
+            TTSInputs snapshot shared by every voice
+        """
+        from ui.panels.cta_panel import get_selected_cta_lines
+
+        vm = getattr(self.gui, "voice_manager", None)
+        voice_profiles = {}
+        if vm:
+            for voice in voices:
+                voice_profiles[voice] = vm.get_voice_profile(voice) or {}
+        return TTSInputs(
+            script=self.extract_clean_script_from_translation(max_len=2000),
+            translation_text=(self.gui.translation_result or "").lower(),
+            cta_lines=list(get_selected_cta_lines(self.gui)),
+            video_duration=self.get_video_duration_helper(),
+            output_dir=self.gui.tts_output_dir,
+            voice_profiles=voice_profiles,
+        )
+
+    def generate_tts_for_voice(
+        self,
+        voice: str,
+        inputs: Optional[TTSInputs] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ):
         """
         Generate TTS audio for a specific voice with automatic length adjustment.
 
@@ -65,6 +185,8 @@ class TTSProcessor:
 
         Args:
             voice: Voice name/ID to use for TTS generation
+            inputs: GUI snapshot from ``snapshot_inputs`` (read now when omitted)
+            log: Progress log callback (defaults to ``gui.add_log``)
 
         Returns:
             Tuple of (metadata list, duration, output_path)
@@ -72,28 +194,29 @@ class TTSProcessor:
         Raises:
             RuntimeError: If Gemini SDK unavailable or no translated script available
         """
-        vm = getattr(self.gui, "voice_manager", None)
+        if inputs is None:
+            inputs = self.snapshot_inputs([voice])
+        log = log or self.gui.add_log
         voice_name = voice
         voice_label = voice
-        if vm:
-            profile = vm.get_voice_profile(voice)
-            if profile:
-                voice_name = profile.get("voice_name") or voice
-                voice_label = profile.get("label", voice)
+        profile = inputs.voice_profiles.get(voice)
+        if profile:
+            voice_name = profile.get("voice_name") or voice
+            voice_label = profile.get("label", voice)
 
         if not (GENAI_SDK_AVAILABLE and GENAI_TYPES_AVAILABLE):
             raise RuntimeError(
                 "Gemini SDK가 없거나 사용할 수 없어 TTS를 생성할 수 없습니다."
             )
 
-        script = self.extract_clean_script_from_translation(max_len=2000)
+        script = inputs.script
         if not script:
             raise RuntimeError("No translated script available for TTS generation.")
 
         base_segments = self._split_script_for_tts(script, max_chars=9)
         base_script = "\n".join(base_segments) if base_segments else script
 
-        video_duration = self.get_video_duration_helper()
+        video_duration = inputs.video_duration
 
         # 20초 이상 영상: TTS는 최대 20초까지 생성 (배속 후에도 충분)
         # 20초 미만 영상: TTS는 영상 길이에 맞춤
@@ -115,7 +238,7 @@ class TTSProcessor:
         last_duration_after_speed = 0.0
         last_path = None
         # 제품 영상 감지 (영문 + 한국어 키워드)
-        translation_text = (self.gui.translation_result or "").lower()
+        translation_text = inputs.translation_text
         is_product = any(
             keyword in translation_text
             for keyword in [
@@ -190,10 +313,8 @@ class TTSProcessor:
                 )
 
             # CTA 추가 (모든 시도에서 적용 - 통합 후 2분할)
-            # 선택된 CTA 라인 가져오기
-            from ui.panels.cta_panel import get_selected_cta_lines
-
-            cta_segments = get_selected_cta_lines(self.gui)
+            # 선택된 CTA 라인은 스냅샷에서 가져옴
+            cta_segments = inputs.cta_lines
             cta_first_line = cta_segments[0] if cta_segments else "제품이 마음에"
 
             if is_product and cta_first_line not in full_script:
@@ -239,8 +360,8 @@ class TTSProcessor:
             output_filename = (
                 f"full_script_tts_{voice_name}_{timestamp}_try{attempt + 1}.wav"
             )
-            output_path = os.path.join(self.gui.tts_output_dir, output_filename)
-            self.gui.add_log(
+            output_path = os.path.join(inputs.output_dir, output_filename)
+            log(
                 f"[TTS] Voice {voice_label} | attempt {attempt + 1} | {len(full_script)} chars"
             )
 
@@ -248,8 +369,8 @@ class TTSProcessor:
             # 자막에는 "7개"로 표시되지만, TTS는 "일곱 개"로 읽음
             tts_script = process_korean_script(full_script)
 
-            try:
-                response = self.gui.genai_client.models.generate_content(
+            def _request(client):
+                return client.models.generate_content(
                     model=self.gui.config.GEMINI_TTS_MODEL,
                     contents=[tts_script],
                     config=types.GenerateContentConfig(
@@ -263,6 +384,10 @@ class TTSProcessor:
                         ),
                     ),
                 )
+
+            try:
+                # 여러 음성이 동시에 호출해도 키별 RPM/TPM 한도 안에서 요청
+                response = keyed_tts_clients(self.gui).call(_request, tts_script)
             except Exception as e:
                 logger.error(f"[TTS API Error] {e}")
                 if "404" in str(e) or "NotFound" in str(e):
@@ -324,7 +449,7 @@ class TTSProcessor:
             last_duration = tts_duration
             last_duration_after_speed = after_speed
             last_path = output_path
-            self.gui.add_log(
+            log(
                 f"[TTS] Result length {tts_duration:.2f}s (1.2x => {after_speed:.2f}s)"
             )
 
@@ -345,7 +470,7 @@ class TTSProcessor:
                 max_allowed,
                 shortage,
             )
-            self.gui.add_log(
+            log(
                 f"[TTS] Exceeds target length by {shortage:.1f}s, reducing script and retrying"
             )
 
@@ -362,7 +487,7 @@ class TTSProcessor:
             )
 
         logger.warning("  하지만 강제로 진행합니다 (주의: 마지막 TTS가 잘릴 수 있음)")
-        self.gui.add_log(
+        log(
             f"[TTS Warning] Failed to meet target length after {attempts} attempts, using shortest version"
         )
         return last_metadata, last_duration, last_path
@@ -569,15 +694,7 @@ class TTSProcessor:
                 logger.warning("[Audio Analysis] 오디오 파일 없음: %s", audio_path)
                 return []
 
-            # 1. Upload audio file to Gemini Files API
-            logger.info(
-                "[Audio Analysis] 오디오 파일 업로드 중... (%s)",
-                os.path.basename(audio_path),
-            )
-            uploaded_file = self.gui.genai_client.files.upload(file=audio_path)
-            logger.info("[Audio Analysis] 업로드 완료: %s", uploaded_file.name)
-
-            # 2. Request detailed transcript with timestamps
+            # 1. Request detailed transcript with timestamps
             # Gemini can provide timestamps in format MM:SS or with word-level timing
             if subtitle_segments:
                 segment_list = "\n".join(
@@ -603,6 +720,27 @@ class TTSProcessor:
                     "Keep timestamps accurate to the actual speech timing."
                 )
 
+            # 2. 같은 오디오 + 같은 요청이면 이전 분석 결과 재사용 (업로드 생략)
+            model = self.gui.config.GEMINI_TEXT_MODEL
+            cache_key = audio_analysis_key(audio_path, model, prompt)
+            cached_transcript = _cached_analysis(cache_key)
+            if cached_transcript:
+                metadata = self._parse_timestamped_transcript(cached_transcript, max_chars)
+                if metadata:
+                    logger.info(
+                        "[Audio Analysis] 캐시된 분석 결과 사용 - %d개 세그먼트 (업로드 생략)",
+                        len(metadata),
+                    )
+                    return metadata
+
+            # 3. Upload audio file to Gemini Files API
+            logger.info(
+                "[Audio Analysis] 오디오 파일 업로드 중... (%s)",
+                os.path.basename(audio_path),
+            )
+            uploaded_file = self.gui.genai_client.files.upload(file=audio_path)
+            logger.info("[Audio Analysis] 업로드 완료: %s", uploaded_file.name)
+
             logger.info("[Audio Analysis] Gemini로 타임스탬프 분석 중...")
 
             # 최대 5회 재시도 (503 서버 오류 대응)
@@ -618,7 +756,7 @@ class TTSProcessor:
                         MAX_AUDIO_RETRIES,
                     )
                     response = self.gui.genai_client.models.generate_content(
-                        model=self.gui.config.GEMINI_TEXT_MODEL,
+                        model=model,
                         contents=[prompt, uploaded_file],
                     )
                     if response and response.text:
@@ -658,6 +796,7 @@ class TTSProcessor:
 
             if metadata and len(metadata) > 0:
                 logger.info("[Audio Analysis] %d개 세그먼트로 파싱 완료", len(metadata))
+                _store_analysis(cache_key, transcript)
                 return metadata
             else:
                 logger.warning("[Audio Analysis] 타임스탬프 파싱 실패")
@@ -72,8 +72,8 @@ class VideoComposer:
         """
         Generate videos for all voice presets.
 
-        Iterates through configured voice presets, generates TTS for each,
-        and creates final videos with synchronized subtitles.
+        Generates TTS for every configured voice preset concurrently and
+        creates each final video as soon as that voice's TTS is ready.
 
         Args:
             source_video: Path to source video file
@@ -130,47 +130,67 @@ class VideoComposer:
         self.gui.generated_videos = []
         self.gui.update_progress_state("tts", "processing", 0)
 
-        for idx, voice in enumerate(voices, 1):
-            voice_label = (
-                voice_manager.get_voice_label(voice) if voice_manager else voice
+        from core.audio.multi_voice import MultiVoiceSynthesizer
+        from processors.tts_processor import TTSProcessor
+
+        # 모든 음성의 TTS를 동시에 생성하고, 먼저 끝난 음성부터 영상 제작
+        # GUI 상태는 여기(GUI 스레드)에서 한 번 읽고, 작업 스레드의 로그는 GUI 스레드로 넘김
+        unique_voices = list(dict.fromkeys(voices))
+        processor = TTSProcessor(self.gui)
+        inputs = processor.snapshot_inputs(unique_voices)
+        with MultiVoiceSynthesizer(
+            lambda voice: processor.generate_tts_for_voice(
+                voice, inputs=inputs, log=self._post_log
             )
-            self.gui.add_log(f"[VOICE] {idx}/{total} - {voice_label}")
-            try:
-                # Import TTS processor
-                from processors.tts_processor import TTSProcessor
+        ) as synthesizer:
+            synthesizer.submit(unique_voices)
+            for idx, voice in enumerate(synthesizer.as_completed(), 1):
+                self._create_video_for_voice(
+                    source_video, voice, synthesizer, idx, len(unique_voices)
+                )
 
-                tts_processor = TTSProcessor(self.gui)
+        self.gui.update_progress_state("tts", "completed", 100)
+        try:
+            self.gui.save_generated_videos_locally()
+        except Exception as exc:
+            logger.error(f"[LocalSave] Failed to store generated videos: {exc}")
 
-                metadata, duration, output_path = tts_processor.generate_tts_for_voice(
-                    voice
-                )
-                if not metadata or not output_path:
-                    raise RuntimeError("TTS generation failed.")
+    def _post_log(self, message: str) -> None:
+        """Log from a TTS worker thread; add_log itself runs on the GUI thread."""
+        signal = getattr(self.gui, "ui_callback_signal", None)
+        if signal is None:
+            self.gui.add_log(message)
+            return
+        signal.emit(lambda: self.gui.add_log(message))
 
-                self.gui._per_line_tts = metadata
-                self.gui.tts_files = [output_path]
-                self.gui.fixed_tts_voice = voice
-                self.gui.last_voice_used = voice
-                self.gui.update_voice_info_label(latest_voice=voice)
-                progress = int(idx / total * 100)
-                self.gui.update_progress_state("tts", "processing", progress)
+    def _create_video_for_voice(self, source_video, voice, synthesizer, idx, total):
+        """Apply one voice's finished TTS and render its video."""
+        voice_manager = getattr(self.gui, "voice_manager", None)
+        voice_label = voice_manager.get_voice_label(voice) if voice_manager else voice
+        self.gui.add_log(f"[VOICE] {idx}/{total} - {voice_label}")
+        try:
+            metadata, duration, output_path = synthesizer.result(voice)
+            if not metadata or not output_path:
+                raise RuntimeError("TTS generation failed.")
 
-                self.gui.source_video = source_video
+            self.gui._per_line_tts = metadata
+            self.gui.tts_files = [output_path]
+            self.gui.fixed_tts_voice = voice
+            self.gui.last_voice_used = voice
+            self.gui.update_voice_info_label(latest_voice=voice)
+            progress = int(idx / total * 100)
+            self.gui.update_progress_state("tts", "processing", progress)
 
-                # Import CreateFinalVideo module
-                from core.video import CreateFinalVideo
+            self.gui.source_video = source_video
 
-                CreateFinalVideo.create_final_video_thread(self.gui)
+            # Import CreateFinalVideo module
+            from core.video import CreateFinalVideo
 
-            except Exception as exc:
-                logger.error(f"[Video] Error during video creation for voice: {exc}")
-                self.gui.update_progress_state("video", "error", message=str(exc))
+            CreateFinalVideo.create_final_video_thread(self.gui)
 
-        self.gui.update_progress_state("tts", "completed", 100)
-        try:
-            self.gui.save_generated_videos_locally()
         except Exception as exc:
-            logger.error(f"[LocalSave] Failed to store generated videos: {exc}")
+            logger.error(f"[Video] Error during video creation for voice: {exc}")
+            self.gui.update_progress_state("video", "error", message=str(exc))
 
     def get_video_duration_helper(self) -> float:
         """
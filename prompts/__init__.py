@@ -8,7 +8,7 @@ from .subtitle_split import get_subtitle_split_prompt
 from .audio_analysis import get_audio_analysis_prompt
 from .video_analysis import get_video_analysis_prompt
 from .translation import get_translation_prompt
-from .video_validation import get_video_validation_prompt
+from .video_validation import get_video_validation_prompt, get_contact_sheet_validation_prompt
 
 __all__ = [
     'get_subtitle_split_prompt',
@@ -16,4 +16,5 @@ __all__ = [
     'get_video_analysis_prompt',
     'get_translation_prompt',
     'get_video_validation_prompt',
+    'get_contact_sheet_validation_prompt',
 ]
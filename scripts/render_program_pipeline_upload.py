@@ -138,7 +138,9 @@ class HeadlessBatchApp(AppState):
             from google import genai
             from google.genai import types
 
-            key = use_specific_key or self.api_key_manager.get_available_key()
+            key = use_specific_key or self.api_key_manager.get_available_key(
+                wait_seconds=ApiKeyManager.DEFAULT_KEY_WAIT_SECONDS
+            )
             # A half-closed upstream socket used to leave unattended renders
             # blocked forever inside ``generate_content``.  Bound every Gemini
             # request and let the SDK retry only transient HTTP failures so the
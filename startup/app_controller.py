@@ -930,6 +930,15 @@ class AppController:
                 # Chrome 연결은 선택 기능이다. 포트 충돌이나 로컬 정책으로
                 # 시작하지 못해도 로그인/편집/업로드 화면은 정상 동작해야 한다.
                 logger.warning("Chrome 연결 도우미를 시작하지 못했습니다.", exc_info=True)
+            try:
+                # 첫 자막 작업이 모델 로딩을 기다리지 않도록 백그라운드에서 미리 로드
+                from core.video.batch.whisper_analyzer import preload_alignment_worker
+                from core.video.batch.whisper_worker import shutdown_workers
+
+                if preload_alignment_worker(self.main_gui) and hasattr(self.app, "aboutToQuit"):
+                    self.app.aboutToQuit.connect(shutdown_workers)
+            except Exception:
+                logger.warning("Whisper 모델 미리 로드를 시작하지 못했습니다.", exc_info=True)
             # Close loading window AFTER main window is shown
             if self.loading_window:
                 self.loading_window.close()
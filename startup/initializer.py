@@ -9,7 +9,9 @@ import time
 import socket
 import subprocess
 import importlib.util
-from typing import Optional, List, Tuple, Dict, Any
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Optional, List, Tuple, Dict, Any
 
 import requests
 from PyQt6 import QtCore
@@ -26,6 +28,25 @@ from .system_check import check_system_requirements
 
 logger = get_logger(__name__)
 
+@dataclass(frozen=True)
+class StartupCheck:
+    """One node of the startup check graph."""
+
+    item: str  # checkItemChanged id shown on the splash
+    component: str  # diagnostics component if the check raises
+    status: str  # splash status text while the check runs
+    weight: int  # share of the progress bar
+    run: Callable[[], None]
+    after: Tuple[str, ...] = ()
+
+
+class StartupCheckError(RuntimeError):
+    def __init__(self, component: str, error: BaseException):
+        super().__init__(str(error))
+        self.component = component
+        self.error = error
+
+
 class Initializer(QtCore.QObject):
     finished = QtCore.pyqtSignal()
     failed = QtCore.pyqtSignal(dict)
@@ -38,6 +59,7 @@ class Initializer(QtCore.QObject):
     def run(self) -> None:
         current_component = "secure_environment"
         try:
+            started = time.perf_counter()
             # 0. Initialize secure environment (API keys from encrypted config)
             try:
                 from utils.secure_config import init_secure_environment
@@ -45,98 +67,15 @@ class Initializer(QtCore.QObject):
             except Exception as e:
                 logger.debug(f"[Init] Secure config initialization skipped: {e}")
 
-            init_issues = []
-            # 1. System requirements (0-10%)
-            current_component = "system_requirements"
-            self.checkItemChanged.emit("system", "checking", "")
-            self.statusChanged.emit("컴퓨터 환경을 확인하고 있습니다...")
-            time.sleep(0.3)
-            can_run, issues, warnings, specs = check_system_requirements()
-            if not can_run:
-                self.checkItemChanged.emit("system", "error", "환경 미충족")
-                init_issues.append(("system", "error", "시스템 요구사항 미충족"))
-            else:
-                self.checkItemChanged.emit("system", "success", "정상")
-            self.progressChanged.emit(10)
-            time.sleep(0.2)
-
-            # 2. Fonts (10-20%)
-            current_component = "fonts"
-            self.checkItemChanged.emit("fonts", "checking", "")
-            self.statusChanged.emit("자막 폰트를 준비하고 있습니다...")
-            time.sleep(0.3)
-            self.checkItemChanged.emit("fonts", "success", "준비 완료")
-            self.progressChanged.emit(20)
-            time.sleep(0.2)
-
-            # 3. FFmpeg (20-30%)
-            current_component = "ffmpeg"
-            self.checkItemChanged.emit("ffmpeg", "checking", "")
-            self.statusChanged.emit("영상 편집 도구를 확인하고 있습니다...")
-            time.sleep(0.3)
-            self.checkItemChanged.emit("ffmpeg", "success", "확인 완료")
-            self.progressChanged.emit(30)
-            time.sleep(0.2)
-
-            # 4. Internet connectivity (30-45%)
-            current_component = "internet"
-            self.checkItemChanged.emit("internet", "checking", "")
-            self.statusChanged.emit("인터넷 연결 상태를 확인하고 있습니다...")
-            time.sleep(0.3)
-            self.checkItemChanged.emit("internet", "success", "연결됨")
-            self.progressChanged.emit(45)
-            time.sleep(0.2)
-
-            # 5. Core modules (45-60%)
-            current_component = "core_modules"
-            self.checkItemChanged.emit("modules", "checking", "")
-            self.statusChanged.emit("필수 기능을 확인하고 있습니다...")
-            time.sleep(0.3)
-            self.checkItemChanged.emit("modules", "success", "확인 완료")
-            self.progressChanged.emit(60)
-            time.sleep(0.2)
-
-            # 6. OCR Engine (60-75%)
-            current_component = "ocr"
-            self.checkItemChanged.emit("ocr", "checking", "")
-            self.statusChanged.emit("자막 인식 기능을 준비하고 있습니다...")
-            time.sleep(0.3)
-            self._init_ocr()
-            self.progressChanged.emit(75)
-            time.sleep(0.2)
-
-            # 7. TTS directory (75-85%)
-            current_component = "tts_directory"
-            self.checkItemChanged.emit("tts_dir", "checking", "")
-            self.statusChanged.emit("음성 저장소를 준비하고 있습니다...")
-            time.sleep(0.3)
-            self.checkItemChanged.emit("tts_dir", "success", "준비 완료")
-            self.progressChanged.emit(85)
-            time.sleep(0.2)
-
-            # 8. API (85-92%)
-            current_component = "api_connectivity"
-            self.checkItemChanged.emit("api", "checking", "")
-            self.statusChanged.emit("서비스 서버에 연결하고 있습니다...")
-            time.sleep(0.3)
-            if self._check_api_connectivity():
-                self.checkItemChanged.emit("api", "success", "연결됨")
-            else:
-                self.checkItemChanged.emit("api", "warning", "연결 실패")
-            self.progressChanged.emit(92)
-            time.sleep(0.2)
-
-            # 9. Update check (92-100%)
-            current_component = "update_check"
-            self.checkItemChanged.emit("update_check", "checking", "")
-            self.statusChanged.emit("새로운 업데이트를 확인하고 있습니다...")
-            time.sleep(0.3)
-            update_info = self._check_update_info()
+            current_component = "startup_checks"
+            try:
+                self.run_checks(self._startup_checks())
+            except StartupCheckError as failure:
+                current_component = failure.component
+                raise failure.error
             self.progressChanged.emit(100)
-
-            # Final delay to show 100% before transitioning
             self.statusChanged.emit("모든 준비가 완료되었습니다!")
-            time.sleep(0.5)
+            logger.info("[Init] Startup checks ready in %.2fs", time.perf_counter() - started)
             self.finished.emit()
         except Exception as e:
             logger.exception("Unexpected startup initialization failure")
@@ -148,6 +87,80 @@ class Initializer(QtCore.QObject):
             )
             self.failed.emit(issue.to_dict())
 
+    def _startup_checks(self) -> List[StartupCheck]:
+        """Startup check graph; checks without ``after`` start immediately."""
+        return [
+            StartupCheck("system", "system_requirements",
+                         "컴퓨터 환경을 확인하고 있습니다...", 10, self._check_system),
+            StartupCheck("fonts", "fonts", "자막 폰트를 준비하고 있습니다...", 10,
+                         lambda: self.checkItemChanged.emit("fonts", "success", "준비 완료")),
+            StartupCheck("ffmpeg", "ffmpeg", "영상 편집 도구를 확인하고 있습니다...", 10,
+                         lambda: self.checkItemChanged.emit("ffmpeg", "success", "확인 완료")),
+            StartupCheck("internet", "internet", "인터넷 연결 상태를 확인하고 있습니다...", 15,
+                         lambda: self.checkItemChanged.emit("internet", "success", "연결됨")),
+            StartupCheck("modules", "core_modules", "필수 기능을 확인하고 있습니다...", 15,
+                         lambda: self.checkItemChanged.emit("modules", "success", "확인 완료")),
+            StartupCheck("ocr", "ocr", "자막 인식 기능을 준비하고 있습니다...", 15,
+                         self._init_ocr, after=("modules",)),
+            StartupCheck("tts_dir", "tts_directory", "음성 저장소를 준비하고 있습니다...", 10,
+                         lambda: self.checkItemChanged.emit("tts_dir", "success", "준비 완료")),
+            StartupCheck("api", "api_connectivity", "서비스 서버에 연결하고 있습니다...", 7,
+                         self._report_api_connectivity),
+            StartupCheck("update_check", "update_check",
+                         "새로운 업데이트를 확인하고 있습니다...", 8, self._check_update_info),
+        ]
+
+    def run_checks(self, checks: List[StartupCheck]) -> None:
+        """Run the check graph concurrently, reporting progress per completion.
+
+        Raises ``StartupCheckError`` for the first check that raises; checks
+        that have not started yet are cancelled.
+        """
+        pending = {check.item: check for check in checks}
+        done: set = set()
+        running: Dict[Future, StartupCheck] = {}
+        progress = 0
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, len(checks)), thread_name_prefix="startup-check"
+        )
+        try:
+            while pending or running:
+                for item, check in list(pending.items()):
+                    if all(dependency in done for dependency in check.after):
+                        del pending[item]
+                        self.checkItemChanged.emit(check.item, "checking", "")
+                        running[executor.submit(check.run)] = check
+                if not running:
+                    raise StartupCheckError(
+                        "startup_checks",
+                        RuntimeError(f"Unresolvable startup checks: {sorted(pending)}"),
+                    )
+                self.statusChanged.emit(next(iter(running.values())).status)
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    check = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        raise StartupCheckError(check.component, error)
+                    done.add(check.item)
+                    progress += check.weight
+                    self.progressChanged.emit(min(99, progress))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _check_system(self) -> None:
+        can_run, _issues, _warnings, _specs = check_system_requirements()
+        if can_run:
+            self.checkItemChanged.emit("system", "success", "정상")
+        else:
+            self.checkItemChanged.emit("system", "error", "환경 미충족")
+
+    def _report_api_connectivity(self) -> None:
+        if self._check_api_connectivity():
+            self.checkItemChanged.emit("api", "success", "연결됨")
+        else:
+            self.checkItemChanged.emit("api", "warning", "연결 실패")
+
     def _init_ocr(self):
         try:
             from utils.ocr_backend import create_ocr_reader
@@ -4,7 +4,9 @@ Pytest Configuration and Shared Fixtures
 Common test fixtures and setup for all tests.
 """
 
+import os
 import sys
+import uuid
 from pathlib import Path
 
 # Add project root to path
@@ -14,6 +16,50 @@ sys.path.insert(0, str(project_root))
 import pytest
 
 
+def pytest_collection_modifyitems(config, items):
+    """Timing comparisons depend on machine load; run them only on request."""
+    if os.getenv("SSMAKER_RUN_BENCHMARKS", "").strip().lower() in {"1", "true", "yes", "on"}:
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark (set SSMAKER_RUN_BENCHMARKS=1)")
+    for item in items:
+        if item.get_closest_marker("benchmark") is not None:
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True)
+def _flush_debounced_settings(monkeypatch):
+    """Write debounced settings while the test's HOME/monkeypatches still apply."""
+    yield
+    settings_module = sys.modules.get("managers.settings_manager")
+    if settings_module is not None:
+        settings_module.flush_all_settings()
+
+
+@pytest.fixture(autouse=True)
+def _reset_secret_cache():
+    """Tests monkeypatch the secret backends; never serve a previous test's values."""
+    secrets_module = sys.modules.get("utils.secrets_manager")
+    if secrets_module is not None:
+        secrets_module.SecretsManager.invalidate_cache()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cta_assets(monkeypatch, tmp_path_factory):
+    """Pre-rendered CTA audio must not leak between tests or into ~/.ssmaker."""
+    directory = tmp_path_factory.getbasetemp() / "cta_assets" / uuid.uuid4().hex
+    monkeypatch.setenv("SSMAKER_CTA_ASSET_DIR", str(directory))
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _isolate_speech_rates(monkeypatch, tmp_path_factory):
+    """Learned TTS speaking rates must not be read from or written to ~/.ssmaker."""
+    path = tmp_path_factory.getbasetemp() / "speech_rate" / uuid.uuid4().hex / "speech_rate.json"
+    monkeypatch.setenv("SSMAKER_SPEECH_RATE_PATH", str(path))
+    yield
+
+
 @pytest.fixture
 def sample_video_path(tmp_path):
     """Provide path to sample video (for testing)"""
@@ -0,0 +1,213 @@
+import os
+import subprocess
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import config
+from core.video import analysis_proxy
+from core.video.analysis_proxy import prepare_upload, proxy_stats
+from utils.ffmpeg import resolve_ffmpeg_exe
+
+
+SOURCE_BYTES = 6 * 1024 * 1024
+PROXY_BYTES = 300 * 1024
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats(monkeypatch):
+    analysis_proxy.reset_proxy_stats()
+    monkeypatch.setattr(analysis_proxy, "resolve_ffmpeg_exe", lambda: "ffmpeg")
+    yield
+    analysis_proxy.reset_proxy_stats()
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.mp4"
+    path.write_bytes(b"\0" * SOURCE_BYTES)
+    return str(path)
+
+
+class _FakeFfmpeg:
+    """Writes a small output file to the command's target path."""
+
+    def __init__(self, output_bytes=PROXY_BYTES, returncode=0):
+        self.output_bytes = output_bytes
+        self.returncode = returncode
+        self.commands = []
+
+    def __call__(self, cmd, timeout):
+        self.commands.append(cmd)
+        with open(cmd[-1], "wb") as handle:
+            handle.write(b"\1" * self.output_bytes)
+        return SimpleNamespace(returncode=self.returncode, stderr=b"boom")
+
+
+def test_off_mode_uploads_source_without_transcoding(source):
+    runner = _FakeFfmpeg()
+
+    media = prepare_upload(source, mode="off", runner=runner)
+
+    assert media.path == source
+    assert runner.commands == []
+    assert proxy_stats()["transcodes"] == 0
+
+
+def test_video_proxy_is_uploaded_and_accounted(source):
+    runner = _FakeFfmpeg()
+
+    media = prepare_upload(source, mode="video", runner=runner)
+    media.record_upload()
+    media.record_upload()  # retry after a key rotation re-uploads
+
+    assert media.path != source and media.path.endswith(".mp4")
+    assert os.path.getsize(media.path) == PROXY_BYTES
+    assert "-vf" in runner.commands[0] and "aac" in runner.commands[0]
+    stats = proxy_stats()
+    assert stats["uploads"] == 2
+    assert stats["bytes_uploaded"] == 2 * PROXY_BYTES
+    assert stats["source_bytes"] == 2 * SOURCE_BYTES
+    assert stats["transcodes"] == 1 and stats["transcode_seconds"] >= 0
+
+    media.cleanup()
+    assert not os.path.exists(media.path)
+    assert os.path.exists(source)
+
+
+def test_contact_sheet_only_where_allowed(source, monkeypatch):
+    runner = _FakeFfmpeg()
+    monkeypatch.setattr(analysis_proxy, "_probe_duration", lambda exe, path: 48.0)
+
+    downgraded = prepare_upload(source, mode="contact_sheet", runner=runner)
+    sheet = prepare_upload(source, mode="contact_sheet", allow_contact_sheet=True, runner=runner)
+
+    assert downgraded.mode == "video" and downgraded.path.endswith(".mp4")
+    assert sheet.mode == "contact_sheet" and sheet.path.endswith(".jpg")
+    assert "fps=16/48.000" in runner.commands[1][runner.commands[1].index("-vf") + 1]
+    assert "nokey" not in runner.commands[1]
+    downgraded.cleanup()
+    sheet.cleanup()
+
+
+def test_contact_sheet_without_duration_uses_video_proxy(source, monkeypatch):
+    runner = _FakeFfmpeg()
+    monkeypatch.setattr(analysis_proxy, "_probe_duration", lambda exe, path: 0.0)
+
+    media = prepare_upload(source, mode="contact_sheet", allow_contact_sheet=True, runner=runner)
+
+    assert media.mode == "video" and media.path.endswith(".mp4")
+    media.cleanup()
+
+
+def test_contact_sheet_samples_the_whole_video(tmp_path, monkeypatch):
+    ffmpeg_exe = resolve_ffmpeg_exe()
+    if not ffmpeg_exe:
+        pytest.skip("ffmpeg not available")
+    monkeypatch.setattr(analysis_proxy, "resolve_ffmpeg_exe", lambda: ffmpeg_exe)
+
+    # 밝기가 0 -> 255로 올라가는 20초 영상, 키프레임은 처음 한 장뿐
+    ramp = tmp_path / "ramp.mp4"
+    subprocess.run(
+        [
+            ffmpeg_exe, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", "color=black:s=160x120:r=10:d=20,format=gray,geq=lum='255*T/20'",
+            "-c:v", "libx264", "-g", "1000", "-pix_fmt", "yuv420p", str(ramp),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    media = prepare_upload(str(ramp), mode="contact_sheet", allow_contact_sheet=True, min_source_bytes=0)
+    try:
+        assert media.mode == "contact_sheet"
+        sheet = np.asarray(Image.open(media.path).convert("L"), dtype=float)
+    finally:
+        media.cleanup()
+    height, width = sheet.shape
+    tiles = [
+        sheet[row * height // 4 : (row + 1) * height // 4, col * width // 4 : (col + 1) * width // 4].mean()
+        for row in range(4)
+        for col in range(4)
+    ]
+    assert all(later > earlier + 5 for earlier, later in zip(tiles, tiles[1:]))
+    assert tiles[0] < 30 and tiles[-1] > 220
+
+
+@pytest.mark.parametrize(
+    "runner",
+    [_FakeFfmpeg(returncode=1), _FakeFfmpeg(output_bytes=SOURCE_BYTES + 1), _FakeFfmpeg(output_bytes=0)],
+    ids=["ffmpeg-error", "not-smaller", "empty"],
+)
+def test_failed_or_useless_transcode_falls_back_to_source(source, runner):
+    media = prepare_upload(source, mode="video", runner=runner)
+
+    assert media.path == source and not media.is_temporary
+    assert not os.path.exists(runner.commands[0][-1])
+    assert proxy_stats()["fallbacks"] == 1
+
+
+def test_missing_ffmpeg_or_small_source_uploads_source(source, tmp_path, monkeypatch):
+    small = tmp_path / "small.mp4"
+    small.write_bytes(b"\0" * 1024)
+    runner = _FakeFfmpeg()
+
+    assert prepare_upload(str(small), mode="video", runner=runner).path == str(small)
+    monkeypatch.setattr(analysis_proxy, "resolve_ffmpeg_exe", lambda: None)
+    assert prepare_upload(source, mode="video", runner=runner).path == source
+    assert runner.commands == []
+
+
+def test_validator_uploads_proxy_and_removes_it(source, monkeypatch):
+    from core.video import video_validator
+
+    runner = _FakeFfmpeg()
+    monkeypatch.setattr(analysis_proxy, "_run_ffmpeg", runner)
+    monkeypatch.setattr(config, "GEMINI_ANALYSIS_PROXY", "video")
+    uploaded = []
+
+    def upload(file):
+        uploaded.append((file, os.path.getsize(file)))
+        return SimpleNamespace(state="ACTIVE", name="files/1", uri="uri", mime_type="video/mp4")
+
+    response = SimpleNamespace(candidates=None, text='{"overall_score": 90, "status": "pass"}')
+    client = SimpleNamespace(
+        files=SimpleNamespace(upload=upload, delete=lambda name: None),
+        models=SimpleNamespace(generate_content=lambda **_kwargs: response),
+    )
+
+    video_validator.validate_final_video(SimpleNamespace(genai_client=client), source)
+
+    assert uploaded == [(runner.commands[0][-1], PROXY_BYTES)]
+    assert not os.path.exists(uploaded[0][0])
+    assert proxy_stats()["bytes_uploaded"] == PROXY_BYTES
+
+
+def test_validator_uses_still_image_prompt_for_contact_sheet(source, monkeypatch):
+    from core.video import video_validator
+    from prompts import get_contact_sheet_validation_prompt
+
+    monkeypatch.setattr(analysis_proxy, "_run_ffmpeg", _FakeFfmpeg())
+    monkeypatch.setattr(analysis_proxy, "_probe_duration", lambda exe, path: 30.0)
+    monkeypatch.setattr(config, "GEMINI_ANALYSIS_PROXY", "contact_sheet")
+    requests = []
+
+    response = SimpleNamespace(
+        candidates=None,
+        text='{"validation_result": {"overall_pass": true, "score": 90, "subtitle_sync": {"pass": false, "score": 0}}}',
+    )
+    client = SimpleNamespace(
+        files=SimpleNamespace(
+            upload=lambda file: SimpleNamespace(state="ACTIVE", name="files/1", uri="uri", mime_type="image/jpeg"),
+            delete=lambda name: None,
+        ),
+        models=SimpleNamespace(generate_content=lambda **kwargs: requests.append(kwargs) or response),
+    )
+
+    result = video_validator.validate_final_video(SimpleNamespace(genai_client=client), source)
+
+    assert requests[0]["contents"][1] == get_contact_sheet_validation_prompt()
+    assert result["validation_result"]["subtitle_sync"]["skipped"] is True
+    assert "subtitle_sync" not in video_validator.get_failed_items(result)
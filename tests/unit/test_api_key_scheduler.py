@@ -0,0 +1,395 @@
+import threading
+import time
+from collections import deque
+
+import pytest
+from google.genai import types
+
+import config
+from core.api.ApiKeyManager import APIKeyManager
+from core.api.key_scheduler import KeyQuotaScheduler
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeQuotaServer:
+    """Sliding 60-second RPM/TPM quota per key; rejected calls do not count."""
+
+    def __init__(self, clock, limits):
+        self.clock = clock
+        self.limits = limits
+        self.history = {key: deque() for key in limits}
+
+    def call(self, key, tokens):
+        now = self.clock()
+        history = self.history[key]
+        while history and history[0][0] <= now - 60:
+            history.popleft()
+        rpm, tpm = self.limits[key]
+        if len(history) + 1 > rpm:
+            return "requests"
+        if sum(used for _at, used in history) + tokens > tpm:
+            return "tokens"
+        history.append((now, tokens))
+        return None
+
+
+LIMITS = {
+    "api_1": (10, 1_000_000),
+    "api_2": (20, 1_000_000),
+    "api_3": (30, 1_000_000),
+    "api_4": (100, 6_000),  # token bound: 12 requests of 500 tokens per minute
+}
+CAPACITY_PER_MINUTE = 10 + 20 + 30 + 12
+REQUEST_TOKENS = 500
+
+
+def _simulate_scheduler(minutes):
+    clock = _Clock()
+    server = _FakeQuotaServer(clock, LIMITS)
+    scheduler = KeyQuotaScheduler(clock=clock)
+    scheduler.set_keys(LIMITS)
+    served = limited = 0
+    warmup_end = clock.now + 120
+    end = clock.now + minutes * 60
+    while clock.now < end:
+        key = scheduler.try_acquire(REQUEST_TOKENS)
+        if key is None:
+            clock.now += max(scheduler.next_ready_in(REQUEST_TOKENS), 0.001)
+            continue
+        rejected = server.call(key, REQUEST_TOKENS)
+        if clock.now >= warmup_end:
+            limited += bool(rejected)
+            served += not rejected
+        if rejected:
+            scheduler.report_rate_limited(key, kind=rejected)
+        else:
+            scheduler.report_success(key, REQUEST_TOKENS, REQUEST_TOKENS)
+    return served, limited, scheduler
+
+
+def _simulate_round_robin_with_block(minutes):
+    """The previous policy: rotate keys, block one for 5 minutes on a 429."""
+    clock = _Clock()
+    server = _FakeQuotaServer(clock, LIMITS)
+    blocked = {}
+    order = list(LIMITS)
+    index = -1
+    served = 0
+    warmup_end = clock.now + 120
+    end = clock.now + minutes * 60
+    while clock.now < end:
+        available = [key for key in order if blocked.get(key, 0) <= clock.now]
+        if not available:
+            clock.now = min(blocked.values())
+            continue
+        index = (index + 1) % len(available)
+        key = available[index]
+        if server.call(key, REQUEST_TOKENS):
+            blocked[key] = clock.now + 300
+        elif clock.now >= warmup_end:
+            served += 1
+        clock.now += 0.5  # one request in flight at a time
+    return served
+
+
+def test_scheduler_learns_quotas_and_saturates_every_key():
+    served, limited, scheduler = _simulate_scheduler(minutes=12)
+
+    steady_capacity = CAPACITY_PER_MINUTE * 10
+    assert served >= 0.85 * steady_capacity, served
+    assert limited <= 0.05 * served, (limited, served)
+    assert scheduler.limits("api_1")[0] <= 11
+    assert scheduler.limits("api_4")[1] <= 6_600
+
+    baseline = _simulate_round_robin_with_block(minutes=12)
+    assert served >= 2 * baseline, (served, baseline)
+
+
+def _fail_on_wait(*_args, **_kwargs):
+    pytest.fail("scheduler waited for a key")
+
+
+def test_exhausted_key_does_not_stall_other_keys(monkeypatch):
+    scheduler = KeyQuotaScheduler()
+    scheduler.set_keys(["api_1", "api_2"])
+    scheduler.report_rate_limited("api_1", retry_after=30)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(scheduler._cond, "wait", _fail_on_wait)
+        grants = [scheduler.try_acquire() for _ in range(3)]
+
+    assert grants == ["api_2", "api_2", "api_2"]
+    scheduler.block("api_2", 30)
+    assert scheduler.try_acquire() is None
+    assert scheduler.acquire(timeout=0.05) is None
+
+
+def test_waiters_are_served_in_arrival_order():
+    scheduler = KeyQuotaScheduler(rpm=600)  # bucket of 60, refills 10/s
+    scheduler.set_keys(["api_1"])
+    while scheduler.try_acquire() is not None:
+        pass
+
+    order = []
+
+    def wait(index):
+        assert scheduler.acquire(timeout=5) == "api_1"
+        order.append(index)
+
+    threads = []
+    for index in range(4):
+        thread = threading.Thread(target=wait, args=(index,))
+        thread.start()
+        threads.append(thread)
+        deadline = time.monotonic() + 2
+        while len(scheduler._waiters) < index + 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    # A newcomer may not jump the queue even if a token appears meanwhile.
+    assert scheduler.try_acquire() is None
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == [0, 1, 2, 3]
+
+
+def test_manager_hands_out_other_key_while_one_is_blocked(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1", "api_2": "value-2"})
+    manager = APIKeyManager(use_secrets_manager=False)
+
+    first = manager.get_available_key()
+    manager.block_current_key(duration_minutes=5)
+    monkeypatch.setattr(manager.scheduler._cond, "wait", _fail_on_wait)
+    second = manager.get_available_key()
+
+    assert {first, second} == {"value-1", "value-2"}
+    assert "차단됨" in manager.get_status()
+
+    manager.block_current_key(duration_minutes=5)
+    with pytest.raises(Exception, match="모든 API 키가 차단됨"):
+        manager.get_available_key()
+
+
+def test_manager_grant_feedback_learns_rate_limit(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1"})
+    manager = APIKeyManager(use_secrets_manager=False)
+
+    grants = [manager.acquire_key(estimated_tokens=100, blocking=False) for _ in range(4)]
+    for grant in grants[:3]:
+        manager.report_success(grant, tokens_used=80)
+    manager.report_rate_limited(grants[3].key_name, retry_after=0)
+
+    rpm, _tpm = manager.scheduler.limits("api_1")
+    assert rpm == pytest.approx(3 * 0.9)
+
+
+def test_picking_a_client_key_does_not_spend_request_quota(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1", "api_2": "value-2"})
+    manager = APIKeyManager(use_secrets_manager=False)
+
+    picked = [manager.get_available_key() for _ in range(500)]
+
+    assert picked[:4] == ["value-1", "value-2", "value-1", "value-2"]
+    assert manager.acquire_key(blocking=False) is not None
+
+
+def test_untracked_rate_limit_only_cools_the_key(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1", "api_2": "value-2"})
+    manager = APIKeyManager(use_secrets_manager=False)
+
+    # pick()으로 고른 클라이언트 키는 창에 기록된 요청이 없음
+    manager.get_available_key()
+    manager.report_rate_limited()
+
+    assert manager.scheduler.limits("api_1") == (60.0, 1_000_000.0)
+    assert manager.acquire_key(blocking=False).key_name == "api_2"
+
+
+def test_repeated_report_of_one_429_learns_once():
+    clock = _Clock()
+    scheduler = KeyQuotaScheduler(clock=clock)
+    scheduler.set_keys(["api_1"])
+    for _ in range(5):
+        scheduler.try_acquire()
+    scheduler.report_rate_limited("api_1")
+    scheduler.report_rate_limited("api_1")
+
+    assert scheduler.limits("api_1")[0] == pytest.approx(4 * 0.9)
+
+
+class _StubModels:
+    def __init__(self, clock, rpm):
+        self.clock = clock
+        self.rpm = rpm
+        self.accepted = deque()
+
+    def generate_content(self, *, model, contents):
+        while self.accepted and self.accepted[0] <= self.clock() - 60:
+            self.accepted.popleft()
+        if len(self.accepted) >= self.rpm:
+            raise RuntimeError("429 RESOURCE_EXHAUSTED")
+        self.accepted.append(self.clock())
+        return type("Response", (), {"usage_metadata": None, "text": "ok"})()
+
+
+def test_metered_app_client_learns_from_real_traffic_and_recovers(monkeypatch):
+    from core.api.gemini_requests import SingleFlight, wrap_client
+
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1"})
+    clock = _Clock()
+    manager = APIKeyManager(use_secrets_manager=False)
+    manager.scheduler = KeyQuotaScheduler(clock=clock)
+    models = _StubModels(clock, rpm=20)
+    client = wrap_client(
+        type("Client", (), {"models": models})(), SingleFlight(), meter=manager.meter("api_1")
+    )
+
+    with pytest.raises(RuntimeError, match="429"):
+        for index in range(25):
+            client.models.generate_content(model="m", contents=f"요청 {index}")
+            clock.now += 0.5
+
+    rpm, _tpm = manager.scheduler.limits("api_1")
+    assert rpm == pytest.approx(20 * 0.9)
+    # 성공하면 학습한 한도가 다시 올라감
+    clock.now += 60
+    for index in range(10):
+        client.models.generate_content(model="m", contents=f"다음 {index}")
+        clock.now += 4
+    assert manager.scheduler.limits("api_1")[0] > rpm
+    assert manager.meter("api_9") is None
+
+
+def test_app_client_requests_are_spread_across_keys(monkeypatch):
+    from core.api.gemini_requests import SingleFlight, wrap_client
+
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1", "api_2": "value-2", "api_3": "value-3"})
+    clock = _Clock()
+    manager = APIKeyManager(use_secrets_manager=False)
+    manager.scheduler = KeyQuotaScheduler(clock=clock)
+    models = {value: _StubModels(clock, rpm=100) for value in ("value-1", "value-2", "value-3")}
+    meter = manager.meter(
+        "api_1", client_factory=lambda value: type("Client", (), {"models": models[value]})()
+    )
+    client = wrap_client(type("Client", (), {"models": models["value-1"]})(), SingleFlight(), meter=meter)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(manager.scheduler._cond, "wait", _fail_on_wait)
+        for index in range(30):
+            client.models.generate_content(model="m", contents=f"분석 {index}")
+
+    # 버킷(6건)이 빈 키가 있어도 기다리지 않고 원래 키로 보냄
+    assert sum(len(stub.accepted) for stub in models.values()) == 30
+    assert all(len(stub.accepted) >= 6 for stub in models.values())
+
+
+def test_get_available_key_waits_only_when_asked(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1"})
+    manager = APIKeyManager(use_secrets_manager=False)
+    manager.get_available_key()
+    manager.scheduler.block("api_1", 0.05)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(manager.scheduler._cond, "wait", _fail_on_wait)
+        with pytest.raises(Exception, match="모든 API 키가 차단됨"):
+            manager.get_available_key()
+
+    manager.current_key = None
+    assert manager.get_available_key(wait_seconds=1) == "value-1"
+    # 기다린 뒤에도 할당량은 예약하지 않고 current_key를 정함
+    assert manager.current_key == "api_1"
+    assert not manager.scheduler._quotas["api_1"].requests
+
+
+class _KeyedClient:
+    """Records which key each upload and generate call went out on."""
+
+    def __init__(self, key_value, calls):
+        from types import SimpleNamespace
+
+        def upload(file):
+            calls.append(("upload", key_value))
+            return types.File(name="files/clip", uri=f"https://files/{key_value}/clip", mime_type="video/mp4")
+
+        def generate_content(*, model, contents):
+            calls.append(("generate", key_value))
+            return type("Response", (), {"usage_metadata": None, "text": "ok"})()
+
+        self.files = SimpleNamespace(upload=upload)
+        self.models = SimpleNamespace(generate_content=generate_content)
+
+
+def test_requests_with_uploaded_files_stay_on_the_uploading_key(monkeypatch):
+    from core.api.gemini_requests import SingleFlight, wrap_client
+
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1", "api_2": "value-2"})
+    manager = APIKeyManager(use_secrets_manager=False)
+    calls = []
+    meter = manager.meter("api_1", client_factory=lambda value: _KeyedClient(value, calls))
+    client = wrap_client(_KeyedClient("value-1", calls), SingleFlight(), meter=meter)
+
+    for index in range(4):
+        uploaded = client.files.upload(file=f"clip_{index}.mp4")
+        client.models.generate_content(model="m", contents=[f"분석 {index}", uploaded])
+        client.models.generate_content(
+            model="m",
+            contents=[types.Part.from_uri(file_uri=uploaded.uri, mime_type="video/mp4"), "번역"],
+        )
+    client.models.generate_content(model="m", contents="텍스트만")
+    client.models.generate_content(model="m", contents="텍스트만 2")
+
+    file_calls = calls[: 4 * 3]
+    assert {key for _kind, key in file_calls} == {"value-1"}
+    # 파일이 없는 요청은 여전히 다른 키로 나뉨
+    assert "value-2" in {key for _kind, key in calls[4 * 3:]}
+
+
+def test_per_request_grants_do_not_move_current_key(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1", "api_2": "value-2"})
+    manager = APIKeyManager(use_secrets_manager=False)
+    manager.get_available_key()
+    client_key = manager.current_key
+
+    grants = [manager.acquire_key(blocking=False) for _ in range(3)]
+    assert {grant.key_name for grant in grants} == {"api_1", "api_2"}
+    assert manager.current_key == client_key
+
+    # TTS 429를 처리하는 block_current_key()는 앱 클라이언트의 키만 막음
+    manager.block_current_key(duration_minutes=5)
+    assert manager.acquire_key(blocking=False).key_name != client_key
+
+
+
+def test_failed_calls_settle_tokens_without_raising_learned_limits(monkeypatch):
+    from core.api.gemini_requests import SingleFlight, wrap_client
+
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {"api_1": "value-1"})
+    clock = _Clock()
+    manager = APIKeyManager(use_secrets_manager=False)
+    manager.scheduler = KeyQuotaScheduler(clock=clock)
+    for _ in range(4):
+        manager.acquire_key(blocking=False)
+    manager.report_rate_limited("api_1", retry_after=0)
+    learned = manager.scheduler.limits("api_1")
+
+    def broken(*, model, contents):
+        raise ValueError("400 INVALID_ARGUMENT")
+
+    client = wrap_client(
+        type("Client", (), {"models": type("Models", (), {"generate_content": staticmethod(broken)})()})(),
+        SingleFlight(),
+        meter=manager.meter("api_1"),
+    )
+    for index in range(5):
+        clock.now += 20
+        with pytest.raises(ValueError):
+            client.models.generate_content(model="m", contents=f"잘못된 요청 {index}")
+
+    assert manager.scheduler.limits("api_1") == learned
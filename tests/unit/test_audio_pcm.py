@@ -0,0 +1,145 @@
+import io
+import os
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from core.audio import pcm
+from core.audio.pipeline import AudioPipeline
+from core.video.batch.audio_utils import _prepare_segment, _write_wave_fallback
+
+RATE = 24000
+
+
+def _speech_like_pcm(seconds, lead=0.4, tail=0.6):
+    """Gemini-style headerless 16-bit mono PCM: silence, voiced syllables, silence."""
+    rng = np.random.default_rng(7)
+    t = np.arange(int(seconds * RATE)) / RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    voiced = np.sin(2 * np.pi * np.cumsum(pitch) / RATE) + 0.3 * np.sin(4 * np.pi * np.cumsum(pitch) / RATE)
+    envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None) ** 0.5
+    body = 0.4 * voiced * envelope + 0.01 * rng.standard_normal(len(t))
+    audio = np.concatenate([np.zeros(int(lead * RATE)), body, np.zeros(int(tail * RATE))])
+    return (audio * 32767).astype("<i2").tobytes()
+
+
+def _pipeline(tmp_path):
+    app = SimpleNamespace(tts_output_dir=str(tmp_path))
+    pipeline = AudioPipeline(app)
+    pipeline._analyze_with_whisper = lambda path, script, segments, duration: ([], "test", 0.0, duration)
+    return pipeline
+
+
+def _gemini_client(audio_bytes):
+    part = SimpleNamespace(inline_data=SimpleNamespace(data=audio_bytes))
+    response = SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+    return SimpleNamespace(models=SimpleNamespace(generate_content=lambda **_kwargs: response))
+
+
+def _disk_round_trip_chain(audio_bytes, tmp_path, speed_ratio=1.2):
+    """The previous post-processing: save, reload, export prepared copy, speed up, reload."""
+    original_path = str(tmp_path / "tts_full.wav")
+    with wave.open(original_path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(audio_bytes)
+    prepared = _prepare_segment(AudioSegment.from_file(original_path, format="wav"))
+    _write_wave_fallback(prepared, original_path, sample_rate=44100)
+    speeded_path = str(tmp_path / "tts_speeded.wav")
+    # ffmpeg atempo path needs the binary; without it the pipeline used pydub speedup.
+    prepared.speedup(playback_speed=speed_ratio, chunk_size=150, crossfade=25).export(speeded_path, format="wav")
+    AudioSegment.from_file(speeded_path)
+    return len(prepared) / 1000.0
+
+
+def test_decode_accepts_raw_gemini_pcm_and_riff():
+    raw = _speech_like_pcm(0.5, lead=0, tail=0)
+    samples, rate = pcm.decode_wav_bytes(raw)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(44100)
+        wf.writeframes(np.repeat(np.frombuffer(raw, "<i2"), 2).tobytes())
+    stereo, stereo_rate = pcm.decode_wav_bytes(buffer.getvalue())
+
+    assert (rate, samples.shape) == (RATE, (len(raw) // 2, 1))
+    assert (stereo_rate, stereo.shape) == (44100, (len(raw) // 2, 2))
+    np.testing.assert_array_equal(pcm.to_int16(samples)[:, 0], np.frombuffer(raw, "<i2"))
+
+
+def test_tempo_change_keeps_pitch_and_scales_duration():
+    t = np.arange(44100 * 3) / 44100
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)[:, None]
+
+    faster = pcm.change_tempo(tone, 44100, 1.25)
+
+    assert len(faster) == round(len(tone) / 1.25)
+    spectrum = np.abs(np.fft.rfft(faster[:, 0]))
+    assert np.argmax(spectrum) * 44100 / len(faster) == pytest.approx(440, abs=2)
+    rms = np.sqrt((faster[2205 : len(faster) // 441 * 441 - 2205, 0].reshape(-1, 441) ** 2).mean(axis=1))
+    assert rms.min() > 0.95 * (0.5 / np.sqrt(2))
+
+
+def test_gemini_clip_is_processed_in_memory_and_written_once(tmp_path):
+    raw = _speech_like_pcm(4.0)
+    pipeline = _pipeline(tmp_path)
+    pipeline.app.genai_client = _gemini_client(raw)
+    pipeline.app.config = SimpleNamespace(GEMINI_TTS_MODEL="tts-test")
+
+    result = pipeline._generate_take("대본", "Charon", ["대본"]).result
+
+    assert os.listdir(tmp_path) == [os.path.basename(result.audio_path)]
+    with wave.open(result.audio_path, "rb") as wf:
+        assert (wf.getframerate(), wf.getnchannels()) == (44100, 2)
+        assert wf.getnframes() / 44100 == pytest.approx(result.speeded_duration, abs=1e-3)
+    # Leading/trailing silence trimmed as before, then 1.2x.
+    assert result.original_duration == pytest.approx(4.0, abs=0.1)
+    assert result.speeded_duration == pytest.approx(result.original_duration / 1.2, abs=0.01)
+
+
+def test_in_memory_chain_matches_disk_round_trips(tmp_path):
+    raw = _speech_like_pcm(20.0)
+    pipeline = _pipeline(tmp_path / "new")
+    os.makedirs(pipeline.app.tts_output_dir)
+    pipeline.app.genai_client = _gemini_client(raw)
+    pipeline.app.config = SimpleNamespace(GEMINI_TTS_MODEL="tts-test")
+
+    old_original_duration = _disk_round_trip_chain(raw, tmp_path)
+    result = pipeline._generate_take("대본", "Charon", ["대본"]).result
+
+    assert result.original_duration == pytest.approx(old_original_duration, abs=0.02)
+    assert os.listdir(pipeline.app.tts_output_dir) == [os.path.basename(result.audio_path)]
+
+
+def _best_of(runs, fn):
+    """Fastest of ``runs`` timed calls after one untimed warm-up call."""
+    result = fn()
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+@pytest.mark.benchmark
+def test_per_clip_latency_beats_disk_round_trips(tmp_path):
+    raw = _speech_like_pcm(20.0)
+    pipeline = _pipeline(tmp_path / "new")
+    os.makedirs(pipeline.app.tts_output_dir)
+    pipeline.app.genai_client = _gemini_client(raw)
+    pipeline.app.config = SimpleNamespace(GEMINI_TTS_MODEL="tts-test")
+
+    # Both paths warm up once, so pydub/wave cold start is not charged to either.
+    old_latency, old_original_duration = _best_of(5, lambda: _disk_round_trip_chain(raw, tmp_path))
+    new_latency, result = _best_of(5, lambda: pipeline._generate_take("대본", "Charon", ["대본"]).result)
+
+    assert result.original_duration == pytest.approx(old_original_duration, abs=0.02)
+    assert new_latency < old_latency, (new_latency, old_latency)
@@ -1,78 +1,85 @@
 import asyncio
+import io
 import sys
 from pathlib import Path
 from types import SimpleNamespace
 
-from core.audio.pipeline import AudioPipeline, _run_coro_in_isolated_loop
-
-
-def test_run_coro_in_isolated_loop_without_running_loop():
+import av
+import numpy as np
+import pytest
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from core.audio import pcm
+from core.audio.edge_tts_stream import get_background_loop
+from core.audio.pipeline import AudioPipeline
+
+
+def _mp3_bytes(seconds, rate=24000):
+    """Edge TTS-style 48kbps mono MP3."""
+    buffer = io.BytesIO()
+    with av.open(buffer, "w", format="mp3") as container:
+        stream = container.add_stream("libmp3lame", rate=rate, layout="mono")
+        stream.bit_rate = 48000
+        t = np.arange(int(seconds * rate)) / rate
+        frame = av.AudioFrame.from_ndarray(
+            (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype(np.int16)[None, :], format="s16", layout="mono"
+        )
+        frame.sample_rate = rate
+        for packet in [*stream.encode(frame), *stream.encode(None)]:
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+def test_background_loop_runs_coro_without_running_loop():
     async def sample():
         return 7
 
-    assert _run_coro_in_isolated_loop(sample()) == 7
+    assert get_background_loop().run(sample()) == 7
 
 
-def test_run_coro_in_isolated_loop_with_running_loop():
+def test_background_loop_runs_coro_with_running_loop():
     async def inner():
-        return _run_coro_in_isolated_loop(asyncio.sleep(0, result=11))
+        return get_background_loop().run(asyncio.sleep(0, result=11))
 
     assert asyncio.run(inner()) == 11
 
 
-def test_generate_edge_tts_wav_works_inside_running_loop(monkeypatch, tmp_path):
-    output_path = tmp_path / "edge.wav"
+def test_generate_edge_tts_samples_works_inside_running_loop(monkeypatch):
+    mp3 = _mp3_bytes(0.4)
 
     class FakeCommunicate:
         def __init__(self, text, voice):
             self.text = text
             self.voice = voice
 
-        async def save(self, mp3_path):
-            Path(mp3_path).write_bytes(b"fake-mp3")
+        async def stream(self):
+            yield {"type": "WordBoundary", "offset": 0, "duration": 0, "text": self.text}
+            for start in range(0, len(mp3), 700):
+                yield {"type": "audio", "data": mp3[start : start + 700]}
 
     fake_module = SimpleNamespace(Communicate=FakeCommunicate)
     monkeypatch.setitem(sys.modules, "edge_tts", fake_module)
 
-    class FakeAudio:
-        def export(self, output, format):
-            Path(output).write_bytes(b"RIFFfakewav")
-
     app = SimpleNamespace(edge_tts_voice="ko-KR-HyunsuMultilingualNeural")
     pipeline = SimpleNamespace(app=app)
-    monkeypatch.setattr("core.audio.pipeline.AudioSegment.from_file", lambda *_args, **_kwargs: FakeAudio())
 
     async def inner():
         from core.audio.pipeline import AudioPipeline
 
-        AudioPipeline._generate_edge_tts_wav(pipeline, "테스트", str(output_path))
-
-    asyncio.run(inner())
+        return AudioPipeline._generate_edge_tts_samples(pipeline, "테스트")
 
-    assert output_path.exists()
+    samples, rate = asyncio.run(inner())
+    assert rate == 24000 and samples.shape[1] == 1
+    assert len(samples) / rate == pytest.approx(0.4, abs=0.08)
 
 
-def test_generate_tts_internal_skips_gemini_when_client_missing(monkeypatch, tmp_path):
+def test_generate_take_skips_gemini_when_client_missing(monkeypatch, tmp_path):
     calls = {"edge": 0}
 
-    class FakeAudio:
-        channels = 2
-        sample_width = 2
-        raw_data = b"\0" * 44100
-
-        @property
-        def duration_seconds(self):
-            return 1.0
-
-        def __len__(self):
-            return 1000
-
-        def export(self, output, format, parameters=None):
-            Path(output).write_bytes(b"RIFFfakewav")
-
-    def fake_edge(self, text, output_path):
+    def fake_edge(self, text):
         calls["edge"] += 1
-        Path(output_path).write_bytes(b"RIFFfakewav")
+        return pcm.from_segment(AudioSegment.silent(duration=300) + Sine(440).to_audio_segment(duration=1200))
 
     app = SimpleNamespace(
         genai_client=None,
@@ -82,11 +89,7 @@ def test_generate_tts_internal_skips_gemini_when_client_missing(monkeypatch, tmp
     )
     pipeline = AudioPipeline(app)
 
-    monkeypatch.setattr(AudioPipeline, "_generate_edge_tts_wav", fake_edge)
-    monkeypatch.setattr("core.audio.pipeline.AudioSegment.from_file", lambda *_args, **_kwargs: FakeAudio())
-    monkeypatch.setattr("core.video.batch.audio_utils._prepare_segment", lambda segment: segment)
-    monkeypatch.setattr("core.video.batch.audio_utils._ensure_pydub_converter", lambda: None)
-    monkeypatch.setattr(pipeline, "_apply_speed", lambda path, *_args: (path, 1.0))
+    monkeypatch.setattr(AudioPipeline, "_generate_edge_tts_samples", fake_edge)
     monkeypatch.setattr(
         pipeline,
         "_analyze_with_whisper",
@@ -98,8 +101,11 @@ def test_generate_tts_internal_skips_gemini_when_client_missing(monkeypatch, tmp
         ),
     )
 
-    result = pipeline._generate_tts_internal("test script", "Charon", ["test script"])
+    result = pipeline._generate_take("test script", "Charon", ["test script"]).result
 
     assert calls["edge"] == 1
     assert Path(result.audio_path).exists()
     assert result.timestamps_source == "test_fallback"
+    assert result.original_duration == pytest.approx(1.2, abs=0.02)
+    assert result.speeded_duration == pytest.approx(1.0, abs=0.02)
+    assert [p.name for p in tmp_path.iterdir()] == [Path(result.audio_path).name]
@@ -0,0 +1,145 @@
+import time
+import wave
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+from pydub.silence import detect_leading_silence
+
+from core.video.batch.audio_utils import _trim_silence
+
+
+def _reference_trim(segment, silence_threshold_db=-45, chunk_size_ms=10, minimum_retain_ms=120):
+    """The previous pydub implementation (10 ms Python loop plus a full reverse)."""
+    start_trim = detect_leading_silence(segment, silence_threshold=silence_threshold_db, chunk_size=chunk_size_ms)
+    end_trim = detect_leading_silence(
+        segment.reverse(), silence_threshold=silence_threshold_db, chunk_size=chunk_size_ms
+    )
+    if start_trim <= 0 and end_trim <= 0:
+        return segment
+    trimmed = segment[start_trim : len(segment) - end_trim if end_trim else None]
+    if len(trimmed) < minimum_retain_ms:
+        return segment
+    return trimmed
+
+
+def _clip(rng, seconds, rate, channels, sample_width, lead, tail, level_db=-25.0):
+    frames = int(seconds * rate)
+    amplitude = 2 ** (8 * sample_width - 1)
+    audio = rng.standard_normal((frames, channels)) * amplitude * 10 ** (level_db / 20)
+    lead_frames, tail_frames = int(lead * rate), int(tail * rate)
+    # quiet room tone around the speech, below the -45 dBFS cut
+    audio[:lead_frames] *= 10 ** (-35 / 20)
+    if tail_frames:
+        audio[-tail_frames:] *= 10 ** (-35 / 20)
+    dtype = {1: np.int8, 2: np.int16, 4: np.int32}[sample_width]
+    data = np.clip(np.round(audio), -amplitude, amplitude - 1).astype(dtype)
+    return AudioSegment(data=data.tobytes(), sample_width=sample_width, frame_rate=rate, channels=channels)
+
+
+@pytest.mark.parametrize("rate", [22050, 24000, 44100, 48000])
+@pytest.mark.parametrize("channels", [1, 2])
+@pytest.mark.parametrize("sample_width", [1, 2, 4])
+def test_matches_pydub_trim_exactly(rate, channels, sample_width):
+    rng = np.random.default_rng(rate + channels + sample_width)
+    for _ in range(4):
+        segment = _clip(
+            rng,
+            seconds=rng.uniform(0.3, 2.5),
+            rate=rate,
+            channels=channels,
+            sample_width=sample_width,
+            lead=rng.uniform(0, 0.4),
+            tail=rng.uniform(0, 0.4),
+            level_db=rng.uniform(-60, -20),
+        )
+        for threshold, chunk in ((-45, 10), (-50.5, 7), (-40, 20)):
+            expected = _reference_trim(segment, threshold, chunk)
+            actual = _trim_silence(segment, silence_threshold_db=threshold, chunk_size_ms=chunk)
+            assert actual.raw_data == expected.raw_data, (threshold, chunk)
+
+
+def test_edge_cases_match_pydub():
+    silent = AudioSegment.silent(duration=500, frame_rate=44100)
+    odd_length = AudioSegment(data=b"\x10\x20" * 1003, sample_width=2, frame_rate=44100, channels=1)
+    too_short_after_trim = AudioSegment.silent(duration=400) + _clip(
+        np.random.default_rng(1), 0.05, 44100, 1, 2, 0, 0
+    ) + AudioSegment.silent(duration=400)
+
+    for segment in (silent, odd_length, too_short_after_trim, AudioSegment.empty()):
+        assert _trim_silence(segment).raw_data == _reference_trim(segment).raw_data
+
+
+def _long_clips():
+    rng = np.random.default_rng(60)
+    clips = [_clip(rng, 60, 44100, 2, 2, lead=0.3, tail=0.5) for _ in range(3)]
+    clips.append(_clip(rng, 60, 44100, 2, 2, lead=30, tail=29.5))  # long silences: worst case for the loop
+    return clips
+
+
+def test_trim_on_60_second_clips_skips_the_chunk_loop_and_reverse(monkeypatch):
+    clips = _long_clips()
+    expected = [_reference_trim(clip) for clip in clips]
+
+    # 청크 루프(AudioSegment 슬라이스별 dBFS)와 전체 reverse 없이 한 번에 계산
+    monkeypatch.setattr(AudioSegment, "reverse", pytest.fail)
+    monkeypatch.setattr(AudioSegment, "dBFS", property(pytest.fail))
+    actual = [_trim_silence(clip) for clip in clips]
+
+    assert [a.raw_data == e.raw_data for a, e in zip(actual, expected)] == [True] * len(clips)
+
+
+@pytest.mark.benchmark
+def test_trim_on_60_second_clips_is_faster():
+    clips = _long_clips()
+
+    start = time.perf_counter()
+    expected = [_reference_trim(clip) for clip in clips]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [_trim_silence(clip) for clip in clips]
+    vector_seconds = time.perf_counter() - start
+
+    print(f"trim 4x60s clips: pydub loop {loop_seconds * 1000:.0f}ms, numpy {vector_seconds * 1000:.0f}ms")
+    assert [a.raw_data == e.raw_data for a, e in zip(actual, expected)] == [True] * len(clips)
+    assert vector_seconds < loop_seconds / 1.5, (vector_seconds, loop_seconds)
+
+
+def _write_wav(path, samples, rate=24000, channels=1, sample_width=2):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sample_width)
+        wf.setframerate(rate)
+        wf.writeframes(samples.tobytes())
+
+
+@pytest.mark.parametrize(
+    "lead_samples, expected",
+    [(0, 0.0), (2400, 0.1), (12000, 0.5), (12001, 0.0), (24000, 0.0)],
+)
+def test_audio_start_offset_only_scans_first_half_second(tmp_path, lead_samples, expected):
+    from core.video.VideoTool import _detect_audio_start_offset
+
+    audio = np.zeros(48000, dtype=np.int16)
+    audio[lead_samples:] = 8000
+    audio[-1] = -32768  # loudest sample is negative full scale
+    path = tmp_path / "tts.wav"
+    _write_wav(path, audio)
+
+    assert _detect_audio_start_offset(str(path)) == pytest.approx(expected)
+
+
+def test_audio_start_offset_handles_stereo_and_8bit(tmp_path):
+    from core.video.VideoTool import _detect_audio_start_offset
+
+    stereo = np.zeros((24000, 2), dtype=np.int16)
+    stereo[4800:, 0] = 1000  # left channel decides
+    stereo[:, 1] = 1000
+    _write_wav(tmp_path / "stereo.wav", stereo, channels=2)
+    eight_bit = np.full(24000, 128, dtype=np.uint8)
+    eight_bit[1200:] = 200
+    _write_wav(tmp_path / "8bit.wav", eight_bit, sample_width=1)
+
+    assert _detect_audio_start_offset(str(tmp_path / "stereo.wav")) == pytest.approx(0.2)
+    assert _detect_audio_start_offset(str(tmp_path / "8bit.wav")) == pytest.approx(0.05)
@@ -0,0 +1,220 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import ImageDraw
+
+from core.audio import pcm
+from core.audio.cta_assets import CTAAssetStore
+from core.audio.pipeline import AudioConfig, AudioPipeline
+from core.video import VideoTool
+from ui.panels.cta_panel import CTA_OPTIONS
+from utils.korean_text_processor import process_korean_script
+
+RATE = 16000
+CTA_LINES = CTA_OPTIONS[0]["lines"]
+CTA_TEXT = " ".join(CTA_LINES)
+VOICE_SYLLABLE_SECONDS = {"Charon": 0.2, "Kore": 0.14, "Puck": 0.165}
+SYLLABLES = list("가나다라마바사아자차카타파하고노도로모보소오조초코토포호")
+
+
+class _StubTTSEngine:
+    """Gemini TTS stand-in: one tone burst per Hangul syllable, counts synthesized seconds."""
+
+    def __init__(self, seed=0):
+        self.rng = np.random.default_rng(seed)
+        self.calls = []
+        self.seconds = 0.0
+
+    def generate_content(self, *, model, contents, config):
+        text = contents[0]
+        voice = config.speech_config.voice_config.prebuilt_voice_config.voice_name
+        pieces = [np.zeros(int(0.2 * 24000))]
+        for word in text.split():
+            for _ in range(max(1, sum(1 for ch in word if "가" <= ch <= "힣"))):
+                t = np.arange(int(VOICE_SYLLABLE_SECONDS[voice] * self.rng.uniform(0.85, 1.15) * 24000)) / 24000
+                pieces.append(0.25 * np.sin(2 * np.pi * self.rng.uniform(110, 200) * t) * np.sin(np.pi * t / t[-1]))
+            pieces.append(np.zeros(int((0.28 if word[-1] in ".,!?" else 0.05) * 24000)))
+        pieces.append(np.zeros(int(0.3 * 24000)))
+        audio = np.concatenate(pieces)
+        self.calls.append((voice, text))
+        self.seconds += len(audio) / 24000
+        data = (audio * 32767).astype("<i2").tobytes()
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=data))
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+def _pipeline(tmp_path, engine, store, **config):
+    app = SimpleNamespace(
+        tts_output_dir=str(tmp_path),
+        genai_client=SimpleNamespace(models=engine),
+        config=SimpleNamespace(GEMINI_TTS_MODEL="tts-stub"),
+        translation_result="이 제품 정말 좋아요",
+    )
+    config = AudioConfig(sample_rate=RATE, channels=1, learn_speech_rate=False, **config)
+    pipeline = AudioPipeline(app, config, cta_assets=store)
+    # 배속/타이밍 분석은 길이만 계산 (이 측정은 합성한 음성 길이만 봄)
+    pipeline._apply_speed = lambda samples, voice, ts, suffix: (
+        str(tmp_path / "speeded.wav"),
+        pcm.duration_seconds(samples, RATE) / config.speed_ratio,
+    )
+    pipeline._analyze_with_whisper = lambda path, script, segments, duration: ([], "stub", 0.0, duration)
+    pipeline._split_text_naturally = pipeline._simple_split
+    return pipeline
+
+
+def _scripts(count, seed=1):
+    rng = np.random.default_rng(seed)
+    return [
+        " ".join(
+            " ".join("".join(rng.choice(SYLLABLES, rng.integers(2, 5))) for _ in range(rng.integers(3, 6))) + "."
+            for _ in range(rng.integers(3, 6))
+        )
+        for _ in range(count)
+    ]
+
+
+def _run_batch(tmp_path, scripts, reuse):
+    engine = _StubTTSEngine()
+    pipeline = _pipeline(tmp_path, engine, CTAAssetStore(), reuse_cta_audio=reuse)
+    voices = list(VOICE_SYLLABLE_SECONDS)
+    for index, script in enumerate(scripts):
+        pipeline.generate_tts(script, voices[index % len(voices)], 60.0, cta_lines=CTA_LINES)
+    return engine
+
+
+def test_pre_rendered_cta_saves_tts_seconds_per_job(tmp_path, record_property):
+    scripts = _scripts(100)
+
+    baseline = _run_batch(tmp_path, scripts, reuse=False)
+    reused = _run_batch(tmp_path, scripts, reuse=True)
+
+    saved = (baseline.seconds - reused.seconds) / len(scripts)
+    cta_texts = [text for _voice, text in reused.calls if text == process_korean_script(CTA_TEXT)]
+    record_property("tts_seconds_per_job_cta_every_job", round(baseline.seconds / len(scripts), 2))
+    record_property("tts_seconds_per_job_pre_rendered_cta", round(reused.seconds / len(scripts), 2))
+    # CTA는 음성마다 한 번만 합성, 나머지 작업은 본문만
+    assert sorted(voice for voice, text in reused.calls if text in cta_texts) == sorted(VOICE_SYLLABLE_SECONDS)
+    assert len(reused.calls) == len(scripts) + len(VOICE_SYLLABLE_SECONDS)
+    assert len(baseline.calls) == len(scripts)
+    assert saved > 2.0
+    assert reused.seconds < baseline.seconds * 0.8
+
+
+def test_spliced_take_ends_with_the_stored_cta_and_keeps_the_script(tmp_path):
+    store = CTAAssetStore()
+    engine = _StubTTSEngine(seed=3)
+    pipeline = _pipeline(tmp_path, engine, store)
+    body = "오늘 소개할 제품은 주방에서 꼭 필요한 냄비예요."
+
+    first = pipeline._generate_take(body + " " + CTA_TEXT, "Kore", [], cta_text=CTA_TEXT)
+    second = pipeline._generate_take(body + " " + CTA_TEXT, "Kore", [], cta_text=CTA_TEXT)
+
+    cta = store.get("tts-stub", "Kore", CTA_TEXT, RATE, 1)
+    assert cta is not None and not cta.flags.writeable
+    for take in (first, second):
+        assert take.script == body + " " + CTA_TEXT
+        np.testing.assert_array_equal(take.samples[-len(cta) :], cta)
+        gap = take.samples[-len(cta) - int(0.3 * RATE) : -len(cta)]
+        assert not gap.any()
+    assert [text for _voice, text in engine.calls] == [
+        process_korean_script(body),
+        process_korean_script(CTA_TEXT),
+        process_korean_script(body),
+    ]
+
+
+def test_assets_persist_per_voice_and_edge_fallback_is_not_stored(tmp_path):
+    directory = tmp_path / "assets"
+    pipeline = _pipeline(tmp_path, _StubTTSEngine(), CTAAssetStore(str(directory)))
+    stored, from_gemini = pipeline._cta_samples(CTA_TEXT, "Puck", "ts", "0000")
+    assert from_gemini
+
+    reloaded = CTAAssetStore(str(directory))
+    np.testing.assert_array_equal(reloaded.get("tts-stub", "Puck", CTA_TEXT, RATE, 1), stored)
+    assert reloaded.get("tts-stub", "Kore", CTA_TEXT, RATE, 1) is None
+    assert reloaded.get("tts-other", "Puck", CTA_TEXT, RATE, 1) is None
+    assert reloaded.get("tts-stub", "Puck", CTA_TEXT, 44100, 1) is None
+
+    edge = _pipeline(tmp_path, None, CTAAssetStore(str(tmp_path / "edge")))
+    edge.app.genai_client = None
+    edge._generate_edge_tts_samples = lambda text: (np.full((24000, 1), 0.2, np.float32), 24000)
+    assert edge._cta_samples(CTA_TEXT, "Puck", "ts", "0000")[1] is False
+    assert edge.cta_assets.get("tts-stub", "Puck", CTA_TEXT, RATE, 1) is None
+    assert not (tmp_path / "edge").exists()
+
+
+class _FailingBodyEngine(_StubTTSEngine):
+    """본문 요청만 실패시키는 엔진 (CTA만 있는 요청은 성공)"""
+
+    def generate_content(self, *, model, contents, config):
+        if contents[0] != process_korean_script(CTA_TEXT):
+            self.calls.append((None, contents[0]))
+            raise RuntimeError("quota")
+        return super().generate_content(model=model, contents=contents, config=config)
+
+
+def test_edge_body_is_not_spliced_with_a_gemini_cta(tmp_path):
+    store = CTAAssetStore()
+    pipeline = _pipeline(tmp_path, _StubTTSEngine(seed=4), store)
+    pipeline._cta_samples(CTA_TEXT, "Kore", "ts", "0000")
+    assert store.get("tts-stub", "Kore", CTA_TEXT, RATE, 1) is not None
+
+    engine = _FailingBodyEngine(seed=4)
+    pipeline.app.genai_client = SimpleNamespace(models=engine)
+    edge_texts = []
+    pipeline._generate_edge_tts_samples = lambda text: (
+        edge_texts.append(text) or np.full((24000, 1), 0.2, np.float32),
+        24000,
+    )
+    body = "오늘 소개할 제품은 주방에서 꼭 필요한 냄비예요."
+    take = pipeline._generate_take(body + " " + CTA_TEXT, "Kore", [], cta_text=CTA_TEXT)
+
+    # 본문이 Edge로 넘어가면 저장된 Gemini CTA를 잇지 않고 대본 전체를 Edge로 합성
+    assert take.from_gemini is False
+    assert edge_texts == [process_korean_script(body), process_korean_script(body + " " + CTA_TEXT)]
+    assert len(engine.calls) == 1
+    assert len(take.samples) == RATE  # Edge 음성 1초만, 뒤에 CTA가 붙지 않음
+    assert pipeline._retry_tail(take, "Kore", take.result.speeded_duration * 0.5, CTA_TEXT) is None
+
+
+def test_cta_subtitle_clips_are_rendered_once(monkeypatch):
+    VideoTool._cta_subtitle_cache.clear()
+    draws = []
+    original_draw = ImageDraw.Draw
+    monkeypatch.setattr(ImageDraw, "Draw", lambda *args, **kwargs: draws.append(1) or original_draw(*args, **kwargs))
+    app = SimpleNamespace(selected_cta_id="default", _precision_record_korean_subtitle_overlays=True)
+
+    clips = [
+        VideoTool._create_single_line_subtitle(app, CTA_LINES[0], 1.2, start, 540, 960) for start in (1.0, 7.5)
+    ]
+    rendered_for_cta = len(draws)
+    VideoTool._create_single_line_subtitle(app, "상품 본문 자막", 1.0, 3.0, 540, 960)
+
+    assert rendered_for_cta == 2  # 측정용 + 배경/텍스트, 첫 클립에서만
+    assert len(draws) == 4  # 본문 자막은 매번 렌더링
+    assert [(clip.start, clip.duration) for clip in clips] == [(1.0, 1.2), (7.5, 1.2)]
+    assert clips[1].mask.duration == 1.2
+    np.testing.assert_array_equal(clips[0].get_frame(0), clips[1].get_frame(0))
+    # 전체 프레임이 아니라 자막 박스만 보관하고 같은 위치에 배치
+    ((image, origin, box),) = VideoTool._cta_subtitle_cache.values()
+    assert image.shape[0] * image.shape[1] < 540 * 960 // 4
+    assert clips[1].size == (image.shape[1], image.shape[0])
+    assert clips[1].pos(0) == origin == tuple(box[:2])
+    boxes = app._precision_korean_subtitle_overlays
+    assert boxes[0]["box"] == boxes[1]["box"] and boxes[1]["start_time"] == 7.5
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (CTA_LINES[1], True),
+        ("확인해 보세요!", True),
+        ("아래고정댓글에서", True),
+        ("고정댓글", False),
+        ("아래 고정댓글에서 확인해 보세요!", False),
+        ("냄비 세트", False),
+    ],
+)
+def test_cta_subtitle_detection_follows_selected_option(text, expected):
+    assert VideoTool._is_cta_subtitle(SimpleNamespace(selected_cta_id="default"), text) is expected
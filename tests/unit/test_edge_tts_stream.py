@@ -0,0 +1,231 @@
+import asyncio
+import io
+import os
+import threading
+import time
+
+import av
+import numpy as np
+import pytest
+from aiohttp import web
+
+edge_tts = pytest.importorskip("edge_tts")
+import edge_tts.communicate  # noqa: E402
+
+from core.audio import edge_tts_stream  # noqa: E402
+from core.audio.edge_tts_stream import BackgroundLoop, Mp3StreamDecoder, get_background_loop  # noqa: E402
+
+RATE = 24000
+
+
+def _mp3_bytes(seconds, rate=RATE, tags=False):
+    """Edge TTS 출력 형식 (audio-24khz-48kbitrate-mono-mp3, ID3/Xing 헤더 없는 프레임)"""
+    buffer = io.BytesIO()
+    options = {} if tags else {"id3v2_version": "0", "write_xing": "0"}
+    with av.open(buffer, "w", format="mp3", options=options) as container:
+        stream = container.add_stream("libmp3lame", rate=rate, layout="mono")
+        stream.bit_rate = 48000
+        t = np.arange(int(seconds * rate)) / rate
+        frame = av.AudioFrame.from_ndarray(
+            (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype(np.int16)[None, :], format="s16", layout="mono"
+        )
+        frame.sample_rate = rate
+        for packet in [*stream.encode(frame), *stream.encode(None)]:
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+class _StubEdgeServer:
+    """
+    Local Edge TTS websocket: first-chunk latency, audio streamed in pieces,
+    in-flight tracking. Runs on its own thread and loop.
+    """
+
+    def __init__(self, audio, latency=0.08, chunks=4, chunk_interval=0.01):
+        self.audio = audio
+        self.latency = latency
+        self.chunks = chunks
+        self.chunk_interval = chunk_interval
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+        threading.Thread(target=self._serve, args=(started,), daemon=True).start()
+        started.wait()
+
+    def _serve(self, started):
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_get("/edge/v1", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        self.url = f"ws://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/edge/v1?TrustedClientToken=stub"
+        started.set()
+        self._loop.run_forever()
+
+    async def _send_audio(self, ws, data):
+        header = b"X-RequestId:stub\r\nContent-Type:audio/mpeg\r\nPath:audio\r\n"
+        await ws.send_bytes(len(header).to_bytes(2, "big") + header + data)
+
+    async def _handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            if "Path:ssml" not in message.data:
+                continue
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await ws.send_str("X-RequestId:stub\r\nPath:turn.start\r\n\r\n{}")
+                await asyncio.sleep(self.latency)
+                size = -(-len(self.audio) // self.chunks)
+                for start in range(0, len(self.audio), size):
+                    await self._send_audio(ws, self.audio[start : start + size])
+                    await asyncio.sleep(self.chunk_interval)
+                await ws.send_str("X-RequestId:stub\r\nPath:turn.end\r\n\r\n{}")
+            finally:
+                self.in_flight -= 1
+        return ws
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    stub = _StubEdgeServer(_mp3_bytes(1.0))
+    monkeypatch.setattr(edge_tts.communicate, "WSS_URL", stub.url)
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    yield stub
+    stub.close()
+
+
+def _previous_fallback(text, mp3_path):
+    """호출마다 새 루프 + MP3 파일 저장 -> 파일 디코딩 -> 삭제 (이전 구현)"""
+    result = {}
+
+    def _runner():
+        result["value"] = asyncio.run(edge_tts.Communicate(text, voice="ko-KR-SunHiNeural").save(mp3_path))
+
+    thread = threading.Thread(target=_runner, daemon=True)
+    thread.start()
+    thread.join()
+    try:
+        # 이전 구현은 pydub(ffmpeg 프로세스)로 읽었음 - 여기서는 더 가벼운 PyAV로 대신
+        with av.open(mp3_path) as container:
+            blocks = [frame.to_ndarray().T for frame in container.decode(audio=0)]
+    finally:
+        os.remove(mp3_path)
+    return np.concatenate(blocks), RATE
+
+
+def test_persistent_loop_and_streamed_decode_match_file_fallback(server, tmp_path):
+    texts = [f"구간 {index}번 문장입니다." for index in range(12)]
+
+    previous = [_previous_fallback(text, str(tmp_path / f"edge_{i}.mp3")) for i, text in enumerate(texts)]
+    streamed = [edge_tts_stream.synthesize(text, "ko-KR-SunHiNeural") for text in texts]
+
+    # 스트리밍 디코딩 결과는 파일로 저장해 디코딩한 결과와 같음
+    for (old, old_rate), (new, new_rate) in zip(previous, streamed):
+        assert old_rate == new_rate == RATE
+        np.testing.assert_allclose(new, old, atol=1e-6)
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.benchmark
+def test_persistent_loop_and_streamed_decode_beat_file_fallback(server, tmp_path):
+    texts = [f"구간 {index}번 문장입니다." for index in range(12)]
+    # 양쪽 모두 한 번씩 먼저 실행해 import/디코더 초기화 비용을 측정에서 제외
+    _previous_fallback(texts[0], str(tmp_path / "warm.mp3"))
+    edge_tts_stream.synthesize(texts[0], "ko-KR-SunHiNeural")
+
+    start = time.perf_counter()
+    for i, text in enumerate(texts):
+        _previous_fallback(text, str(tmp_path / f"edge_{i}.mp3"))
+    previous_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        edge_tts_stream.synthesize(text, "ko-KR-SunHiNeural")
+    streamed_seconds = time.perf_counter() - start
+
+    assert streamed_seconds < previous_seconds, (streamed_seconds, previous_seconds)
+
+
+def test_every_call_runs_on_the_same_background_thread(server):
+    threads_before = threading.active_count()
+    seen = set()
+
+    async def _where():
+        seen.add(threading.current_thread().name)
+
+    for _ in range(5):
+        get_background_loop().run(_where())
+        edge_tts_stream.synthesize("안녕하세요", "ko-KR-SunHiNeural")
+
+    assert seen == {get_background_loop().name}
+    assert threading.active_count() <= threads_before + 1
+
+
+def test_calls_from_worker_threads_share_the_request_limit(server):
+    results = [None] * 8
+
+    def _worker(index):
+        results[index] = edge_tts_stream.synthesize(f"문장 {index}", "ko-KR-SunHiNeural")
+
+    workers = [threading.Thread(target=_worker, args=(index,)) for index in range(len(results))]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert all(samples.shape == results[0][0].shape for samples, _rate in results)
+    assert server.max_in_flight <= edge_tts_stream.MAX_CONCURRENT_REQUESTS
+
+
+def test_stream_without_audio_raises_in_the_caller(server):
+    server.audio = b""
+
+    with pytest.raises(edge_tts.exceptions.NoAudioReceived):
+        edge_tts_stream.synthesize("안녕하세요", "ko-KR-SunHiNeural")
+
+
+def test_decoder_handles_arbitrary_chunk_boundaries_and_id3_header():
+    data = _mp3_bytes(0.5, tags=True)
+    assert data.startswith(b"ID3")
+    whole = Mp3StreamDecoder()
+    whole.feed(data)
+    expected, rate = whole.finish()
+
+    rng = np.random.default_rng(0)
+    cuts = np.sort(rng.choice(np.arange(1, len(data)), 40, replace=False))
+    pieces = Mp3StreamDecoder()
+    for chunk in np.split(np.frombuffer(data, np.uint8), cuts):
+        pieces.feed(chunk.tobytes())
+    samples, pieces_rate = pieces.finish()
+
+    assert rate == pieces_rate == RATE and samples.dtype == np.float32
+    np.testing.assert_array_equal(samples, expected)
+    assert len(samples) / RATE == pytest.approx(0.5, abs=0.08)
+    with pytest.raises(RuntimeError):
+        Mp3StreamDecoder().finish()
+
+
+def test_background_loop_rejects_reentrant_run_and_restarts_after_close():
+    loop = BackgroundLoop(name="test-loop")
+
+    async def _nested():
+        return loop.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        loop.run(_nested())
+    first = loop.loop
+    loop.close()
+    assert loop.run(asyncio.sleep(0, result=3)) == 3
+    assert loop.loop is not first
+    loop.close()
@@ -0,0 +1,227 @@
+import os
+import re
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.audio import forced_align, pcm
+from core.audio.pipeline import AudioPipeline
+from core.video.batch import whisper_analyzer
+
+RATE = 24000
+SCRIPT = [
+    "오늘 소개할 제품은",
+    "주방에서 꼭 필요한",
+    "스테인리스 냄비 세트예요.",
+    "바닥이 두꺼워서",
+    "열이 골고루 퍼지고,",
+    "손잡이도 뜨겁지 않아요.",
+    "지금 할인 중이니",
+    "링크 확인해 보세요!",
+    "3개 묶음 구성이라",
+    "더 저렴합니다.",
+]
+
+
+def _synthetic_tts(segments, seed=0, word_gap=(0.03, 0.08), punct_pause=(0.2, 0.35)):
+    """
+    TTS-like fixture: one 130-220ms harmonic burst per syllable, short gaps
+    between words, longer pauses after punctuation. Returns (samples, truth)
+    where truth holds each segment's (first onset, last offset).
+    """
+    rng = np.random.default_rng(seed)
+    pieces = [np.zeros(int(0.3 * RATE))]
+    cursor = len(pieces[0])
+    truth = []
+    for segment in segments:
+        onset = None
+        for word in segment.split():
+            syllables = len(re.findall(r"[가-힣]", word)) + round(1.3 * len(re.findall(r"[0-9]", word)))
+            for _ in range(max(1, syllables)):
+                t = np.arange(int(rng.uniform(0.13, 0.22) * RATE)) / RATE
+                f0 = rng.uniform(110, 200)
+                envelope = 0.35 + 0.65 * np.sin(np.pi * t / t[-1])
+                voiced = np.sin(2 * np.pi * f0 * t) + 0.5 * np.sin(4 * np.pi * f0 * t) + 0.25 * np.sin(6 * np.pi * f0 * t)
+                burst = voiced * envelope * 0.25 * rng.uniform(0.6, 1.0)
+                onset = cursor if onset is None else onset
+                pieces.append(burst)
+                cursor += len(burst)
+            offset = cursor
+            pause = punct_pause if re.search(r"[.,!?]$", word) else word_gap
+            gap = np.zeros(int(rng.uniform(*pause) * RATE))
+            pieces.append(gap)
+            cursor += len(gap)
+        truth.append((onset / RATE, offset / RATE))
+    pieces.append(np.zeros(int(0.4 * RATE)))
+    audio = np.concatenate(pieces) + rng.standard_normal(cursor + int(0.4 * RATE)) * 10 ** (-70 / 20)
+    return audio.astype(np.float32)[:, None], truth
+
+
+def _boundary_error(segments, truth):
+    return float(np.mean([max(abs(s["start"] - a), abs(s["end"] - b)) for s, (a, b) in zip(segments, truth)]))
+
+
+def _char_proportional(segments, duration, start):
+    """``AudioPipeline._create_char_proportional_metadata`` (the previous fallback)."""
+    pipeline = AudioPipeline(SimpleNamespace())
+    return pipeline._create_char_proportional_metadata(segments, duration, "tts.wav", start_offset=start)
+
+
+def test_alignment_recovers_segment_timing_on_synthetic_tts(record_property):
+    errors, baseline, confidences = [], [], []
+    for seed in range(12):
+        samples, truth = _synthetic_tts(SCRIPT, seed)
+        result = forced_align.align_segments(samples, RATE, SCRIPT)
+        errors.append(_boundary_error(result["segments"], truth))
+        confidences.append(result["confidence"])
+        fallback = _char_proportional(SCRIPT, len(samples) / RATE, result["voice_start"])
+        baseline.append(_boundary_error(fallback, truth))
+
+    record_property("mean_boundary_error_ms", round(float(np.mean(errors)) * 1000))
+    record_property("char_proportional_error_ms", round(float(np.mean(baseline)) * 1000))
+    record_property("min_confidence", round(min(confidences), 2))
+    assert np.mean(errors) < 0.03 and max(errors) < 0.12
+    assert np.mean(errors) < np.mean(baseline) / 3
+    assert min(confidences) >= forced_align.MIN_CONFIDENCE
+
+
+def test_segments_are_ordered_and_inside_voiced_span():
+    samples, truth = _synthetic_tts(SCRIPT, 5)
+
+    result = forced_align.align_segments(samples, RATE, SCRIPT)
+
+    segments = result["segments"]
+    assert [s["index"] for s in segments] == list(range(1, len(SCRIPT) + 1))
+    assert [s["text"] for s in segments] == SCRIPT
+    assert all(s["start"] < s["end"] for s in segments)
+    assert all(a["end"] <= b["start"] for a, b in zip(segments, segments[1:]))
+    assert result["voice_start"] == pytest.approx(truth[0][0], abs=0.03)
+    assert result["voice_end"] == pytest.approx(truth[-1][1], abs=0.03)
+
+
+@pytest.mark.parametrize(
+    "script",
+    [SCRIPT[:3] + ["가" * 30] + SCRIPT[3:], SCRIPT[:5]],
+    ids=["script-longer-than-audio", "audio-longer-than-script"],
+)
+def test_mismatched_script_is_low_confidence(script):
+    samples, _truth = _synthetic_tts(SCRIPT, 1)
+
+    assert forced_align.align_segments(samples, RATE, script)["confidence"] < forced_align.MIN_CONFIDENCE
+
+
+def test_speech_without_pauses_is_low_confidence():
+    samples, _truth = _synthetic_tts(SCRIPT, 4, word_gap=(0, 0), punct_pause=(0, 0))
+
+    assert forced_align.align_segments(samples, RATE, SCRIPT)["confidence"] < forced_align.MIN_CONFIDENCE
+
+
+def test_silence_and_empty_input_give_no_alignment():
+    assert forced_align.align_segments(np.zeros((RATE, 1), np.float32), RATE, SCRIPT) is None
+    assert forced_align.align_segments(_synthetic_tts(SCRIPT)[0], RATE, []) is None
+
+
+def _write(path, samples):
+    pcm.write_wav(str(path), samples, RATE)
+    return str(path)
+
+
+@pytest.fixture
+def alignment_enabled(monkeypatch):
+    monkeypatch.setenv("SSMAKER_FORCED_ALIGNMENT", "1")
+
+
+def test_timing_uses_alignment_and_skips_whisper(tmp_path, monkeypatch, alignment_enabled):
+    samples, truth = _synthetic_tts(SCRIPT, 2)
+    path = _write(tmp_path / "tts_speeded.wav", samples)
+    monkeypatch.setattr(whisper_analyzer, "analyze_tts_with_whisper", pytest.fail)
+
+    result = whisper_analyzer.analyze_tts_timing(SimpleNamespace(), path, " ".join(SCRIPT), SCRIPT)
+
+    assert result["method"] == "forced_alignment"
+    assert _boundary_error(result["segments"], truth) < 0.05
+
+
+def test_low_confidence_falls_back_to_whisper(tmp_path, monkeypatch, alignment_enabled):
+    samples, _truth = _synthetic_tts(SCRIPT, 4, word_gap=(0, 0), punct_pause=(0, 0))
+    path = _write(tmp_path / "tts_speeded.wav", samples)
+    calls = []
+
+    def whisper(app, tts_path, text, segments):
+        calls.append(tts_path)
+        return {"audio_duration": 1.0, "voice_start": 0.0, "voice_end": 1.0, "segments": []}
+
+    monkeypatch.setattr(whisper_analyzer, "analyze_tts_with_whisper", whisper)
+
+    result = whisper_analyzer.analyze_tts_timing(SimpleNamespace(), path, " ".join(SCRIPT), SCRIPT)
+
+    assert calls == [path] and result["method"] == "whisper"
+
+
+def test_alignment_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.delenv("SSMAKER_FORCED_ALIGNMENT", raising=False)
+    monkeypatch.setattr(
+        whisper_analyzer,
+        "analyze_tts_with_whisper",
+        lambda app, tts_path, text, segments: {"audio_duration": 1.0, "voice_start": 0.0, "voice_end": 1.0, "segments": []},
+    )
+    monkeypatch.setattr(forced_align, "align_file", pytest.fail)
+    clean = _write(tmp_path / "clean.wav", _synthetic_tts(SCRIPT, 2)[0])
+
+    assert whisper_analyzer.analyze_tts_timing(SimpleNamespace(), clean, "", SCRIPT)["method"] == "whisper"
+
+
+def test_pipeline_reports_forced_alignment_source(tmp_path, alignment_enabled):
+    samples, _truth = _synthetic_tts(SCRIPT, 3)
+    path = _write(tmp_path / "tts_speeded.wav", samples)
+    pipeline = AudioPipeline(SimpleNamespace(tts_output_dir=str(tmp_path)))
+
+    metadata, source, voice_start, _voice_end = pipeline._analyze_with_whisper(
+        path, " ".join(SCRIPT), SCRIPT, len(samples) / RATE
+    )
+
+    assert source == "forced_alignment"
+    assert [m["idx"] for m in metadata] == list(range(len(SCRIPT)))
+    assert metadata[0]["start"] == voice_start
+
+
+def _tiny_model_path():
+    roots = [os.environ.get("WHISPER_MODEL_PATH"), os.path.join(os.path.dirname(__file__), "..", "..", "faster_whisper_models")]
+    for root in roots:
+        if root:
+            found = whisper_analyzer._find_model_in_dir(os.path.join(root, "tiny"))
+            if found:
+                return found
+    return None
+
+
+@pytest.mark.benchmark
+def test_accuracy_and_speed_against_whisper_word_timestamps(tmp_path):
+    model_path = _tiny_model_path()
+    if not model_path:
+        pytest.skip("faster-whisper tiny model not available")
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(model_path, device="cpu", compute_type="int8")
+    samples, truth = _synthetic_tts(SCRIPT, 7)
+    path = _write(tmp_path / "tts.wav", samples)
+
+    start = time.perf_counter()
+    aligned = forced_align.align_file(path, SCRIPT)
+    align_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    segments, _info = model.transcribe(path, language="ko", beam_size=5, word_timestamps=True, vad_filter=False)
+    words = [word for segment in segments for word in (segment.words or [])]
+    whisper_seconds = time.perf_counter() - start
+    onsets = np.array([word.start for word in words]) if words else np.zeros(1)
+    # Whisper가 세그먼트 시작에 가장 가까운 단어를 찾았다고 후하게 가정
+    whisper_error = float(np.mean([np.min(np.abs(onsets - a)) for a, _b in truth]))
+
+    print(
+        f"forced alignment {align_seconds * 1000:.0f}ms, error {_boundary_error(aligned['segments'], truth) * 1000:.0f}ms; "
+        f"whisper tiny {whisper_seconds * 1000:.0f}ms, nearest-onset error {whisper_error * 1000:.0f}ms"
+    )
+    assert align_seconds < whisper_seconds
@@ -0,0 +1,157 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from google import genai
+from google.genai import types
+
+from core.api.gemini_requests import SingleFlight, request_fingerprint, wrap_client
+
+
+class _StubGemini:
+    """Counts generateContent calls and answers each after ``delay`` seconds."""
+
+    def __init__(self, delay=0.3, status=200):
+        self.delay = delay
+        self.status = status
+        self.calls = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.calls.append((self.path, body))
+                time.sleep(stub.delay)
+                if stub.status != 200:
+                    payload = {"error": {"code": stub.status, "message": "quota", "status": "RESOURCE_EXHAUSTED"}}
+                else:
+                    prompt = body["contents"][0]["parts"][0].get("text", "media")
+                    payload = {
+                        "candidates": [
+                            {"content": {"role": "model", "parts": [{"text": f"echo:{prompt}"}]}}
+                        ]
+                    }
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *_args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def client(self, flights):
+        raw = genai.Client(
+            api_key="test-key",
+            http_options=types.HttpOptions(
+                base_url=f"http://127.0.0.1:{self.server.server_port}",
+                retry_options=types.HttpRetryOptions(attempts=1),
+            ),
+        )
+        return wrap_client(raw, flights)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = _StubGemini()
+    yield server
+    server.close()
+
+
+def _run_parallel(fn, count):
+    results = [None] * count
+    errors = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = fn(index)
+        except Exception as exc:  # noqa: BLE001 - collected for assertions
+            errors[index] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results, errors
+
+
+def test_identical_concurrent_requests_share_one_upstream_call(stub):
+    flights = SingleFlight()
+    # Separate clients (e.g. different workers/keys) still share the flight.
+    clients = [stub.client(flights) for _ in range(3)]
+    config = types.GenerateContentConfig(temperature=0.2)
+
+    results, errors = _run_parallel(
+        lambda i: clients[i % 3].models.generate_content(
+            model="gemini-test", contents="상품 분석", config=config
+        ).text,
+        8,
+    )
+
+    assert errors == [None] * 8
+    assert results == ["echo:상품 분석"] * 8
+    assert len(stub.calls) == 1
+    assert (flights.upstream_calls, flights.coalesced_calls) == (1, 7)
+
+    # Nothing is cached once the flight lands.
+    clients[0].models.generate_content(model="gemini-test", contents="상품 분석", config=config)
+    assert len(stub.calls) == 2
+
+
+def test_different_prompts_models_configs_and_media_are_not_merged(stub):
+    flights = SingleFlight()
+    client = stub.client(flights)
+    variants = [
+        dict(model="gemini-test", contents="a"),
+        dict(model="gemini-test", contents="b"),
+        dict(model="gemini-other", contents="a"),
+        dict(model="gemini-test", contents="a", config=types.GenerateContentConfig(temperature=0.9)),
+        dict(model="gemini-test", contents=[types.Part.from_bytes(data=b"frame-1", mime_type="image/png"), "a"]),
+        dict(model="gemini-test", contents=[types.Part.from_bytes(data=b"frame-2", mime_type="image/png"), "a"]),
+    ]
+
+    _results, errors = _run_parallel(lambda i: client.models.generate_content(**variants[i]), len(variants))
+
+    assert errors == [None] * len(variants)
+    assert len(stub.calls) == len(variants)
+
+
+def test_upstream_error_reaches_every_coalesced_caller(stub):
+    stub.status = 429
+    flights = SingleFlight()
+    client = stub.client(flights)
+
+    results, errors = _run_parallel(
+        lambda _i: client.models.generate_content(model="gemini-test", contents="same"), 4
+    )
+
+    assert results == [None] * 4
+    assert all("429" in str(error) for error in errors)
+    assert len(stub.calls) == 1
+
+
+def test_fingerprint_keys_media_by_content_and_skips_unknown_objects():
+    png = types.Part.from_bytes(data=b"x" * 10, mime_type="image/png")
+    same_png = types.Part.from_bytes(data=b"x" * 10, mime_type="image/png")
+    uploaded = types.File(name="files/abc", uri="https://example/files/abc", mime_type="video/mp4")
+
+    assert request_fingerprint("m", [png, "p"]) == request_fingerprint("m", [same_png, "p"])
+    assert request_fingerprint("m", [uploaded, "p"]) == request_fingerprint(
+        "m", [types.File(name="files/abc", uri="https://example/files/abc"), "p"]
+    )
+    assert request_fingerprint("m", "p", {"temperature": 0.1}) != request_fingerprint("m", "p")
+    assert request_fingerprint("m", [object()]) is None
@@ -0,0 +1,196 @@
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types
+
+from core.api import gemini_response_cache as cache_module
+from core.api.gemini_response_cache import GeminiResponseCache, cached_generate_content
+
+
+class _StubModels:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def generate_content(self, *, model, contents, config=None):
+        self.calls.append((model, contents, config))
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(role="model", parts=[types.Part(text=self.reply)])
+                )
+            ],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=12, candidates_token_count=8
+            ),
+        )
+
+
+def _stub_client(reply="ok"):
+    return SimpleNamespace(models=_StubModels(reply))
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("SSMAKER_GEMINI_RESPONSE_CACHE", "1")
+    monkeypatch.setenv("SSMAKER_GEMINI_CACHE_ROOT", str(tmp_path / "gemini_cache"))
+    monkeypatch.setattr(cache_module, "_cache", None)
+    yield
+    if cache_module._cache is not None:
+        cache_module._cache.close()
+    monkeypatch.setattr(cache_module, "_cache", None)
+
+
+@pytest.fixture
+def split_subtitle():
+    # CreateFinalVideo only imports after core.video.batch (circular import in the app)
+    importlib.import_module("core.video.batch")
+    return importlib.import_module("core.video.CreateFinalVideo")._split_subtitle_with_gemini
+
+
+def _restart_process(monkeypatch):
+    """Drop the in-process cache object so the next run reopens the disk store."""
+    cache_module._cache.close()
+    monkeypatch.setattr(cache_module, "_cache", None)
+
+
+def test_cache_is_opt_in(monkeypatch):
+    monkeypatch.delenv("SSMAKER_GEMINI_RESPONSE_CACHE", raising=False)
+    client = _stub_client()
+
+    for _ in range(2):
+        cached_generate_content(client, model="m", contents=["prompt"])
+
+    assert cache_module.get_response_cache() is None
+    assert len(client.models.calls) == 2
+
+
+def test_repeat_runs_of_subtitle_split_and_keywords_skip_upstream(enabled_cache, monkeypatch, split_subtitle):
+    from core.sourcing.keyword_converter import convert_keywords_gemini
+
+    split_client = _stub_client("첫 번째 줄\n두 번째 줄")
+    keyword_client = _stub_client("chinese: 浴室清洁刷\nenglish: bathroom cleaning brush")
+    app = SimpleNamespace(genai_client=split_client)
+
+    first_split = split_subtitle(app, "첫 번째 줄 두 번째 줄", max_chars=6)
+    first_keywords = asyncio.run(convert_keywords_gemini("욕실 청소 브러시", keyword_client))
+    _restart_process(monkeypatch)
+    second_split = split_subtitle(app, "첫 번째 줄 두 번째 줄", max_chars=6)
+    second_keywords = asyncio.run(convert_keywords_gemini("욕실 청소 브러시", keyword_client))
+
+    assert second_split == first_split == ["첫 번째 줄", "두 번째 줄"]
+    assert second_keywords == first_keywords
+    assert len(split_client.models.calls) == 1
+    assert len(keyword_client.models.calls) == 1
+    stats = cache_module.get_response_cache().stats()
+    assert (stats["hits"], stats["misses"]) == (2, 0)
+    assert stats["entries"] == 2
+
+
+def test_responses_the_caller_rejects_are_not_cached(enabled_cache, split_subtitle):
+
+    # 마커만 있는 응답은 분할 실패 -> 단순 분할로 대체, 캐시에 남기지 않음
+    bad_client = _stub_client("1.\n-")
+    app = SimpleNamespace(genai_client=bad_client)
+    assert split_subtitle(app, "첫 번째 줄 두 번째 줄", max_chars=6) != ["1.", "-"]
+    assert cache_module.get_response_cache().stats()["entries"] == 0
+
+    app.genai_client = _stub_client("첫 번째 줄\n두 번째 줄")
+    assert split_subtitle(app, "첫 번째 줄 두 번째 줄", max_chars=6) == ["첫 번째 줄", "두 번째 줄"]
+    assert len(app.genai_client.models.calls) == 1
+    assert cache_module.get_response_cache().stats()["entries"] == 1
+
+
+def test_stored_response_failing_validation_is_requested_again(enabled_cache):
+    client = _stub_client("not json")
+    cached_generate_content(client, model="m", contents=["prompt"])
+
+    fresh = cached_generate_content(
+        client, model="m", contents=["prompt"], validate=lambda r: r.text.startswith("{")
+    )
+
+    assert fresh.usage_metadata is not None
+    assert len(client.models.calls) == 2
+
+    def _raises(_response):
+        raise ValueError("boom")
+
+    other = _stub_client("{}")
+    cached_generate_content(other, model="m", contents=["other"], validate=_raises)
+    cached_generate_content(other, model="m", contents=["other"], validate=_raises)
+    assert len(other.models.calls) == 2
+
+
+def test_hit_drops_usage_metadata_and_keys_follow_request(enabled_cache):
+    client = _stub_client("translated")
+    config = types.GenerateContentConfig(temperature=0.1)
+    png = types.Part.from_bytes(data=b"frame-1", mime_type="image/png")
+
+    miss = cached_generate_content(client, model="m", contents=[png, "line one\r\nline two  "], config=config)
+    hit = cached_generate_content(client, model="m", contents=[png, "line one\nline two"], config=config)
+
+    assert miss.usage_metadata is not None
+    assert hit.text == "translated"
+    assert hit.usage_metadata is None
+    assert len(client.models.calls) == 1
+
+    other_media = types.Part.from_bytes(data=b"frame-2", mime_type="image/png")
+    cached_generate_content(client, model="m", contents=[other_media, "line one\nline two"], config=config)
+    cached_generate_content(client, model="m", contents=[png, "line one\nline two"])
+    cached_generate_content(client, model="other", contents=[png, "line one\nline two"], config=config)
+    assert len(client.models.calls) == 4
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = GeminiResponseCache(tmp_path, ttl_seconds=60)
+    key = cache.key("m", "prompt")
+
+    cache.put(key, {"text": "a"})
+    now[0] += 59
+    assert cache.get(key) == {"text": "a"}
+    now[0] += 2
+    assert cache.get(key) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expired"], stats["entries"]) == (1, 1, 1, 0)
+    cache.close()
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = GeminiResponseCache(tmp_path, max_bytes=250)
+    keys = [cache.key("m", f"prompt {index}") for index in range(3)]
+
+    for key in keys[:2]:
+        cache.put(key, {"text": "x" * 100})
+        now[0] += 1
+    assert cache.get(keys[0]) is not None  # refresh first entry
+    now[0] += 1
+    cache.put(keys[2], {"text": "y" * 100})
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 250
+    cache.close()
+
+
+def test_keyword_replies_that_do_not_parse_are_not_cached(enabled_cache):
+    from core.sourcing.keyword_converter import convert_keywords_gemini
+
+    bad_client = _stub_client("浴室清洁刷")
+    asyncio.run(convert_keywords_gemini("욕실 청소 브러시", bad_client))
+    assert cache_module.get_response_cache().stats()["entries"] == 0
+
+    good_client = _stub_client("chinese: 浴室清洁刷\nenglish: bathroom cleaning brush")
+    keywords = asyncio.run(convert_keywords_gemini("욕실 청소 브러시", good_client))
+    assert keywords["english"].startswith("bathroom cleaning brush")
+    assert len(good_client.models.calls) == 1
+    assert cache_module.get_response_cache().stats()["entries"] == 1
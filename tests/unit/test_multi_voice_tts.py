@@ -0,0 +1,375 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+import config
+from core.api.ApiKeyManager import APIKeyManager
+from core.api.key_scheduler import DEFAULT_RPM, KeyQuotaScheduler
+from core.audio import multi_voice
+from core.audio.multi_voice import KeyedTTSClients, MultiVoiceSynthesizer, keyed_tts_clients
+from core.audio.pipeline import AudioPipeline, TTSResult
+from core.video.batch import tts_generator
+
+AUDIO = b"\x00\x01" * 2400
+
+
+class _StubTTSServer:
+    """Local TTS endpoint: per-voice latency, optional 429 per API key, in-flight tracking."""
+
+    def __init__(self, latency=0.2, voice_latency=None, rejected_keys=()):
+        self.latency = latency
+        self.voice_latency = dict(voice_latency or {})
+        self.rejected_keys = set(rejected_keys)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.finished = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                key = self.headers["X-Api-Key"]
+                with stub._lock:
+                    stub.requests.append((key, body["voice"]))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if key in stub.rejected_keys:
+                        self.send_response(429)
+                        self.end_headers()
+                        return
+                    time.sleep(stub.voice_latency.get(body["voice"], stub.latency))
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(AUDIO)))
+                    self.end_headers()
+                    self.wfile.write(AUDIO)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                        stub.finished.append(body["voice"])
+
+            def log_message(self, *_args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/tts"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _StubModels:
+    def __init__(self, url, api_key):
+        self.url = url
+        self.api_key = api_key
+
+    def generate_content(self, *, model, contents, config):
+        voice = config.speech_config.voice_config.prebuilt_voice_config.voice_name
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"voice": voice, "text": contents[0]}).encode(),
+            headers={"X-Api-Key": self.api_key, "Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                data = response.read()
+        except urllib.error.HTTPError as exc:
+            raise RuntimeError(f"{exc.code} RESOURCE_EXHAUSTED") from exc
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=data))
+        candidate = SimpleNamespace(content=SimpleNamespace(parts=[part]))
+        return SimpleNamespace(candidates=[candidate], usage_metadata=SimpleNamespace(total_token_count=120))
+
+
+@pytest.fixture
+def server():
+    stub = _StubTTSServer()
+    yield stub
+    stub.close()
+
+
+def _pipeline(monkeypatch, server, keys=("api_1", "api_2"), acquire_timeout=10.0):
+    monkeypatch.setattr(config, "GEMINI_API_KEYS", {name: f"value-{name[-1]}" for name in keys})
+    app = SimpleNamespace(
+        api_key_manager=APIKeyManager(use_secrets_manager=False),
+        config=SimpleNamespace(GEMINI_TTS_MODEL="tts-stub"),
+    )
+    app._keyed_tts_clients = KeyedTTSClients(
+        app,
+        client_factory=lambda key: SimpleNamespace(models=_StubModels(server.url, key)),
+        acquire_timeout=acquire_timeout,
+    )
+    return AudioPipeline(app), app
+
+
+def test_voices_synthesize_concurrently_and_arrive_as_they_finish(monkeypatch, server):
+    server.voice_latency = {"Charon": 0.6, "Kore": 0.2, "Puck": 0.4}
+    pipeline, _app = _pipeline(monkeypatch, server)
+    voices = list(server.voice_latency)
+
+    arrivals = []
+    with MultiVoiceSynthesizer(lambda voice: pipeline._request_gemini_audio("안녕하세요", voice)) as tts:
+        tts.submit(voices)
+        for voice in tts.as_completed():
+            arrivals.append((voice, list(server.finished)))
+            assert tts.result(voice) == AUDIO
+
+    assert [voice for voice, _finished in arrivals] == ["Kore", "Puck", "Charon"]
+    # 첫 음성은 가장 느린 음성을 기다리지 않고 바로 넘어옴
+    assert "Charon" not in arrivals[0][1]
+    assert server.max_in_flight == 3
+
+
+@pytest.mark.benchmark
+def test_concurrent_voices_beat_sequential_requests(monkeypatch, server):
+    server.voice_latency = {"Charon": 0.6, "Kore": 0.2, "Puck": 0.4}
+    pipeline, _app = _pipeline(monkeypatch, server)
+    voices = list(server.voice_latency)
+
+    start = time.perf_counter()
+    for voice in voices:
+        pipeline._request_gemini_audio("안녕하세요", voice)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with MultiVoiceSynthesizer(lambda voice: pipeline._request_gemini_audio("안녕하세요", voice)) as tts:
+        tts.submit(voices)
+        first_arrival = None
+        for _voice in tts.as_completed():
+            first_arrival = first_arrival or time.perf_counter() - start
+    concurrent = time.perf_counter() - start
+
+    print(f"3 voices: sequential {sequential * 1000:.0f}ms, concurrent {concurrent * 1000:.0f}ms")
+    assert first_arrival < 0.45
+    assert concurrent < sequential * 0.7
+
+
+def test_pool_bounds_requests_in_flight(monkeypatch, server):
+    server.latency = 0.15
+    pipeline, _app = _pipeline(monkeypatch, server)
+    voices = ["Charon", "Kore", "Puck", "Zephyr", "Fenrir"]
+
+    with MultiVoiceSynthesizer(lambda voice: pipeline._request_gemini_audio("안녕", voice), max_workers=2) as tts:
+        results = {voice: tts.result(voice) for voice in tts.submit(voices).voices}
+
+    assert results == {voice: AUDIO for voice in voices}
+    assert server.max_in_flight == 2
+    assert sorted(voice for _key, voice in server.requests) == sorted(voices)
+
+
+def test_quota_exhausted_keys_hold_back_extra_voices(monkeypatch, server):
+    pipeline, app = _pipeline(monkeypatch, server, acquire_timeout=0.3)
+    # 키마다 즉시 보낼 수 있는 요청 1개, 다음 요청은 60초 뒤
+    app.api_key_manager.scheduler = KeyQuotaScheduler(rpm=1.0)
+
+    with MultiVoiceSynthesizer(lambda voice: pipeline._request_gemini_audio("안녕", voice)) as tts:
+        results = [tts.result(voice) for voice in tts.submit(["Charon", "Kore", "Puck"]).voices]
+
+    # 할당량이 없는 세 번째 음성은 요청을 보내지 않고 Edge 폴백(b"")으로 넘어감
+    assert sorted(results) == [b"", AUDIO, AUDIO]
+    assert sorted(key for key, _voice in server.requests) == ["value-1", "value-2"]
+
+
+def test_rate_limited_key_is_reported_and_skipped(monkeypatch, server):
+    server.rejected_keys = {"value-1"}
+    pipeline, app = _pipeline(monkeypatch, server)
+
+    with MultiVoiceSynthesizer(lambda voice: pipeline._request_gemini_audio("안녕", voice), max_workers=1) as tts:
+        results = [tts.result(voice) for voice in tts.submit(["Charon", "Kore", "Puck"]).voices]
+
+    assert results == [AUDIO] * 3
+    assert [key for key, _voice in server.requests].count("value-1") == 1
+    assert app.api_key_manager.scheduler.limits("api_1")[0] < DEFAULT_RPM
+
+
+def test_failed_request_does_not_raise_learned_limits(monkeypatch, server):
+    _, app = _pipeline(monkeypatch, server, keys=("api_1",))
+    manager = app.api_key_manager
+    now = [1_000.0]
+    manager.scheduler = KeyQuotaScheduler(clock=lambda: now[0])
+    for _ in range(4):
+        manager.acquire_key(blocking=False)
+    manager.report_rate_limited("api_1", retry_after=0)
+    learned = manager.scheduler.limits("api_1")
+    now[0] += 60
+
+    def request(_client):
+        raise ValueError("400 INVALID_ARGUMENT")
+
+    with pytest.raises(ValueError):
+        app._keyed_tts_clients.call(request, "안녕하세요")
+    assert manager.scheduler.limits("api_1") == learned
+
+
+def test_without_key_manager_the_app_client_is_used(server):
+    app = SimpleNamespace(
+        genai_client=SimpleNamespace(models=_StubModels(server.url, "app-client")),
+        config=SimpleNamespace(GEMINI_TTS_MODEL="tts-stub"),
+    )
+
+    assert AudioPipeline(app)._request_gemini_audio("안녕", "Kore") == AUDIO
+    assert server.requests == [("app-client", "Kore")]
+
+
+def test_concurrent_first_calls_share_one_keyed_client_set(monkeypatch):
+    created = []
+
+    class _SlowKeyedClients:
+        def __init__(self, app):
+            created.append(self)
+            time.sleep(0.05)  # 생성 중에 다른 스레드가 끼어들 틈
+
+    monkeypatch.setattr(multi_voice, "KeyedTTSClients", _SlowKeyedClients)
+    app = SimpleNamespace()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def _first_call():
+        barrier.wait()
+        results.append(keyed_tts_clients(app))
+
+    threads = [threading.Thread(target=_first_call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(clients is created[0] for clients in results) and len(results) == 8
+
+
+class _SlowPipeline:
+    def __init__(self, latency):
+        self.latency = latency
+        self.started = []
+
+    def generate_tts(self, script, voice, video_duration, cta_lines):
+        self.started.append(voice)
+        time.sleep(self.latency[voice])
+        return TTSResult(
+            audio_path=f"/tmp/{voice}.wav",
+            original_duration=12.0,
+            speeded_duration=10.0,
+            metadata=[{"idx": 0, "start": 0.0, "end": 10.0, "text": script}],
+            timestamps_source="forced_alignment",
+        )
+
+
+def test_batch_applies_each_voice_as_its_tts_finishes():
+    latency = {"Charon": 0.3, "Kore": 0.05}
+    pipeline = _SlowPipeline(latency)
+    logs = []
+    app = SimpleNamespace(
+        _audio_pipeline=pipeline,
+        get_video_duration_helper=lambda: 30.0,
+        extract_clean_script_from_translation=lambda: "오늘 소개할 제품입니다",
+        add_log=logs.append,
+        token_calculator=SimpleNamespace(log_cost=lambda *args: None),
+    )
+
+    synthesizer = tts_generator._start_multi_voice_tts(app, list(latency))
+    applied = []
+    try:
+        for voice in synthesizer.as_completed():
+            tts_generator._generate_tts_for_batch(app, voice, synthesizer=synthesizer)
+            applied.append((voice, app.tts_files, app._per_line_tts[0]["speaker"]))
+    finally:
+        synthesizer.close()
+
+    assert sorted(pipeline.started) == ["Charon", "Kore"]
+    assert applied == [
+        ("Kore", ["/tmp/Kore.wav"], "Kore"),
+        ("Charon", ["/tmp/Charon.wav"], "Charon"),
+    ]
+    assert app.tts_sync_info["timestamps_source"] == "forced_alignment"
+
+
+def test_batch_failure_of_one_voice_surfaces_for_that_voice():
+    class _Failing(_SlowPipeline):
+        def generate_tts(self, script, voice, video_duration, cta_lines):
+            if voice == "Puck":
+                raise RuntimeError("TTS 실패")
+            return super().generate_tts(script, voice, video_duration, cta_lines)
+
+    app = SimpleNamespace(
+        _audio_pipeline=_Failing({"Kore": 0.0}),
+        get_video_duration_helper=lambda: 30.0,
+        extract_clean_script_from_translation=lambda: "대본",
+        add_log=lambda _msg: None,
+        token_calculator=SimpleNamespace(log_cost=lambda *args: None),
+    )
+
+    synthesizer = tts_generator._start_multi_voice_tts(app, ["Puck", "Kore"])
+    try:
+        tts_generator._generate_tts_for_batch(app, "Kore", synthesizer=synthesizer)
+        assert app.tts_files == ["/tmp/Kore.wav"]
+        with pytest.raises(RuntimeError, match="TTS 실패"):
+            tts_generator._generate_tts_for_batch(app, "Puck", synthesizer=synthesizer)
+    finally:
+        synthesizer.close()
+
+
+class _GuiSpy:
+    """GUI stand-in that records which threads read widget-backed state."""
+
+    WATCHED = {"selected_cta_id", "translation_result", "tts_output_dir", "voice_manager", "add_log"}
+
+    def __init__(self, tmp_path):
+        self.reads = []
+        self.logs = []
+        self.selected_cta_id = "default"
+        self.translation_result = "오늘 소개할 제품은 주방 필수템이에요. 링크에서 확인하세요."
+        self.tts_output_dir = str(tmp_path)
+        self.voice_manager = None
+        self.config = SimpleNamespace(GEMINI_TTS_MODEL="tts-test")
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=AUDIO))
+        response = SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+        self.genai_client = SimpleNamespace(models=SimpleNamespace(generate_content=lambda **_kwargs: response))
+
+    def __getattribute__(self, name):
+        if name in type(self).WATCHED:
+            object.__getattribute__(self, "reads").append((name, threading.current_thread().name))
+        return object.__getattribute__(self, name)
+
+    def add_log(self, message, level="info"):
+        self.logs.append(message)
+
+
+def test_voice_workers_use_the_gui_snapshot_and_post_logs(monkeypatch, tmp_path):
+    from processors import video_composer
+    from processors.tts_processor import TTSProcessor
+
+    monkeypatch.setattr(TTSProcessor, "get_video_duration_helper", lambda self: 10.0)
+    monkeypatch.setattr(
+        TTSProcessor, "build_tts_metadata", lambda self, script, duration, path, *args, **kwargs: [{"path": path}]
+    )
+    gui = _GuiSpy(tmp_path)
+    posted = []
+    gui.ui_callback_signal = SimpleNamespace(emit=posted.append)
+    composer = video_composer.VideoComposer(gui)
+    processor = TTSProcessor(gui)
+    voices = ["Charon", "Kore", "Puck"]
+
+    inputs = processor.snapshot_inputs(voices)
+    gui.reads.clear()
+    with MultiVoiceSynthesizer(
+        lambda voice: processor.generate_tts_for_voice(voice, inputs=inputs, log=composer._post_log)
+    ) as synthesizer:
+        synthesizer.submit(voices)
+        results = {voice: synthesizer.result(voice) for voice in voices}
+
+    assert all(path and path.startswith(str(tmp_path)) for _meta, _duration, path in results.values())
+    assert gui.reads == []
+    assert posted and gui.logs == []
+    for callback in posted:
+        callback()
+    assert len(gui.logs) == len(posted)
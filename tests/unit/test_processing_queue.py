@@ -0,0 +1,79 @@
+"""ProcessingQueue ordering, per-status indexes and a 10k-URL micro-benchmark."""
+
+import logging
+import time
+
+import pytest
+
+from managers import processing_queue
+from managers.processing_queue import ProcessingQueue, UrlStatus
+
+
+def _urls(count):
+    return [f"https://example.com/video/{index}" for index in range(count)]
+
+
+def test_next_waiting_and_status_lists_follow_queue_order():
+    queue = ProcessingQueue()
+    urls = _urls(5)
+    assert queue.add_urls(urls) == 5
+    assert queue.add_url(urls[2]) is False
+
+    queue.set_status(urls[0], UrlStatus.PROCESSING)
+    queue.set_status(urls[1], UrlStatus.FAILED)
+    assert queue.get_next_waiting_url() == urls[2]
+
+    # A retried URL goes back to waiting ahead of later URLs.
+    queue.set_status(urls[1], UrlStatus.WAITING)
+    assert queue.get_next_waiting_url() == urls[1]
+    assert queue.get_waiting_urls() == [urls[1], urls[2], urls[3], urls[4]]
+
+    assert queue.remove_url(urls[1]) is True
+    assert urls[1] not in queue
+    assert queue.get_all_urls() == [urls[0], urls[2], urls[3], urls[4]]
+    assert queue.get_stats() == {
+        "waiting": 3, "processing": 1, "completed": 0, "failed": 0, "skipped": 0, "total": 4,
+    }
+    assert queue.normalize_processing_to_waiting() == 1
+    assert queue.get_waiting_urls() == [urls[0], urls[2], urls[3], urls[4]]
+    assert queue.has_pending_urls() is True
+
+
+def test_round_trip_restores_order_and_indexes():
+    queue = ProcessingQueue()
+    urls = _urls(4)
+    queue.add_urls(urls)
+    queue.set_status(urls[0], UrlStatus.COMPLETED)
+    queue.set_status(urls[2], UrlStatus.PROCESSING)
+
+    restored = ProcessingQueue()
+    assert restored.from_dict(queue.to_dict()) is True
+
+    assert restored.get_all_urls() == urls
+    assert restored.get_completed_urls() == [urls[0]]
+    assert restored.get_next_waiting_url() == urls[1]
+    assert restored.get_waiting_urls() == [urls[1], urls[2], urls[3]]
+
+
+@pytest.mark.benchmark
+def test_ten_thousand_url_queue_operations_stay_constant_time(caplog):
+    # Time the data structure, not debug handlers another test may have installed.
+    caplog.set_level(logging.INFO, logger=processing_queue.logger.name)
+    queue = ProcessingQueue()
+    urls = _urls(10_000)
+
+    started = time.perf_counter()
+    queue.add_urls(urls)
+    for url in urls:
+        assert url in queue
+        next_url = queue.get_next_waiting_url()
+        queue.set_status(next_url, UrlStatus.PROCESSING)
+        queue.set_status(next_url, UrlStatus.COMPLETED)
+    for url in urls[::2]:
+        queue.remove_url(url)
+    elapsed = time.perf_counter() - started
+
+    # The list-backed queue needed O(n) per step here (~50M comparisons).
+    assert elapsed < 2.0, elapsed
+    assert queue.get_next_waiting_url() is None
+    assert queue.get_completed_urls() == urls[1::2]
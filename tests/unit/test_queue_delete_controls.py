@@ -3,10 +3,10 @@ from types import SimpleNamespace
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QApplication, QTreeWidgetItem
+from PyQt6.QtWidgets import QApplication
 
 from managers.queue_manager import QueueManager
+from ui.components.queue_table import QueueRow
 from ui.panels.queue_panel import QueuePanel
 
 
@@ -54,14 +54,14 @@ def test_delete_controls_show_counts_selection_and_result_feedback():
     panel.clear_completed_btn.click()
     panel.clear_btn.click()
 
-    selected = QTreeWidgetItem(["대기", "https://example.com", "대기", "-", ""])
-    selected.setData(
-        0,
-        Qt.ItemDataRole.UserRole,
-        {"source": "scheduled", "id": "scheduled-1", "status": "waiting"},
-    )
-    gui.url_listbox.addTopLevelItem(selected)
-    selected.setSelected(True)
+    gui.url_listbox.set_rows([
+        QueueRow(
+            ("scheduled", "scheduled-1"),
+            ("대기", "https://example.com", "대기", "-", ""),
+            {"source": "scheduled", "id": "scheduled-1", "status": "waiting"},
+        )
+    ])
+    gui.url_listbox.selectAll()
     panel.sync_delete_controls(snapshot)
 
     assert panel.remove_btn.isEnabled() is True
@@ -0,0 +1,123 @@
+"""Incremental queue table updates: row-level signals, kept selection, 5k-row latency."""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QItemSelectionModel, Qt
+from PyQt6.QtWidgets import QApplication
+
+from managers import queue_manager as queue_module
+from managers.queue_manager import QueueManager
+from ui.components.queue_table import QueueRow, QueueTreeView
+
+QT_APP = QApplication.instance() or QApplication([])
+
+
+def _row(key, status="대기", remark=""):
+    return QueueRow(("local", key), ("대기", key, status, "-", remark), {"key": key})
+
+
+class _Signals:
+    def __init__(self, model):
+        self.changed = []
+        self.inserted = []
+        self.removed = []
+        model.dataChanged.connect(lambda first, last, _roles: self.changed.append((first.row(), last.row())))
+        model.rowsInserted.connect(lambda _parent, first, last: self.inserted.append((first, last)))
+        model.rowsRemoved.connect(lambda _parent, first, last: self.removed.append((first, last)))
+
+
+def test_set_rows_signals_only_changed_rows_and_keeps_selection():
+    view = QueueTreeView()
+    model = view.queue_model
+    view.set_rows([_row(f"u{i}") for i in range(6)])
+    view.selectionModel().select(
+        model.index(4, 0),
+        QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows,
+    )
+    signals = _Signals(model)
+
+    rows = [_row(f"u{i}") for i in range(6)]
+    rows[2] = _row("u2", status="진행 중")
+    view.set_rows(rows)
+    assert signals.changed == [(2, 2)]
+    assert signals.inserted == [] and signals.removed == []
+
+    # Removing u1 and appending u6 shifts rows without resetting the model.
+    view.set_rows([rows[0]] + rows[2:] + [_row("u6")])
+    assert len(signals.removed) == len(signals.inserted) == 1
+    assert [model.row(i).identity[1] for i in range(model.rowCount())] == [
+        "u0", "u2", "u3", "u4", "u5", "u6",
+    ]
+    assert [item.text(1) for item in view.selectedItems()] == ["u4"]
+    assert view.selectedItems()[0].data(0, Qt.ItemDataRole.UserRole) == {"key": "u4"}
+    assert model.data(model.index(1, 2), Qt.ItemDataRole.ToolTipRole) == "진행 중"
+
+
+def _manager_with_rows(monkeypatch, count):
+    settings = SimpleNamespace(
+        get_youtube_auto_upload=lambda: False,
+        get_youtube_connected=lambda: False,
+    )
+    monkeypatch.setattr(queue_module, "get_settings_manager", lambda: settings)
+    monkeypatch.setattr(queue_module, "build_summer_coupang_queue_snapshot", lambda: {"rows": []})
+    urls = [f"https://example.com/video/{index}" for index in range(count)]
+    gui = SimpleNamespace(
+        url_queue=list(urls),
+        url_status={url: "waiting" for url in urls},
+        url_status_message={},
+        url_remarks={},
+        url_auto_upload_status={},
+        mix_jobs={},
+        url_listbox=QueueTreeView(),
+    )
+    return QueueManager(gui), gui, urls
+
+
+def test_update_at_5k_rows_repaints_only_the_changed_row(monkeypatch):
+    manager, gui, urls = _manager_with_rows(monkeypatch, 5_000)
+    view = gui.url_listbox
+    view.resize(800, 400)
+    manager.update_url_listbox()
+    view.scrollTo(view.queue_model.index(2_500, 0))
+    scroll = view.verticalScrollBar().value()
+    view.selectionModel().select(
+        view.queue_model.index(2_500, 0),
+        QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows,
+    )
+    signals = _Signals(view.queue_model)
+
+    for tick in range(10):
+        gui.url_status[urls[tick]] = "processing"
+        gui.url_status_message[urls[tick]] = f"step {tick}"
+        manager.update_url_listbox()
+        gui.url_status[urls[tick]] = "completed"
+
+    # Each tick repaints only the row that finished and the one that started.
+    assert signals.changed == [(0, 0)] + [(tick - 1, tick) for tick in range(1, 10)]
+    assert signals.inserted == [] and signals.removed == []
+    assert view.verticalScrollBar().value() == scroll
+    assert [item.text(1) for item in view.selectedItems()] == [urls[2_500]]
+
+
+@pytest.mark.benchmark
+def test_update_latency_at_5k_rows(monkeypatch):
+    manager, gui, urls = _manager_with_rows(monkeypatch, 5_000)
+    gui.url_listbox.resize(800, 400)
+    manager.update_url_listbox()
+
+    timings = []
+    for tick in range(10):
+        gui.url_status[urls[tick]] = "processing"
+        started = time.perf_counter()
+        manager.update_url_listbox()
+        timings.append(time.perf_counter() - started)
+        gui.url_status[urls[tick]] = "completed"
+
+    # Rebuilding 5k QTreeWidgetItems took hundreds of ms per tick.
+    assert sorted(timings)[len(timings) // 2] < 0.1, timings
@@ -0,0 +1,142 @@
+import logging
+import sys
+import time
+import types
+
+import pytest
+
+from core.api import ApiKeyManager as api_key_module
+from core.api.ApiKeyManager import APIKeyManager
+from utils.secrets_manager import SecretsManager
+
+
+class _FakeKeyring:
+    """OS keyring stand-in with a per-call cost like a real credential store."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.values = {}
+        self.reads = 0
+
+    def module(self):
+        module = types.ModuleType("keyring")
+        module.get_password = self.get_password
+        module.set_password = self.set_password
+        module.delete_password = self.delete_password
+        return module
+
+    def get_password(self, service, name):
+        self.reads += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.values.get((service, name))
+
+    def set_password(self, service, name, value):
+        self.values[(service, name)] = value
+
+    def delete_password(self, service, name):
+        self.values.pop((service, name), None)
+
+
+@pytest.fixture
+def keyring_store(monkeypatch, tmp_path, caplog):
+    caplog.set_level(logging.INFO, logger=api_key_module.logger.name)
+    app_dir = tmp_path / ".ssmaker"
+    secret_file = app_dir / ".secrets"
+    fake = _FakeKeyring()
+    monkeypatch.setitem(sys.modules, "keyring", fake.module())
+    monkeypatch.setattr(SecretsManager, "_use_keyring", True)
+    monkeypatch.setattr(SecretsManager, "_fallback_file", None)
+    monkeypatch.setattr(SecretsManager, "_init_keyring", classmethod(lambda cls: True))
+    monkeypatch.setattr(SecretsManager, "_candidate_base_dirs", classmethod(lambda cls: [app_dir]))
+    monkeypatch.setattr(
+        SecretsManager, "_candidate_secret_files", classmethod(lambda cls: [secret_file])
+    )
+    SecretsManager.invalidate_cache()
+    return fake
+
+
+def _timed_lookups(manager, lookups, cached):
+    start = time.perf_counter()
+    for _ in range(lookups):
+        if not cached:
+            SecretsManager.invalidate_cache()
+            manager._secrets_version = None
+        manager.get_available_key()
+    return (time.perf_counter() - start) / lookups
+
+
+def test_10k_key_lookups_do_not_touch_the_keyring(keyring_store):
+    assert SecretsManager.store_api_key("gemini_api_1", "key-one")
+    assert SecretsManager.store_api_key("gemini_api_2", "key-two")
+    manager = APIKeyManager()
+
+    keyring_store.reads = 0
+    _timed_lookups(manager, 200, cached=False)
+    assert keyring_store.reads == 200 * APIKeyManager.MAX_KEYS
+
+    keyring_store.reads = 0
+    _timed_lookups(manager, 10_000, cached=True)
+
+    assert keyring_store.reads <= APIKeyManager.MAX_KEYS
+    assert {manager.api_keys["api_1"], manager.api_keys["api_2"]} == {"key-one", "key-two"}
+
+
+@pytest.mark.benchmark
+def test_cached_key_lookup_time(keyring_store):
+    keyring_store.latency = 0.0001
+    assert SecretsManager.store_api_key("gemini_api_1", "key-one")
+    manager = APIKeyManager()
+
+    uncached = _timed_lookups(manager, 200, cached=False)
+    cached = _timed_lookups(manager, 10_000, cached=True)
+
+    assert cached < uncached / 5, (cached, uncached)
+
+
+def test_store_and_delete_invalidate_cached_value(keyring_store):
+    assert SecretsManager.get_api_key("gemini_api_1") is None  # negative entry cached
+    assert SecretsManager.store_api_key("gemini_api_1", "first")
+    assert SecretsManager.get_api_key("gemini_api_1") == "first"
+
+    assert SecretsManager.store_api_key("gemini_api_1", "second")
+    assert SecretsManager.get_api_key("gemini_api_1") == "second"
+
+    assert SecretsManager.delete_api_key("gemini_api_1")
+    assert SecretsManager.get_api_key("gemini_api_1") is None
+
+
+def test_write_from_another_process_is_seen(keyring_store):
+    assert SecretsManager.store_api_key("gemini_api_1", "mine")
+    assert SecretsManager.get_api_key("gemini_api_1") == "mine"
+    reads = keyring_store.reads
+    assert SecretsManager.get_api_key("gemini_api_1") == "mine"
+    assert keyring_store.reads == reads
+
+    # Another process writes the keyring and bumps the shared generation file.
+    keyring_store.values[(SecretsManager.SERVICE_NAME, "gemini_api_1")] = "theirs"
+    SecretsManager._generation_file().write_text("other-process", encoding="utf-8")
+
+    assert SecretsManager.get_api_key("gemini_api_1") == "theirs"
+
+
+def test_fallback_file_change_invalidates_cache(keyring_store, monkeypatch):
+    monkeypatch.setattr(SecretsManager, "_use_keyring", False)
+    assert SecretsManager.store_api_key("gemini_api_1", "file-one")
+    assert SecretsManager.get_api_key("gemini_api_1") == "file-one"
+
+    # Rewrite the file without going through store_api_key (older client).
+    SecretsManager._store_to_file("gemini_api_1", "file-two-longer")
+
+    assert SecretsManager.get_api_key("gemini_api_1") == "file-two-longer"
+
+
+def test_key_manager_picks_up_keys_added_after_startup(keyring_store):
+    assert SecretsManager.store_api_key("gemini_api_1", "key-one")
+    manager = APIKeyManager()
+    manager.get_available_key()
+
+    assert SecretsManager.store_api_key("gemini_api_3", "key-three")
+    manager.get_available_key()
+
+    assert manager.api_keys["api_3"] == "key-three"
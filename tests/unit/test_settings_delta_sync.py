@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""Field-level settings sync against a local versioned stub backend."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from caller import rest
+from managers.settings_manager import SettingsManager
+
+
+class _SettingsServer(ThreadingHTTPServer):
+    """Versioned /user/settings with per-field versions, like the backend."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SettingsHandler)
+        self.settings = {}
+        self.field_versions = {}
+        self.version = 0
+        self.log = []  # (method, request bytes, response bytes)
+        self.lock = threading.Lock()
+
+    def store(self, updated):
+        changed = {
+            key
+            for key in set(self.settings) | set(updated)
+            if self.settings.get(key, object()) != updated.get(key, object())
+        }
+        if changed or not self.version:
+            self.version += 1
+            self.field_versions.update({key: self.version for key in changed})
+        self.settings = updated
+
+
+class _SettingsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *_args):
+        return None
+
+    def _body(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        return raw, json.loads(raw or b"{}")
+
+    def _reply(self, method, request_bytes, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+        self.server.log.append((method, request_bytes, len(data)))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server: _SettingsServer = self.server
+        since = parse_qs(urlparse(self.path).query).get("since_version")
+        with server.lock:
+            if since and int(since[0]) == server.version:
+                payload = {"success": True, "unchanged": True, "version": server.version}
+            elif since and int(since[0]) < server.version:
+                newer = [k for k, v in server.field_versions.items() if v > int(since[0])]
+                payload = {
+                    "success": True,
+                    "delta": True,
+                    "changes": {k: server.settings[k] for k in newer if k in server.settings},
+                    "removed": [k for k in newer if k not in server.settings],
+                    "version": server.version,
+                }
+            else:
+                payload = {"success": True, "settings": server.settings, "version": server.version}
+        self._reply("GET", 0, payload)
+
+    def do_PUT(self):
+        server: _SettingsServer = self.server
+        raw, body = self._body()
+        with server.lock:
+            server.store(body["settings"])
+            payload = {"success": True, "version": server.version}
+        self._reply("PUT", len(raw), payload)
+
+    def do_PATCH(self):
+        server: _SettingsServer = self.server
+        raw, body = self._body()
+        with server.lock:
+            if body["base_version"] != server.version:
+                return self._reply(
+                    "PATCH", len(raw), {"success": False, "conflict": True}, status=409
+                )
+            updated = {**server.settings, **body["changes"]}
+            for key in body["removed"]:
+                updated.pop(key, None)
+            server.store(updated)
+            payload = {"success": True, "version": server.version}
+        self._reply("PATCH", len(raw), payload)
+
+
+class _MemoryCredentialStore:
+    def __init__(self):
+        self.values = {}
+
+    def set_credential(self, key, value):
+        self.values[key] = value
+        return True
+
+    def get_credential(self, key):
+        return self.values.get(key)
+
+    def delete_credential(self, key):
+        self.values.pop(key, None)
+        return True
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    store = _MemoryCredentialStore()
+    monkeypatch.setattr("managers.settings_manager.get_secrets_manager", lambda: store)
+
+    stub = _SettingsServer()
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    monkeypatch.setattr(rest, "main_server", f"http://127.0.0.1:{stub.server_port}")
+    monkeypatch.setattr(rest, "_secure_session", requests.Session())
+    monkeypatch.setattr(rest, "_get_auth_token", lambda: "desktop-jwt")
+    yield stub
+    stub.shutdown()
+    stub.server_close()
+
+
+def _device(name, presets=None):
+    manager = SettingsManager(f"{name}.json")
+    if presets is not None:
+        manager.update_settings({"voice_presets": presets})
+    assert manager.sync_with_remote({}) is True
+    # Push explicitly so request counts do not depend on the flush timer.
+    manager._remote_sync_enabled = False
+    return manager
+
+
+def test_single_field_change_sends_only_that_field(server):
+    presets = [{"id": f"preset-{i}", "voices": ["a", "b", "c"], "speed": 1.1} for i in range(300)]
+    device = _device("a", presets)
+    assert [entry[0] for entry in server.log] == ["GET", "PUT"]  # empty account: seed it
+    full_bytes = server.log[-1][1]
+
+    server.log.clear()
+    device.set_theme("dark")
+    assert device.push_remote_settings() is True
+    assert device.push_remote_settings() is True  # nothing left to send
+
+    (method, delta_bytes, _), = server.log
+    assert method == "PATCH"
+    assert delta_bytes * 50 < full_bytes, (delta_bytes, full_bytes)
+    assert server.settings["theme"] == "dark"
+    assert server.settings["voice_presets"] == presets
+
+
+def test_diverged_version_rebases_local_changes_on_the_remote_ones(server):
+    device = _device("a")
+    with server.lock:
+        server.store({**server.settings, "cta_id": "other-device", "theme": "dark"})
+
+    device.set_cta_id("this-device")
+    assert device.push_remote_settings() is True
+    assert [entry[0] for entry in server.log[-3:]] == ["PATCH", "GET", "PATCH"]
+    assert "PUT" not in [entry[0] for entry in server.log[2:]]
+
+    # 다른 기기의 변경(theme)은 유지하고 이 기기의 변경(cta_id)을 위에 얹음
+    assert server.settings["cta_id"] == "this-device"
+    assert server.settings["theme"] == "dark"
+    assert device.get_cta_id() == "this-device"
+    assert device.get_theme() == "dark"
+
+    device.set_theme("dark")
+    assert device.push_remote_settings() is True
+    assert server.log[-1][0] == "PATCH"
+
+
+def test_second_device_pulls_only_changed_fields(server):
+    presets = [{"id": f"preset-{i}", "voices": ["a", "b"]} for i in range(300)]
+    first = _device("a", presets)
+    second = _device("b")
+    assert second.get_all_settings()["voice_presets"] == presets
+    full_pull_bytes = [entry for entry in server.log if entry[0] == "GET"][-1][2]
+
+    first.set_theme("dark")
+    assert first.push_remote_settings() is True
+    server.log.clear()
+    assert second.pull_remote_settings() is True
+
+    (method, _, delta_pull_bytes), = server.log
+    assert method == "GET"
+    assert delta_pull_bytes * 50 < full_pull_bytes
+    assert second.get_theme() == "dark"
+    assert second.get_all_settings()["voice_presets"] == presets
+
+    server.log.clear()
+    assert second.pull_remote_settings() is True
+    assert server.log[0][2] < 100  # "unchanged"
+
+
+def test_sync_state_of_another_account_is_reset(server, monkeypatch):
+    device = _device("a")
+    device._remote_user_id = ""
+    assert device.sync_with_remote({"data": {"data": {"id": 7}}}) is True
+    state = device.get_all_settings()[SettingsManager.REMOTE_SYNC_STATE_KEY]
+    assert state["user_id"] == "7" and state["version"] == server.version
+
+    fetched = []
+    monkeypatch.setattr(
+        rest,
+        "fetch_user_settings",
+        lambda since_version=None: fetched.append(since_version) or {"success": True, "settings": {"theme": "light"}},
+    )
+    monkeypatch.setattr(rest, "patch_user_settings", pytest.fail)
+    assert device.sync_with_remote({"data": {"data": {"id": 8}}}) is True
+
+    # 다른 계정의 버전은 기준 버전으로 보내지 않고 전체를 다시 받음
+    assert fetched == [None]
+    assert device.get_all_settings()[SettingsManager.REMOTE_SYNC_STATE_KEY]["user_id"] == "8"
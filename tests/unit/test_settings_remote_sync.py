@@ -1,5 +1,10 @@
+import json
+import threading
+import time
+
 import pytest
 
+from managers import settings_manager as settings_module
 from managers.settings_manager import SettingsManager
 
 
@@ -121,3 +126,79 @@ def test_remote_sync_migrates_legacy_server_secrets_to_device_store(
     assert manager.get_all_settings()["linktree_webhook_url"] == ""
     assert manager.get_all_settings()["linktree_api_key"] == ""
     assert manager.get_all_settings()["cookies_1688"] == {}
+
+
+def test_rapid_setter_calls_coalesce_into_one_write_and_one_push(
+    monkeypatch,
+    tmp_path,
+    memory_credentials,
+):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.setattr(SettingsManager, "SAVE_DEBOUNCE_SECONDS", 0.2)
+
+    manager = SettingsManager("prefs.json")
+    manager._remote_sync_enabled = True
+    writes = []
+    real_write = manager._write_settings
+    monkeypatch.setattr(manager, "_write_settings", lambda: writes.append(1) or real_write())
+
+    from caller import rest
+
+    pushes = []
+    pushed = threading.Event()
+
+    def _fake_save(payload):
+        pushes.append(payload)
+        pushed.set()
+        return {"success": True}
+
+    monkeypatch.setattr(rest, "save_user_settings", _fake_save)
+
+    for index in range(10):
+        assert manager.set_cta_id(f"cta-{index}") is True
+    assert manager.set_theme("dark") is True
+    assert manager.set_watermark_enabled(True) is True
+    assert writes == []
+
+    assert pushed.wait(5)
+    time.sleep(0.4)  # a second debounce window would have fired by now
+    assert writes == [1]
+    assert len(pushes) == 1
+    assert pushes[0]["cta_id"] == "cta-9"
+    assert pushes[0]["theme"] == "dark"
+    with open(manager._get_settings_path(), encoding="utf-8") as stream:
+        assert json.load(stream)["cta_id"] == "cta-9"
+
+
+def test_pending_changes_are_written_at_shutdown(monkeypatch, tmp_path, memory_credentials):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.setattr(SettingsManager, "SAVE_DEBOUNCE_SECONDS", 60)
+
+    manager = SettingsManager("prefs.json")
+    settings_path = manager._get_settings_path()
+    assert manager.set_cta_id("before-exit") is True
+
+    settings_module.flush_all_settings()
+
+    with open(settings_path, encoding="utf-8") as stream:
+        assert json.load(stream)["cta_id"] == "before-exit"
+    assert manager._flush_timer is None
+
+
+def test_failed_flush_keeps_changes_pending(monkeypatch, tmp_path, memory_credentials):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.setattr(SettingsManager, "SAVE_DEBOUNCE_SECONDS", 60)
+
+    manager = SettingsManager("prefs.json")
+    assert manager.set_cta_id("retry-me") is True
+    real_write = manager._write_settings
+    monkeypatch.setattr(manager, "_write_settings", lambda: False)
+    assert manager.flush() is False
+
+    monkeypatch.setattr(manager, "_write_settings", real_write)
+    assert manager.flush() is True
+    with open(manager._get_settings_path(), encoding="utf-8") as stream:
+        assert json.load(stream)["cta_id"] == "retry-me"
@@ -65,6 +65,7 @@ def test_sensitive_settings_use_credential_store_and_leave_json_value_free(
     assert manager.set_computer_use_settings(bridge_api_key="bridge-token") is True
     assert manager.set_inpock_cookies({"session": "inpock-cookie"}) is True
     assert manager.set_1688_cookies({"session": "1688-cookie"}) is True
+    assert manager.flush() is True
 
     persisted = json.loads(settings_path.read_text(encoding="utf-8"))
     for key in SettingsManager.SECURE_CREDENTIAL_KEYS:
@@ -111,6 +112,19 @@ def test_credential_store_failure_is_fail_closed(monkeypatch, tmp_path):
         assert "secret-value" not in serialized
 
 
+def test_credential_setters_report_a_failed_preferences_write(monkeypatch, tmp_path):
+    manager, _settings_path = _manager(monkeypatch, tmp_path, MemoryCredentialStore())
+    monkeypatch.setattr(manager, "_write_settings", lambda: False)
+
+    assert manager.set_coupang_keys("access-value", "secret-value") is False
+    assert manager.set_linktree_settings("https://example.com/hook", "linktree-token") is False
+    assert manager.set_computer_use_settings(bridge_api_key="bridge-token") is False
+    assert manager.set_inpock_cookies({"session": "inpock-cookie"}) is False
+    assert manager.set_1688_cookies({"session": "1688-cookie"}) is False
+    # 자격 증명이 없는 설정은 그대로 디바운스
+    assert manager.set_computer_use_settings(paid_only=True) is True
+
+
 def test_startup_migrates_plaintext_secrets_then_scrubs_preferences(
     monkeypatch,
     tmp_path,
@@ -197,6 +197,8 @@ def test_saves_replace_a_same_directory_temporary_file(monkeypatch, tmp_path):
     manager = SettingsManager()
 
     assert manager.set_theme("dark") is True
+    assert replace_calls == []
+    assert manager.flush() is True
     assert len(replace_calls) == 1
     temporary_path, destination_path = replace_calls[0]
     assert temporary_path.parent == destination_path.parent == paths["current"].parent
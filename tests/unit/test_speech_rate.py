@@ -0,0 +1,283 @@
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.audio import pcm, speech_rate
+from core.audio.pipeline import AudioConfig, AudioPipeline
+from core.audio.speech_rate import SpeechRateModel, spoken_units
+from utils.korean_text_processor import process_korean_script
+
+RATE = 24000
+CTA_LINES = ["제품이 마음에 드셨다면", "아래 링크에서 확인해 보세요!"]
+# 원본 속도에서 음절당 평균 길이 (초) - 음성마다 빠르기가 다름
+VOICE_SYLLABLE_SECONDS = {"Charon": 0.2, "Kore": 0.14, "Puck": 0.165}
+SYLLABLES = list("가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주")
+
+
+class _StubTTSEngine:
+    """
+    Gemini TTS stand-in: one harmonic burst per Hangul syllable at the voice's
+    rate, word gaps, pauses after punctuation, per-take tempo jitter.
+    """
+
+    def __init__(self, seed=0):
+        self.rng = np.random.default_rng(seed)
+        self.calls = []
+
+    def generate_content(self, *, model, contents, config):
+        text = contents[0]
+        voice = config.speech_config.voice_config.prebuilt_voice_config.voice_name
+        self.calls.append((voice, text))
+        syllable = VOICE_SYLLABLE_SECONDS[voice] * self.rng.normal(1.0, 0.04)
+        pieces = [np.zeros(int(0.3 * RATE))]
+        for word in text.split():
+            for _ in range(max(1, sum(1 for ch in word if "가" <= ch <= "힣"))):
+                t = np.arange(int(syllable * self.rng.uniform(0.85, 1.15) * RATE)) / RATE
+                f0 = self.rng.uniform(110, 200)
+                envelope = 0.35 + 0.65 * np.sin(np.pi * t / t[-1])
+                voiced = np.sin(2 * np.pi * f0 * t) + 0.5 * np.sin(4 * np.pi * f0 * t)
+                pieces.append(voiced * envelope * 0.25)
+            pause = 0.28 if word[-1] in ".,!?" else 0.05
+            pieces.append(np.zeros(int(pause * self.rng.uniform(0.8, 1.2) * RATE)))
+        pieces.append(np.zeros(int(0.4 * RATE)))
+        audio = np.concatenate(pieces) + self.rng.standard_normal(sum(map(len, pieces))) * 10 ** (-70 / 20)
+        data = (np.clip(audio, -1, 1) * 32767).astype("<i2").tobytes()
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=data))
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+def _sentence(rng):
+    words = ["".join(rng.choice(SYLLABLES, rng.integers(2, 5))) for _ in range(rng.integers(3, 6))]
+    return " ".join(words) + str(rng.choice([".", "!", "."]))
+
+
+def _jobs(count, seed=1):
+    rng = np.random.default_rng(seed)
+    voices = list(VOICE_SYLLABLE_SECONDS)
+    return [
+        (
+            " ".join(_sentence(rng) for _ in range(rng.integers(8, 18))),
+            voices[index % len(voices)],
+            float(rng.uniform(12, 28)),
+        )
+        for index in range(count)
+    ]
+
+
+def _pipeline(tmp_path, engine, config, model=None):
+    app = SimpleNamespace(
+        tts_output_dir=str(tmp_path),
+        genai_client=SimpleNamespace(models=engine),
+        config=SimpleNamespace(GEMINI_TTS_MODEL="tts-stub"),
+        translation_result="이 제품 정말 좋아요",
+    )
+    pipeline = AudioPipeline(app, config, speech_rates=model or SpeechRateModel())
+    # 배속/타이밍 분석은 길이만 계산 (이 시뮬레이션은 생성 횟수와 길이만 봄)
+    pipeline._apply_speed = lambda samples, voice, ts, suffix: (
+        str(tmp_path / "speeded.wav"),
+        pcm.duration_seconds(samples, config.sample_rate) / config.speed_ratio,
+    )
+    pipeline._analyze_with_whisper = lambda path, script, segments, duration: ([], "stub", 0.0, duration)
+    pipeline._split_text_naturally = pipeline._simple_split
+    return pipeline
+
+
+def _simulate(tmp_path, config, jobs):
+    engine = _StubTTSEngine(seed=3)
+    pipeline = _pipeline(tmp_path, engine, config)
+    calls, hits, fill, tail_texts = [], 0, [], []
+    for script, voice, video_duration in jobs:
+        target = video_duration * config.max_duration_ratio
+        before = len(engine.calls)
+        first = []
+        original_generate_take = pipeline._generate_take
+
+        def _generate_take(*args, **kwargs):
+            take = original_generate_take(*args, **kwargs)
+            first.append(take.result.speeded_duration)
+            return take
+
+        pipeline._generate_take = _generate_take
+        result = pipeline.generate_tts(script, voice, video_duration, cta_lines=CTA_LINES)
+        pipeline._generate_take = original_generate_take
+        job_calls = engine.calls[before:]
+        calls.append(len(job_calls))
+        hits += bool(first) and first[0] <= target and len(job_calls) == 1
+        fill.append(result.speeded_duration / target)
+        tail_texts.extend(text for _voice, text in job_calls[1:])
+    return {
+        "first_try_hit_rate": hits / len(jobs),
+        "calls_per_job": float(np.mean(calls)),
+        "mean_fill": float(np.mean(fill)),
+        "max_fill": float(np.max(fill)),
+        "tail_texts": tail_texts,
+    }
+
+
+def test_learned_rate_and_tail_retry_cut_tts_calls_per_job(tmp_path, record_property):
+    jobs = _jobs(45)
+    fast = dict(sample_rate=16000, channels=1)
+    baseline = _simulate(tmp_path, AudioConfig(learn_speech_rate=False, tail_only_retry=False, **fast), jobs)
+    learned = _simulate(tmp_path, AudioConfig(tail_only_retry=True, **fast), jobs)
+
+    for name, report in (("fixed_rate_full_retry", baseline), ("learned_rate_tail_retry", learned)):
+        for metric in ("first_try_hit_rate", "calls_per_job", "mean_fill", "max_fill"):
+            record_property(f"{name}_{metric}", round(report[metric], 3))
+    assert learned["first_try_hit_rate"] >= 0.8
+    assert learned["first_try_hit_rate"] > baseline["first_try_hit_rate"]
+    assert learned["calls_per_job"] < baseline["calls_per_job"]
+    assert learned["calls_per_job"] <= 1.2
+    assert learned["max_fill"] <= 1.0
+    # 재시도는 잘린 끝부분(CTA)만 합성
+    assert set(learned["tail_texts"]) <= {process_korean_script(" ".join(CTA_LINES))}
+
+
+def test_default_retry_regenerates_the_whole_trimmed_script(tmp_path, monkeypatch):
+    monkeypatch.delenv("SSMAKER_FORCED_ALIGNMENT", raising=False)
+    engine = _StubTTSEngine(seed=5)
+    config = AudioConfig(sample_rate=16000, channels=1, reuse_cta_audio=False)
+    pipeline = _pipeline(tmp_path, engine, config)
+    pipeline._retry_tail = lambda *args: pytest.fail("tail-only retry is opt-in")
+    rng = np.random.default_rng(9)
+    sentences = [_sentence(rng) for _ in range(12)]
+    cta = " ".join(CTA_LINES)
+
+    assert config.tail_only_retry is False
+    pipeline._generate_with_retry(" ".join(sentences) + " " + cta, "Charon", 8.0, [], cta)
+
+    texts = [text for _voice, text in engine.calls]
+    assert texts[0] == process_korean_script(" ".join(sentences) + " " + cta)
+    assert len(texts) > 1
+    for text in texts[1:]:
+        # 재시도마다 첫 문장부터 줄인 대본 전체를 다시 합성
+        assert text.startswith(process_korean_script(sentences[0]))
+        assert text.endswith(process_korean_script(cta))
+        assert len(text) < len(texts[0])
+
+
+def test_tail_retry_keeps_head_audio_and_synthesizes_only_the_cta(tmp_path):
+    engine = _StubTTSEngine(seed=5)
+    config = AudioConfig(sample_rate=16000, channels=1)
+    pipeline = _pipeline(tmp_path, engine, config)
+    rng = np.random.default_rng(9)
+    script = " ".join(_sentence(rng) for _ in range(12))
+    cta = " ".join(CTA_LINES)
+
+    synthesized = []
+    original_cta_samples = pipeline._cta_samples
+
+    def _cta_samples(*args):
+        samples, from_gemini = original_cta_samples(*args)
+        synthesized.append(samples)
+        return samples, from_gemini
+
+    pipeline._cta_samples = _cta_samples
+    take = pipeline._generate_take(script + " " + cta, "Charon", [])
+    target = take.result.speeded_duration * 0.7
+    retry = pipeline._retry_tail(take, "Charon", target, cta)
+
+    assert retry is not None
+    assert [text for _voice, text in engine.calls] == [
+        process_korean_script(script + " " + cta),
+        process_korean_script(cta),
+    ]
+    assert retry.script.endswith(cta) and script.startswith(retry.script[: -len(cta)].strip())
+    kept = retry.script[: -len(cta)].strip()
+    assert len(pipeline._split_sentences(kept)) < 12
+    # 앞부분은 직전 생성 음성 그대로, 뒤에는 쉼 + 새로 합성한 CTA
+    tail = synthesized[-1]
+    head = len(retry.samples) - len(tail) - int(0.3 * config.sample_rate)
+    np.testing.assert_array_equal(retry.samples[:head], take.samples[:head])
+    np.testing.assert_array_equal(retry.samples[-len(tail) :], tail)
+    assert retry.result.speeded_duration <= target
+
+
+def test_unaligned_take_falls_back_to_full_regeneration(tmp_path):
+    engine = _StubTTSEngine()
+    config = AudioConfig(sample_rate=16000, channels=1)
+    pipeline = _pipeline(tmp_path, engine, config)
+    take = pipeline._generate_take("짧은 문장. 또 다른 문장.", "Kore", [])
+    take.samples = np.zeros_like(take.samples)
+
+    assert pipeline._retry_tail(take, "Kore", 0.5, "") is None
+
+
+def test_model_learns_per_voice_and_speed_and_persists(tmp_path):
+    path = tmp_path / "rates.json"
+    model = SpeechRateModel(str(path))
+    text = "오늘 소개할 제품은 주방에서 꼭 필요한 냄비 세트예요."
+
+    for seconds in (3.0, 3.2, 3.1, 2.9):
+        assert model.observe("Charon", 1.2, text, seconds)
+    assert not model.observe("Charon", 1.2, text, 60.0)  # 말이 안 되는 길이는 무시
+    assert not model.observe("Charon", 1.2, "네", 1.0)  # 너무 짧은 문장도 무시
+
+    mean, std, count = model.rate("Charon", 1.2)
+    assert count == 4 and mean * spoken_units(text) == pytest.approx(3.05, abs=0.05)
+    assert 0 < std < mean * 0.1
+    # 다른 음성/배속은 아직 학습 전 (사전값)
+    assert model.rate("Kore", 1.2, prior=0.2)[:2] == (0.2, pytest.approx(0.024))
+    assert model.rate("Charon", 1.0)[2] == 0
+
+    assert model.flush()
+    reloaded = SpeechRateModel(str(path))
+    assert reloaded.rate("Charon", 1.2) == pytest.approx(model.rate("Charon", 1.2))
+    assert json.loads(path.read_text(encoding="utf-8"))["version"] == 1
+    assert reloaded.predict("Charon", 1.2, text, z=1.3) > reloaded.predict("Charon", 1.2, text)
+
+
+def test_observations_are_saved_once_per_debounce_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(speech_rate, "SAVE_DEBOUNCE_SECONDS", 0.05)
+    replaced = []
+    real_replace = os.replace
+
+    def _counting_replace(src, dst):
+        replaced.append((src, dst))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(speech_rate.os, "replace", _counting_replace)
+    path = tmp_path / "rates.json"
+    model = SpeechRateModel(str(path))
+    text = "오늘 소개할 제품은 주방에서 꼭 필요한 냄비 세트예요."
+
+    for _ in range(20):
+        model.observe("Charon", 1.2, text, 3.0)
+    assert not path.exists()  # 관측마다 쓰지 않음
+    timer = model._flush_timer
+    timer.join()
+
+    assert len(replaced) == 1 and replaced[0][1] == str(path)
+    assert SpeechRateModel(str(path)).rate("Charon", 1.2)[2] == 20
+    assert [p.name for p in tmp_path.iterdir()] == ["rates.json"]  # 임시 파일 안 남음
+    assert model.flush() and len(replaced) == 1  # 바뀐 게 없으면 다시 안 씀
+
+
+def test_failed_save_keeps_statistics_pending(tmp_path, monkeypatch):
+    path = tmp_path / "rates.json"
+    model = SpeechRateModel(str(path))
+    model.observe("Charon", 1.2, "오늘 소개할 제품은 주방에서 꼭 필요한 냄비 세트예요.", 3.0)
+
+    def _disk_full(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(speech_rate.os, "replace", _disk_full)
+        assert not model.flush()
+    assert list(tmp_path.iterdir()) == []
+
+    assert model.flush()
+    assert SpeechRateModel(str(path)).rate("Charon", 1.2)[2] == 1
+
+
+def test_estimate_duration_uses_learned_rate_for_the_voice():
+    model = SpeechRateModel()
+    pipeline = AudioPipeline(SimpleNamespace(), speech_rates=model)
+    text = "바닥이 두꺼워서 열이 골고루 퍼지고, 손잡이도 뜨겁지 않아요."
+    for _ in range(5):
+        model.observe("Charon", 1.2, text, 6.0)
+
+    assert pipeline.estimate_duration(text, voice="Charon") == pytest.approx(6.0)
+    assert pipeline.estimate_duration(text) == pytest.approx(len(text.replace(" ", "")) / 7.0 / 1.2)
@@ -0,0 +1,168 @@
+"""Concurrent startup check graph: ordering, progress and splash-to-ready time."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PyQt6 import QtCore
+
+from startup import initializer as initializer_module
+from startup.initializer import Initializer, StartupCheck, StartupCheckError
+
+ENDPOINT_DELAY = 0.4
+OCR_DELAY = 0.4
+
+
+class _InFlight:
+    """Counts slow checks running at the same moment."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def hold(self, seconds):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        try:
+            time.sleep(seconds)
+        finally:
+            with self._lock:
+                self.current -= 1
+
+
+class _SlowBackend(BaseHTTPRequestHandler):
+    """Local stand-in for the health and release-note endpoints."""
+
+    in_flight = None
+
+    def log_message(self, *_args):
+        return None
+
+    def do_GET(self):
+        self.in_flight.hold(ENDPOINT_DELAY)
+        if self.path == "/app/version":
+            body = json.dumps({"version": "9.9.9", "release_notes": "notes"}).encode()
+        else:
+            body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def local_backend(monkeypatch, tmp_path):
+    in_flight = _InFlight()
+    monkeypatch.setattr(_SlowBackend, "in_flight", in_flight)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowBackend)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        initializer_module, "PAYMENT_API_BASE_URL", f"http://127.0.0.1:{server.server_port}"
+    )
+    monkeypatch.setattr(initializer_module.sys, "frozen", True, raising=False)
+    monkeypatch.setattr(initializer_module, "is_msix_package", lambda: False)
+    monkeypatch.setattr(Initializer, "_get_current_version", lambda self: "1.0.0")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    yield in_flight
+    server.shutdown()
+    server.server_close()
+
+
+def _record(initializer):
+    # Checks emit from worker threads; record them without an event loop.
+    direct = QtCore.Qt.ConnectionType.DirectConnection
+    events = {"progress": [], "items": [], "finished": [], "failed": []}
+    initializer.progressChanged.connect(events["progress"].append, direct)
+    initializer.checkItemChanged.connect(lambda *args: events["items"].append(args), direct)
+    initializer.finished.connect(lambda: events["finished"].append(True), direct)
+    initializer.failed.connect(events["failed"].append, direct)
+    return events
+
+
+def _run_with_slow_ocr(in_flight, monkeypatch):
+    from utils import ocr_backend
+
+    def slow_ocr_reader():
+        in_flight.hold(OCR_DELAY)
+        return object()
+
+    monkeypatch.setattr(ocr_backend, "create_ocr_reader", slow_ocr_reader)
+    initializer = Initializer()
+    events = _record(initializer)
+    update_info = []
+    initializer.updateInfoReady.connect(
+        update_info.append, QtCore.Qt.ConnectionType.DirectConnection
+    )
+    initializer.run()
+    return events, update_info
+
+
+def test_splash_to_ready_overlaps_ocr_api_and_update_checks(local_backend, monkeypatch):
+    events, update_info = _run_with_slow_ocr(local_backend, monkeypatch)
+
+    # OCR 로딩과 API/업데이트 요청이 겹쳐서 실행됨
+    assert local_backend.peak >= 2
+    assert events["finished"] == [True] and events["failed"] == []
+    assert events["progress"] == sorted(events["progress"])
+    assert events["progress"][-1] == 100
+    final = {item: status for item, status, _message in events["items"]}
+    assert set(final) == {
+        "system", "fonts", "ffmpeg", "internet", "modules",
+        "ocr", "tts_dir", "api", "update_check",
+    }
+    assert "checking" not in final.values()
+    assert final["api"] == "success" and final["update_check"] == "success"
+    assert update_info[0]["version"] == "9.9.9"
+
+
+@pytest.mark.benchmark
+def test_splash_to_ready_time(local_backend, monkeypatch):
+    started = time.perf_counter()
+    events, _update_info = _run_with_slow_ocr(local_backend, monkeypatch)
+    elapsed = time.perf_counter() - started
+
+    # Run back to back the three slow checks alone take 1.2s, and the old
+    # fixed splash delays added ~5s on top.
+    assert events["finished"] == [True]
+    assert elapsed < OCR_DELAY + ENDPOINT_DELAY * 2 - 0.2, elapsed
+
+
+def test_dependent_check_waits_for_its_prerequisite():
+    initializer = Initializer()
+    events = _record(initializer)
+    order = []
+
+    def slow_first():
+        time.sleep(0.05)
+        order.append("first")
+
+    initializer.run_checks([
+        StartupCheck("second", "second", "", 50, lambda: order.append("second"), after=("first",)),
+        StartupCheck("first", "first", "", 50, slow_first),
+    ])
+
+    assert order == ["first", "second"]
+    assert events["progress"] == [50, 99]
+
+
+def test_failing_check_reports_its_component():
+    initializer = Initializer()
+
+    def broken():
+        raise RuntimeError("probe failed")
+
+    with pytest.raises(StartupCheckError) as failure:
+        initializer.run_checks([
+            StartupCheck("ok", "ok_component", "", 50, lambda: None),
+            StartupCheck("broken", "broken_component", "", 50, broken),
+        ])
+
+    assert failure.value.component == "broken_component"
+    assert isinstance(failure.value.error, RuntimeError)
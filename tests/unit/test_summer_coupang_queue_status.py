@@ -1,14 +1,24 @@
 import json
+import os
+import time
 
 import pytest
 
+from managers import summer_coupang_queue_status
 from managers.summer_coupang_queue_status import (
     build_summer_coupang_queue_snapshot,
     delete_summer_coupang_queue_items,
+    invalidate_summer_coupang_queue_snapshot,
     summer_coupang_item_identity,
 )
 
 
+def _age_file(path, seconds=60):
+    """Move mtime out of the racy window so the snapshot may be cached."""
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
 def _write_delete_fixture(queue_path):
     items = [
         {
@@ -344,3 +354,106 @@ def test_build_snapshot_replaces_question_mark_mojibake_reason(tmp_path):
     remarks = snapshot["rows"][0]["remarks"]
     assert "같은 상품으로 확인할 수 있는 영상을 찾지 못해" in remarks
     assert "???" not in remarks
+
+
+def _write_large_queue(queue_path, count):
+    statuses = ["pending", "completed", "failed", "processing", "skipped_quality_gate"]
+    items = [
+        {
+            "planned_number": f"[{index:05d}]",
+            "status": statuses[index % len(statuses)],
+            "scheduled_at": f"2026-08-{11 + index % 5}T12:00:00+09:00",
+            "scheduled_order": index,
+            "coupang_url": f"https://example.com/product/{index}",
+            "attempts": index % 3,
+        }
+        for index in range(count)
+    ]
+    queue_path.write_text(json.dumps({"items": items}), encoding="utf-8")
+    _age_file(queue_path)
+    return items
+
+
+def test_unchanged_20k_queue_snapshot_is_served_from_cache(tmp_path, monkeypatch):
+    queue_path = tmp_path / "summer_queue.json"
+    items = _write_large_queue(queue_path, 20_000)
+
+    first = build_summer_coupang_queue_snapshot(queue_path)
+    assert first["total"] == 20_000
+    assert first["counts"] == {
+        "waiting": 4_000,
+        "processing": 4_000,
+        "completed": 4_000,
+        "skipped": 4_000,
+        "failed": 4_000,
+    }
+    identity = summer_coupang_item_identity(items[1234])
+    assert first["rows_by_id"][identity]["planned_number"] == "[01234]"
+
+    # A full parse of this file takes hundreds of milliseconds; repeat reads never parse.
+    monkeypatch.setattr(summer_coupang_queue_status, "_parse_snapshot", pytest.fail)
+    for _ in range(3):
+        snapshot = build_summer_coupang_queue_snapshot(queue_path)
+    assert snapshot["rows"] is first["rows"]
+
+
+@pytest.mark.benchmark
+def test_cached_20k_queue_snapshot_read_time(tmp_path):
+    queue_path = tmp_path / "summer_queue.json"
+    _write_large_queue(queue_path, 20_000)
+    build_summer_coupang_queue_snapshot(queue_path)
+
+    reads = 1_000
+    started = time.perf_counter()
+    for _ in range(reads):
+        build_summer_coupang_queue_snapshot(queue_path)
+    per_read = (time.perf_counter() - started) / reads
+
+    assert per_read < 0.001, per_read
+
+
+def test_snapshot_reloads_when_queue_file_changes(tmp_path):
+    queue_path = tmp_path / "summer_queue.json"
+    _write_delete_fixture(queue_path)
+    _age_file(queue_path, seconds=120)
+    assert build_summer_coupang_queue_snapshot(queue_path)["counts"]["waiting"] == 1
+
+    payload = json.loads(queue_path.read_text(encoding="utf-8"))
+    payload["items"][0]["status"] = "completed"
+    queue_path.write_text(json.dumps(payload), encoding="utf-8")
+    _age_file(queue_path, seconds=60)
+    assert build_summer_coupang_queue_snapshot(queue_path)["counts"]["waiting"] == 0
+
+    # Same size and mtime after an in-place edit: only an explicit invalidate notices.
+    stat = queue_path.stat()
+    payload["items"][0]["status"] = "completeX"
+    queue_path.write_text(json.dumps(payload), encoding="utf-8")
+    os.utime(queue_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert build_summer_coupang_queue_snapshot(queue_path)["counts"]["waiting"] == 0
+    invalidate_summer_coupang_queue_snapshot(queue_path)
+    assert build_summer_coupang_queue_snapshot(queue_path)["counts"]["waiting"] == 1
+
+
+def test_recently_written_queue_is_not_cached(tmp_path):
+    queue_path = tmp_path / "summer_queue.json"
+    _write_delete_fixture(queue_path)
+    assert build_summer_coupang_queue_snapshot(queue_path)["total"] == 4
+
+    stat = queue_path.stat()
+    payload = json.loads(queue_path.read_text(encoding="utf-8"))
+    payload["items"][0]["status"] = "failed "
+    queue_path.write_text(json.dumps(payload), encoding="utf-8")
+    os.utime(queue_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert build_summer_coupang_queue_snapshot(queue_path)["counts"]["waiting"] == 0
+
+
+def test_deleting_items_refreshes_cached_snapshot(tmp_path):
+    queue_path = tmp_path / "summer_queue.json"
+    _write_delete_fixture(queue_path)
+    _age_file(queue_path)
+    assert build_summer_coupang_queue_snapshot(queue_path)["total"] == 4
+
+    delete_summer_coupang_queue_items("completed", path=queue_path)
+
+    assert build_summer_coupang_queue_snapshot(queue_path)["total"] == 3
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import pytest
+
+from processors import tts_processor
+from processors.tts_processor import TTSProcessor
+
+TRANSCRIPT = "0.0-1.2: 오늘 소개할 제품은\n1.2-2.6: 주방 필수템이에요\n2.6-3.9: 링크에서 확인하세요"
+
+
+class _StubGenaiClient:
+    """files.upload / generate_content 횟수를 세는 Gemini 클라이언트"""
+
+    def __init__(self, text=TRANSCRIPT):
+        self.text = text
+        self.uploads = []
+        self.requests = 0
+        self.files = SimpleNamespace(upload=self._upload)
+        self.models = SimpleNamespace(generate_content=self._generate_content)
+
+    def _upload(self, *, file):
+        self.uploads.append(file)
+        return SimpleNamespace(name=f"files/{len(self.uploads)}")
+
+    def _generate_content(self, *, model, contents):
+        self.requests += 1
+        return SimpleNamespace(text=self.text)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_analysis_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(tts_processor, "_analysis_memory", type(tts_processor._analysis_memory)())
+    monkeypatch.delenv("SSMAKER_GEMINI_RESPONSE_CACHE", raising=False)
+    monkeypatch.setenv("SSMAKER_GEMINI_CACHE_ROOT", str(tmp_path / "gemini_cache"))
+
+
+def _processor(client):
+    gui = SimpleNamespace(genai_client=client, config=SimpleNamespace(GEMINI_TEXT_MODEL="text-stub"))
+    return TTSProcessor(gui)
+
+
+def _audio(path, data=b"RIFF-tts-audio-1"):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_repeated_analysis_uploads_once(tmp_path):
+    client = _StubGenaiClient()
+    path = _audio(tmp_path / "tts.wav")
+
+    results = [
+        processor._analyze_audio_with_gemini(path, "대본", max_chars=12)
+        for processor in (_processor(client), _processor(client), _processor(client))
+    ]
+
+    assert client.uploads == [path] and client.requests == 1
+    assert len(results[0]) == 3 and results[0] == results[1] == results[2]
+    assert results[1] is not results[0]  # 호출한 쪽이 고쳐도 캐시는 그대로
+
+
+def test_same_audio_under_another_name_reuses_the_analysis(tmp_path):
+    client = _StubGenaiClient()
+    processor = _processor(client)
+
+    processor._analyze_audio_with_gemini(_audio(tmp_path / "a.wav"), "대본")
+    processor._analyze_audio_with_gemini(_audio(tmp_path / "rerender.wav"), "대본")
+
+    assert len(client.uploads) == 1
+
+
+def test_changed_audio_segments_or_version_invalidate(tmp_path, monkeypatch):
+    client = _StubGenaiClient()
+    processor = _processor(client)
+    path = _audio(tmp_path / "tts.wav")
+
+    processor._analyze_audio_with_gemini(path, "대본")
+    _audio(tmp_path / "tts.wav", b"RIFF-tts-audio-2")
+    processor._analyze_audio_with_gemini(path, "대본")
+    processor._analyze_audio_with_gemini(path, "대본", subtitle_segments=["오늘 소개할", "제품은"])
+    monkeypatch.setattr(tts_processor, "ANALYSIS_VERSION", tts_processor.ANALYSIS_VERSION + 1)
+    processor._analyze_audio_with_gemini(path, "대본")
+    processor._analyze_audio_with_gemini(path, "대본")
+
+    assert len(client.uploads) == 4
+
+
+def test_unparseable_response_is_not_cached(tmp_path):
+    client = _StubGenaiClient(text="타임스탬프를 찾을 수 없습니다.")
+    processor = _processor(client)
+    path = _audio(tmp_path / "tts.wav")
+
+    assert processor._analyze_audio_with_gemini(path, "대본") == []
+    assert processor._analyze_audio_with_gemini(path, "대본") == []
+    assert len(client.uploads) == 2
+
+
+def test_response_cache_keeps_analysis_across_processes(tmp_path, monkeypatch):
+    monkeypatch.setenv("SSMAKER_GEMINI_RESPONSE_CACHE", "1")
+    path = _audio(tmp_path / "tts.wav")
+    first = _StubGenaiClient()
+    expected = _processor(first)._analyze_audio_with_gemini(path, "대본")
+
+    # 새 프로세스처럼 메모리 캐시 비움
+    tts_processor._analysis_memory.clear()
+    second = _StubGenaiClient()
+    assert _processor(second)._analyze_audio_with_gemini(path, "대본") == expected
+    assert len(first.uploads) == 1 and second.uploads == []
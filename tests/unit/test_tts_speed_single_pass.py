@@ -0,0 +1,225 @@
+import subprocess
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from core.video import VideoTool
+from core.video.batch import tts_speed
+from core.video.batch.audio_utils import _ensure_pydub_converter
+from core.video.CreateFinalVideo import _rescale_tts_metadata_to_duration
+
+RATE = 24000
+SPEED = 1.2
+
+
+def _write_tts(path, seconds, seed, lead=0.15):
+    """Gemini TTS처럼 앞 무음 + 음절 같은 톤 (24kHz 모노 16-bit)"""
+    rng = np.random.default_rng(seed)
+    pieces = [np.zeros(int(lead * RATE))]
+    while sum(map(len, pieces)) < seconds * RATE:
+        t = np.arange(int(rng.uniform(0.12, 0.22) * RATE)) / RATE
+        pieces.append(0.3 * np.sin(2 * np.pi * rng.uniform(110, 220) * t) * np.sin(np.pi * t / t[-1]))
+        pieces.append(np.zeros(int(rng.uniform(0.03, 0.2) * RATE)))
+    audio = (np.concatenate(pieces)[: int(seconds * RATE)] * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(audio.tobytes())
+    return str(path)
+
+
+def _entries(path, seconds, count, first_index=0):
+    step = seconds / count
+    return [
+        {"idx": first_index + i, "text": f"문장 {first_index + i}", "path": path, "start": i * step, "end": (i + 1) * step}
+        for i in range(count)
+    ]
+
+
+def _app(tmp_path, entries):
+    out = tmp_path / "out"
+    out.mkdir(exist_ok=True)
+    return SimpleNamespace(_per_line_tts=entries, tts_sync_info={}, tts_output_dir=str(out))
+
+
+def _speed_and_export(path, out_path):
+    """이전 구현: 파일 읽기 -> frame_rate 배속 -> ffmpeg로 44.1kHz 스테레오 export"""
+    audio = AudioSegment.from_wav(path)
+    speeded = audio._spawn(audio.raw_data, overrides={"frame_rate": int(audio.frame_rate * SPEED)})
+    speeded.set_frame_rate(44100).export(out_path, format="wav", parameters=["-ar", "44100", "-ac", "2"])
+    return len(audio) / 1000.0
+
+
+def _previous_combine(app, tmp_path):
+    """
+    이전 방식: 파일마다 배속 + ffmpeg export, 이어 붙여 다시 export,
+    결과 파일을 다시 읽어 앞무음 감지
+    """
+    paths = tts_speed._segment_tts_paths(app)
+    speeded_paths = []
+    offsets, position = {}, 0.0
+    for index, path in enumerate(paths):
+        offsets[path] = position
+        speeded_paths.append(str(tmp_path / f"previous_{index}.wav"))
+        position += _speed_and_export(path, speeded_paths[-1])
+    combined_path = speeded_paths[0]
+    if len(speeded_paths) > 1:
+        combined_path = str(tmp_path / "previous_combined.wav")
+        combined = sum((AudioSegment.from_wav(p) for p in speeded_paths[1:]), AudioSegment.from_wav(speeded_paths[0]))
+        combined.export(combined_path, format="wav", parameters=["-ar", "44100", "-ac", "2"])
+    for entry in app._per_line_tts:
+        entry["start"] += offsets[entry["path"]]
+        entry["end"] += offsets[entry["path"]]
+    actual_duration = len(AudioSegment.from_wav(combined_path)) / 1000.0
+    offset = VideoTool._detect_audio_start_offset(combined_path)
+    _rescale_tts_metadata_to_duration(app, actual_duration, new_path=combined_path, start_offset=offset)
+    return combined_path, actual_duration, offset
+
+
+@pytest.fixture
+def ffmpeg_spawns(monkeypatch):
+    if not _ensure_pydub_converter():
+        pytest.skip("ffmpeg not available")
+    spawns = []
+    original_popen = subprocess.Popen
+
+    class _CountingPopen(original_popen):
+        def __init__(self, args, *rest, **kwargs):
+            spawns.append(args)
+            super().__init__(args, *rest, **kwargs)
+
+    monkeypatch.setattr(subprocess, "Popen", _CountingPopen)
+    return spawns
+
+
+def test_single_file_output_matches_previous_export_without_spawning(tmp_path, ffmpeg_spawns):
+    path = _write_tts(tmp_path / "tts.wav", 9.3, seed=1)
+    previous_app = _app(tmp_path, _entries(path, 9.3, 7))
+    previous_path, previous_duration, previous_offset = _previous_combine(previous_app, tmp_path)
+    assert ffmpeg_spawns
+
+    ffmpeg_spawns.clear()
+    app = _app(tmp_path, _entries(path, 9.3, 7))
+    speeded_path = tts_speed.combine_tts_files_with_speed(app)
+
+    assert ffmpeg_spawns == []
+    with wave.open(previous_path, "rb") as old, wave.open(speeded_path, "rb") as new:
+        assert new.getparams()[:3] == old.getparams()[:3] == (2, 2, 44100)
+        assert new.getnframes() == old.getnframes()
+        assert new.readframes(new.getnframes()) == old.readframes(old.getnframes())
+    info = app.tts_sync_info
+    assert info["speeded_duration"] == previous_duration
+    assert info["audio_start_offset"] == previous_offset > 0.1
+    assert info["timestamps_source"] == "scaled_no_gemini" and info["original_tts_path"] == path
+    assert [(e["start"], e["end"]) for e in app._per_line_tts] == [
+        (e["start"], e["end"]) for e in previous_app._per_line_tts
+    ]
+    assert {e["path"] for e in app._per_line_tts} == {speeded_path}
+
+
+SEGMENT_LENGTHS = [2.7, 3.4, 1.9, 4.1, 2.2, 3.0, 2.6, 3.3]
+
+
+def _segment_files(tmp_path):
+    paths = [_write_tts(tmp_path / f"seg_{i}.wav", seconds, seed=i) for i, seconds in enumerate(SEGMENT_LENGTHS)]
+
+    def _segment_entries():
+        entries = []
+        for path, seconds in zip(paths, SEGMENT_LENGTHS):
+            entries.extend(_entries(path, seconds, 2, first_index=len(entries)))
+        return entries
+
+    return paths, _segment_entries
+
+
+def test_segment_files_are_concatenated_and_sped_in_one_pass(tmp_path, ffmpeg_spawns):
+    paths, _segment_entries = _segment_files(tmp_path)
+
+    previous_app = _app(tmp_path, _segment_entries())
+    ffmpeg_spawns.clear()
+    _previous_path, previous_duration, previous_offset = _previous_combine(previous_app, tmp_path)
+    previous_spawns = len(ffmpeg_spawns)
+
+    app = _app(tmp_path, _segment_entries())
+    ffmpeg_spawns.clear()
+    speeded_path = tts_speed.combine_tts_files_with_speed(app)
+
+    assert ffmpeg_spawns == []
+    assert previous_spawns == len(paths) + 1
+    # 파일별 반올림 차이(파일당 1프레임 미만)만큼만 다름
+    assert app.tts_sync_info["speeded_duration"] == pytest.approx(previous_duration, abs=0.002)
+    assert app.tts_sync_info["original_duration"] == pytest.approx(sum(SEGMENT_LENGTHS))
+    assert app.tts_sync_info["audio_start_offset"] == previous_offset
+    for new, old in zip(app._per_line_tts, previous_app._per_line_tts):
+        assert new["start"] == pytest.approx(old["start"], abs=0.002)
+        assert new["end"] == pytest.approx(old["end"], abs=0.002)
+        assert new["path"] == speeded_path
+    with wave.open(speeded_path, "rb") as wf:
+        assert round(1000 * wf.getnframes() / wf.getframerate()) / 1000 == app.tts_sync_info["speeded_duration"]
+
+
+@pytest.mark.benchmark
+def test_single_pass_beats_speed_each_then_concat(tmp_path, ffmpeg_spawns):
+    paths, _segment_entries = _segment_files(tmp_path)
+
+    start = time.perf_counter()
+    _previous_combine(_app(tmp_path, _segment_entries()), tmp_path)
+    previous_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tts_speed.combine_tts_files_with_speed(_app(tmp_path, _segment_entries()))
+    single_pass_seconds = time.perf_counter() - start
+
+    print(
+        f"{len(paths)} TTS files: speed each + concat {previous_seconds * 1000:.0f}ms, "
+        f"single pass {single_pass_seconds * 1000:.0f}ms"
+    )
+    assert single_pass_seconds < previous_seconds * 0.5
+
+
+def test_segment_tts_duration_reads_only_the_header(tmp_path, monkeypatch):
+    path = _write_tts(tmp_path / "tts.wav", 2.3456, seed=4)
+    monkeypatch.setattr(AudioSegment, "from_wav", pytest.fail)
+
+    app = SimpleNamespace(_per_line_tts=_entries(path, 2.3, 2), tts_sync_info={})
+    assert tts_speed._apply_speed_to_segment_tts(app, path) == path
+
+    assert app.tts_sync_info["speeded_duration"] == round(2.3456 * RATE * 1000 / RATE) / 1000
+
+
+def test_failed_write_does_not_shift_entries_twice(tmp_path, monkeypatch):
+    lengths = [2.1, 1.7, 2.4]
+    paths = [_write_tts(tmp_path / f"seg_{i}.wav", seconds, seed=i) for i, seconds in enumerate(lengths)]
+
+    def _segment_entries():
+        entries = []
+        for path, seconds in zip(paths, lengths):
+            entries.extend(_entries(path, seconds, 2, first_index=len(entries)))
+        return entries
+
+    expected_app = _app(tmp_path, _segment_entries())
+    tts_speed.combine_tts_files_with_speed(expected_app)
+
+    app = _app(tmp_path, _segment_entries())
+    original = [dict(entry) for entry in app._per_line_tts]
+    real_write = tts_speed._write_wave_fallback
+
+    def _disk_full(*_args, **_kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(tts_speed, "_write_wave_fallback", _disk_full)
+    tts_speed.combine_tts_files_with_speed(app)
+    # 저장에 실패하면 항목은 그대로 (다시 시도할 때 또 밀리지 않음)
+    assert app._per_line_tts == original
+
+    monkeypatch.setattr(tts_speed, "_write_wave_fallback", real_write)
+    speeded_path = tts_speed.combine_tts_files_with_speed(app)
+    assert [(e["start"], e["end"]) for e in app._per_line_tts] == [
+        (e["start"], e["end"]) for e in expected_app._per_line_tts
+    ]
+    assert {e["path"] for e in app._per_line_tts} == {speeded_path}
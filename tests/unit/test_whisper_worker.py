@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.video.batch import whisper_analyzer, whisper_worker
+from core.video.batch.whisper_worker import AlignmentWorker, SAMPLE_RATE, get_worker, shutdown_workers
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry():
+    shutdown_workers()
+    yield
+    shutdown_workers()
+
+
+def _word(text, start, end):
+    return SimpleNamespace(word=text, start=start, end=end, probability=0.9)
+
+
+def _segment(text, start, end, words):
+    return SimpleNamespace(text=text, start=start, end=end, words=words)
+
+
+class _FakeModel:
+    """Sequential ``transcribe``: one word per call, optionally without VAD support."""
+
+    def __init__(self, vad_error=False):
+        self.calls = []
+        self.vad_error = vad_error
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((audio if isinstance(audio, str) else len(audio), kwargs))
+        if self.vad_error and kwargs["vad_filter"]:
+            raise RuntimeError("Requires onnxruntime")
+        words = [_word(" 안녕", 0.2, 0.6), _word(" 세상", 0.7, 1.1)]
+        info = SimpleNamespace(language="ko", language_probability=0.97, duration=1.5)
+        return iter([_segment(" 안녕 세상", 0.2, 1.1, words)]), info
+
+
+class _FakePipeline:
+    """Batched pipeline: one segment per ``clip_timestamps`` entry, in absolute time."""
+
+    def __init__(self, info=None):
+        self.calls = []
+        self.info = info or SimpleNamespace(language="ko")
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((len(audio), kwargs))
+        segments = []
+        for index, clip in enumerate(kwargs["clip_timestamps"]):
+            offset = clip["start"]
+            words = [_word(f" w{index}", offset + 0.1, offset + 0.4)]
+            # 반올림으로 클립 시작보다 0.5ms 앞선 세그먼트도 제 클립으로 가야 함
+            segments.append(_segment(f" w{index}", offset - 0.0005, offset + 0.4, words))
+        return iter(segments), self.info
+
+
+def _clip(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def test_clips_submitted_during_load_are_batched_once_ready():
+    release = threading.Event()
+    loads = []
+    pipeline = _FakePipeline()
+
+    def loader():
+        loads.append(1)
+        release.wait(5)
+        return _FakeModel()
+
+    worker = AlignmentWorker(loader, pipeline_factory=lambda _model: pipeline).start()
+    futures = [worker.submit(_clip(seconds)) for seconds in (1.0, 2.5, 0.7)]
+    time.sleep(0.05)
+
+    assert not any(future.done() for future in futures)
+    assert not worker.ready
+    release.set()
+    results = [future.result(timeout=5) for future in futures]
+
+    assert loads == [1] and worker.ready
+    assert len(pipeline.calls) == 1
+    packed_samples, kwargs = pipeline.calls[0]
+    assert len(kwargs["clip_timestamps"]) == 3 and kwargs["word_timestamps"] is True
+    assert packed_samples == int((1.0 + 2.5 + 0.7 + 3 * whisper_worker.PACK_GAP_SECONDS) * SAMPLE_RATE)
+    for index, result in enumerate(results):
+        assert [(w.word, w.start, w.end) for w in result.words] == [(f" w{index}", 0.1, 0.4)]
+        assert result.batch_size == 3 and result.segments[0].start == 0.0
+    assert results[1].duration == pytest.approx(2.5)
+    # 파이프라인이 확률을 주지 않으면 꾸며내지 않음
+    assert {(result.language, result.language_probability) for result in results} == {("ko", None)}
+    assert worker.stats()["largest_batch"] == 3
+    worker.stop(1)
+
+
+def test_packed_clips_report_the_detected_language_probability():
+    pipeline = _FakePipeline(SimpleNamespace(language="ja", language_probability=0.42))
+    worker = AlignmentWorker(lambda: _FakeModel(), pipeline_factory=lambda _model: pipeline).start()
+
+    results = [future.result(timeout=5) for future in [worker.submit(_clip(1.0)), worker.submit(_clip(1.2))]]
+
+    assert [(result.language, result.language_probability) for result in results] == [("ja", 0.42)] * len(results)
+    worker.stop(1)
+
+
+def test_long_clips_and_plain_models_transcribe_one_by_one(tmp_path):
+    model = _FakeModel(vad_error=True)
+    pipeline = _FakePipeline()
+    worker = AlignmentWorker(lambda: model, pipeline_factory=lambda _model: pipeline)
+
+    long_result = worker.submit(_clip(31), beam_size=3).result(timeout=5)
+    plain = AlignmentWorker(lambda: _FakeModel()).start()
+    plain_result = plain.submit(str(tmp_path / "tts.wav")).result(timeout=5)
+
+    assert pipeline.calls == []
+    # VAD에 onnxruntime이 없으면 VAD 없이 재시도 (기존 동작)
+    assert [kwargs["vad_filter"] for _audio, kwargs in model.calls] == [True, False]
+    assert model.calls[0][1]["beam_size"] == 3
+    assert [w.word for w in long_result.words] == [" 안녕", " 세상"]
+    assert plain_result.language_probability == pytest.approx(0.97)
+    worker.stop(1)
+    plain.stop(1)
+
+
+def test_load_failure_reaches_callers_and_registry_retries():
+    attempts = []
+
+    def loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("model missing")
+        return _FakeModel()
+
+    first = get_worker("tiny", loader)
+    with pytest.raises(RuntimeError, match="model missing"):
+        first.submit(_clip(1)).result(timeout=5)
+    with pytest.raises(RuntimeError, match="model missing"):
+        first.submit(_clip(1)).result(timeout=5)
+
+    second = get_worker("tiny", loader)
+    assert second is not first
+    assert second.submit("tts.wav").result(timeout=5).words
+    assert get_worker("tiny", loader) is second and len(attempts) == 2
+
+
+def _write_wav(path, seconds=1.5, rate=24000):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(np.zeros(int(seconds * rate), dtype="<i2").tobytes())
+
+
+def test_analyzer_reuses_model_preloaded_at_startup(tmp_path, monkeypatch):
+    monkeypatch.setenv("SSMAKER_DISABLE_FASTER_WHISPER", "0")
+    params = {"model_size": "tiny", "device": "cpu", "compute_type": "int8", "beam_size": 2, "cpu_threads": 1}
+    monkeypatch.setattr(whisper_analyzer, "_get_whisper_model_params", lambda _app: params)
+    loaded = []
+    model = _FakeModel()
+
+    def load(*args):
+        loaded.append(args)
+        return model
+
+    monkeypatch.setattr(whisper_analyzer, "_load_whisper_model", load)
+    tts_path = tmp_path / "tts.wav"
+    _write_wav(tts_path)
+    app = SimpleNamespace()
+
+    worker = whisper_analyzer.preload_alignment_worker(app)
+    assert worker.wait_ready(5) and loaded == [("tiny", "cpu", "int8", 1)]
+
+    for _ in range(2):
+        result = whisper_analyzer.analyze_tts_with_whisper(app, str(tts_path), "안녕 세상", ["안녕", "세상"])
+        assert [(s["start"], s["end"]) for s in result["segments"]] == [(0.2, 0.6), (0.7, 1.1)]
+
+    assert len(loaded) == 1
+    assert [kwargs["beam_size"] for _audio, kwargs in model.calls] == [2, 2]
+    assert not any(name.startswith("_faster_whisper_model") for name in vars(app))
+
+
+def test_preload_is_skipped_when_faster_whisper_is_disabled(monkeypatch):
+    monkeypatch.setenv("SSMAKER_DISABLE_FASTER_WHISPER", "1")
+    monkeypatch.setattr(whisper_analyzer, "_load_whisper_model", pytest.fail)
+
+    assert whisper_analyzer.preload_alignment_worker(SimpleNamespace()) is None
+
+
+def _tiny_model_path():
+    roots = [os.environ.get("WHISPER_MODEL_PATH"), os.path.join(os.path.dirname(__file__), "..", "..", "faster_whisper_models")]
+    for root in roots:
+        if root:
+            found = whisper_analyzer._find_model_in_dir(os.path.join(root, "tiny"))
+            if found:
+                return found
+    return None
+
+
+@pytest.mark.benchmark
+def test_tiny_model_cold_and_warm_latency():
+    model_path = _tiny_model_path()
+    if not model_path:
+        pytest.skip("faster-whisper tiny model not available")
+    from faster_whisper import WhisperModel
+
+    t = np.arange(int(4 * SAMPLE_RATE)) / SAMPLE_RATE
+    clip = (0.3 * np.sin(2 * np.pi * 180 * t) * (np.sin(2 * np.pi * 2 * t) > 0)).astype(np.float32)
+
+    start = time.perf_counter()
+    worker = AlignmentWorker(lambda: WhisperModel(model_path, device="cpu", compute_type="int8")).start()
+    worker.submit(clip).result(timeout=300)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    worker.submit(clip).result(timeout=300)
+    warm = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(4):
+        worker.submit(clip).result(timeout=300)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = [worker.submit(clip) for _ in range(4)]
+    results = [future.result(timeout=300) for future in batched]
+    batch = time.perf_counter() - start
+
+    print(
+        f"whisper tiny: cold {cold * 1000:.0f}ms (load {worker.load_seconds * 1000:.0f}ms), "
+        f"warm {warm * 1000:.0f}ms, 4 clips sequential {sequential * 1000:.0f}ms / batched {batch * 1000:.0f}ms "
+        f"(largest batch {max(r.batch_size for r in results)})"
+    )
+    assert warm < cold
+    worker.stop(5)
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""Leased bulk work reservations against a local request-counting stub server."""
+
+import json
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from caller import rest
+
+
+class _QuotaServer(ThreadingHTTPServer):
+    """Minimal stand-in for the v3 reservation endpoints with a work quota."""
+
+    daemon_threads = True
+
+    def __init__(self, work_count: int):
+        super().__init__(("127.0.0.1", 0), _QuotaHandler)
+        self.work_count = work_count
+        self.requests: Counter = Counter()
+        self.status: dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def outstanding(self) -> int:
+        return sum(1 for status in self.status.values() if status in {"reserved", "completed"})
+
+    def reservation(self, key: str, lease_expires_at: str = "") -> dict:
+        return {
+            "success": self.status.get(key) in {"reserved", "completed", "released"},
+            "message": "ok",
+            "remaining": self.work_count - self.outstanding(),
+            "used": sum(1 for status in self.status.values() if status == "completed"),
+            "idempotency_key": key,
+            "idempotent_replay": False,
+            "reservation_status": self.status.get(key, "denied"),
+            "lease_expires_at": lease_expires_at or None,
+        }
+
+
+class _QuotaHandler(BaseHTTPRequestHandler):
+    def log_message(self, *_args):
+        return None
+
+    def do_POST(self):
+        server: _QuotaServer = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        endpoint = self.path.split("/user/work/", 1)[-1]
+        expires = (datetime.now(timezone.utc) + timedelta(hours=4)).isoformat()
+        with server.lock:
+            server.requests[endpoint] += 1
+            if endpoint == "lease-v3":
+                reservations = []
+                for key in body["idempotency_keys"]:
+                    if server.outstanding() >= server.work_count:
+                        break
+                    server.status[key] = "reserved"
+                    reservations.append(server.reservation(key, expires))
+                payload = {
+                    "success": bool(reservations),
+                    "message": "ok",
+                    "granted": len(reservations),
+                    "remaining": server.work_count - server.outstanding(),
+                    "reservations": reservations,
+                }
+            elif endpoint == "lease-v3/release":
+                for key in body["idempotency_keys"]:
+                    if server.status.get(key) == "reserved":
+                        server.status[key] = "released"
+                payload = {
+                    "success": True,
+                    "message": "ok",
+                    "reservations": [
+                        server.reservation(key) for key in body["idempotency_keys"]
+                    ],
+                }
+            else:
+                key = body["idempotency_key"]
+                if endpoint == "reserve-v3" and key not in server.status:
+                    if server.outstanding() < server.work_count:
+                        server.status[key] = "reserved"
+                elif endpoint == "finalize-v3" and server.status.get(key) == "reserved":
+                    server.status[key] = "completed"
+                elif endpoint == "release-v3" and server.status.get(key) == "reserved":
+                    server.status[key] = "released"
+                payload = server.reservation(key, expires)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def quota_server(monkeypatch):
+    servers = []
+
+    def start(work_count: int) -> _QuotaServer:
+        server = _QuotaServer(work_count)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setattr(rest, "main_server", f"http://127.0.0.1:{server.server_port}")
+        monkeypatch.setattr(rest, "_secure_session", requests.Session())
+        monkeypatch.setattr(rest, "_get_auth_token", lambda: "desktop-jwt")
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _run_batch(lease, store, jobs):
+    from managers.work_quota import DurableWorkReservation
+
+    completed = 0
+    for index in range(jobs):
+        reservation, result = DurableWorkReservation.begin(
+            "42", f"batch:https://example/{index}", store=store, lease=lease
+        )
+        if not result.get("success"):
+            continue
+        if reservation.finalize().get("success"):
+            completed += 1
+    return completed
+
+
+def test_batch_of_50_uses_one_lease_request_instead_of_a_reserve_per_job(
+    quota_server, tmp_path
+):
+    from managers.work_quota import WorkLease
+    from managers.work_reservation_store import WorkReservationStore
+
+    server = quota_server(work_count=1000)
+    store = WorkReservationStore(tmp_path / "reservations.json")
+
+    lease = WorkLease.acquire("42", 50)
+    completed = _run_batch(lease, store, 50)
+    lease.release_unused()
+
+    assert completed == 50
+    assert server.requests == Counter({"lease-v3": 1, "finalize-v3": 50})
+
+
+def test_unused_leased_slots_are_returned_in_one_request(quota_server, tmp_path):
+    from managers.work_quota import WorkLease
+    from managers.work_reservation_store import WorkReservationStore
+
+    server = quota_server(work_count=1000)
+    store = WorkReservationStore(tmp_path / "reservations.json")
+
+    lease = WorkLease.acquire("42", 50)
+    assert _run_batch(lease, store, 20) == 20
+    lease.release_unused()
+    lease.release_unused()
+
+    assert server.requests == Counter(
+        {"lease-v3": 1, "finalize-v3": 20, "lease-v3/release": 1}
+    )
+    assert Counter(server.status.values()) == Counter({"completed": 20, "released": 30})
+
+
+def test_quota_limited_lease_falls_back_to_per_job_reservation(quota_server, tmp_path):
+    from managers.work_quota import WorkLease
+    from managers.work_reservation_store import WorkReservationStore
+
+    server = quota_server(work_count=3)
+    store = WorkReservationStore(tmp_path / "reservations.json")
+
+    lease = WorkLease.acquire("42", 5)
+    completed = _run_batch(lease, store, 5)
+    lease.release_unused()
+
+    assert completed == 3
+    assert server.requests == Counter({"lease-v3": 1, "finalize-v3": 3, "reserve-v3": 2})
+
+
+def test_job_with_recovered_key_keeps_it_and_leaves_the_leased_slot(quota_server, tmp_path):
+    from managers.work_quota import DurableWorkReservation, WorkLease
+    from managers.work_reservation_store import WorkReservationStore
+
+    server = quota_server(work_count=10)
+    store = WorkReservationStore(tmp_path / "reservations.json")
+    previous_key = store.get_or_create("batch:https://example/0", "42")
+
+    lease = WorkLease.acquire("42", 1)
+    reservation, result = DurableWorkReservation.begin(
+        "42", "batch:https://example/0", store=store, lease=lease
+    )
+
+    assert reservation.idempotency_key == previous_key
+    assert result["reservation_status"] == "reserved"
+    assert len(lease) == 1
+    lease.release_unused()
+    assert server.requests["reserve-v3"] == 1
+    assert server.requests["lease-v3/release"] == 1
+
+
+def test_keys_close_to_lease_expiry_are_not_handed_out(monkeypatch):
+    from managers.work_quota import WorkLease
+
+    soon = (datetime.now(timezone.utc) + timedelta(minutes=1)).isoformat()
+    later = (datetime.now(timezone.utc) + timedelta(hours=3)).isoformat()
+    stale_key, fresh_key = str(uuid.uuid4()), str(uuid.uuid4())
+    returned = []
+    monkeypatch.setattr(
+        "managers.work_quota.rest.releaseWorkLease",
+        lambda _user_id, keys: returned.extend(keys) or {"success": True},
+    )
+    lease = WorkLease(
+        "42",
+        [
+            {"idempotency_key": stale_key, "lease_expires_at": soon},
+            {"idempotency_key": fresh_key, "lease_expires_at": later},
+        ],
+        remaining=0,
+    )
+
+    taken = lease.take()
+
+    assert taken["idempotency_key"] == fresh_key
+    assert taken["leased"] is True
+    assert lease.take() is None
+    lease.release_unused()
+    assert returned == [stale_key]
+
+
+def test_lease_rejects_invalid_keys_without_network(monkeypatch):
+    class _UnexpectedSession:
+        def post(self, *args, **kwargs):  # pragma: no cover - must never execute
+            raise AssertionError("network request must not be made")
+
+    monkeypatch.setattr(rest, "_get_auth_token", lambda: "desktop-jwt")
+    monkeypatch.setattr(rest, "_secure_session", _UnexpectedSession())
+
+    assert rest.leaseWork("42", ["not-a-uuid"])["success"] is False
+    assert rest.leaseWork("42", [])["success"] is False
+    too_many = [str(uuid.uuid4()) for _ in range(rest.MAX_WORK_LEASE + 1)]
+    assert rest.leaseWork("42", too_many)["success"] is False
@@ -0,0 +1,146 @@
+"""
+Queue table model/view for the production queue panel.
+
+``QueueManager.update_url_listbox`` used to clear and rebuild a QTreeWidget on
+every status tick. ``QueueTableModel.set_rows`` instead diffs the new rows
+against the current ones by identity and emits row-level insert/remove/
+dataChanged signals, so only changed rows repaint and the view keeps its
+selection and scroll position.
+"""
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtWidgets import QAbstractItemView, QTreeView
+
+QUEUE_HEADERS = ("구분", "URL", "상태", "자동 업로드", "비고")
+
+
+class QueueRow(NamedTuple):
+    """One table row; ``identity`` stays stable while the row's texts change."""
+
+    identity: Tuple[str, str]
+    texts: Tuple[str, str, str, str, str]
+    metadata: Dict[str, Any]
+
+
+class QueueTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[QueueRow] = []
+
+    # -- Qt model API --
+
+    def rowCount(self, parent=QModelIndex()):  # noqa: N802 - Qt API
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):  # noqa: N802 - Qt API
+        return 0 if parent.isValid() else len(QUEUE_HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            # Compact columns elide; the tooltip carries the full value.
+            return row.texts[index.column()]
+        if role == Qt.ItemDataRole.UserRole and index.column() == 0:
+            return row.metadata
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):  # noqa: N802
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return QUEUE_HEADERS[section]
+        return None
+
+    # -- incremental updates --
+
+    def row(self, position: int) -> QueueRow:
+        return self._rows[position]
+
+    def set_rows(self, rows: Sequence[QueueRow]) -> None:
+        """Replace the rows, signalling only the rows that actually changed."""
+        new_rows = list(rows)
+        old_ids = [row.identity for row in self._rows]
+        new_ids = [row.identity for row in new_rows]
+        if old_ids == new_ids:
+            self._update_range(0, new_rows)
+            return
+
+        opcodes = SequenceMatcher(None, old_ids, new_ids, autojunk=False).get_opcodes()
+        # Apply from the end so earlier row numbers stay valid.
+        for tag, old_start, old_end, new_start, new_end in reversed(opcodes):
+            if tag == "equal":
+                self._update_range(old_start, new_rows[new_start:new_end])
+                continue
+            if tag in ("delete", "replace"):
+                self.beginRemoveRows(QModelIndex(), old_start, old_end - 1)
+                del self._rows[old_start:old_end]
+                self.endRemoveRows()
+            if tag in ("insert", "replace"):
+                self.beginInsertRows(QModelIndex(), old_start, old_start + new_end - new_start - 1)
+                self._rows[old_start:old_start] = new_rows[new_start:new_end]
+                self.endInsertRows()
+
+    def _update_range(self, start: int, rows: Sequence[QueueRow]) -> None:
+        first_changed = None
+        for offset, row in enumerate(rows):
+            position = start + offset
+            if self._rows[position] == row:
+                if first_changed is not None:
+                    self._emit_changed(first_changed, position - 1)
+                    first_changed = None
+                continue
+            self._rows[position] = row
+            if first_changed is None:
+                first_changed = position
+        if first_changed is not None:
+            self._emit_changed(first_changed, start + len(rows) - 1)
+
+    def _emit_changed(self, first: int, last: int) -> None:
+        self.dataChanged.emit(
+            self.index(first, 0),
+            self.index(last, len(QUEUE_HEADERS) - 1),
+            [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole, Qt.ItemDataRole.UserRole],
+        )
+
+
+class QueueRowRef:
+    """``QTreeWidgetItem``-like read access to a selected row."""
+
+    def __init__(self, row: QueueRow):
+        self._row = row
+
+    def data(self, column: int, role: int = Qt.ItemDataRole.UserRole):
+        if role == Qt.ItemDataRole.UserRole and column == 0:
+            return self._row.metadata
+        return self._row.texts[column]
+
+    def text(self, column: int) -> str:
+        return self._row.texts[column]
+
+
+class QueueTreeView(QTreeView):
+    """Flat queue table backed by ``QueueTableModel``."""
+
+    itemSelectionChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.queue_model = QueueTableModel(self)
+        self.setModel(self.queue_model)
+        self.setRootIsDecorated(False)
+        self.setUniformRowHeights(True)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.selectionModel().selectionChanged.connect(
+            lambda *_args: self.itemSelectionChanged.emit()
+        )
+
+    def set_rows(self, rows: Sequence[QueueRow]) -> None:
+        self.queue_model.set_rows(rows)
+
+    def selectedItems(self) -> List[QueueRowRef]:  # noqa: N802 - QTreeWidget API
+        rows = sorted(index.row() for index in self.selectionModel().selectedRows())
+        return [QueueRowRef(self.queue_model.row(row)) for row in rows]
@@ -3,10 +3,10 @@ Queue Panel for PyQt6
 """
 from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QBoxLayout, QLabel, QFrame,
-    QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterator,
     QHeaderView, QAbstractItemView
 )
 from PyQt6.QtCore import Qt, QTimer
+from ui.components.queue_table import QueueTreeView
 from ui.components.rounded_widgets import create_rounded_button
 from ui.components.base_widget import ThemedMixin
 
@@ -96,10 +96,8 @@ class QueuePanel(QFrame, ThemedMixin):
         run_status_layout.addWidget(self.gui.start_run_detail_label)
         self.main_layout.addLayout(run_status_layout)
         
-        # TreeWidget (Replacement for Treeview)
-        self.gui.url_listbox = QTreeWidget()
-        self.gui.url_listbox.setColumnCount(5)
-        self.gui.url_listbox.setHeaderLabels(["구분", "URL", "상태", "자동 업로드", "비고"])
+        # Model/view table: refreshes repaint only the rows that changed.
+        self.gui.url_listbox = QueueTreeView()
         self.gui.url_listbox.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.gui.url_listbox.itemSelectionChanged.connect(self.sync_delete_controls)
         self._configure_queue_table_columns()
@@ -253,7 +251,6 @@ class QueuePanel(QFrame, ThemedMixin):
         if callable(updater):
             try:
                 updater()
-                QTimer.singleShot(0, self._apply_item_tooltips)
                 return
             except Exception:
                 pass
@@ -263,19 +260,9 @@ class QueuePanel(QFrame, ThemedMixin):
         if callable(update):
             try:
                 update()
-                QTimer.singleShot(0, self._apply_item_tooltips)
             except Exception:
                 pass
 
-    def _apply_item_tooltips(self) -> None:
-        """Expose every elided table value without changing compact columns."""
-        iterator = QTreeWidgetItemIterator(self.gui.url_listbox)
-        while iterator.value() is not None:
-            item = iterator.value()
-            for column in range(self.gui.url_listbox.columnCount()):
-                item.setToolTip(column, item.text(column))
-            iterator += 1
-
     def apply_theme(self):
         bg = self.get_color("bg_card")
         border = self.get_color("border_light")
@@ -319,7 +306,7 @@ class QueuePanel(QFrame, ThemedMixin):
             )
         
         self.gui.url_listbox.setStyleSheet(f"""
-            QTreeWidget {{
+            QTreeView {{
                 background-color: {self.get_color("bg_input")};
                 color: {text_primary};
                 border: 1px solid {border};
@@ -7,6 +7,11 @@ Uses the system's native keyring (Windows Credential Manager, macOS Keychain, et
 Security: Added thread safety to prevent race conditions in multi-threaded apps.
 보안: 멀티스레드 앱에서 경쟁 조건을 방지하기 위한 스레드 안전성 추가.
 
+Reads are served from an in-process cache. Every write or delete bumps a
+generation file next to the fallback store; a lookup revalidates the cache
+against that file and the fallback store files with a stat, so changes made
+by another process are picked up without keyring or decryption work.
+
 Usage:
     from utils.secrets_manager import SecretsManager
 
@@ -25,7 +30,7 @@ import base64
 import hashlib
 import threading
 import time
-from typing import Optional, Dict
+from typing import Any, Optional, Dict, Tuple
 from pathlib import Path
 
 # Fernet encryption support (AES-128-CBC with HMAC)
@@ -60,6 +65,13 @@ class SecretsManager:
     _startup_issues: list[Dict[str, str]] = []
     _reported_issue_sources: set[str] = set()
 
+    # Decrypted values (None for "not stored") valid while the store signature
+    # below is unchanged. Guarded by _lock.
+    _secret_cache: Dict[str, Optional[str]] = {}
+    _cache_signature: Optional[Tuple[Any, ...]] = None
+    _local_generation = 0
+    _GENERATION_FILE_NAME = ".secrets_generation"
+
     # Regex pattern for validating key names (security: prevent injection)
     # 키 이름 검증용 정규식 패턴 (보안: 주입 방지)
     _KEY_NAME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]{0,63}$')
@@ -247,33 +259,43 @@ class SecretsManager:
 
         # Thread-safe operation
         with cls._lock:
-            # Try keyring first
-            if cls._use_keyring and cls._init_keyring():
-                try:
-                    import keyring
-                    keyring.set_password(cls.SERVICE_NAME, key_name, key_value)
-                    # Some environments report success but fail to persist.
-                    verify_value = keyring.get_password(cls.SERVICE_NAME, key_name)
-                    if verify_value == key_value:
-                        return True
-                    logger.warning("Keyring write verification failed; falling back to file storage")
-                    cls._use_keyring = False
-                except Exception as e:
-                    logger.debug("Keyring storage failed: %s", type(e).__name__)
-                    cls._use_keyring = False
-
-            # A packaged Windows client must fail closed.  A file encryption
-            # key stored beside its ciphertext is recoverable by the same
-            # local attacker who can inspect the application.
-            if not cls._allow_file_fallback():
-                cls._record_os_store_required()
-                logger.error(
-                    "OS credential store unavailable; refusing file fallback for %s",
-                    key_name,
-                )
-                return False
+            try:
+                return cls._store_secret(key_name, key_value)
+            finally:
+                cls._bump_generation(key_name)
 
-            return cls._store_to_file(key_name, key_value)
+    @classmethod
+    def _store_secret(cls, key_name: str, key_value: str) -> bool:
+        import logging
+        logger = logging.getLogger(__name__)
+
+        # Try keyring first
+        if cls._use_keyring and cls._init_keyring():
+            try:
+                import keyring
+                keyring.set_password(cls.SERVICE_NAME, key_name, key_value)
+                # Some environments report success but fail to persist.
+                verify_value = keyring.get_password(cls.SERVICE_NAME, key_name)
+                if verify_value == key_value:
+                    return True
+                logger.warning("Keyring write verification failed; falling back to file storage")
+                cls._use_keyring = False
+            except Exception as e:
+                logger.debug("Keyring storage failed: %s", type(e).__name__)
+                cls._use_keyring = False
+
+        # A packaged Windows client must fail closed.  A file encryption
+        # key stored beside its ciphertext is recoverable by the same
+        # local attacker who can inspect the application.
+        if not cls._allow_file_fallback():
+            cls._record_os_store_required()
+            logger.error(
+                "OS credential store unavailable; refusing file fallback for %s",
+                key_name,
+            )
+            return False
+
+        return cls._store_to_file(key_name, key_value)
 
     @classmethod
     def get_api_key(cls, key_name: str) -> Optional[str]:
@@ -302,37 +324,118 @@ class SecretsManager:
 
         # Thread-safe operation
         with cls._lock:
-            # Try keyring first
-            if cls._use_keyring and cls._init_keyring():
-                try:
-                    import keyring
-                    value = keyring.get_password(cls.SERVICE_NAME, key_name)
-                    if value:
-                        return value
-
-                    # Migrate older packaged releases only while a verified OS
-                    # store is available, then remove the recoverable file copy.
-                    if not cls._allow_file_fallback():
-                        legacy_value = cls._read_from_file(key_name)
-                        if legacy_value:
-                            keyring.set_password(cls.SERVICE_NAME, key_name, legacy_value)
-                            verify_value = keyring.get_password(cls.SERVICE_NAME, key_name)
-                            if verify_value == legacy_value:
-                                cls._delete_from_file(key_name)
-                                return legacy_value
-                            logger.error(
-                                "OS credential migration verification failed for %s",
-                                key_name,
-                            )
-                except Exception as e:
-                    logger.debug("Keyring retrieval failed: %s", type(e).__name__)
-                    cls._use_keyring = False
-
-            if not cls._allow_file_fallback():
-                cls._record_os_store_required()
-                return None
-
-            return cls._read_from_file(key_name)
+            signature = cls._store_signature()
+            if signature != cls._cache_signature:
+                cls._secret_cache.clear()
+                cls._cache_signature = signature
+            elif key_name in cls._secret_cache:
+                return cls._secret_cache[key_name]
+
+            value, cacheable = cls._read_secret(key_name)
+            if cacheable:
+                # Re-stat: a legacy migration above may have rewritten the store.
+                if cls._store_signature() != signature:
+                    cls._secret_cache.clear()
+                    cls._cache_signature = cls._store_signature()
+                cls._secret_cache[key_name] = value
+            return value
+
+    @classmethod
+    def _read_secret(cls, key_name: str) -> Tuple[Optional[str], bool]:
+        """Read from the backing store; returns ``(value, cacheable)``."""
+        import logging
+        logger = logging.getLogger(__name__)
+
+        # Try keyring first
+        if cls._use_keyring and cls._init_keyring():
+            try:
+                import keyring
+                value = keyring.get_password(cls.SERVICE_NAME, key_name)
+                if value:
+                    return value, True
+
+                # Migrate older packaged releases only while a verified OS
+                # store is available, then remove the recoverable file copy.
+                if not cls._allow_file_fallback():
+                    legacy_value = cls._read_from_file(key_name)
+                    if legacy_value:
+                        keyring.set_password(cls.SERVICE_NAME, key_name, legacy_value)
+                        verify_value = keyring.get_password(cls.SERVICE_NAME, key_name)
+                        if verify_value == legacy_value:
+                            cls._delete_from_file(key_name)
+                            return legacy_value, True
+                        logger.error(
+                            "OS credential migration verification failed for %s",
+                            key_name,
+                        )
+            except Exception as e:
+                logger.debug("Keyring retrieval failed: %s", type(e).__name__)
+                cls._use_keyring = False
+
+        if not cls._allow_file_fallback():
+            cls._record_os_store_required()
+            return None, False
+
+        return cls._read_from_file(key_name), True
+
+    @classmethod
+    def _generation_file(cls) -> Path:
+        return cls._candidate_base_dirs()[0] / cls._GENERATION_FILE_NAME
+
+    @classmethod
+    def _store_signature(cls) -> Tuple[Any, ...]:
+        """Cheap identity of the backing store.
+
+        The generation file is read rather than stat-ed: two bumps inside one
+        filesystem timestamp tick would otherwise look identical.
+        """
+        try:
+            generation = cls._generation_file().read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            generation = None
+        signature: list = [cls._use_keyring, cls._local_generation, generation]
+        for path in cls._candidate_secret_files():
+            try:
+                stat = path.stat()
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino))
+            except OSError:
+                signature.append((str(path), None))
+        return tuple(signature)
+
+    @classmethod
+    def _bump_generation(cls, key_name: Optional[str] = None) -> None:
+        """Invalidate this and other processes' caches after a write (call under _lock)."""
+        if key_name is None:
+            cls._secret_cache.clear()
+        else:
+            cls._secret_cache.pop(key_name, None)
+        cls._cache_signature = None
+        cls._local_generation += 1
+        try:
+            generation_file = cls._generation_file()
+            generation_file.parent.mkdir(parents=True, exist_ok=True)
+            generation_file.write_text(
+                f"{time.time_ns()}:{os.getpid()}:{cls._local_generation}",
+                encoding="utf-8",
+            )
+        except OSError:
+            # Other processes fall back to the fallback-file stats alone.
+            pass
+
+    @classmethod
+    def invalidate_cache(cls, key_name: Optional[str] = None) -> None:
+        """Drop cached secrets (one key or all) so the next read hits the store."""
+        with cls._lock:
+            if key_name is None:
+                cls._secret_cache.clear()
+                cls._cache_signature = None
+            else:
+                cls._secret_cache.pop(key_name, None)
+
+    @classmethod
+    def store_version(cls) -> Tuple[Any, ...]:
+        """Opaque token that changes whenever any stored secret may have changed."""
+        return cls._store_signature()
 
     @classmethod
     def delete_api_key(cls, key_name: str) -> bool:
@@ -359,6 +462,7 @@ class SecretsManager:
             # Also remove from file-based storage
             if cls._delete_from_file(key_name):
                 success = True
+            cls._bump_generation(key_name)
 
         return success
 